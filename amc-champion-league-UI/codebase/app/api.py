@@ -1,8 +1,15 @@
-from fastapi import FastAPI, Depends, HTTPException, UploadFile, File, Form, Query
+from fastapi import FastAPI, Depends, HTTPException, UploadFile, File, Form, Query, Header, Request, Response, WebSocket
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
 from typing import List, Optional, Dict, Any
+from datetime import datetime
 from sqlalchemy.orm import Session
+import asyncio
+import json
+import math
 import os
 import uvicorn
 
@@ -16,39 +23,58 @@ from codebase.service.game_service import (
     create_player, get_players, get_player, update_player, delete_player,
     # Match
     create_match, get_matches, get_match, update_match, delete_match, get_match_with_details,
+    submit_match_result,
     # Match Player
     add_player_to_match, update_match_player_result, get_match_players,
     # Gallery
     add_gallery_image, get_gallery_images, delete_gallery_image, list_s3_gallery_images,
     # Team
     create_team, get_teams, get_team, update_team, delete_team,
-    get_teams_by_franchise, get_teams_by_game,
     # Team Player
     add_player_to_team, get_team_players, get_player_teams, remove_player_from_team,
     # Fixtures
-    get_fixtures,
+    get_fixtures, fixture_cursor_key, get_fixture_calendar,
     # Leaderboard
-    get_leaderboard, get_player_leaderboard, get_franchise_leaderboard, get_team_leaderboard
+    get_leaderboard, get_leaderboards, get_player_leaderboard, get_franchise_leaderboard, get_team_leaderboard,
+    get_team_rank, get_leaderboard_movers, get_player_leaderboard_around
 )
 
 # Import from team_service
 from codebase.service.team_service import get_teams_with_details
+from codebase.service.standings_service import ensure_standings, list_snapshots
+from codebase.service.rating_service import ensure_ratings, get_rating_leaderboard
+from codebase.service.points_service import ensure_points_ledger
+from codebase.service.schedule_service import ensure_scheduled_at
+from codebase.service.tournament_service import generate_tournament
+from codebase.service.conflict_service import ScheduleConflictError, get_schedule_conflicts
+from codebase.service.live_scoring_service import live_scores, record_live_events, get_live_score
+from codebase.service.summary_service import summary_jobs, get_summary_job, resume_summaries
+from codebase.service.scoring_service import evaluate_game_score, rescore_matches
+from codebase.service.stats_service import get_stat_leaders, get_stat_records
 
 # Import models and schemas
 from codebase.service.request_payload import (
     Game, GameCreate,
     Franchise, FranchiseCreate,
     Player, PlayerCreate, AddPlayerRequest,
-    Match, MatchCreate,
+    Match, MatchCreate, MatchResult, MatchResultSubmit,
     MatchPlayer, MatchPlayerCreate, MatchPlayerUpdate,
     Gallery, GalleryCreate,
     TeamCreate, Team, TeamPlayer, TeamPlayerCreate, TeamWithDetails,
-    FixtureDetail,
-    Leaderboard
+    FixtureDetail, TournamentCreate, TournamentSummary, ScheduleConflict,
+    LiveScore, LiveScoreEventBatch, SummaryJob, ScoreEvaluation, RescoreSummary,
+    Leaderboard, LeaderboardMover, StandingSnapshot, StatLeader, StatRecord
 )
 
 # Import database utils
-from codebase.utils.database import get_db, create_db_tables
+from codebase.utils.database import get_db, create_db_tables, SessionLocal
+from codebase.utils.extracted_fields import ensure_extracted_fields
+from codebase.utils.cache import query_cache
+from codebase.utils.etag import conditional_get
+from codebase.utils.events import MATCH_TOPIC, broker, parse_topics
+from codebase.utils.pagination import page_limit, next_cursor, set_next_cursor
+from codebase.utils.config_manager import config
+from codebase.utils.resilience import DependencyUnavailableError, resilience_metrics
 
 # Create FastAPI app
 app = FastAPI(
@@ -64,28 +90,137 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allow all methods
     allow_headers=["*"],  # Allow all headers
+    expose_headers=["ETag", "X-Next-Cursor", "Link"],
 )
 
+# Tables behind each group of GET endpoints; their change counters make up the ETag
+GAME_TABLES = ("game",)
+FRANCHISE_TABLES = ("franchise",)
+PLAYER_TABLES = ("player",)
+TEAM_TABLES = ("team", "franchise", "game")
+ROSTER_TABLES = ("team_player", "team", "player", "franchise", "game")
+MATCH_TABLES = ("match",)
+MATCH_PLAYER_TABLES = ("match_player", "player", "franchise", "team", "match")
+FIXTURE_TABLES = ("match", "game", "franchise", "team")
+CONFLICT_TABLES = ("match_schedule",)
+GALLERY_TABLES = ("gallery",)
+LEADERBOARD_TABLES = ("standing", "player", "franchise", "team", "team_player", "game", "match")
+SNAPSHOT_TABLES = ("standing_snapshot",)
+MOVER_TABLES = LEADERBOARD_TABLES + SNAPSHOT_TABLES
+RATING_TABLES = ("rating", "player", "team")
+STAT_TABLES = ("match_player", "match", "player", "franchise")
+
 # Mount static files directory for local image storage
 os.makedirs("static/images", exist_ok=True)
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
+@app.on_event("startup")
+def prepare_database():
+    """Create missing tables, migrate older tables and seed the standings and ratings"""
+    create_db_tables()
+    db = SessionLocal()
+    try:
+        ensure_extracted_fields(db)
+        ensure_scheduled_at(db)
+        ensure_standings(db)
+        ensure_ratings(db)
+        ensure_points_ledger(db)
+    finally:
+        db.close()
+
+@app.on_event("startup")
+def start_live_scoring():
+    """Write buffered live scoring events in the background"""
+    live_scores.start(SessionLocal)
+
+@app.on_event("shutdown")
+def stop_live_scoring():
+    """Write whatever live scoring events are still buffered"""
+    live_scores.stop(SessionLocal)
+
+@app.on_event("startup")
+def start_summary_workers():
+    """Generate match summaries in the background, picking up any left pending"""
+    summary_jobs.start(SessionLocal)
+    db = SessionLocal()
+    try:
+        resume_summaries(db)
+    finally:
+        db.close()
+
+@app.on_event("shutdown")
+def stop_summary_workers():
+    summary_jobs.stop()
+
+@app.exception_handler(DependencyUnavailableError)
+def dependency_unavailable(request: Request, error: DependencyUnavailableError):
+    """503 with a Retry-After hint when S3 or the LLM is refused, failing or too slow"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(error), "dependency": error.dependency},
+        headers={"Retry-After": str(max(1, math.ceil(error.retry_after)))}
+    )
+
+def _page(request: Request, response: Response, limit: int, fetch, key=None):
+    """Run a cursor-paginated service call and advertise the next page's cursor (keyed on id by default)"""
+    try:
+        items = fetch()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if key is None:
+        key = (lambda item: (item["id"],)) if items and isinstance(items[0], dict) else (lambda item: (item.id,))
+    set_next_cursor(request, response, next_cursor(items, limit, key))
+    return items
+
+def _conflict_error(error: ScheduleConflictError) -> HTTPException:
+    """409 listing every clash, so clients can show all of them at once"""
+    return HTTPException(status_code=409, detail=jsonable_encoder({"message": str(error), "conflicts": error.conflicts}))
+
+def _split_csv(value: Optional[str]) -> Optional[List[str]]:
+    """Split a comma-separated query parameter into a list"""
+    if not value:
+        return None
+    return [item.strip() for item in value.split(",") if item.strip()]
+
 # Health check endpoint
 @app.get("/", tags=["health"])
 def health_check():
     return {"status": "ok", "message": "AMC Champion League API is running"}
 
+@app.get("/metrics", response_class=PlainTextResponse, tags=["health"])
+def metrics():
+    """Expose cache, stream, live scoring, summary queue and dependency guard metrics in Prometheus text format"""
+    lines = []
+    for name, value in query_cache.stats().items():
+        metric = f"amc_cache_{name}" if name == "entries" else f"amc_cache_{name}_total"
+        lines.append(f"# TYPE {metric} {'gauge' if name == 'entries' else 'counter'}")
+        lines.append(f'{metric}{{cache="{query_cache.name}"}} {value}')
+    lines.append("# TYPE amc_stream_subscribers gauge")
+    lines.append(f"amc_stream_subscribers {broker.subscriber_count}")
+    lines.append("# TYPE amc_live_matches gauge")
+    lines.append(f"amc_live_matches {live_scores.active_count}")
+    lines.append("# TYPE amc_summary_jobs_queued gauge")
+    lines.append(f"amc_summary_jobs_queued {summary_jobs.backlog}")
+    lines.extend(resilience_metrics())
+    return "\n".join(lines) + "\n"
+
 # Game endpoints
 @app.post("/api/v1/games/", response_model=Game, tags=["games"])
 def create_game_endpoint(game: GameCreate, db: Session = Depends(get_db)):
     return create_game(db=db, game=game)
 
-@app.get("/api/v1/games/", response_model=List[Game], tags=["games"])
-def read_games(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    games = get_games(db, skip=skip, limit=limit)
-    return games
+@app.get("/api/v1/games/", response_model=List[Game], tags=["games"], dependencies=[conditional_get(*GAME_TABLES)])
+def read_games(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = page_limit(),
+    after: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    return _page(request, response, limit, lambda: get_games(db, skip=skip, limit=limit, after=after))
 
-@app.get("/api/v1/games/{game_id}", response_model=Game, tags=["games"])
+@app.get("/api/v1/games/{game_id}", response_model=Game, tags=["games"], dependencies=[conditional_get(*GAME_TABLES)])
 def read_game(game_id: int, db: Session = Depends(get_db)):
     db_game = get_game(db, game_id=game_id)
     if db_game is None:
@@ -106,17 +241,46 @@ def delete_game_endpoint(game_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Game not found")
     return {"message": "Game deleted successfully"}
 
+@app.post("/api/v1/games/{game_id}/score", response_model=ScoreEvaluation, tags=["games"])
+def evaluate_score_endpoint(game_id: int, score_data: Dict[str, Any], db: Session = Depends(get_db)):
+    """Check a score against the game's rules and show the winner, margin and points it gives, without saving"""
+    try:
+        evaluation = evaluate_game_score(db, game_id=game_id, score_data=score_data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if evaluation is None:
+        raise HTTPException(status_code=404, detail="Game not found")
+    return evaluation
+
+@app.post("/api/v1/games/{game_id}/rescore", response_model=RescoreSummary, tags=["games"])
+def rescore_game_endpoint(
+    game_id: int,
+    match_date: Optional[str] = Query(None, description="Only matches played on this date (YYYY-MM-DD)"),
+    dry_run: bool = False,
+    db: Session = Depends(get_db)
+):
+    """Re-score the game's completed matches from their stored scores under its current rules"""
+    if get_game(db, game_id=game_id) is None:
+        raise HTTPException(status_code=404, detail="Game not found")
+    return rescore_matches(db, game_id=game_id, match_date=match_date, dry_run=dry_run)
+
 # Franchise endpoints
 @app.post("/api/v1/franchises/", response_model=Franchise, tags=["franchises"])
 def create_franchise_endpoint(franchise: FranchiseCreate, db: Session = Depends(get_db)):
     return create_franchise(db=db, franchise=franchise)
 
-@app.get("/api/v1/franchises/", response_model=List[Franchise], tags=["franchises"])
-def read_franchises(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    franchises = get_franchises(db, skip=skip, limit=limit)
-    return franchises
+@app.get("/api/v1/franchises/", response_model=List[Franchise], tags=["franchises"], dependencies=[conditional_get(*FRANCHISE_TABLES)])
+def read_franchises(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = page_limit(),
+    after: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    return _page(request, response, limit, lambda: get_franchises(db, skip=skip, limit=limit, after=after))
 
-@app.get("/api/v1/franchises/{franchise_id}", response_model=Franchise, tags=["franchises"])
+@app.get("/api/v1/franchises/{franchise_id}", response_model=Franchise, tags=["franchises"], dependencies=[conditional_get(*FRANCHISE_TABLES)])
 def read_franchise(franchise_id: int, db: Session = Depends(get_db)):
     db_franchise = get_franchise(db, franchise_id=franchise_id)
     if db_franchise is None:
@@ -142,17 +306,21 @@ def delete_franchise_endpoint(franchise_id: int, db: Session = Depends(get_db)):
 async def create_player_endpoint(player: PlayerCreate, db: Session = Depends(get_db)):
     return await create_player(db=db, player=player)
 
-@app.get("/api/v1/players/", response_model=List[Player], tags=["players"])
+@app.get("/api/v1/players/", response_model=List[Player], tags=["players"], dependencies=[conditional_get(*PLAYER_TABLES)])
 def read_players(
+    request: Request,
+    response: Response,
     skip: int = 0, 
-    limit: int = 100, 
+    limit: int = page_limit(), 
     franchise_id: Optional[int] = None,
+    after: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    players = get_players(db, skip=skip, limit=limit, franchise_id=franchise_id)
-    return players
+    return _page(request, response, limit, lambda: get_players(
+        db, skip=skip, limit=limit, franchise_id=franchise_id, after=after
+    ))
 
-@app.get("/api/v1/players/{player_id}", response_model=Player, tags=["players"])
+@app.get("/api/v1/players/{player_id}", response_model=Player, tags=["players"], dependencies=[conditional_get(*PLAYER_TABLES)])
 def read_player(player_id: int, db: Session = Depends(get_db)):
     db_player = get_player(db, player_id=player_id)
     if db_player is None:
@@ -190,7 +358,7 @@ def create_team_endpoint(team: TeamCreate, db: Session = Depends(get_db)):
     """Create a new team"""
     return create_team(db=db, team=team)
 
-@app.get("/api/v1/teams/{team_id}", response_model=Team, tags=["teams"])
+@app.get("/api/v1/teams/{team_id}", response_model=Team, tags=["teams"], dependencies=[conditional_get(*TEAM_TABLES)])
 def get_team_endpoint(team_id: int, db: Session = Depends(get_db)):
     """Get a team by ID"""
     db_team = get_team(db=db, team_id=team_id)
@@ -198,25 +366,33 @@ def get_team_endpoint(team_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Team not found")
     return db_team
 
-@app.get("/api/v1/teams/", response_model=List[Team], tags=["teams"])
+@app.get("/api/v1/teams/", response_model=List[Team], tags=["teams"], dependencies=[conditional_get(*TEAM_TABLES)])
 def get_teams_endpoint(
+    request: Request,
+    response: Response,
     skip: int = 0, 
-    limit: int = 100, 
+    limit: int = page_limit(), 
     franchise_id: Optional[int] = None, 
     game_id: Optional[int] = None,
+    after: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """Get teams with optional filtering"""
-    if franchise_id:
-        return get_teams_by_franchise(db=db, franchise_id=franchise_id)
-    elif game_id:
-        return get_teams_by_game(db=db, game_id=game_id)
-    return get_teams(db=db, skip=skip, limit=limit)
-
-@app.get("/api/v1/teams-with-details/", response_model=List[TeamWithDetails], tags=["teams"])
-def get_teams_details_endpoint(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+    return _page(request, response, limit, lambda: get_teams(
+        db=db, skip=skip, limit=limit, franchise_id=franchise_id, game_id=game_id, after=after
+    ))
+
+@app.get("/api/v1/teams-with-details/", response_model=List[TeamWithDetails], tags=["teams"], dependencies=[conditional_get(*TEAM_TABLES)])
+def get_teams_details_endpoint(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = page_limit(),
+    after: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
     """Get teams with franchise and game details"""
-    return get_teams_with_details(db=db, skip=skip, limit=limit)
+    return _page(request, response, limit, lambda: get_teams_with_details(db=db, skip=skip, limit=limit, after=after))
 
 @app.put("/api/v1/teams/{team_id}", response_model=Team, tags=["teams"])
 def update_team_endpoint(team_id: int, team_data: Dict[str, Any], db: Session = Depends(get_db)):
@@ -240,15 +416,29 @@ def add_player_to_team_endpoint(team_player: TeamPlayerCreate, db: Session = Dep
     """Add a player to a team"""
     return add_player_to_team(db=db, team_player=team_player)
 
-@app.get("/api/v1/teams/{team_id}/players", response_model=List[Dict], tags=["team-players"])
-def get_team_players_endpoint(team_id: int, db: Session = Depends(get_db)):
+@app.get("/api/v1/teams/{team_id}/players", response_model=List[Dict], tags=["team-players"], dependencies=[conditional_get(*ROSTER_TABLES)])
+def get_team_players_endpoint(
+    team_id: int,
+    include: Optional[str] = Query(None, description="Comma-separated relations to embed: player, franchise, team"),
+    db: Session = Depends(get_db)
+):
     """Get all players in a team"""
-    return get_team_players(db=db, team_id=team_id)
-
-@app.get("/api/v1/players/{player_id}/teams", response_model=List[Dict], tags=["team-players"])
-def get_player_teams_endpoint(player_id: int, db: Session = Depends(get_db)):
+    try:
+        return get_team_players(db=db, team_id=team_id, include=_split_csv(include))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/api/v1/players/{player_id}/teams", response_model=List[Dict], tags=["team-players"], dependencies=[conditional_get(*ROSTER_TABLES)])
+def get_player_teams_endpoint(
+    player_id: int,
+    include: Optional[str] = Query(None, description="Comma-separated relations to embed: team, franchise, game"),
+    db: Session = Depends(get_db)
+):
     """Get all teams a player belongs to"""
-    return get_player_teams(db=db, player_id=player_id)
+    try:
+        return get_player_teams(db=db, player_id=player_id, include=_split_csv(include))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @app.delete("/api/v1/teams/{team_id}/players/{player_id}", tags=["team-players"])
 def remove_player_from_team_endpoint(team_id: int, player_id: int, db: Session = Depends(get_db)):
@@ -261,29 +451,36 @@ def remove_player_from_team_endpoint(team_id: int, player_id: int, db: Session =
 # Match endpoints
 @app.post("/api/v1/matches/", response_model=Match, tags=["matches"])
 def create_match_endpoint(match: MatchCreate, db: Session = Depends(get_db)):
-    return create_match(db=db, match=match)
+    try:
+        return create_match(db=db, match=match)
+    except ScheduleConflictError as e:
+        raise _conflict_error(e)
 
-@app.get("/api/v1/matches/", response_model=List[Match], tags=["matches"])
+@app.get("/api/v1/matches/", response_model=List[Match], tags=["matches"], dependencies=[conditional_get(*MATCH_TABLES)])
 def read_matches(
+    request: Request,
+    response: Response,
     skip: int = 0, 
-    limit: int = 100,
+    limit: int = page_limit(),
     game_id: Optional[int] = None,
     status: Optional[str] = None,
     franchise_id: Optional[int] = None,
     round: Optional[str] = None,
+    after: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    matches = get_matches(db, skip=skip, limit=limit, game_id=game_id, status=status, round=round)
-    return matches
+    return _page(request, response, limit, lambda: get_matches(
+        db, skip=skip, limit=limit, game_id=game_id, status=status, round=round, after=after
+    ))
 
-@app.get("/api/v1/matches/{match_id}", response_model=Match, tags=["matches"])
+@app.get("/api/v1/matches/{match_id}", response_model=Match, tags=["matches"], dependencies=[conditional_get(*MATCH_TABLES)])
 def read_match(match_id: int, db: Session = Depends(get_db)):
     db_match = get_match(db, match_id=match_id)
     if db_match is None:
         raise HTTPException(status_code=404, detail="Match not found")
     return db_match
 
-@app.get("/api/v1/matches/{match_id}/details", response_model=Dict, tags=["matches"])
+@app.get("/api/v1/matches/{match_id}/details", response_model=Dict, tags=["matches"], dependencies=[conditional_get(*FIXTURE_TABLES)])
 def get_match_details_endpoint(match_id: int, db: Session = Depends(get_db)):
     """Get detailed match information including opponents"""
     match_details = get_match_with_details(db=db, match_id=match_id)
@@ -293,11 +490,30 @@ def get_match_details_endpoint(match_id: int, db: Session = Depends(get_db)):
 
 @app.put("/api/v1/matches/{match_id}", response_model=Match, tags=["matches"])
 def update_match_endpoint(match_id: int, match_data: Dict[str, Any], db: Session = Depends(get_db)):
-    db_match = update_match(db=db, match_id=match_id, match_data=match_data)
+    try:
+        db_match = update_match(db=db, match_id=match_id, match_data=match_data)
+    except ScheduleConflictError as e:
+        raise _conflict_error(e)
     if db_match is None:
         raise HTTPException(status_code=404, detail="Match not found")
     return db_match
 
+@app.post("/api/v1/matches/{match_id}/result", response_model=MatchResult, tags=["matches"])
+def submit_match_result_endpoint(match_id: int, result: MatchResultSubmit, db: Session = Depends(get_db)):
+    """
+    Record the final score, the winner and every player's points in one request and one commit
+    
+    Players are matched on player_id (rows are created as needed); is_winner defaults to
+    whether the player's team (or franchise) is winner_id. Returns the standings deltas.
+    """
+    try:
+        result = submit_match_result(db=db, match_id=match_id, result=result)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=404, detail="Match not found")
+    return result
+
 @app.delete("/api/v1/matches/{match_id}", tags=["matches"])
 def delete_match_endpoint(match_id: int, db: Session = Depends(get_db)):
     success = delete_match(db=db, match_id=match_id)
@@ -306,14 +522,17 @@ def delete_match_endpoint(match_id: int, db: Session = Depends(get_db)):
     return {"message": "Match deleted successfully"}
 
 # Fixtures endpoints
-@app.get("/api/v1/fixtures/", response_model=List[FixtureDetail], tags=["fixtures"])
+@app.get("/api/v1/fixtures/", response_model=List[FixtureDetail], tags=["fixtures"], dependencies=[conditional_get(*FIXTURE_TABLES)])
 def get_fixtures_endpoint(
+    request: Request,
+    response: Response,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = page_limit(),
     status: Optional[str] = None,
     game_id: Optional[int] = None,
     franchise_id: Optional[int] = None,
     round: Optional[str] = None,
+    after: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """
@@ -324,25 +543,94 @@ def get_fixtures_endpoint(
     - game_id: Filter by specific game
     - franchise_id: Filter by franchise (home or away)
     - round: Filter by tournament round (Semi Final, Final, etc.)
+    - after: cursor from the previous page's X-Next-Cursor header
     """
-    return get_fixtures(
+    return _page(request, response, limit, lambda: get_fixtures(
         db=db,
         skip=skip,
         limit=limit,
         status=status,
         game_id=game_id,
         franchise_id=franchise_id,
-        round=round
-    )
+        round=round,
+        after=after
+    ), key=fixture_cursor_key)
+
+@app.post("/api/v1/fixtures/generate", response_model=TournamentSummary, tags=["fixtures"])
+def generate_tournament_endpoint(tournament: TournamentCreate, db: Session = Depends(get_db)):
+    """
+    Generate all matches of a tournament in one transaction
+    
+    - format: round_robin (optionally in snake-seeded groups, with return legs) or knockout
+      (seeded bracket; top seeds get byes, later rounds fill in as winners are recorded)
+    - entry_type / entry_ids: teams or franchises, best seed first
+    """
+    try:
+        return generate_tournament(db=db, request=tournament)
+    except ScheduleConflictError as e:
+        raise _conflict_error(e)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/api/v1/fixtures/conflicts", response_model=List[ScheduleConflict], tags=["fixtures"], dependencies=[conditional_get(*CONFLICT_TABLES)])
+def get_fixture_conflicts_endpoint(
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    game_id: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Report overlapping fixtures: the same venue, team or rostered player booked twice at once
+    
+    - from / to: optional window; pairs overlapping it are reported
+    - game_id: only pairs involving a match of this game
+    """
+    return get_schedule_conflicts(db=db, start=start, end=end, game_id=game_id)
+
+@app.get("/api/v1/fixtures/calendar", response_model=List[FixtureDetail], tags=["fixtures"], dependencies=[conditional_get(*FIXTURE_TABLES)])
+def get_fixture_calendar_endpoint(
+    request: Request,
+    response: Response,
+    start: datetime = Query(..., alias="from"),
+    end: datetime = Query(..., alias="to"),
+    game_id: Optional[int] = None,
+    status: Optional[str] = None,
+    limit: int = page_limit(),
+    after: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Get the fixtures scheduled between two moments, in chronological order
+    
+    - from / to: ISO date or date-time, league-local; from is inclusive, to exclusive
+    - game_id, status: optional filters
+    - after: cursor from the previous page's X-Next-Cursor header
+    """
+    return _page(request, response, limit, lambda: get_fixture_calendar(
+        db=db,
+        start=start,
+        end=end,
+        game_id=game_id,
+        status=status,
+        limit=limit,
+        after=after
+    ), key=lambda fixture: (fixture.scheduled_at, fixture.id))
 
 # Match Players endpoints
 @app.post("/api/v1/match-players/", response_model=MatchPlayer, tags=["match-players"])
 def add_player_to_match_endpoint(match_player: MatchPlayerCreate, db: Session = Depends(get_db)):
     return add_player_to_match(db=db, match_player=match_player)
 
-@app.get("/api/v1/matches/{match_id}/players", response_model=List[Dict], tags=["match-players"])
-def get_match_players_endpoint(match_id: int, db: Session = Depends(get_db)):
-    return get_match_players(db=db, match_id=match_id)
+@app.get("/api/v1/matches/{match_id}/players", response_model=List[Dict], tags=["match-players"], dependencies=[conditional_get(*MATCH_PLAYER_TABLES)])
+def get_match_players_endpoint(
+    match_id: int,
+    include: Optional[str] = Query(None, description="Comma-separated relations to embed: player, franchise, team, match"),
+    db: Session = Depends(get_db)
+):
+    try:
+        return get_match_players(db=db, match_id=match_id, include=_split_csv(include))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @app.put("/api/v1/match-players/{match_player_id}", response_model=MatchPlayer, tags=["match-players"])
 def update_match_player_result_endpoint(
@@ -361,6 +649,101 @@ def update_match_player_result_endpoint(
     
     return db_match_player
 
+# Match summaries
+@app.get("/api/v1/summary-jobs/{job_id}", response_model=SummaryJob, tags=["matches"])
+def get_summary_job_endpoint(job_id: str):
+    """
+    Status of a match summary job
+    
+    Updating a match with `extra_data.notes` but no `ai_summary` queues a job and returns at
+    once with `ai_summary_status: pending` and the job's id in `ai_summary_job_id`.
+    """
+    job = get_summary_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Summary job not found")
+    return job
+
+# Live scoring
+@app.post("/api/v1/matches/{match_id}/live", response_model=LiveScore, tags=["live-scoring"])
+def record_live_events_endpoint(match_id: int, batch: LiveScoreEventBatch, db: Session = Depends(get_db)):
+    """
+    Score rally points (badminton, table tennis, pickleball, pool, carom) or balls (box cricket)
+    
+    Events are applied in order, all or none; the running score is returned and pushed to
+    the match's WebSocket and stream subscribers at once, and written to the database in batches.
+    """
+    try:
+        live_score = record_live_events(db=db, match_id=match_id, events=[
+            event.model_dump(exclude_unset=True) for event in batch.events
+        ])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if live_score is None:
+        raise HTTPException(status_code=404, detail="Match not found")
+    return live_score
+
+@app.get("/api/v1/matches/{match_id}/live", response_model=LiveScore, tags=["live-scoring"])
+def get_live_score_endpoint(match_id: int, db: Session = Depends(get_db)):
+    """Current live score of a match"""
+    try:
+        live_score = get_live_score(db=db, match_id=match_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if live_score is None:
+        raise HTTPException(status_code=404, detail="Match not found")
+    return live_score
+
+def _load_live_score(match_id: int) -> Optional[Dict[str, Any]]:
+    db = SessionLocal()
+    try:
+        return get_live_score(db=db, match_id=match_id)
+    except ValueError:
+        return None
+    finally:
+        db.close()
+
+@app.websocket("/api/v1/matches/{match_id}/live/ws")
+async def live_score_socket(websocket: WebSocket, match_id: int):
+    """
+    Watch a match's live score
+    
+    Sends the current score as a `live_score` message, then every scoring update and
+    match change as `{"id", "type", "data"}` messages. Messages from the client are ignored.
+    """
+    live_score = await run_in_threadpool(_load_live_score, match_id)
+    if live_score is None:
+        await websocket.close(code=1008)
+        return
+    
+    await websocket.accept()
+    subscription, _, _ = broker.subscribe({f"{MATCH_TOPIC}:{match_id}"})
+    
+    async def forward():
+        await websocket.send_text(json.dumps({"id": None, "type": "live_score", "data": live_score}, default=str))
+        while True:
+            stream_event = await subscription.queue.get()
+            # None means the viewer fell too far behind; it reconnects for a fresh score
+            if stream_event is None:
+                break
+            await websocket.send_text(json.dumps(
+                {"id": stream_event.id, "type": stream_event.type, "data": stream_event.data}, default=str
+            ))
+    
+    async def drain():
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+    
+    sender = asyncio.create_task(forward())
+    receiver = asyncio.create_task(drain())
+    try:
+        done, _ = await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+        if sender in done and sender.exception() is None:
+            await websocket.close()
+    finally:
+        sender.cancel()
+        receiver.cancel()
+        broker.unsubscribe(subscription)
+
 # Gallery endpoints
 @app.post("/api/v1/gallery/", response_model=Gallery, tags=["gallery"])
 async def create_gallery_item(
@@ -377,10 +760,19 @@ async def create_gallery_item(
     )
     return await add_gallery_image(db=db, gallery_data=gallery_data, image=file)
 
-@app.get("/api/v1/gallery/", response_model=List[Gallery], tags=["gallery"])
-def read_gallery(skip: int = 0, limit: int = 100, match_id: Optional[int] = None, db: Session = Depends(get_db)):
-    gallery_items = get_gallery_images(db=db, skip=skip, limit=limit, match_id=match_id)
-    return gallery_items
+@app.get("/api/v1/gallery/", response_model=List[Gallery], tags=["gallery"], dependencies=[conditional_get(*GALLERY_TABLES)])
+def read_gallery(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = page_limit(),
+    match_id: Optional[int] = None,
+    after: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    return _page(request, response, limit, lambda: get_gallery_images(
+        db=db, skip=skip, limit=limit, match_id=match_id, after=after
+    ))
 
 @app.get("/api/v1/s3-gallery/", response_model=List[str], tags=["gallery"])
 def list_s3_images():
@@ -394,33 +786,220 @@ def delete_gallery_item(gallery_id: int, db: Session = Depends(get_db)):
     return {"message": "Gallery item deleted successfully"}
 
 # Leaderboard endpoints
-@app.get("/api/v1/leaderboard/", response_model=Dict, tags=["leaderboard"])
-def get_leaderboard_endpoint(game_id: Optional[int] = None, db: Session = Depends(get_db)):
-    return get_leaderboard(db=db, game_id=game_id)
-
-@app.get("/api/v1/leaderboard/players", tags=["leaderboard"])
+@app.get("/api/v1/leaderboard/", response_model=Dict, tags=["leaderboard"], dependencies=[conditional_get(*LEADERBOARD_TABLES)])
+def get_leaderboard_endpoint(
+    game_id: Optional[int] = None,
+    game_ids: Optional[str] = None,
+    as_of: Optional[datetime] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Get the combined player, franchise and team leaderboard
+    
+    - game_ids: comma-separated game IDs (0 for overall); returns the boards keyed by game ID,
+      all computed in one pass
+    """
+    if game_ids:
+        try:
+            ids = [int(game) for game in _split_csv(game_ids)]
+        except ValueError:
+            raise HTTPException(status_code=400, detail="game_ids must be comma-separated integers")
+        return get_leaderboards(db=db, game_ids=ids, as_of=as_of)
+    return get_leaderboard(db=db, game_id=game_id, as_of=as_of)
+
+@app.get("/api/v1/leaderboard/players", tags=["leaderboard"], dependencies=[conditional_get(*LEADERBOARD_TABLES)])
 def get_player_leaderboard_endpoint(
     limit: int = 10,
     game_id: Optional[int] = None, 
+    as_of: Optional[datetime] = None,
     db: Session = Depends(get_db)
 ):
-    return get_player_leaderboard(db=db, limit=limit, game_id=game_id)
+    return get_player_leaderboard(db=db, limit=limit, game_id=game_id, as_of=as_of)
 
-@app.get("/api/v1/leaderboard/franchises", tags=["leaderboard"])
+@app.get("/api/v1/leaderboard/players/{player_id}/around", tags=["leaderboard"], dependencies=[conditional_get(*LEADERBOARD_TABLES)])
+def get_player_leaderboard_around_endpoint(
+    player_id: int,
+    n: int = Query(5, ge=0, le=50),
+    game_id: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """Get the n player leaderboard entries above and below a player, with ranks"""
+    entries = get_player_leaderboard_around(db=db, player_id=player_id, n=n, game_id=game_id)
+    if entries is None:
+        raise HTTPException(status_code=404, detail="Player has no results on this leaderboard")
+    return entries
+
+@app.get("/api/v1/leaderboard/franchises", tags=["leaderboard"], dependencies=[conditional_get(*LEADERBOARD_TABLES)])
 def get_franchise_leaderboard_endpoint(
     limit: int = 10,
     game_id: Optional[int] = None,
+    as_of: Optional[datetime] = None,
     db: Session = Depends(get_db)
 ):
-    return get_franchise_leaderboard(db=db, limit=limit, game_id=game_id)
+    return get_franchise_leaderboard(db=db, limit=limit, game_id=game_id, as_of=as_of)
 
-@app.get("/api/v1/leaderboard/teams", tags=["leaderboard"])
+@app.get("/api/v1/leaderboard/teams", tags=["leaderboard"], dependencies=[conditional_get(*LEADERBOARD_TABLES)])
 def get_team_leaderboard_endpoint(
     limit: int = 10,
+    offset: int = 0,
+    game_id: Optional[int] = None,
+    tie_breakers: Optional[str] = None,
+    as_of: Optional[datetime] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Get the team leaderboard with RANK/DENSE_RANK
+    
+    - tie_breakers: comma-separated order, e.g. points,wins,head_to_head (default)
+    - as_of: return the standings as they were at this moment
+    """
+    try:
+        return get_team_leaderboard(
+            db=db, limit=limit, offset=offset, game_id=game_id,
+            tie_breakers=_split_csv(tie_breakers), as_of=as_of
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/api/v1/leaderboard/teams/{team_id}/rank", tags=["leaderboard"], dependencies=[conditional_get(*LEADERBOARD_TABLES)])
+def get_team_rank_endpoint(
+    team_id: int,
+    game_id: Optional[int] = None,
+    tie_breakers: Optional[str] = None,
+    as_of: Optional[datetime] = None,
+    db: Session = Depends(get_db)
+):
+    """Get a team's leaderboard entry and rank"""
+    try:
+        entry = get_team_rank(
+            db=db, team_id=team_id, game_id=game_id,
+            tie_breakers=_split_csv(tie_breakers), as_of=as_of
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Team not found")
+    return entry
+
+@app.get("/api/v1/leaderboard/movers", response_model=List[LeaderboardMover], tags=["leaderboard"], dependencies=[conditional_get(*MOVER_TABLES)])
+def get_leaderboard_movers_endpoint(
+    scope: str = "player",
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    game_id: Optional[int] = None,
+    limit: int = 10,
+    db: Session = Depends(get_db)
+):
+    """
+    Get rank movement between two moments
+    
+    - scope: player, team or franchise
+    - since: defaults to the latest snapshot before `until`
+    - until: defaults to now
+    """
+    try:
+        return get_leaderboard_movers(db=db, scope=scope, since=since, until=until, game_id=game_id, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/api/v1/leaderboard/ratings", tags=["leaderboard"], dependencies=[conditional_get(*RATING_TABLES)])
+def get_rating_leaderboard_endpoint(
+    game_id: int,
+    scope: str = "player",
+    limit: int = 10,
+    min_matches: int = 1,
+    db: Session = Depends(get_db)
+):
+    """Get the Elo rating leaderboard of a game for players or teams"""
+    try:
+        return get_rating_leaderboard(db=db, game_id=game_id, scope=scope, limit=limit, min_matches=min_matches)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/api/v1/leaderboard/stats/{stat}", response_model=List[StatLeader], tags=["leaderboard"], dependencies=[conditional_get(*STAT_TABLES)])
+def get_stat_leaders_endpoint(
+    stat: str,
     game_id: Optional[int] = None,
+    limit: int = Query(10, ge=1, le=100),
     db: Session = Depends(get_db)
 ):
-    return get_team_leaderboard(db=db, limit=limit, game_id=game_id)
+    """Get the players with the highest total of a per-player stat (goals, runs, wickets), e.g. most goals in foosball"""
+    try:
+        return get_stat_leaders(db=db, stat=stat, game_id=game_id, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/api/v1/leaderboard/stats/{stat}/records", response_model=List[StatRecord], tags=["leaderboard"], dependencies=[conditional_get(*STAT_TABLES)])
+def get_stat_records_endpoint(
+    stat: str,
+    game_id: Optional[int] = None,
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """Get the best single-match performances in a per-player stat"""
+    try:
+        return get_stat_records(db=db, stat=stat, game_id=game_id, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/api/v1/leaderboard/snapshots", response_model=List[StandingSnapshot], tags=["leaderboard"], dependencies=[conditional_get(*SNAPSHOT_TABLES)])
+def get_snapshots_endpoint(limit: int = 20, db: Session = Depends(get_db)):
+    """List standings snapshots, most recent first"""
+    return list_snapshots(db=db, limit=limit)
+
+# Live updates
+@app.get("/api/v1/stream", tags=["stream"])
+async def stream_endpoint(
+    request: Request,
+    topics: str = "leaderboard",
+    last_event_id: Optional[int] = Query(None),
+    last_event_id_header: Optional[int] = Header(None, alias="Last-Event-ID")
+):
+    """
+    Server-sent events with compact deltas for match, result and standings changes
+    
+    - topics: comma-separated, any of leaderboard, fixtures, fixtures:{game_id}, match:{match_id}
+    - Last-Event-ID (header, or last_event_id query) replays missed events; a `reset`
+      event means they are no longer buffered and the client should reload
+    """
+    try:
+        wanted = parse_topics(_split_csv(topics) or [])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not wanted:
+        raise HTTPException(status_code=400, detail="At least one topic is required")
+    
+    resume_from = last_event_id_header if last_event_id_header is not None else last_event_id
+    subscription, replay, reset = broker.subscribe(wanted, resume_from)
+    heartbeat = config.get_stream_config()["heartbeat_seconds"]
+    
+    async def event_stream():
+        try:
+            yield "retry: 3000\n\n"
+            if reset:
+                yield "event: reset\ndata: {}\n\n"
+            for stream_event in replay:
+                yield stream_event.to_sse()
+            while True:
+                try:
+                    stream_event = await asyncio.wait_for(subscription.queue.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keepalive\n\n"
+                    continue
+                # None means the client fell too far behind; it reconnects with Last-Event-ID
+                if stream_event is None:
+                    break
+                yield stream_event.to_sse()
+        finally:
+            broker.unsubscribe(subscription)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 # Run the application
 if __name__ == "__main__":
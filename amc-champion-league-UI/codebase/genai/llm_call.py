@@ -1,31 +1,98 @@
+import json
+import random
+import re
+import threading
+import time
+from typing import Optional
+
 from openai import OpenAI
 
-# Initialize the OpenAI client with your API key
-# It's recommended to set your API key as an environment variable (OPENAI_API_KEY)
-# or pass it directly like: client = OpenAI(api_key="YOUR_API_KEY")
-client = OpenAI(api_key="sk-proj")
+from codebase.utils.config_manager import config
+from codebase.utils.resilience import dependency
+
+_genai_config = config.get_genai_config()
+
+SYSTEM_PROMPT = "You are a helpful assistant that creates concise summaries of sports match reports."
+
+# Numbered items of a batch prompt: "[3] notes of the third match"
+_BATCH_ITEM = re.compile(r"^\[(\d+)\] (.*)$", re.MULTILINE)
+
+_client: Optional[OpenAI] = None
+_client_lock = threading.Lock()
+
 
-def get_chat_completion(user_message):
+def get_client() -> OpenAI:
     """
-    Sends a message to the OpenAI Chat Completion API and returns the response.
+    The shared OpenAI client, created on first use.
+
+    One client (and its connection pool) serves every call. The API key comes from
+    [genai] api_key, else the OPENAI_API_KEY environment variable. The client does not
+    retry on its own, because the summary queue already retries.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = OpenAI(api_key=_genai_config["api_key"] or None, max_retries=0)
+    return _client
+
+
+def _first_sentences(text: str) -> str:
+    return " ".join(re.split(r"(?<=[.!?])\s+", text.strip())[:2])
+
+
+def stub_completion(user_message: str, timeout: Optional[float] = None) -> str:
+    """
+    Offline stand-in for the chat API (provider = stub).
+
+    Answers with the first two sentences of the text after the prompt's colon, or for a
+    prompt of numbered "[n] ..." items with a JSON object of each item's first two
+    sentences. Answers after [genai] stub_latency_seconds and fails at stub_failure_rate,
+    so timeouts and retries can be exercised without network access.
+    """
+    latency = _genai_config["stub_latency_seconds"]
+    if timeout is not None and latency > timeout:
+        time.sleep(timeout)
+        raise TimeoutError(f"Stub LLM did not answer within {timeout}s")
+    time.sleep(latency)
+    if random.random() < _genai_config["stub_failure_rate"]:
+        raise RuntimeError("Stub LLM failure (injected)")
+
+    items = _BATCH_ITEM.findall(user_message)
+    if items:
+        return json.dumps({number: _first_sentences(text) for number, text in items})
+    return _first_sentences(user_message.split(":", 1)[-1])
+
+
+def _completion(user_message: str, timeout: Optional[float], max_tokens: int) -> str:
+    if _genai_config["provider"] == "stub":
+        return stub_completion(user_message, timeout)
+
+    completion = get_client().chat.completions.create(
+        model=_genai_config["model"],
+        messages=[
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": user_message}
+        ],
+        temperature=0.7,  # Controls randomness; lower for more deterministic output
+        max_tokens=max_tokens,  # Maximum number of tokens to generate in the response
+        timeout=timeout
+    )
+    return completion.choices[0].message.content.strip()
+
+
+def get_chat_completion(user_message: str, timeout: Optional[float] = None, max_tokens: int = 150) -> str:
+    """
+    Sends a message to the configured chat model and returns the response.
+
+    The call runs under the llm dependency guard ([resilience] llm_*): a deadline of
+    timeout (capped at llm_timeout_seconds), bounded concurrency and a circuit breaker.
+    Errors and timeouts are raised, so callers can retry; a DependencyUnavailableError
+    means the call was refused or cut off by the guard.
     """
-    print(f"LLM Called with message: {user_message}")
-    return user_message
-    try:
-        completion = client.chat.completions.create(
-            model="gpt-3.5-turbo",  # Or another suitable model like "gpt-3.5-turbo"
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant that creates concise summaries of sports match reports."},
-                {"role": "user", "content": user_message}
-            ],
-            temperature=0.7,  # Controls randomness; lower for more deterministic output
-            max_tokens=150,   # Maximum number of tokens to generate in the response
-        )
-        result = completion.choices[0].message.content.strip()
-        print(f"Response from LLM: {result}")
-        return result
-    except Exception as e:
-        return f"An error occurred: {e}"
+    llm = dependency("llm")
+    deadline = min(timeout, llm.timeout_seconds) if timeout else llm.timeout_seconds
+    return llm.call(_completion, user_message, deadline, max_tokens, timeout=deadline)
 
 # Example usage
 if __name__ == "__main__":
@@ -37,4 +104,4 @@ if __name__ == "__main__":
     user_input_2 = "What is the capital of France?"
     response_2 = get_chat_completion(user_input_2)
     print(f"\nUser: {user_input_2}")
-    print(f"Assistant: {response_2}")
\ No newline at end of file
+    print(f"Assistant: {response_2}")
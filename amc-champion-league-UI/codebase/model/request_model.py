@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, DateTime, Text, JSON, Table
+from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, DateTime, Text, JSON, Table, Index, UniqueConstraint, cast
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -14,6 +15,10 @@ class Game(Base):
     winning_points = Column(Integer, default=10)  # Default points for winning
     image_path = Column(String, nullable=True)
     extra_data = Column(JSON, nullable=True)  # For storing game-specific scoring rules and other data
+    match_minutes = Column(Integer, nullable=True)  # extra_data["match_minutes"]
+    
+    # Typed copies of extra_data keys: column -> path, kept in sync on write (see codebase/utils/extracted_fields.py)
+    __extracted_fields__ = {"match_minutes": ("match_minutes",)}
     
     # Relationships
     matches = relationship("Match", back_populates="game")
@@ -44,7 +49,7 @@ class Player(Base):
     franchise_id = Column(Integer, ForeignKey("franchise.id"), nullable=True)  # Optional franchise
     email = Column(String, nullable=True)
     profile_image_path = Column(String, nullable=True)
-    total_points = Column(Integer, default=0)
+    total_points = Column(Integer, default=0)  # Sum of the player's PointsLedger entries (points earned in wins)
     extra_data = Column(JSON, nullable=True)  # For storing any additional player data
     
     # Relationships
@@ -65,12 +70,25 @@ class Match(Base):
     away_team_id = Column(Integer, ForeignKey("team.id"), nullable=True)
     match_date = Column(String, nullable=True)  # Date in YYYY-MM-DD format
     match_time = Column(String, nullable=True)  # Time in HH:MM format
+    scheduled_at = Column(DateTime, nullable=True, index=True)  # match_date + match_time as a timestamp, kept in sync on write
     status = Column(String, default="scheduled")  # scheduled, in_progress, completed, cancelled
     location = Column(String, nullable=True)
     score_summary = Column(String, nullable=True)  # Brief score like "21-19, 19-21, 21-18"
     winner_id = Column(Integer, nullable=True)  # ID of the winning franchise or team
     round = Column(String, nullable=True)  # Tournament round like "Semi Final", "Final", etc.
     extra_data = Column(JSON, nullable=True)  # For storing match-specific data and scoring
+    has_notes = Column(Boolean, nullable=True)  # extra_data["notes"] is not empty
+    summary_status = Column(String, nullable=True, index=True)  # extra_data["ai_summary_status"]
+    
+    __extracted_fields__ = {"has_notes": ("notes",), "summary_status": ("ai_summary_status",)}
+    
+    __table_args__ = (
+        # Calendar range scans per game and per status
+        Index("ix_match_game_scheduled", "game_id", "scheduled_at"),
+        Index("ix_match_status_scheduled", "status", "scheduled_at"),
+        # Containment (@>) and key (?) lookups on keys that are not extracted; PostgreSQL only
+        Index("ix_match_extra_data", cast(extra_data, JSONB), postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
     
     # Relationships
     game = relationship("Game", back_populates="matches")
@@ -94,6 +112,16 @@ class MatchPlayer(Base):
     points_earned = Column(Integer, default=0)
     is_winner = Column(Boolean, default=False)
     extra_data = Column(JSON, nullable=True)  # For storing game-specific scores and stats
+    # Per-player stats from extra_data, e.g. {"goals": 3} or {"runs": 42, "wickets": 2}
+    stat_goals = Column(Integer, nullable=True, index=True)
+    stat_runs = Column(Integer, nullable=True, index=True)
+    stat_wickets = Column(Integer, nullable=True, index=True)
+    
+    __extracted_fields__ = {"stat_goals": ("goals",), "stat_runs": ("runs",), "stat_wickets": ("wickets",)}
+    
+    __table_args__ = (
+        Index("ix_match_player_extra_data", cast(extra_data, JSONB), postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
     
     # Relationships
     match = relationship("Match", back_populates="players")
@@ -144,3 +172,131 @@ class TeamPlayer(Base):
     # Relationships
     team = relationship("Team", back_populates="team_players")
     player = relationship("Player", back_populates="team_memberships")
+
+
+class PointsLedger(Base):
+    """
+    Append-only log of the changes match results make to players' points.
+
+    A match player row's credit is the sum of its entries; Player.total_points is the sum
+    of the player's entries. Entries are never updated or deleted (except with the player).
+    """
+    __tablename__ = "points_ledger"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    match_player_id = Column(Integer, nullable=False, index=True)  # No foreign key: entries outlive deleted rows
+    match_id = Column(Integer, nullable=False, index=True)
+    player_id = Column(Integer, ForeignKey("player.id"), nullable=False, index=True)
+    points = Column(Integer, nullable=False)  # Change to the player's total
+    reason = Column(String, nullable=False, default="result")  # result, removed or correction
+    recorded_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+class Standing(Base):
+    """Materialized leaderboard totals, maintained on every result write"""
+    __tablename__ = "standing"
+    __table_args__ = (
+        UniqueConstraint("scope", "entity_id", "game_id", name="uq_standing_entry"),
+        Index("ix_standing_board", "scope", "game_id", "total_points"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    scope = Column(String, nullable=False)  # player, team or franchise
+    entity_id = Column(Integer, nullable=False)  # ID of the player, team or franchise
+    game_id = Column(Integer, nullable=False, default=0)  # 0 holds the overall (all games) totals
+    matches_played = Column(Integer, nullable=False, default=0)
+    matches_won = Column(Integer, nullable=False, default=0)
+    matches_lost = Column(Integer, nullable=False, default=0)
+    total_points = Column(Integer, nullable=False, default=0)
+
+class StandingChange(Base):
+    """Append-only log of the increments applied to the standings, one row per standings row per write"""
+    __tablename__ = "standing_change"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    recorded_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+    scope = Column(String, nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    game_id = Column(Integer, nullable=False)
+    matches_played = Column(Integer, nullable=False, default=0)
+    matches_won = Column(Integer, nullable=False, default=0)
+    matches_lost = Column(Integer, nullable=False, default=0)
+    total_points = Column(Integer, nullable=False, default=0)
+
+class StandingSnapshot(Base):
+    """A full copy of the standings as of a point in the change log"""
+    __tablename__ = "standing_snapshot"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    taken_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    reason = Column(String, nullable=False, default="periodic")  # periodic, rebuild or manual
+    last_change_id = Column(Integer, nullable=False, default=0, index=True)  # Last StandingChange included
+    
+    entries = relationship("StandingSnapshotEntry", back_populates="snapshot", cascade="all, delete-orphan")
+
+class StandingSnapshotEntry(Base):
+    """One standings row inside a snapshot; rows with no matches played are not stored"""
+    __tablename__ = "standing_snapshot_entry"
+    __table_args__ = (
+        Index("ix_standing_snapshot_entry_board", "snapshot_id", "scope", "game_id"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    snapshot_id = Column(Integer, ForeignKey("standing_snapshot.id"), nullable=False)
+    scope = Column(String, nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    game_id = Column(Integer, nullable=False)
+    matches_played = Column(Integer, nullable=False, default=0)
+    matches_won = Column(Integer, nullable=False, default=0)
+    matches_lost = Column(Integer, nullable=False, default=0)
+    total_points = Column(Integer, nullable=False, default=0)
+    
+    snapshot = relationship("StandingSnapshot", back_populates="entries")
+
+class Rating(Base):
+    """Skill rating of a player or team in one game"""
+    __tablename__ = "rating"
+    __table_args__ = (
+        UniqueConstraint("scope", "entity_id", "game_id", name="uq_rating_entry"),
+        Index("ix_rating_board", "scope", "game_id", "rating"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    scope = Column(String, nullable=False)  # player or team
+    entity_id = Column(Integer, nullable=False)
+    game_id = Column(Integer, nullable=False)
+    rating = Column(Float, nullable=False)
+    matches_rated = Column(Integer, nullable=False, default=0)
+
+class RatedMatch(Base):
+    """Matches already folded into the ratings, so each is rated once"""
+    __tablename__ = "rated_match"
+    
+    match_id = Column(Integer, ForeignKey("match.id"), primary_key=True)
+    rated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+class LiveScoreEvent(Base):
+    """Append-only live scoring log: one compact event code (a rally point, a ball or an undo) per row"""
+    __tablename__ = "live_score_event"
+    
+    match_id = Column(Integer, ForeignKey("match.id"), primary_key=True)
+    seq = Column(Integer, primary_key=True)  # 1, 2, 3 ... within the match
+    code = Column(String(12), nullable=False)  # e.g. "h", "a3", "b4", "b1wd", "b0w", "u"
+    recorded_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+class SummaryCache(Base):
+    """LLM match summaries keyed by a hash of the model and the normalized prompt"""
+    __tablename__ = "summary_cache"
+    
+    key = Column(String(64), primary_key=True)  # SHA-256 hex digest
+    model = Column(String, nullable=False)
+    summary = Column(Text, nullable=False)
+    hits = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_used_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+class TableVersion(Base):
+    """Per-table change counter, bumped in the same transaction as every write"""
+    __tablename__ = "table_version"
+    
+    table_name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,274 @@
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from codebase.model.request_model import Game, Match, MatchPlayer, TeamPlayer
+from codebase.service.schedule_service import league_time
+from codebase.utils.config_manager import config
+from codebase.utils.intervals import IntervalIndex
+from codebase.utils.versioning import committed_tables, get_table_versions
+
+_scheduling_config = config.get_scheduling_config()
+
+# Column counter that moves whenever an interval or its keys may have moved (see versioning.COLUMN_COUNTERS);
+# score, result and extra_data writes leave it alone
+WATCHED_TABLES = ("match_schedule",)
+
+# Key kinds a match is indexed under
+CONFLICT_TYPES = ("location", "team", "player")
+
+# Beyond this many changed matches a rebuild is cheaper than patching the index
+_MAX_REFRESH = 500
+
+ConflictKey = Tuple[str, Hashable]  # e.g. ("location", "court 1"), ("team", 4), ("player", 17)
+
+
+class ScheduleConflictError(ValueError):
+    """A proposed schedule overlaps existing fixtures"""
+
+    def __init__(self, conflicts: List[Dict[str, Any]]):
+        self.conflicts = conflicts
+        first = conflicts[0]
+        other = f"match {first['other_match_id']}" if first["other_match_id"] is not None else "another new match"
+        super().__init__(
+            f"Schedule conflict: {first['type']} {first['key']} is already booked by {other}"
+            + (f" (and {len(conflicts) - 1} more)" if len(conflicts) > 1 else "")
+        )
+
+
+class ProposedMatch:
+    """A match to check: when it is played and which venue, teams and players it occupies"""
+    __slots__ = ("match_id", "start", "end", "keys")
+
+    def __init__(self, match_id: Optional[Hashable], start: datetime, end: datetime, keys: Set[ConflictKey]):
+        self.match_id = match_id
+        self.start = start
+        self.end = end
+        self.keys = keys
+
+
+def _location_key(location: Optional[str]) -> Optional[str]:
+    return " ".join(location.split()).lower() if location and location.strip() else None
+
+
+def _match_minutes(minutes: Optional[int]) -> int:
+    return minutes if minutes and minutes > 0 else _scheduling_config["default_match_minutes"]
+
+
+def match_length(db: Session, game_id: int) -> timedelta:
+    """How long a match of this game occupies its venue, teams and players"""
+    return timedelta(minutes=_match_minutes(db.query(Game.match_minutes).filter(Game.id == game_id).scalar()))
+
+
+# Columns a slot is built from; loaded as plain rows so pending ORM changes never leak in
+_SLOT_COLUMNS = (
+    Match.id, Match.game_id, Match.scheduled_at, Match.match_time, Match.status,
+    Match.location, Match.home_team_id, Match.away_team_id
+)
+
+
+def _schedulable(query):
+    """Matches that occupy a time slot: a real time of day, and not cancelled"""
+    return query.filter(
+        Match.scheduled_at.isnot(None),
+        Match.match_time.isnot(None),
+        Match.status != "cancelled"
+    )
+
+
+def _load_proposals(db: Session, matches: Iterable[Any]) -> List[ProposedMatch]:
+    """
+    Build proposals for match rows or Match objects with a fixed number of queries.
+
+    Players come from the rosters (TeamPlayer) of both teams plus any MatchPlayer rows.
+    """
+    matches = [match for match in matches if match.scheduled_at is not None and match.match_time]
+    if not matches:
+        return []
+
+    team_ids = {team_id for match in matches for team_id in (match.home_team_id, match.away_team_id) if team_id}
+    rosters: Dict[int, Set[int]] = defaultdict(set)
+    if team_ids:
+        for team_id, player_id in db.query(TeamPlayer.team_id, TeamPlayer.player_id).filter(
+            TeamPlayer.team_id.in_(team_ids)
+        ):
+            rosters[team_id].add(player_id)
+
+    match_ids = [match.id for match in matches if match.id is not None]
+    listed: Dict[int, Set[int]] = defaultdict(set)
+    if match_ids:
+        for match_id, player_id in db.query(MatchPlayer.match_id, MatchPlayer.player_id).filter(
+            MatchPlayer.match_id.in_(match_ids)
+        ):
+            listed[match_id].add(player_id)
+
+    game_ids = {match.game_id for match in matches}
+    minutes = {game_id: _match_minutes(match_minutes) for game_id, match_minutes in db.query(
+        Game.id, Game.match_minutes
+    ).filter(Game.id.in_(game_ids))}
+
+    proposals = []
+    for match in matches:
+        keys: Set[ConflictKey] = set()
+        location = _location_key(match.location)
+        if location:
+            keys.add(("location", location))
+        for team_id in (match.home_team_id, match.away_team_id):
+            if team_id:
+                keys.add(("team", team_id))
+                keys.update(("player", player_id) for player_id in rosters[team_id])
+        keys.update(("player", player_id) for player_id in listed.get(match.id, ()))
+        if not keys:
+            continue
+        length = timedelta(minutes=minutes.get(match.game_id, _scheduling_config["default_match_minutes"]))
+        proposals.append(ProposedMatch(match.id, match.scheduled_at, match.scheduled_at + length, keys))
+    return proposals
+
+
+def _conflict(key: ConflictKey, match_id: Hashable, other_id: Hashable,
+              start: datetime, end: datetime, other_start: datetime, other_end: datetime) -> Dict[str, Any]:
+    return {
+        "type": key[0],
+        "key": key[1],
+        "match_id": match_id,
+        "other_match_id": other_id,
+        "overlap_start": max(start, other_start),
+        "overlap_end": min(end, other_end)
+    }
+
+
+class ConflictIndex:
+    """
+    In-memory interval index of every scheduled match, by venue, team and rostered player.
+
+    The index remembers the version of the schedule counter it reflects. It is rebuilt
+    (O(n log n)) when another writer changed a schedule column, and patched in place after
+    this process's own match writes, so individual checks stay O(log n) per key.
+    """
+
+    def __init__(self):
+        self._index = IntervalIndex()
+        self._versions: Optional[Dict[str, int]] = None
+        self._lock = threading.RLock()
+
+    def _current(self, db: Session) -> IntervalIndex:
+        """The index, rebuilt first if the database moved on without us"""
+        versions = get_table_versions(db, WATCHED_TABLES)
+        with self._lock:
+            if versions != self._versions:
+                index = IntervalIndex()
+                for proposal in _load_proposals(db, _schedulable(db.query(*_SLOT_COLUMNS)).all()):
+                    index.add(proposal.match_id, proposal.start, proposal.end, proposal.keys)
+                self._index = index
+                self._versions = versions
+            return self._index
+
+    def check(self, db: Session, proposals: List[ProposedMatch]) -> List[Dict[str, Any]]:
+        """
+        Conflicts of proposed matches with the schedule and with each other.
+
+        A proposal with a match_id replaces that match's current slot (a reschedule).
+        """
+        conflicts = []
+        index = self._current(db)
+        with self._lock:
+            batch = IntervalIndex()
+            for number, proposal in enumerate(proposals):
+                for key in proposal.keys:
+                    for other_start, other_end, other_id in index.overlapping(key, proposal.start, proposal.end,
+                                                                              ignore=proposal.match_id):
+                        conflicts.append(_conflict(key, proposal.match_id, other_id, proposal.start,
+                                                   proposal.end, other_start, other_end))
+                    for other_start, other_end, other_number in batch.overlapping(key, proposal.start, proposal.end):
+                        conflicts.append(_conflict(key, proposal.match_id, proposals[other_number].match_id,
+                                                   proposal.start, proposal.end, other_start, other_end))
+                batch.add(number, proposal.start, proposal.end, proposal.keys)
+        return conflicts
+
+    def report(self, db: Session, start: Optional[datetime] = None, end: Optional[datetime] = None,
+               game_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Every overlapping pair in the schedule, optionally limited to a window and a game"""
+        index = self._current(db)
+        game_of = None
+        if game_id:
+            game_of = dict(_schedulable(db.query(Match.id, Match.game_id)).all())
+        with self._lock:
+            pairs = list(index.overlapping_pairs())
+
+        conflicts = []
+        for key, (first_start, first_end, first_id), (second_start, second_end, second_id) in pairs:
+            if start is not None and max(first_end, second_end) <= start:
+                continue
+            if end is not None and min(first_start, second_start) >= end:
+                continue
+            if game_of is not None and game_id not in (game_of.get(first_id), game_of.get(second_id)):
+                continue
+            conflicts.append(_conflict(key, first_id, second_id, first_start, first_end, second_start, second_end))
+        conflicts.sort(key=lambda conflict: (conflict["overlap_start"], conflict["type"], str(conflict["key"])))
+        return conflicts
+
+    def reset(self) -> None:
+        """Forget the index; the next check rebuilds it from the database"""
+        with self._lock:
+            self._index = IntervalIndex()
+            self._versions = None
+
+    def refresh(self, db: Session, match_ids: Iterable[int]) -> None:
+        """
+        Patch the index after this session committed writes to the given matches.
+
+        Nothing to do when the commit left the schedule alone. Otherwise patching applies
+        only when that commit was the sole schedule change since the index was built (the
+        counter moved by exactly one); if not, the next check rebuilds from scratch.
+        """
+        match_ids = list(match_ids)
+        bumped = committed_tables(db)
+        versions = get_table_versions(db, WATCHED_TABLES)
+        with self._lock:
+            if self._versions is None:
+                return
+            expected = {name: version + (1 if name in bumped else 0) for name, version in self._versions.items()}
+            if versions == self._versions:
+                return
+            if versions != expected or len(match_ids) > _MAX_REFRESH:
+                self._versions = None
+                return
+            for match_id in match_ids:
+                self._index.remove(match_id)
+            rows = _schedulable(db.query(*_SLOT_COLUMNS)).filter(Match.id.in_(match_ids)).all() if match_ids else []
+            for proposal in _load_proposals(db, rows):
+                self._index.add(proposal.match_id, proposal.start, proposal.end, proposal.keys)
+            self._versions = versions
+
+
+conflict_index = ConflictIndex()
+
+
+def check_schedule(db: Session, matches: Iterable[Any]) -> None:
+    """
+    Reject matches that would overlap a booked venue, team or rostered player.
+
+    Accepts Match objects, new or modified; run it before they are flushed, so the index
+    never sees uncommitted rows. Raises ScheduleConflictError.
+    """
+    if not _scheduling_config["reject_conflicts"]:
+        return
+    conflicts = conflict_index.check(db, _load_proposals(db, [
+        match for match in matches if getattr(match, "status", None) != "cancelled"
+    ]))
+    if conflicts:
+        raise ScheduleConflictError(conflicts)
+
+
+def get_schedule_conflicts(db: Session, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                           game_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Report every pair of overlapping fixtures; window bounds with a UTC offset are converted to league time"""
+    return conflict_index.report(
+        db,
+        league_time(start) if start else None,
+        league_time(end) if end else None,
+        game_id
+    )
@@ -1,23 +1,47 @@
 from sqlalchemy.orm import Session, aliased, joinedload
-from sqlalchemy import func
-from typing import List, Optional, Dict, Any, Union
+from sqlalchemy import func, case, and_, or_, true
+from typing import List, Optional, Dict, Any, Tuple, Union
+from collections import defaultdict
 from fastapi import UploadFile, HTTPException
 from datetime import datetime
 import json
-from codebase.genai.llm_call import get_chat_completion
 
 
 from codebase.model.request_model import (
-    Game, Franchise, Player, Match, MatchPlayer, Gallery, Team, TeamPlayer
+    Game, Franchise, Player, Match, MatchPlayer, Gallery, Team, TeamPlayer, Standing, StandingSnapshot,
+    PointsLedger, LiveScoreEvent
 )
+from codebase.service.standings_service import (
+    OVERALL_GAME_ID, STANDING_COLUMNS, collect_contributions, apply_contributions, standings_as_of, naive_utc
+)
+from codebase.service.rating_service import rate_match
+from codebase.service.points_service import record_points, record_points_many, remove_points
+from codebase.service.schedule_service import league_time, sync_scheduled_at
+from codebase.service.tournament_service import advance_bracket
+from codebase.service.conflict_service import check_schedule, conflict_index
+from codebase.service.live_scoring_service import live_scores
+from codebase.service.scoring_service import evaluate_game_score, result_points, score_record, winner_id as outcome_winner_id
+from codebase.service.summary_service import request_summary, summary_jobs
 from codebase.service.request_payload import (
     GameCreate, FranchiseCreate, PlayerCreate, MatchCreate,
     MatchPlayerCreate, MatchPlayerUpdate, GalleryCreate,
-    TeamCreate, TeamPlayerCreate, GameScore, FixtureDetail
+    TeamCreate, TeamPlayerCreate, GameScore, FixtureDetail, MatchResultSubmit, MatchResultPlayer
 )
 from codebase.utils.image_storage import (
     upload_image_to_storage, list_images_from_storage, delete_image_from_storage
 )
+from codebase.utils.cache import cached, cached_per_game, invalidate_game, invalidate_namespace
+from codebase.utils.events import match_topics, queue_event
+from codebase.utils.pagination import keyset
+
+# Match fields pushed to stream subscribers when they change
+MATCH_STREAM_FIELDS = (
+    "game_id", "status", "score_summary", "winner_id", "match_date", "location",
+    "home_franchise_id", "away_franchise_id", "home_team_id", "away_team_id"
+)
+
+# Fields that move a match's slot in the schedule
+MATCH_SLOT_FIELDS = ("game_id", "scheduled_at", "match_time", "location", "home_team_id", "away_team_id")
 
 # Game services
 async def create_game(db: Session, game: GameCreate, image: Optional[UploadFile] = None) -> Game:
@@ -41,9 +65,9 @@ async def create_game(db: Session, game: GameCreate, image: Optional[UploadFile]
     db.refresh(db_game)
     return db_game
 
-def get_games(db: Session, skip: int = 0, limit: int = 100) -> List[Game]:
+def get_games(db: Session, skip: int = 0, limit: int = 100, after: Optional[str] = None) -> List[Game]:
     """Get all games in the championship"""
-    return db.query(Game).offset(skip).limit(limit).all()
+    return keyset(db.query(Game), [Game.id], after).offset(skip).limit(limit).all()
 
 def get_game(db: Session, game_id: int) -> Optional[Game]:
     """Get a game by ID"""
@@ -71,6 +95,7 @@ def update_game(db: Session, game_id: int, game_data: Union[GameCreate, Dict[str
 
     db.commit()
     db.refresh(db_game)
+    invalidate_game(game_id)
     return db_game
 
 def delete_game(db: Session, game_id: int) -> bool:
@@ -81,6 +106,7 @@ def delete_game(db: Session, game_id: int) -> bool:
         
     db.delete(db_game)
     db.commit()
+    invalidate_game(game_id)
     return True
 
 # Franchise services
@@ -99,11 +125,12 @@ async def create_franchise(db: Session, franchise: FranchiseCreate, logo: Option
     db.add(db_franchise)
     db.commit()
     db.refresh(db_franchise)
+    invalidate_namespace("leaderboard")
     return db_franchise
 
-def get_franchises(db: Session, skip: int = 0, limit: int = 100) -> List[Franchise]:
+def get_franchises(db: Session, skip: int = 0, limit: int = 100, after: Optional[str] = None) -> List[Franchise]:
     """Get all franchises"""
-    return db.query(Franchise).offset(skip).limit(limit).all()
+    return keyset(db.query(Franchise), [Franchise.id], after).offset(skip).limit(limit).all()
 
 def get_franchise(db: Session, franchise_id: int) -> Optional[Franchise]:
     """Get a franchise by ID"""
@@ -131,6 +158,7 @@ def update_franchise(db: Session, franchise_id: int, franchise_data: Union[Franc
 
     db.commit()
     db.refresh(db_franchise)
+    invalidate_namespace("leaderboard", "fixtures")
     return db_franchise
 
 def delete_franchise(db: Session, franchise_id: int) -> bool:
@@ -141,6 +169,7 @@ def delete_franchise(db: Session, franchise_id: int) -> bool:
         
     db.delete(db_franchise)
     db.commit()
+    invalidate_namespace("leaderboard", "fixtures")
     return True
 
 # Player services
@@ -161,14 +190,16 @@ async def create_player(db: Session, player: PlayerCreate, profile_image: Option
     db.add(db_player)
     db.commit()
     db.refresh(db_player)
+    invalidate_namespace("leaderboard")
     return db_player
 
-def get_players(db: Session, skip: int = 0, limit: int = 100, franchise_id: Optional[int] = None) -> List[Player]:
+def get_players(db: Session, skip: int = 0, limit: int = 100, franchise_id: Optional[int] = None,
+                after: Optional[str] = None) -> List[Player]:
     """Get all players, optionally filtered by franchise"""
     query = db.query(Player)
     if franchise_id:
         query = query.filter(Player.franchise_id == franchise_id)
-    return query.offset(skip).limit(limit).all()
+    return keyset(query, [Player.id], after).offset(skip).limit(limit).all()
 
 def get_player(db: Session, player_id: int) -> Optional[Player]:
     """Get a player by ID"""
@@ -188,14 +219,30 @@ def update_player(db: Session, player_id: int, player_data: Union[PlayerCreate,
         # It's already a dictionary
         update_data = player_data
     
+    # total_points is derived from the points ledger
+    update_data = {field: value for field, value in update_data.items() if field != 'total_points'}
+    
+    # Franchise standings follow the player's current franchise
+    franchise_changed = (
+        update_data.get('franchise_id') is not None
+        and update_data['franchise_id'] != db_player.franchise_id
+    )
+    if franchise_changed:
+        before = collect_contributions(db, player_id=player_id)
+    
     # Update player fields
     for field, value in update_data.items():
         if hasattr(db_player, field) and value is not None:
             setattr(db_player, field, value)
     
+    if franchise_changed:
+        db.flush()
+        after = collect_contributions(db, player_id=player_id)
+        apply_contributions(db, [(c, -1) for c in before] + [(c, 1) for c in after])
 
     db.commit()
     db.refresh(db_player)
+    invalidate_namespace("leaderboard")
     return db_player
 
 def delete_player(db: Session, player_id: int) -> bool:
@@ -204,8 +251,10 @@ def delete_player(db: Session, player_id: int) -> bool:
     if not db_player:
         return False
         
+    db.query(PointsLedger).filter(PointsLedger.player_id == player_id).delete(synchronize_session=False)
     db.delete(db_player)
     db.commit()
+    invalidate_namespace("leaderboard")
     return True
 
 # Match services
@@ -218,20 +267,30 @@ def create_match(db: Session, match: MatchCreate) -> Match:
         home_team_id=match.home_team_id,
         away_team_id=match.away_team_id,
         match_date=match.match_date or datetime.utcnow(),
+        match_time=match.match_time,
         status=match.status,
         location=match.location,
+        round=match.round,
         score_summary=match.score_summary,
         winner_id=match.winner_id,
         extra_data=match.extra_data
     )
+    sync_scheduled_at(db_match)
+    check_schedule(db, [db_match])
     
     db.add(db_match)
+    db.flush()
+    queue_event(db, match_topics(db_match.id, db_match.game_id), "match_created", dict(
+        id=db_match.id, **{field: getattr(db_match, field) for field in MATCH_STREAM_FIELDS}
+    ))
     db.commit()
     db.refresh(db_match)
+    invalidate_game(db_match.game_id)
+    conflict_index.refresh(db, [db_match.id])
     return db_match
 
 def get_matches(db: Session, skip: int = 0, limit: int = 100, game_id: Optional[int] = None,
-               status: Optional[str] = None, round: Optional[str] = None) -> List[Match]:
+               status: Optional[str] = None, round: Optional[str] = None, after: Optional[str] = None) -> List[Match]:
     """Get all matches, optionally filtered by game, status, and round"""
     query = db.query(Match)
     if game_id:
@@ -240,7 +299,7 @@ def get_matches(db: Session, skip: int = 0, limit: int = 100, game_id: Optional[
         query = query.filter(Match.status == status)
     if round:
         query = query.filter(Match.round == round)
-    return query.offset(skip).limit(limit).all()
+    return keyset(query, [Match.id], after).offset(skip).limit(limit).all()
 
 def get_match(db: Session, match_id: int) -> Optional[Match]:
     """Get a match by ID"""
@@ -327,37 +386,66 @@ def update_match(db: Session, match_id: int, match_data: Union[MatchCreate, Dict
         # It's already a dictionary
         update_data = match_data
     
-    # Generate AI summary if notes are provided in extra_data
-    if update_data.get('extra_data') and isinstance(update_data['extra_data'], dict):
-        extra_data = update_data['extra_data']
-        
-        # Check if notes exist and ai_summary is empty or not provided
-        if extra_data.get('notes') and not extra_data.get('ai_summary'):
-            try:
-                # Create a prompt for match summary
-                notes = extra_data['notes']
-                prompt = f"Summarize this match report in 2-3 concise sentences focusing on key highlights and outcome: {notes}"
-                
-                # Get AI summary
-                ai_summary = get_chat_completion(prompt)
-                if ai_summary:
-                    extra_data['ai_summary'] = ai_summary
-                    update_data['extra_data'] = extra_data
-                    
-            except Exception as e:
-                # Log the error but don't fail the update
-                print(f"Failed to generate AI summary: {e}")
-                # Set a fallback message
-                extra_data['ai_summary'] = "AI summary generation failed"
+    previous_game_id = db_match.game_id
+    previous_values = {field: getattr(db_match, field) for field in MATCH_STREAM_FIELDS}
+    previous_slot = {field: getattr(db_match, field) for field in MATCH_SLOT_FIELDS}
+    
+    # Moving a match to another game moves its results between game standings
+    game_changed = (
+        update_data.get('game_id') is not None
+        and update_data['game_id'] != db_match.game_id
+    )
+    if game_changed:
+        before = collect_contributions(db, match_id=match_id)
     
     # Update match fields
     for field, value in update_data.items():
         if hasattr(db_match, field) and value is not None:
             setattr(db_match, field, value)
+    if update_data.get('match_date') is not None or update_data.get('match_time') is not None:
+        sync_scheduled_at(db_match)
+    
+    # Notes without an ai_summary get one generated in the background
+    summary_job = request_summary(db, db_match) if update_data.get('extra_data') is not None else None
+    
+    # Reschedules (and reinstated cancellations) must not overlap other fixtures
+    rescheduled = any(getattr(db_match, field) != previous_slot[field] for field in MATCH_SLOT_FIELDS)
+    if rescheduled or (previous_values["status"] == "cancelled" and db_match.status != "cancelled"):
+        check_schedule(db, [db_match])
     
+    if game_changed:
+        db.flush()
+        after = collect_contributions(db, match_id=match_id)
+        apply_contributions(db, [(c, -1) for c in before] + [(c, 1) for c in after])
+    
+    # Completing a match folds its result into the ratings
+    if db_match.status == "completed" and previous_values["status"] != "completed":
+        db.flush()
+        rate_match(db, match_id)
+    
+    # A knockout winner moves on to the next round's match
+    changed_ids = [match_id]
+    if db_match.status == "completed" and (
+        previous_values["status"] != "completed" or previous_values["winner_id"] != db_match.winner_id
+    ):
+        next_match = advance_bracket(db, db_match)
+        if next_match is not None:
+            changed_ids.append(next_match.id)
+    
+    # Stream only the fields that actually changed
+    changes = {
+        field: getattr(db_match, field) for field in MATCH_STREAM_FIELDS
+        if getattr(db_match, field) != previous_values[field]
+    }
+    if changes:
+        queue_event(db, match_topics(match_id, previous_game_id, db_match.game_id), "match", dict(id=match_id, **changes))
     
     db.commit()
     db.refresh(db_match)
+    invalidate_game(previous_game_id, db_match.game_id)
+    conflict_index.refresh(db, changed_ids)
+    if summary_job is not None:
+        summary_jobs.submit(summary_job)
     return db_match
 
 def delete_match(db: Session, match_id: int) -> bool:
@@ -365,33 +453,146 @@ def delete_match(db: Session, match_id: int) -> bool:
     db_match = db.query(Match).filter(Match.id == match_id).first()
     if not db_match:
         return False
+    
+    # Take the match's results out of the standings and points along with its player rows
+    apply_contributions(db, [(c, -1) for c in collect_contributions(db, match_id=match_id)])
+    remove_points(db, match_id)
+    db.query(MatchPlayer).filter(MatchPlayer.match_id == match_id).delete(synchronize_session=False)
+    db.query(LiveScoreEvent).filter(LiveScoreEvent.match_id == match_id).delete(synchronize_session=False)
         
+    game_id = db_match.game_id
     db.delete(db_match)
+    queue_event(db, match_topics(match_id, game_id), "match_deleted", {"id": match_id})
     db.commit()
+    invalidate_game(game_id)
+    conflict_index.refresh(db, [match_id])
+    live_scores.discard(match_id)
     return True
 
 # Match Player services
+def _queue_match_player_event(db: Session, db_match_player: MatchPlayer) -> None:
+    """Stream a player's result in a match to the match and fixture subscribers"""
+    queue_event(db, match_topics(db_match_player.match_id, db_match_player.match.game_id), "match_player", {
+        "id": db_match_player.id,
+        "match_id": db_match_player.match_id,
+        "player_id": db_match_player.player_id,
+        "team_id": db_match_player.team_id,
+        "points_earned": db_match_player.points_earned,
+        "is_winner": db_match_player.is_winner
+    })
+
 def add_player_to_match(db: Session, match_player: MatchPlayerCreate) -> MatchPlayer:
     """Add a player to a match"""
     db_match_player = MatchPlayer(
         match_id=match_player.match_id,
         player_id=match_player.player_id,
         franchise_id=match_player.franchise_id,
+        team_id=match_player.team_id,
         points_earned=match_player.points_earned,
         is_winner=match_player.is_winner,
         extra_data=match_player.extra_data
     )
     
     db.add(db_match_player)
+    db.flush()
+    apply_contributions(db, [(c, 1) for c in collect_contributions(db, match_player_ids=[db_match_player.id])])
+    record_points(db, db_match_player)
+    _queue_match_player_event(db, db_match_player)
     db.commit()
     db.refresh(db_match_player)
+    invalidate_game(db_match_player.match.game_id)
     return db_match_player
 
 def update_match_result(db: Session, match_player_id: int, update_data: MatchPlayerUpdate) -> Optional[MatchPlayer]:
+    """Update match results for a player (kept for compatibility, see update_match_player_result)"""
+    return update_match_player_result(db, match_player_id, update_data)
+
+# Optional relations the roster endpoints embed on request, and the columns each projects
+ROSTER_RELATION_COLUMNS = {
+    "player": ("id", "name", "email", "profile_image_path", "total_points"),
+    "franchise": ("id", "name", "franchise_code", "logo_path"),
+    "team": ("id", "name", "franchise_id", "game_id", "logo_path"),
+    "game": ("id", "name", "winning_points", "image_path"),
+    "match": ("id", "game_id", "match_date", "match_time", "scheduled_at", "status", "round", "location")
+}
+
+def _roster_includes(include: Optional[List[str]], allowed: Tuple[str, ...]) -> List[str]:
+    """Validate an include= list against the relations an endpoint offers"""
+    wanted = list(dict.fromkeys(include or ()))
+    unknown = [name for name in wanted if name not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown include {', '.join(unknown)}; expected any of: {', '.join(allowed)}")
+    return wanted
+
+def _with_relations(query, entities: Dict[str, Any], include: List[str]):
+    """Add the columns of each included relation to a roster query, labelled <relation>__<column>"""
+    return query.add_columns(*(
+        getattr(entities[name], column).label(f"{name}__{column}")
+        for name in include for column in ROSTER_RELATION_COLUMNS[name]
+    ))
+
+def _relations(row, include: List[str]) -> Dict[str, Any]:
+    """Nest a roster row's included relation columns; a relation with no row is None"""
+    mapping = row._mapping
+    nested = {}
+    for name in include:
+        values = {column: mapping[f"{name}__{column}"] for column in ROSTER_RELATION_COLUMNS[name]}
+        nested[name] = values if values["id"] is not None else None
+    return nested
+
+MATCH_PLAYER_INCLUDES = ("player", "franchise", "team", "match")
+
+def get_match_players(db: Session, match_id: int, include: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Get all players in a match with details.
+
+    One query whatever the number of players: names come from outer joins and are
+    projected straight into the result, and include= embeds the player, franchise,
+    team or match as nested objects. Raises ValueError for an unknown include.
+    """
+    include = _roster_includes(include, MATCH_PLAYER_INCLUDES)
+    query = db.query(
+        MatchPlayer.id,
+        MatchPlayer.match_id,
+        MatchPlayer.player_id,
+        Player.name.label("player_name"),
+        MatchPlayer.franchise_id,
+        Franchise.name.label("franchise_name"),
+        MatchPlayer.points_earned,
+        MatchPlayer.is_winner,
+        MatchPlayer.extra_data
+    ).outerjoin(
+        Player, MatchPlayer.player_id == Player.id
+    ).outerjoin(
+        Franchise, MatchPlayer.franchise_id == Franchise.id
+    )
+    if "team" in include:
+        query = query.outerjoin(Team, MatchPlayer.team_id == Team.id)
+    if "match" in include:
+        query = query.join(Match, MatchPlayer.match_id == Match.id)
+    query = _with_relations(query, {"player": Player, "franchise": Franchise, "team": Team, "match": Match}, include)
+    
+    rows = query.filter(MatchPlayer.match_id == match_id).order_by(MatchPlayer.id).all()
+    return [{
+        "id": row.id,
+        "match_id": row.match_id,
+        "player_id": row.player_id,
+        "player_name": row.player_name,
+        "franchise_id": row.franchise_id,
+        "franchise_name": row.franchise_name,
+        "points_earned": row.points_earned,
+        "is_winner": row.is_winner,
+        "extra_data": row.extra_data,
+        **_relations(row, include)
+    } for row in rows]
+
+def update_match_player_result(db: Session, match_player_id: int, update_data: MatchPlayerUpdate) -> Optional[MatchPlayer]:
     """Update match results for a player"""
     db_match_player = db.query(MatchPlayer).filter(MatchPlayer.id == match_player_id).first()
     if not db_match_player:
         return None
+    
+    before = collect_contributions(db, match_player_ids=[match_player_id])
         
     # Update fields
     if update_data.points_earned is not None:
@@ -401,81 +602,165 @@ def update_match_result(db: Session, match_player_id: int, update_data: MatchPla
         db_match_player.is_winner = update_data.is_winner
     
     if update_data.extra_data:
-        # Update extra_data without overwriting existing data
-        if not db_match_player.extra_data:
-            db_match_player.extra_data = {}
-        db_match_player.extra_data.update(update_data.extra_data)
+        # Merge into a new dict: in-place changes to the JSON column are not written
+        db_match_player.extra_data = {**(db_match_player.extra_data or {}), **update_data.extra_data}
     
-
-    db.commit()
+    # Swap the row's old contribution for the new one in the same transaction
+    db.flush()
+    after = collect_contributions(db, match_player_ids=[match_player_id])
+    apply_contributions(db, [(c, -1) for c in before] + [(c, 1) for c in after])
+    
+    # Credit the player's total through the ledger, so repeated updates count a win once
+    record_points(db, db_match_player)
+    _queue_match_player_event(db, db_match_player)
     
-    # Update player total points if this was a win
-    if db_match_player.is_winner and db_match_player.points_earned > 0:
-        player = db.query(Player).filter(Player.id == db_match_player.player_id).first()
-        if player:
-            player.total_points += db_match_player.points_earned
-            db.commit()
+    # Results recorded after the match was marked completed rate it once both sides are known
+    if db_match_player.match.status == "completed":
+        rate_match(db, db_match_player.match_id)
+    
+    db.commit()
     
     db.refresh(db_match_player)
+    invalidate_game(db_match_player.match.game_id)
     return db_match_player
 
-def get_match_players(db: Session, match_id: int) -> List[Dict[str, Any]]:
-    """Get all players in a match with details"""
-    match_players = db.query(MatchPlayer).filter(MatchPlayer.match_id == match_id).all()
+def submit_match_result(db: Session, match_id: int, result: MatchResultSubmit) -> Optional[Dict[str, Any]]:
+    """
+    Record a whole match result (score, winner and every player's points) in one transaction.
+
+    Player rows are matched on player_id: existing rows are updated and missing ones
+    inserted, all in a single flush. Standings move by one batched upsert, player totals
+    by one ledger insert and one UPDATE, and everything commits once. Players not listed
+    keep their rows. Returns the match, its player rows and the applied deltas.
+
+    With a score, the game's scoring rules check it and decide the winner, the score
+    summary and the points of every player of the match (listed or not); explicit
+    is_winner and points_earned values still take precedence. Raises ValueError for a
+    score that does not fit the rules.
+    """
+    db_match = db.query(Match).filter(Match.id == match_id).first()
+    if not db_match:
+        return None
     
-    result = []
-    for mp in match_players:
-        # Get player details
-        player = db.query(Player).filter(Player.id == mp.player_id).first()
-        franchise = db.query(Franchise).filter(Franchise.id == mp.franchise_id).first()
-        
-        result.append({
-            "id": mp.id,
-            "match_id": mp.match_id,
-            "player_id": mp.player_id,
-            "player_name": player.name if player else None,
-            "franchise_id": mp.franchise_id,
-            "franchise_name": franchise.name if franchise else None,
-            "points_earned": mp.points_earned,
-            "is_winner": mp.is_winner,
+    player_ids = [entry.player_id for entry in result.players]
+    if len(set(player_ids)) != len(player_ids):
+        raise ValueError("Each player may appear only once in a result")
     
+    existing = {mp.player_id: mp for mp in db.query(MatchPlayer).filter(MatchPlayer.match_id == match_id)}
     
-            "extra_data": mp.extra_data
-        })
+    outcome = None
+    entries = list(result.players)
+    if result.score is not None:
+        outcome = evaluate_game_score(db, db_match.game_id, result.score)
+        scored_winner_id = outcome_winner_id(db_match, outcome)
+        if result.winner_id is not None and result.winner_id != scored_winner_id:
+            raise ValueError("winner_id does not match the winner of the score")
+        # The score decides the result of every player of the match, listed or not
+        entries += [MatchResultPlayer(player_id=player_id) for player_id in existing if player_id not in player_ids]
+        player_ids = [entry.player_id for entry in entries]
     
-    return result
-
-def update_match_player_result(db: Session, match_player_id: int, update_data: MatchPlayerUpdate) -> Optional[MatchPlayer]:
-    """Update match results for a player"""
-    db_match_player = db.query(MatchPlayer).filter(MatchPlayer.id == match_player_id).first()
-    if not db_match_player:
-        return None
-        
-    # Update fields
-    if update_data.points_earned is not None:
-        db_match_player.points_earned = update_data.points_earned
+    new_ids = [player_id for player_id in player_ids if player_id not in existing]
+    franchises = dict(db.query(Player.id, Player.franchise_id).filter(Player.id.in_(new_ids))) if new_ids else {}
+    unknown = [player_id for player_id in new_ids if player_id not in franchises]
+    if unknown:
+        raise ValueError(f"Unknown player ids: {unknown}")
     
-    if update_data.is_winner is not None:
-        db_match_player.is_winner = update_data.is_winner
+    # New rows join the match team the player is rostered on
+    match_teams = [team_id for team_id in (db_match.home_team_id, db_match.away_team_id) if team_id]
+    rostered = {}
+    if new_ids and match_teams:
+        rostered = dict(db.query(TeamPlayer.player_id, TeamPlayer.team_id).filter(
+            TeamPlayer.team_id.in_(match_teams), TeamPlayer.player_id.in_(new_ids)
+        ))
     
-    if update_data.extra_data:
-        # Update extra_data without overwriting existing data
-        if not db_match_player.extra_data:
-            db_match_player.extra_data = {}
-        db_match_player.extra_data.update(update_data.extra_data)
+    if outcome is not None:
+        winner_id = scored_winner_id
+    else:
+        winner_id = result.winner_id if result.winner_id is not None else db_match.winner_id
+    before = collect_contributions(db, match_player_ids=[
+        existing[player_id].id for player_id in player_ids if player_id in existing
+    ]) if existing else []
     
-
-    db.commit()
+    rows = []
+    for entry in entries:
+        row = existing.get(entry.player_id)
+        if row is None:
+            row = MatchPlayer(match_id=match_id, player_id=entry.player_id,
+                              franchise_id=franchises.get(entry.player_id),
+                              team_id=rostered.get(entry.player_id))
+            db.add(row)
+        if entry.team_id is not None:
+            row.team_id = entry.team_id
+        if entry.franchise_id is not None:
+            row.franchise_id = entry.franchise_id
+        if entry.is_winner is not None:
+            row.is_winner = entry.is_winner
+        else:
+            # Team matches name the winning team, franchise matches the winning franchise
+            side = row.team_id if db_match.home_team_id or db_match.away_team_id else row.franchise_id
+            row.is_winner = winner_id is not None and side == winner_id
+        if entry.points_earned is not None:
+            row.points_earned = entry.points_earned
+        else:
+            row.points_earned = result_points(outcome, row.is_winner) if outcome is not None else 0
+        if entry.extra_data:
+            row.extra_data = {**(row.extra_data or {}), **entry.extra_data}
+        rows.append(row)
     
-    # Update player total points if this was a win
-    if db_match_player.is_winner and db_match_player.points_earned > 0:
-        player = db.query(Player).filter(Player.id == db_match_player.player_id).first()
-        if player:
-            player.total_points += db_match_player.points_earned
-            db.commit()
+    previous_values = {field: getattr(db_match, field) for field in MATCH_STREAM_FIELDS}
+    if result.score_summary is not None:
+        db_match.score_summary = result.score_summary
+    elif outcome is not None:
+        db_match.score_summary = outcome["summary"]
+    if result.winner_id is not None or outcome is not None:
+        db_match.winner_id = winner_id
+    if result.status is not None:
+        db_match.status = result.status
+    summary_job = None
+    if result.extra_data:
+        db_match.extra_data = {**(db_match.extra_data or {}), **result.extra_data}
+        # New notes replace the summary of the old ones
+        if result.extra_data.get("notes") and not result.extra_data.get("ai_summary"):
+            db_match.extra_data.pop("ai_summary", None)
+            summary_job = request_summary(db, db_match)
+    if outcome is not None:
+        db_match.extra_data = {**(db_match.extra_data or {}), "score": score_record(outcome)}
     
-    db.refresh(db_match_player)
-    return db_match_player
+    db.flush()
+    after = collect_contributions(db, match_player_ids=[row.id for row in rows]) if rows else []
+    standings_changes = apply_contributions(db, [(c, -1) for c in before] + [(c, 1) for c in after])
+    points_changes = record_points_many(db, rows)
+    
+    changed_ids = [match_id]
+    if db_match.status == "completed":
+        if previous_values["status"] != "completed":
+            rate_match(db, match_id)
+        if previous_values["status"] != "completed" or previous_values["winner_id"] != db_match.winner_id:
+            next_match = advance_bracket(db, db_match)
+            if next_match is not None:
+                changed_ids.append(next_match.id)
+    
+    changes = {
+        field: getattr(db_match, field) for field in MATCH_STREAM_FIELDS
+        if getattr(db_match, field) != previous_values[field]
+    }
+    if changes:
+        queue_event(db, match_topics(match_id, db_match.game_id), "match", dict(id=match_id, **changes))
+    for row in rows:
+        _queue_match_player_event(db, row)
+    
+    db.commit()
+    invalidate_game(db_match.game_id)
+    conflict_index.refresh(db, changed_ids)
+    if summary_job is not None:
+        summary_jobs.submit(summary_job)
+    
+    return {
+        "match": db_match,
+        "players": db.query(MatchPlayer).filter(MatchPlayer.match_id == match_id).order_by(MatchPlayer.id).all(),
+        "standings_changes": standings_changes,
+        "points_changes": points_changes
+    }
 
 # Gallery services
 async def add_gallery_image(db: Session, gallery_data: GalleryCreate, image: UploadFile) -> Gallery:
@@ -495,12 +780,13 @@ async def add_gallery_image(db: Session, gallery_data: GalleryCreate, image: Upl
     db.refresh(db_gallery)
     return db_gallery
 
-def get_gallery_images(db: Session, skip: int = 0, limit: int = 100, match_id: Optional[int] = None) -> List[Gallery]:
+def get_gallery_images(db: Session, skip: int = 0, limit: int = 100, match_id: Optional[int] = None,
+                       after: Optional[str] = None) -> List[Gallery]:
     """Get gallery images, optionally filtered by match"""
     query = db.query(Gallery)
     if match_id:
         query = query.filter(Gallery.match_id == match_id)
-    return query.offset(skip).limit(limit).all()
+    return keyset(query, [Gallery.id], after).offset(skip).limit(limit).all()
 
 def delete_gallery_image(db: Session, image_id: int) -> bool:
     """Delete an image from the gallery"""
@@ -521,103 +807,212 @@ def list_s3_gallery_images() -> List[str]:
     return list_images_from_storage("gallery")
 
 # Leaderboard services
-def get_player_leaderboard(db: Session, limit: int = 10, game_id: Optional[int] = None) -> List[Dict]:
-    """Get player leaderboard based on total points"""
-    query = db.query(Player)
+def _rank_entries(entries: List[Dict]) -> List[Dict]:
+    """Assign competition ranks to ordered entries; equal points and wins share a rank (1, 2, 2, 4)"""
+    rank = 0
+    previous_key = None
+    for position, entry in enumerate(entries, start=1):
+        key = (entry["total_points"], entry["matches_won"])
+        if key != previous_key:
+            rank = position
+            previous_key = key
+        entry["rank"] = rank
+    return entries
+
+@cached("leaderboard")
+def get_player_leaderboard(db: Session, limit: int = 10, game_id: Optional[int] = None,
+                           as_of: Optional[datetime] = None) -> List[Dict]:
+    """Get player leaderboard from the materialized standings, optionally as of a past moment"""
+    standing = standings_as_of(db, as_of)
+    rows = db.query(
+        Player.id,
+        Player.name,
+        Player.franchise_id,
+        Franchise.name.label("franchise_name"),
+        standing.c.total_points,
+        standing.c.matches_played,
+        standing.c.matches_won,
+        standing.c.matches_lost
+    ).join(
+        Player, standing.c.entity_id == Player.id
+    ).outerjoin(
+        Franchise, Player.franchise_id == Franchise.id
+    ).filter(
+        standing.c.scope == "player",
+        standing.c.game_id == (game_id or OVERALL_GAME_ID),
+        standing.c.matches_played > 0
+    ).order_by(
+        standing.c.total_points.desc(), standing.c.matches_won.desc(),
+        standing.c.matches_played.asc(), standing.c.entity_id.asc()
+    ).limit(limit).all()
+
+    return _rank_entries([
+        {
+            "id": row.id,
+            "name": row.name,
+            "franchise_id": row.franchise_id,
+            "franchise_name": row.franchise_name,
+            "total_points": row.total_points,
+            "matches_played": row.matches_played,
+            "matches_won": row.matches_won,
+            "matches_lost": row.matches_lost
+        }
+        for row in rows
+    ])
+
+def _player_board_entry(row, rank: int, position: int) -> Dict:
+    return {
+        "rank": rank,
+        "position": position,
+        "id": row.id,
+        "name": row.name,
+        "franchise_id": row.franchise_id,
+        "franchise_name": row.franchise_name,
+        "total_points": row.total_points,
+        "matches_played": row.matches_played,
+        "matches_won": row.matches_won,
+        "matches_lost": row.matches_lost
+    }
+
+@cached("leaderboard")
+def get_player_leaderboard_around(db: Session, player_id: int, n: int = 5,
+                                  game_id: Optional[int] = None) -> Optional[List[Dict]]:
+    """
+    Get the n player leaderboard entries above and below a player.
+
+    Neighbours are fetched with keyset seeks on the standings board index from the
+    player's own sort key, so the cost depends on n, not on the player's position.
+    Returns None when the player has no results on the board.
+    """
+    board = (Standing.scope == "player", Standing.game_id == (game_id or OVERALL_GAME_ID), Standing.matches_played > 0)
+    me = db.query(Standing).filter(*board, Standing.entity_id == player_id).first()
+    if me is None:
+        return None
+
+    # Board order: points desc, wins desc, fewest played, id
+    ahead_of_me = or_(
+        Standing.total_points > me.total_points,
+        and_(Standing.total_points == me.total_points, or_(
+            Standing.matches_won > me.matches_won,
+            and_(Standing.matches_won == me.matches_won, or_(
+                Standing.matches_played < me.matches_played,
+                and_(Standing.matches_played == me.matches_played, Standing.entity_id < me.entity_id)
+            ))
+        ))
+    )
+    entry_query = db.query(
+        Standing.entity_id.label("id"),
+        Player.name,
+        Player.franchise_id,
+        Franchise.name.label("franchise_name"),
+        Standing.total_points,
+        Standing.matches_played,
+        Standing.matches_won,
+        Standing.matches_lost
+    ).join(
+        Player, Standing.entity_id == Player.id
+    ).outerjoin(
+        Franchise, Player.franchise_id == Franchise.id
+    ).filter(*board)
+
+    above = entry_query.filter(ahead_of_me).order_by(
+        Standing.total_points.asc(), Standing.matches_won.asc(),
+        Standing.matches_played.desc(), Standing.entity_id.desc()
+    ).limit(n).all()[::-1]
+    rows = above + entry_query.filter(
+        Standing.entity_id == player_id
+    ).all() + entry_query.filter(~ahead_of_me, Standing.entity_id != player_id).order_by(
+        Standing.total_points.desc(), Standing.matches_won.desc(),
+        Standing.matches_played.asc(), Standing.entity_id.asc()
+    ).limit(n).all()
+
+    # Absolute position of the first row, and its competition rank (ties on points and wins)
+    first = rows[0]
+    position = db.query(func.count(Standing.id)).filter(*board, ahead_of_me).scalar() + 1 - len(above)
+    rank = db.query(func.count(Standing.id)).filter(*board, or_(
+        Standing.total_points > first.total_points,
+        and_(Standing.total_points == first.total_points, Standing.matches_won > first.matches_won)
+    )).scalar() + 1
+
+    entries = []
+    for offset, row in enumerate(rows):
+        if offset and (row.total_points, row.matches_won) != (rows[offset - 1].total_points, rows[offset - 1].matches_won):
+            rank = position + offset
+        entries.append(_player_board_entry(row, rank, position + offset))
+    return entries
+
+@cached("leaderboard")
+def get_franchise_leaderboard(db: Session, limit: int = 10, game_id: Optional[int] = None,
+                              as_of: Optional[datetime] = None) -> List[Dict]:
+    """Get franchise leaderboard in one grouped query over the materialized standings"""
+    standing = standings_as_of(db, as_of)
+    board_game_id = game_id or OVERALL_GAME_ID
+
+    # Players in franchise, only those who played the game when filtering by game
     if game_id:
-        # Filter players who have played matches in the specific game
-        query = query.join(MatchPlayer).join(Match).filter(Match.game_id == game_id).distinct()
-    
-    players = query.order_by(Player.total_points.desc()).limit(limit).all()
-    
-    result = []
-    for player in players:
-        # Count matches played, won, and lost, optionally filtered by game
-        match_player_query = db.query(MatchPlayer).filter(MatchPlayer.player_id == player.id)
-        if game_id:
-            match_player_query = match_player_query.join(Match).filter(Match.game_id == game_id)
-        
-        matches_played = match_player_query.count()
-        matches_won = match_player_query.filter(MatchPlayer.is_winner == True).count()
-        matches_lost = matches_played - matches_won
-        
-        # Get franchise name if available
-        franchise_name = None
-        if player.franchise_id:
-            franchise = db.query(Franchise).filter(Franchise.id == player.franchise_id).first()
-            if franchise:
-                franchise_name = franchise.name
-                
-        result.append({
-            "id": player.id,
-            "name": player.name,
-            "franchise_id": player.franchise_id,
-            "franchise_name": franchise_name,
-            "total_points": player.total_points,
-            "matches_played": matches_played,
-            "matches_won": matches_won,
-            "matches_lost": matches_lost
-        })
-    
-    return result
-
-def get_franchise_leaderboard(db: Session, limit: int = 10, game_id: Optional[int] = None) -> List[Dict]:
-    """Get franchise leaderboard based on total points of players"""
-    franchises = db.query(Franchise).all()
-    
-    franchise_stats = []
-    for franchise in franchises:
-        # Get all players in this franchise
-        players_query = db.query(Player).filter(Player.franchise_id == franchise.id)
-        if game_id:
-            # Filter players who have played matches in the specific game
-            players_query = players_query.join(MatchPlayer).join(Match).filter(Match.game_id == game_id).distinct()
-        
-        players = players_query.all()
-        
-        # Calculate total points from matches, optionally filtered by game
-        total_points = 0
-        matches_won = 0
-        total_matches_played = 0
-        
-        for player in players:
-            match_query = db.query(MatchPlayer).filter(MatchPlayer.player_id == player.id)
-            if game_id:
-                match_query = match_query.join(Match).filter(Match.game_id == game_id)
-            
-            player_points = match_query.with_entities(
-                func.sum(MatchPlayer.points_earned)
-            ).scalar() or 0
-            total_points += player_points
-            
-            player_matches_played = match_query.count()
-            total_matches_played += player_matches_played
-            
-            player_wins = match_query.filter(MatchPlayer.is_winner == True).count()
-            matches_won += player_wins
-        
-        matches_lost = total_matches_played - matches_won
-        
-        # Count teams in franchise
-        teams_query = db.query(Team).filter(Team.franchise_id == franchise.id)
-        if game_id:
-            teams_query = teams_query.filter(Team.game_id == game_id)
-        teams_count = teams_query.count()
-        
-        franchise_stats.append({
-            "id": franchise.id,
-            "name": franchise.name,
-            "total_points": total_points,
-            "players_count": len(players),
-            "teams_count": teams_count,
-            "matches_played": total_matches_played,
-            "matches_won": matches_won,
-            "matches_lost": matches_lost
-        })
-    
-    # Sort by total points
-    franchise_stats.sort(key=lambda x: x["total_points"], reverse=True)
-    return franchise_stats[:limit]
+        players_count = db.query(
+            Player.franchise_id.label("franchise_id"),
+            func.count(standing.c.entity_id).label("players_count")
+        ).join(
+            Player, standing.c.entity_id == Player.id
+        ).filter(
+            standing.c.scope == "player",
+            standing.c.game_id == board_game_id,
+            standing.c.matches_played > 0
+        ).group_by(Player.franchise_id).subquery()
+    else:
+        players_count = db.query(
+            Player.franchise_id.label("franchise_id"),
+            func.count(Player.id).label("players_count")
+        ).group_by(Player.franchise_id).subquery()
+
+    # Teams in franchise
+    teams_query = db.query(
+        Team.franchise_id.label("franchise_id"),
+        func.count(Team.id).label("teams_count")
+    )
+    if game_id:
+        teams_query = teams_query.filter(Team.game_id == game_id)
+    teams_count = teams_query.group_by(Team.franchise_id).subquery()
+
+    total_points = func.coalesce(standing.c.total_points, 0)
+    matches_won = func.coalesce(standing.c.matches_won, 0)
+
+    rows = db.query(
+        Franchise.id,
+        Franchise.name,
+        total_points.label("total_points"),
+        func.coalesce(players_count.c.players_count, 0).label("players_count"),
+        func.coalesce(teams_count.c.teams_count, 0).label("teams_count"),
+        func.coalesce(standing.c.matches_played, 0).label("matches_played"),
+        matches_won.label("matches_won"),
+        func.coalesce(standing.c.matches_lost, 0).label("matches_lost")
+    ).outerjoin(
+        standing,
+        (standing.c.scope == "franchise")
+        & (standing.c.entity_id == Franchise.id)
+        & (standing.c.game_id == board_game_id)
+    ).outerjoin(
+        players_count, players_count.c.franchise_id == Franchise.id
+    ).outerjoin(
+        teams_count, teams_count.c.franchise_id == Franchise.id
+    ).order_by(
+        total_points.desc(), matches_won.desc(), Franchise.id.asc()
+    ).limit(limit).all()
+
+    return _rank_entries([
+        {
+            "id": row.id,
+            "name": row.name,
+            "total_points": row.total_points,
+            "players_count": row.players_count,
+            "teams_count": row.teams_count,
+            "matches_played": row.matches_played,
+            "matches_won": row.matches_won,
+            "matches_lost": row.matches_lost
+        }
+        for row in rows
+    ])
 
 # Team services
 def create_team(db: Session, team: TeamCreate) -> Team:
@@ -632,17 +1027,18 @@ def create_team(db: Session, team: TeamCreate) -> Team:
     db.add(db_team)
     db.commit()
     db.refresh(db_team)
+    invalidate_game(db_team.game_id)
     return db_team
 
 def get_teams(db: Session, skip: int = 0, limit: int = 100, franchise_id: Optional[int] = None, 
-             game_id: Optional[int] = None) -> List[Team]:
+             game_id: Optional[int] = None, after: Optional[str] = None) -> List[Team]:
     """Get all teams, optionally filtered by franchise and/or game"""
     query = db.query(Team)
     if franchise_id:
         query = query.filter(Team.franchise_id == franchise_id)
     if game_id:
         query = query.filter(Team.game_id == game_id)
-    return query.offset(skip).limit(limit).all()
+    return keyset(query, [Team.id], after).offset(skip).limit(limit).all()
 
 def get_team(db: Session, team_id: int) -> Optional[Team]:
     """Get a team by ID"""
@@ -662,6 +1058,8 @@ def update_team(db: Session, team_id: int, team_data: Union[TeamCreate, Dict[str
         # It's already a dictionary
         update_data = team_data
     
+    previous_game_id = db_team.game_id
+    
     # Update team fields
     for field, value in update_data.items():
         if hasattr(db_team, field) and value is not None:
@@ -670,6 +1068,7 @@ def update_team(db: Session, team_id: int, team_data: Union[TeamCreate, Dict[str
     
     db.commit()
     db.refresh(db_team)
+    invalidate_game(previous_game_id, db_team.game_id)
     return db_team
 
 def delete_team(db: Session, team_id: int) -> bool:
@@ -678,8 +1077,10 @@ def delete_team(db: Session, team_id: int) -> bool:
     if not db_team:
         return False
         
+    game_id = db_team.game_id
     db.delete(db_team)
     db.commit()
+    invalidate_game(game_id)
     return True
 
 def get_teams_by_franchise(db: Session, franchise_id: int) -> List[Team]:
@@ -709,27 +1110,45 @@ def add_player_to_team(db: Session, team_player: TeamPlayerCreate) -> TeamPlayer
     db.add(db_team_player)
     db.commit()
     db.refresh(db_team_player)
+    invalidate_game(db_team_player.team.game_id)
     return db_team_player
 
-def get_team_players(db: Session, team_id: int) -> List[Dict[str, Any]]:
-    """Get all players in a team with details"""
-    team_players = db.query(TeamPlayer).filter(TeamPlayer.team_id == team_id).all()
-    
-    result = []
-    for tp in team_players:
-        # Get player details
-        player = db.query(Player).filter(Player.id == tp.player_id).first()
-        if player:
-            result.append({
-                "team_player_id": tp.id,
-                "player_id": player.id,
-                "player_name": player.name,
-                "player_email": player.email,
-                "total_points": player.total_points,
-                "extra_data": tp.extra_data
-            })
-    
-    return result
+TEAM_PLAYER_INCLUDES = ("player", "franchise", "team")
+
+def get_team_players(db: Session, team_id: int, include: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Get all players in a team with details, in one query.
+
+    include= embeds each player's full record, their franchise or the team itself.
+    Raises ValueError for an unknown include.
+    """
+    include = _roster_includes(include, TEAM_PLAYER_INCLUDES)
+    query = db.query(
+        TeamPlayer.id.label("team_player_id"),
+        Player.id.label("player_id"),
+        Player.name.label("player_name"),
+        Player.email.label("player_email"),
+        Player.total_points,
+        TeamPlayer.extra_data
+    ).join(
+        Player, TeamPlayer.player_id == Player.id
+    )
+    if "franchise" in include:
+        query = query.outerjoin(Franchise, Player.franchise_id == Franchise.id)
+    if "team" in include:
+        query = query.join(Team, TeamPlayer.team_id == Team.id)
+    query = _with_relations(query, {"player": Player, "franchise": Franchise, "team": Team}, include)
+    
+    rows = query.filter(TeamPlayer.team_id == team_id).order_by(TeamPlayer.id).all()
+    return [{
+        "team_player_id": row.team_player_id,
+        "player_id": row.player_id,
+        "player_name": row.player_name,
+        "player_email": row.player_email,
+        "total_points": row.total_points,
+        "extra_data": row.extra_data,
+        **_relations(row, include)
+    } for row in rows]
 
 def remove_player_from_team(db: Session, team_player_id: int) -> bool:
     """Remove a player from a team"""
@@ -737,98 +1156,266 @@ def remove_player_from_team(db: Session, team_player_id: int) -> bool:
     if not db_team_player:
         return False
         
+    game_id = db_team_player.team.game_id
     db.delete(db_team_player)
     db.commit()
+    invalidate_game(game_id)
     return True
 
-def get_player_teams(db: Session, player_id: int) -> List[Dict[str, Any]]:
-    """Get all teams that a player belongs to"""
-    team_players = db.query(TeamPlayer).filter(TeamPlayer.player_id == player_id).all()
-    
-    result = []
-    for tp in team_players:
-        # Get team details
-        team = db.query(Team).filter(Team.id == tp.team_id).first()
-        if team:
-            # Get franchise and game details
-            franchise = db.query(Franchise).filter(Franchise.id == team.franchise_id).first()
-            game = db.query(Game).filter(Game.id == team.game_id).first()
-            
-            result.append({
-                "team_player_id": tp.id,
-                "team_id": team.id,
-                "team_name": team.name,
-                "franchise_name": franchise.name if franchise else None,
-                "game_name": game.name if game else None,
-                "extra_data": tp.extra_data
-            })
-    
-    return result
-
-def get_team_leaderboard(db: Session, limit: int = 10, game_id: Optional[int] = None) -> List[Dict]:
-    """Get team leaderboard based on total points"""
-    query = db.query(Team)
+PLAYER_TEAM_INCLUDES = ("team", "franchise", "game")
+
+def get_player_teams(db: Session, player_id: int, include: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Get all teams that a player belongs to, in one query.
+
+    include= embeds the team, its franchise or its game as nested objects.
+    Raises ValueError for an unknown include.
+    """
+    include = _roster_includes(include, PLAYER_TEAM_INCLUDES)
+    query = db.query(
+        TeamPlayer.id.label("team_player_id"),
+        Team.id.label("team_id"),
+        Team.name.label("team_name"),
+        Franchise.name.label("franchise_name"),
+        Game.name.label("game_name"),
+        TeamPlayer.extra_data
+    ).join(
+        Team, TeamPlayer.team_id == Team.id
+    ).outerjoin(
+        Franchise, Team.franchise_id == Franchise.id
+    ).outerjoin(
+        Game, Team.game_id == Game.id
+    )
+    query = _with_relations(query, {"team": Team, "franchise": Franchise, "game": Game}, include)
+    
+    rows = query.filter(TeamPlayer.player_id == player_id).order_by(TeamPlayer.id).all()
+    return [{
+        "team_player_id": row.team_player_id,
+        "team_id": row.team_id,
+        "team_name": row.team_name,
+        "franchise_name": row.franchise_name,
+        "game_name": row.game_name,
+        "extra_data": row.extra_data,
+        **_relations(row, include)
+    } for row in rows]
+
+# Tie-breakers available to the team leaderboard, in the order they are applied
+TEAM_TIE_BREAKERS = ("points", "wins", "head_to_head", "fewest_played")
+DEFAULT_TEAM_TIE_BREAKERS = ("points", "wins", "head_to_head")
+
+def _ranked_team_board(db: Session, game_id: Optional[int], tie_breakers: List[str],
+                       as_of: Optional[datetime] = None):
+    """
+    Build the windowed team board as a subquery with rank, dense_rank and position columns.
+
+    Head-to-head counts a team's wins in matches against teams that are level with it on
+    every tie-breaker listed before "head_to_head".
+    """
+    unknown = [name for name in tie_breakers if name not in TEAM_TIE_BREAKERS]
+    if unknown:
+        raise ValueError(f"Unknown tie-breaker(s): {', '.join(unknown)}")
+
+    standing = standings_as_of(db, as_of)
+    players_count = db.query(
+        TeamPlayer.team_id.label("team_id"),
+        func.count(TeamPlayer.id).label("players_count")
+    ).group_by(TeamPlayer.team_id).subquery()
+
+    board_query = db.query(
+        Team.id.label("id"),
+        Team.name.label("name"),
+        Team.franchise_id.label("franchise_id"),
+        Franchise.name.label("franchise_name"),
+        Team.game_id.label("game_id"),
+        Game.name.label("game_name"),
+        func.coalesce(standing.c.total_points, 0).label("total_points"),
+        func.coalesce(players_count.c.players_count, 0).label("players_count"),
+        func.coalesce(standing.c.matches_played, 0).label("matches_played"),
+        func.coalesce(standing.c.matches_won, 0).label("matches_won"),
+        func.coalesce(standing.c.matches_lost, 0).label("matches_lost")
+    ).outerjoin(
+        standing,
+        (standing.c.scope == "team")
+        & (standing.c.entity_id == Team.id)
+        & (standing.c.game_id == (game_id or OVERALL_GAME_ID))
+    ).outerjoin(
+        players_count, players_count.c.team_id == Team.id
+    ).outerjoin(
+        Franchise, Team.franchise_id == Franchise.id
+    ).outerjoin(
+        Game, Team.game_id == Game.id
+    )
     if game_id:
-        query = query.filter(Team.game_id == game_id)
+        board_query = board_query.filter(Team.game_id == game_id)
+    board = board_query.cte("team_board")
+
+    sort_columns = {
+        "points": board.c.total_points.desc(),
+        "wins": board.c.matches_won.desc(),
+        "fewest_played": board.c.matches_played.asc(),
+    }
+    level_columns = {
+        "points": board.c.total_points,
+        "wins": board.c.matches_won,
+        "fewest_played": board.c.matches_played,
+    }
+
+    head_to_head = None
+    if "head_to_head" in tie_breakers:
+        opponent = board.alias("opponent")
+        level_with = [
+            level_columns[name] == opponent.c[level_columns[name].name]
+            for name in tie_breakers[:tie_breakers.index("head_to_head")]
+        ]
+        head_to_head = db.query(
+            board.c.id.label("team_id"),
+            func.count(Match.id).label("head_to_head_wins")
+        ).join(
+            Match,
+            ((Match.home_team_id == board.c.id) | (Match.away_team_id == board.c.id))
+            & (Match.winner_id == board.c.id)
+        ).join(
+            opponent,
+            (opponent.c.id == case((Match.home_team_id == board.c.id, Match.away_team_id), else_=Match.home_team_id))
+            & and_(true(), *level_with)
+        ).group_by(board.c.id).subquery()
+        sort_columns["head_to_head"] = func.coalesce(head_to_head.c.head_to_head_wins, 0).desc()
+
+    order = [sort_columns[name] for name in tie_breakers]
+    ranked_query = db.query(
+        board,
+        func.rank().over(order_by=order).label("rank"),
+        func.dense_rank().over(order_by=order).label("dense_rank"),
+        func.row_number().over(order_by=order + [board.c.id.asc()]).label("position")
+    )
+    if head_to_head is not None:
+        ranked_query = ranked_query.outerjoin(head_to_head, head_to_head.c.team_id == board.c.id)
+    return ranked_query.subquery("ranked_team_board")
+
+def _team_board_entry(row) -> Dict:
+    return {
+        "rank": row.rank,
+        "dense_rank": row.dense_rank,
+        "id": row.id,
+        "name": row.name,
+        "franchise_id": row.franchise_id,
+        "franchise_name": row.franchise_name,
+        "game_id": row.game_id,
+        "game_name": row.game_name,
+        "total_points": row.total_points,
+        "players_count": row.players_count,
+        "matches_played": row.matches_played,
+        "matches_won": row.matches_won,
+        "matches_lost": row.matches_lost
+    }
+
+@cached("leaderboard")
+def get_team_leaderboard(db: Session, limit: int = 10, game_id: Optional[int] = None, offset: int = 0,
+                         tie_breakers: Optional[List[str]] = None, as_of: Optional[datetime] = None) -> List[Dict]:
+    """Get a page of the team leaderboard, ranked with RANK/DENSE_RANK over the configured tie-breakers"""
+    ranked = _ranked_team_board(db, game_id, list(tie_breakers or DEFAULT_TEAM_TIE_BREAKERS), as_of)
+    rows = db.query(ranked).order_by(ranked.c.position).offset(offset).limit(limit).all()
+    return [_team_board_entry(row) for row in rows]
+
+@cached("leaderboard")
+def get_team_rank(db: Session, team_id: int, game_id: Optional[int] = None,
+                  tie_breakers: Optional[List[str]] = None, as_of: Optional[datetime] = None) -> Optional[Dict]:
+    """Get a single team's leaderboard entry and rank"""
+    ranked = _ranked_team_board(db, game_id, list(tie_breakers or DEFAULT_TEAM_TIE_BREAKERS), as_of)
+    row = db.query(ranked).filter(ranked.c.id == team_id).first()
+    return _team_board_entry(row) if row else None
+
+# Fixture services
+def _fixture_sort_key():
+    """Fixture order: match date, time and id, with undated matches first; non-null so keyset paging can seek on it"""
+    return [func.coalesce(Match.match_date, ""), func.coalesce(Match.match_time, ""), Match.id]
+
+def fixture_cursor_key(fixture: FixtureDetail) -> Tuple[str, str, int]:
+    """Cursor values of a fixture, matching _fixture_sort_key"""
+    return (fixture.match_date or "", fixture.match_time or "", fixture.id)
+
+def _fixtures_query(db: Session):
+    """
+    Matches with every name a fixture shows, from aliased outer joins.
+
+    The winner (a franchise, or else a team, with that id) is resolved by the same query,
+    so a page of any size costs a single query.
+    """
+    HomeFranchise = aliased(Franchise)
+    AwayFranchise = aliased(Franchise)
+    HomeTeam = aliased(Team)
+    AwayTeam = aliased(Team)
+    WinnerFranchise = aliased(Franchise)
+    WinnerTeam = aliased(Team)
     
-    teams = query.all()
-    team_stats = []
+    return db.query(
+        Match,
+        Game.name.label("game_name"),
+        HomeFranchise.name.label("home_franchise_name"),
+        AwayFranchise.name.label("away_franchise_name"),
+        HomeTeam.name.label("home_team_name"),
+        AwayTeam.name.label("away_team_name"),
+        WinnerFranchise.name.label("winner_franchise_name"),
+        WinnerTeam.name.label("winner_team_name")
+    ).outerjoin(
+        Game, Match.game_id == Game.id
+    ).outerjoin(
+        HomeFranchise, Match.home_franchise_id == HomeFranchise.id
+    ).outerjoin(
+        AwayFranchise, Match.away_franchise_id == AwayFranchise.id
+    ).outerjoin(
+        HomeTeam, Match.home_team_id == HomeTeam.id
+    ).outerjoin(
+        AwayTeam, Match.away_team_id == AwayTeam.id
+    ).outerjoin(
+        WinnerFranchise, Match.winner_id == WinnerFranchise.id
+    ).outerjoin(
+        WinnerTeam, Match.winner_id == WinnerTeam.id
+    )
+
+def _fixture_detail(row) -> FixtureDetail:
+    """Build a fixture from a _fixtures_query row"""
+    match = row.Match
     
-    for team in teams:
-        # Get total points from team players in matches
-        total_points = db.query(MatchPlayer).join(
-            TeamPlayer, MatchPlayer.player_id == TeamPlayer.player_id
-        ).filter(
-            TeamPlayer.team_id == team.id
-        ).with_entities(
-            func.sum(MatchPlayer.points_earned)
-        ).scalar() or 0
-        
-        # Get matches played and won by team players
-        matches_played = db.query(MatchPlayer).join(
-            TeamPlayer, MatchPlayer.player_id == TeamPlayer.player_id
-        ).filter(
-            TeamPlayer.team_id == team.id
-        ).count()
-        
-        matches_won = db.query(MatchPlayer).join(
-            TeamPlayer, MatchPlayer.player_id == TeamPlayer.player_id
-        ).filter(
-            TeamPlayer.team_id == team.id,
-            MatchPlayer.is_winner == True
-        ).count()
-        
-        matches_lost = matches_played - matches_won
-        
-        # Get players count
-        players_count = db.query(TeamPlayer).filter(TeamPlayer.team_id == team.id).count()
-        
-        # Get franchise and game details
-        franchise = db.query(Franchise).filter(Franchise.id == team.franchise_id).first()
-        game = db.query(Game).filter(Game.id == team.game_id).first()
-        
-        team_stats.append({
-            "id": team.id,
-            "name": team.name,
-            "franchise_name": franchise.name if franchise else None,
-            "game_name": game.name if game else None,
-            "total_points": int(total_points),
-            "players_count": players_count,
-            "matches_played": matches_played,
-            "matches_won": matches_won,
-            "matches_lost": matches_lost
-        })
-    
-    # Sort by total points
-    team_stats.sort(key=lambda x: x["total_points"], reverse=True)
-    return team_stats[:limit]
+    # winner_id may name a franchise or a team; a franchise wins the tie as before
+    winner = None
+    if row.winner_franchise_name is not None:
+        winner = {"type": "franchise", "id": match.winner_id, "name": row.winner_franchise_name}
+    elif row.winner_team_name is not None:
+        winner = {"type": "team", "id": match.winner_id, "name": row.winner_team_name}
+    
+    return FixtureDetail(
+        id=match.id,
+        game_id=match.game_id,
+        game_name=row.game_name,
+        home_franchise_id=match.home_franchise_id,
+        home_franchise_name=row.home_franchise_name,
+        away_franchise_id=match.away_franchise_id,
+        away_franchise_name=row.away_franchise_name,
+        home_team_id=match.home_team_id,
+        home_team_name=row.home_team_name,
+        away_team_id=match.away_team_id,
+        away_team_name=row.away_team_name,
+        home_team={"id": match.home_team_id, "name": row.home_team_name} if row.home_team_name is not None else None,
+        away_team={"id": match.away_team_id, "name": row.away_team_name} if row.away_team_name is not None else None,
+        match_date=match.match_date,
+        match_time=match.match_time,
+        scheduled_at=match.scheduled_at,
+        status=match.status,
+        location=match.location,
+        score_summary=match.score_summary,
+        winner_id=match.winner_id,
+        winner=winner,
+        round=match.round,
+        extra_data=match.extra_data
+    )
 
-# Fixture services
+@cached("fixtures")
 def get_fixtures(db: Session, skip: int = 0, limit: int = 100, game_id: Optional[int] = None,
-                status: Optional[str] = None, franchise_id: Optional[int] = None, round: Optional[str] = None) -> List[FixtureDetail]:
-    """Get fixtures (matches with team/franchise details)"""
-    # Base query for matches
-    query = db.query(Match)
+                status: Optional[str] = None, franchise_id: Optional[int] = None, round: Optional[str] = None,
+                after: Optional[str] = None) -> List[FixtureDetail]:
+    """Get fixtures (matches with team/franchise details), ordered by match date and time, in one query"""
+    query = _fixtures_query(db)
     
     # Apply filters
     if game_id:
@@ -842,76 +1429,239 @@ def get_fixtures(db: Session, skip: int = 0, limit: int = 100, game_id: Optional
     if round:
         query = query.filter(Match.round == round)
     
-    # Get matches
-    matches = query.offset(skip).limit(limit).all()
+    rows = keyset(query, _fixture_sort_key(), after).offset(skip).limit(limit).all()
+    return [_fixture_detail(row) for row in rows]
+
+@cached("fixtures")
+def get_fixture_calendar(db: Session, start: datetime, end: datetime, game_id: Optional[int] = None,
+                         status: Optional[str] = None, limit: int = 100,
+                         after: Optional[str] = None) -> List[FixtureDetail]:
+    """
+    Get the fixtures scheduled in [start, end), in chronological order.
+
+    Filters on the typed scheduled_at column, so the range is an index range scan
+    (on (game_id, scheduled_at) or (status, scheduled_at) when filtered). Matches without
+    a readable date are not on the calendar. Bounds with a UTC offset are converted to
+    league time.
+    """
+    start, end = league_time(start), league_time(end)
+    if end <= start:
+        raise ValueError("'to' must be later than 'from'")
     
-    # Fetch related data for each match
-    fixtures = []
-    for match in matches:
-        # Get game details
-        game = db.query(Game).filter(Game.id == match.game_id).first()
-        
-        # Get franchise details
-        home_franchise = None
-        away_franchise = None
-        if match.home_franchise_id:
-            home_franchise = db.query(Franchise).filter(Franchise.id == match.home_franchise_id).first()
-        if match.away_franchise_id:
-            away_franchise = db.query(Franchise).filter(Franchise.id == match.away_franchise_id).first()
-            
-        # Get team details if applicable
-        home_team = None
-        away_team = None
-        if match.home_team_id:
-            home_team = db.query(Team).filter(Team.id == match.home_team_id).first()
-        if match.away_team_id:
-            away_team = db.query(Team).filter(Team.id == match.away_team_id).first()
-        
-        # Get winner details
-        winner = None
-        if match.winner_id:
-            # Check if winner is a franchise
-            winner_franchise = db.query(Franchise).filter(Franchise.id == match.winner_id).first()
-            if winner_franchise:
-                winner = {"type": "franchise", "id": winner_franchise.id, "name": winner_franchise.name}
-            else:
-                # Check if winner is a team
-                winner_team = db.query(Team).filter(Team.id == match.winner_id).first()
-                if winner_team:
-                    winner = {"type": "team", "id": winner_team.id, "name": winner_team.name}
-            
-        # Create fixture detail
-        fixture = FixtureDetail(
-            id=match.id,
-            game_id=match.game_id,
-            game_name=game.name if game else None,
-            home_franchise_id=match.home_franchise_id,
-            home_franchise_name=home_franchise.name if home_franchise else None,
-            away_franchise_id=match.away_franchise_id,
-            away_franchise_name=away_franchise.name if away_franchise else None,
-            home_team_id=match.home_team_id,
-            home_team_name=home_team.name if home_team else None,
-            away_team_id=match.away_team_id,
-            away_team_name=away_team.name if away_team else None,
-            home_team={"id": home_team.id, "name": home_team.name} if home_team else None,
-            away_team={"id": away_team.id, "name": away_team.name} if away_team else None,
-            match_date=match.match_date,
-            status=match.status,
-            location=match.location,
-            score_summary=match.score_summary,
-            winner_id=match.winner_id,
-            winner=winner,
-            round=match.round,
-            extra_data=match.extra_data
-        )
-        fixtures.append(fixture)
-        
-    return fixtures
+    query = _fixtures_query(db).filter(Match.scheduled_at >= start, Match.scheduled_at < end)
+    if game_id:
+        query = query.filter(Match.game_id == game_id)
+    if status:
+        query = query.filter(Match.status == status)
+    
+    rows = keyset(query, [Match.scheduled_at, Match.id], after).limit(limit).all()
+    return [_fixture_detail(row) for row in rows]
 
-def get_leaderboard(db: Session, game_id: Optional[int] = None) -> Dict:
-    """Get combined player and franchise leaderboard"""
-    return {
-        "player_leaderboard": get_player_leaderboard(db, game_id=game_id),
-        "franchise_leaderboard": get_franchise_leaderboard(db, game_id=game_id),
-        "team_leaderboard": get_team_leaderboard(db, game_id=game_id)
-    }
\ No newline at end of file
+def _combined_boards(db: Session, game_ids: List[Optional[int]], limit: int,
+                     as_of: Optional[datetime]) -> Dict[Optional[int], Dict]:
+    """
+    Build the player, franchise and team boards of several games from one pass over the standings.
+
+    Franchise, game, team and roster lookups are loaded once and shared by every board. The
+    boards match get_player_leaderboard, get_franchise_leaderboard and get_team_leaderboard.
+    """
+    board_ids = {game_id: game_id or OVERALL_GAME_ID for game_id in game_ids}
+    standing = standings_as_of(db, as_of)
+
+    # The single scan: every standings row of the requested boards
+    rows = db.query(standing).filter(standing.c.game_id.in_(set(board_ids.values()))).all()
+    by_board = defaultdict(lambda: defaultdict(dict))
+    for row in rows:
+        by_board[row.game_id][row.scope][row.entity_id] = row
+
+    player_ids = {row.entity_id for row in rows if row.scope == "player" and row.matches_played > 0}
+    players = {row.id: row for row in db.query(Player.id, Player.name, Player.franchise_id).filter(Player.id.in_(player_ids))}
+    franchises = db.query(Franchise.id, Franchise.name).order_by(Franchise.id).all()
+    franchise_names = {row.id: row.name for row in franchises}
+    game_names = dict(db.query(Game.id, Game.name).all())
+    roster_sizes = dict(db.query(TeamPlayer.team_id, func.count(TeamPlayer.id)).group_by(TeamPlayer.team_id).all())
+    franchise_sizes = dict(db.query(Player.franchise_id, func.count(Player.id)).group_by(Player.franchise_id).all())
+
+    # Teams and team results, limited to the requested games unless the overall board is included
+    team_query = db.query(Team.id, Team.name, Team.franchise_id, Team.game_id)
+    result_query = db.query(Match.home_team_id, Match.away_team_id, Match.winner_id).filter(
+        Match.home_team_id.isnot(None), Match.away_team_id.isnot(None), Match.winner_id.isnot(None)
+    )
+    if all(board_ids):
+        team_query = team_query.filter(Team.game_id.in_(board_ids))
+        result_query = result_query.filter(Match.game_id.in_(board_ids))
+    teams = team_query.all()
+    results = result_query.all()
+
+    def totals(row) -> Dict[str, int]:
+        return {column: getattr(row, column) if row is not None else 0 for column in STANDING_COLUMNS}
+
+    boards = {}
+    for game_id, board_id in board_ids.items():
+        standings = by_board[board_id]
+
+        # Players
+        player_rows = sorted(
+            (row for row in standings["player"].values() if row.matches_played > 0 and row.entity_id in players),
+            key=lambda row: (-row.total_points, -row.matches_won, row.matches_played, row.entity_id)
+        )[:limit]
+        player_board = _rank_entries([
+            {
+                "id": row.entity_id,
+                "name": players[row.entity_id].name,
+                "franchise_id": players[row.entity_id].franchise_id,
+                "franchise_name": franchise_names.get(players[row.entity_id].franchise_id),
+                **totals(row)
+            }
+            for row in player_rows
+        ])
+
+        # Franchises
+        if game_id:
+            players_count = defaultdict(int)
+            for row in standings["player"].values():
+                if row.matches_played > 0 and row.entity_id in players:
+                    players_count[players[row.entity_id].franchise_id] += 1
+        else:
+            players_count = franchise_sizes
+        teams_count = defaultdict(int)
+        for team in teams:
+            if not game_id or team.game_id == game_id:
+                teams_count[team.franchise_id] += 1
+        franchise_entries = [
+            {
+                "id": franchise.id,
+                "name": franchise.name,
+                "players_count": players_count.get(franchise.id, 0),
+                "teams_count": teams_count.get(franchise.id, 0),
+                **totals(standings["franchise"].get(franchise.id))
+            }
+            for franchise in franchises
+        ]
+        franchise_entries.sort(key=lambda entry: (-entry["total_points"], -entry["matches_won"], entry["id"]))
+        franchise_board = _rank_entries(franchise_entries[:limit])
+
+        # Teams, ranked on points, wins, then wins against level opponents
+        team_entries = {
+            team.id: {
+                "id": team.id,
+                "name": team.name,
+                "franchise_id": team.franchise_id,
+                "franchise_name": franchise_names.get(team.franchise_id),
+                "game_id": team.game_id,
+                "game_name": game_names.get(team.game_id),
+                "players_count": roster_sizes.get(team.id, 0),
+                **totals(standings["team"].get(team.id))
+            }
+            for team in teams if not game_id or team.game_id == game_id
+        }
+        level = {team_id: (entry["total_points"], entry["matches_won"]) for team_id, entry in team_entries.items()}
+        head_to_head = defaultdict(int)
+        for home_team_id, away_team_id, winner_id in results:
+            opponent_id = away_team_id if winner_id == home_team_id else home_team_id if winner_id == away_team_id else None
+            if opponent_id in level and winner_id in level and level[winner_id] == level[opponent_id]:
+                head_to_head[winner_id] += 1
+
+        ordered = sorted(team_entries.values(), key=lambda entry: (
+            -entry["total_points"], -entry["matches_won"], -head_to_head[entry["id"]], entry["id"]
+        ))
+        team_board = []
+        rank = dense_rank = 0
+        previous_key = None
+        for position, entry in enumerate(ordered, start=1):
+            key = (entry["total_points"], entry["matches_won"], head_to_head[entry["id"]])
+            if key != previous_key:
+                rank, dense_rank, previous_key = position, dense_rank + 1, key
+            if position <= limit:
+                team_board.append({"rank": rank, "dense_rank": dense_rank, **entry})
+
+        boards[game_id] = {
+            "player_leaderboard": player_board,
+            "franchise_leaderboard": franchise_board,
+            "team_leaderboard": team_board
+        }
+    return boards
+
+def get_leaderboards(db: Session, game_ids: List[Optional[int]], limit: int = 10,
+                     as_of: Optional[datetime] = None) -> Dict[Optional[int], Dict]:
+    """Get the combined boards of several games (None for overall), computing cache misses in one pass"""
+    return cached_per_game(
+        "leaderboard", "combined", game_ids, {"limit": limit, "as_of": as_of},
+        lambda missing: _combined_boards(db, missing, limit, as_of)
+    )
+
+def get_leaderboard(db: Session, game_id: Optional[int] = None, as_of: Optional[datetime] = None) -> Dict:
+    """Get combined player, franchise and team leaderboard"""
+    return get_leaderboards(db, [game_id], as_of=as_of)[game_id]
+
+# Entities that can appear on a leaderboard, by standings scope
+LEADERBOARD_SCOPES = {"player": Player, "team": Team, "franchise": Franchise}
+
+def _ranked_standings(db: Session, scope: str, game_id: Optional[int], as_of: Optional[datetime]):
+    """Standings of one scope as of a moment, ranked by points then wins"""
+    standing = standings_as_of(db, as_of)
+    order = [standing.c.total_points.desc(), standing.c.matches_won.desc()]
+    return db.query(
+        standing.c.entity_id,
+        standing.c.total_points,
+        standing.c.matches_won,
+        func.rank().over(order_by=order).label("rank")
+    ).filter(
+        standing.c.scope == scope,
+        standing.c.game_id == (game_id or OVERALL_GAME_ID),
+        standing.c.matches_played > 0
+    ).subquery()
+
+@cached("leaderboard")
+def get_leaderboard_movers(db: Session, scope: str = "player", since: Optional[datetime] = None,
+                           until: Optional[datetime] = None, game_id: Optional[int] = None,
+                           limit: int = 10) -> List[Dict]:
+    """
+    Diff the standings at two moments: each entry's rank at `until` (default now) and at `since`.
+
+    `since` defaults to the latest snapshot taken before `until`. movement is positive for
+    entries that climbed and None for entries that were not on the board at `since`.
+    """
+    if scope not in LEADERBOARD_SCOPES:
+        raise ValueError(f"Unknown scope '{scope}', expected one of: {', '.join(LEADERBOARD_SCOPES)}")
+
+    until = naive_utc(until) if until is not None else None
+    if since is None:
+        snapshot_query = db.query(StandingSnapshot.taken_at)
+        if until is not None:
+            snapshot_query = snapshot_query.filter(StandingSnapshot.taken_at < until)
+        since = snapshot_query.order_by(StandingSnapshot.taken_at.desc()).limit(1).scalar()
+        if since is None:
+            raise ValueError("No standings snapshot to compare against; pass since")
+
+    entity = LEADERBOARD_SCOPES[scope]
+    current = _ranked_standings(db, scope, game_id, until)
+    previous = _ranked_standings(db, scope, game_id, since)
+
+    rows = db.query(
+        current.c.entity_id,
+        entity.name,
+        current.c.rank,
+        current.c.total_points,
+        previous.c.rank.label("previous_rank"),
+        previous.c.total_points.label("previous_points")
+    ).outerjoin(
+        entity, entity.id == current.c.entity_id
+    ).outerjoin(
+        previous, previous.c.entity_id == current.c.entity_id
+    ).order_by(
+        current.c.rank, current.c.entity_id
+    ).limit(limit).all()
+
+    return [
+        {
+            "id": row.entity_id,
+            "name": row.name,
+            "rank": row.rank,
+            "previous_rank": row.previous_rank,
+            "movement": row.previous_rank - row.rank if row.previous_rank is not None else None,
+            "total_points": row.total_points,
+            "points_gained": row.total_points - (row.previous_points or 0)
+        }
+        for row in rows
+    ]
\ No newline at end of file
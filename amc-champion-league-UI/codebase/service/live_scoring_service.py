@@ -0,0 +1,488 @@
+import logging
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session, sessionmaker
+
+from codebase.model.request_model import Game, LiveScoreEvent, Match
+from codebase.service.conflict_service import conflict_index
+from codebase.service.scoring_service import INNINGS_RULES, RALLY_RULES, game_rules, game_type, override_rules
+from codebase.utils.cache import invalidate_game
+from codebase.utils.config_manager import config
+from codebase.utils.events import MATCH_TOPIC, broker, match_topics, queue_event
+
+logger = logging.getLogger(__name__)
+
+_live_config = config.get_live_scoring_config()
+
+SIDES = {"h": "home", "a": "away"}
+SIDE_CODES = {side: code for code, side in SIDES.items()}
+
+# Event codes: "h"/"a" (+ points) for a rally point, "b" (+ batting side) + runs (+ extra) (+ "w")
+# for a ball, "u" to undo the previous event
+_POINT_CODE = re.compile(r"^([ha])(\d*)$")
+_BALL_CODE = re.compile(r"^b([ha]?)(\d+)(wd|nb|lb|by)?(w?)$")
+_EXTRA_CODES = {"wide": "wd", "no_ball": "nb", "leg_bye": "lb", "bye": "by"}
+UNDO = "u"
+
+
+def live_rules(name: str, extra_data: Optional[Dict[str, Any]] = None) -> Tuple[str, Dict[str, Any]]:
+    """
+    A game's type and live scoring rules.
+
+    The game's scoring rules (see game_rules) can be overridden for live scoring by
+    extra_data["live_scoring"], e.g. {"overs": 8} or {"target": 15, "cap": 0}. Raises
+    ValueError for games that are not scored point by point.
+    """
+    if game_type(name, extra_data) not in {**RALLY_RULES, **INNINGS_RULES}:
+        raise ValueError(f"Live scoring is not available for {name}")
+    kind, rules = game_rules(name, extra_data)
+    override_rules(rules, (extra_data or {}).get("live_scoring"))
+    return kind, rules
+
+
+def encode_event(event: Dict[str, Any], innings: bool) -> str:
+    """Turn a submitted event into its compact log code; raises ValueError if it does not fit the game"""
+    event_type = event.get("type") or ("ball" if innings else "point")
+    side = event.get("side")
+    if side is not None and side not in SIDE_CODES:
+        raise ValueError(f"Unknown side '{side}'; expected home or away")
+
+    if event_type == "undo":
+        return UNDO
+    if event_type == "point" and not innings:
+        if side is None:
+            raise ValueError("A point needs the side that won it")
+        points = event.get("points", 1)
+        if not isinstance(points, int) or points < 1:
+            raise ValueError("points must be a positive integer")
+        return SIDE_CODES[side] + (str(points) if points != 1 else "")
+    if event_type == "ball" and innings:
+        runs = event.get("runs", 0)
+        if not isinstance(runs, int) or runs < 0:
+            raise ValueError("runs must be zero or more")
+        extra = event.get("extra")
+        if extra is not None and extra not in _EXTRA_CODES:
+            raise ValueError(f"Unknown extra '{extra}'; expected one of: {', '.join(_EXTRA_CODES)}")
+        return (
+            "b" + (SIDE_CODES[side] if side else "") + str(runs)
+            + (_EXTRA_CODES[extra] if extra else "") + ("w" if event.get("wicket") else "")
+        )
+    raise ValueError(f"'{event_type}' events do not apply to this game; expected "
+                     + ("ball or undo" if innings else "point or undo"))
+
+
+class _RallyScore:
+    """Running score of a set, frame or round based game"""
+    innings = False
+
+    def __init__(self, rules: Dict[str, Any]):
+        self.rules = rules
+        self.units: List[Dict[str, int]] = []
+        self.current = {"home": 0, "away": 0}
+        self.won = {"home": 0, "away": 0}
+        self.winner: Optional[str] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.winner is not None
+
+    def apply(self, code: str) -> None:
+        if self.finished:
+            raise ValueError("The match is already decided")
+        side_code, points = _POINT_CODE.match(code).groups()
+        self.current[SIDES[side_code]] += int(points or 1)
+
+        unit_winner = self._unit_winner()
+        if unit_winner:
+            self.units.append(self.current)
+            self.current = {"home": 0, "away": 0}
+            self.won[unit_winner] += 1
+            if self.won[unit_winner] >= self.rules["to_win"]:
+                self.winner = unit_winner
+
+    def _unit_winner(self) -> Optional[str]:
+        home, away = self.current["home"], self.current["away"]
+        leader, best = ("home", home) if home > away else ("away", away)
+        if home == away:
+            return None
+        if best >= self.rules["target"] and abs(home - away) >= self.rules["win_by"]:
+            return leader
+        if self.rules["cap"] and best >= self.rules["cap"]:
+            return leader
+        return None
+
+    def score_data(self) -> Dict[str, Any]:
+        """The score in the game's GameScore shape, the set in play last"""
+        units = self.units + ([dict(self.current)] if any(self.current.values()) else [])
+        return {self.rules["unit"]: units, "final_result": dict(self.won)}
+
+    def summary(self) -> str:
+        if self.rules["target"] == 1:
+            return f"{self.won['home']}-{self.won['away']}"
+        units = self.units + ([self.current] if any(self.current.values()) else [])
+        return ", ".join(f"{unit['home']}-{unit['away']}" for unit in units)
+
+
+class _InningsScore:
+    """Running score of a limited-overs game, ball by ball"""
+    innings = True
+
+    def __init__(self, rules: Dict[str, Any]):
+        self.rules = rules
+        self.innings_list: List[Dict[str, Any]] = []
+        self.closed = False  # the latest innings is over
+        self.finished = False
+        self.winner: Optional[str] = None
+
+    def apply(self, code: str) -> None:
+        if self.finished:
+            raise ValueError("The match is already decided")
+        side_code, runs, extra, wicket = _BALL_CODE.match(code).groups()
+        side = SIDES.get(side_code)
+
+        if not self.innings_list or self.closed:
+            if self.innings_list:
+                first = self.innings_list[0]["batting"]
+                batting = "away" if first == "home" else "home"
+                if side and side != batting:
+                    raise ValueError(f"{side} already batted; {batting} bats the second innings")
+            else:
+                batting = side or "home"
+            self.innings_list.append({"batting": batting, "runs": 0, "wickets": 0, "balls": 0, "extras": 0})
+            self.closed = False
+        innings = self.innings_list[-1]
+        if side and side != innings["batting"]:
+            raise ValueError(f"{innings['batting']} is batting")
+
+        runs = int(runs)
+        if extra in ("wd", "nb"):
+            innings["runs"] += runs + 1
+            innings["extras"] += 1 + (runs if extra == "wd" else 0)
+        else:
+            innings["runs"] += runs
+            innings["balls"] += 1
+            if extra:
+                innings["extras"] += runs
+        if wicket:
+            innings["wickets"] += 1
+
+        chasing = len(self.innings_list) == 2
+        target_reached = chasing and innings["runs"] > self.innings_list[0]["runs"]
+        if (innings["wickets"] >= self.rules["wickets"]
+                or innings["balls"] >= self.rules["overs"] * self.rules["balls_per_over"]
+                or target_reached):
+            self.closed = True
+            if chasing:
+                self.finished = True
+                first, second = self.innings_list
+                if first["runs"] != second["runs"]:
+                    self.winner = first["batting"] if first["runs"] > second["runs"] else second["batting"]
+
+    def _overs(self, balls: int) -> str:
+        per_over = self.rules["balls_per_over"]
+        return f"{balls // per_over}.{balls % per_over}"
+
+    def score_data(self) -> Dict[str, Any]:
+        """The score in the CricketScore shape"""
+        innings = [dict(entry, overs=self._overs(entry["balls"])) for entry in self.innings_list]
+        if len(innings) == 2:
+            innings[1]["target"] = innings[0]["runs"] + 1
+        final_result = {"home": 0, "away": 0}
+        for entry in innings:
+            final_result[entry["batting"]] = entry["runs"]
+        if self.finished:
+            final_result["winner"] = self.winner or "tie"
+        return {"innings": innings, "final_result": final_result}
+
+    def summary(self) -> str:
+        return ", ".join(
+            f"{entry['batting']} {entry['runs']}/{entry['wickets']} ({self._overs(entry['balls'])})"
+            for entry in self.innings_list
+        )
+
+
+class LiveMatch:
+    """One match's live state: the effective event codes, the running score and unflushed events"""
+
+    def __init__(self, match_id: int, game_id: int, kind: str, rules: Dict[str, Any], seq: int = 0):
+        self.match_id = match_id
+        self.game_id = game_id
+        self.kind = kind
+        self.rules = rules
+        self.seq = seq  # last sequence number handed out, undo events included
+        self.codes: List[str] = []  # scoring events in effect, oldest first
+        self.pending: List[Tuple[int, str, datetime]] = []
+        self.score = self._new_score()
+        self.touched = time.monotonic()
+        self.evicted = False
+        self.lock = threading.Lock()
+
+    def _new_score(self):
+        return _InningsScore(self.rules) if self.kind in INNINGS_RULES else _RallyScore(self.rules)
+
+    def apply(self, code: str) -> None:
+        """Apply one event code; an undo replays the log without its last scoring event"""
+        if code == UNDO:
+            if not self.codes:
+                raise ValueError("There is no event to undo")
+            self.codes.pop()
+            self.score = self._new_score()
+            for previous in self.codes:
+                self.score.apply(previous)
+        else:
+            self.score.apply(code)
+            self.codes.append(code)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "match_id": self.match_id,
+            "game_id": self.game_id,
+            "game_type": self.kind,
+            "seq": self.seq,
+            "finished": self.score.finished,
+            "winner": self.score.winner,
+            "summary": self.score.summary(),
+            "score_data": self.score.score_data()
+        }
+
+
+class LiveScoreBoard:
+    """
+    In-memory running scores for matches being scored live.
+
+    Events are applied to the match's score as they arrive and published to the match
+    topic straight away; the database only sees them in batches, every flush_seconds from
+    a background thread or as soon as a match buffers flush_batch events or is decided.
+    A match not held in memory is rebuilt by replaying its persisted event log.
+    """
+
+    def __init__(self, flush_seconds: float = 2.0, flush_batch: int = 200, idle_seconds: int = 900):
+        self.flush_seconds = flush_seconds
+        self.flush_batch = flush_batch
+        self.idle_seconds = idle_seconds
+        self._matches: Dict[int, LiveMatch] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop: Optional[threading.Event] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _load(self, db: Session, match_id: int) -> Optional[LiveMatch]:
+        with self._lock:
+            live = self._matches.get(match_id)
+        if live is not None:
+            return live
+
+        row = db.query(Match.id, Match.game_id, Game.name, Game.extra_data).join(
+            Game, Match.game_id == Game.id
+        ).filter(Match.id == match_id).first()
+        if row is None:
+            return None
+        kind, rules = live_rules(row.name, row.extra_data)
+
+        live = LiveMatch(match_id, row.game_id, kind, rules)
+        for seq, code in db.query(LiveScoreEvent.seq, LiveScoreEvent.code).filter(
+            LiveScoreEvent.match_id == match_id
+        ).order_by(LiveScoreEvent.seq):
+            live.seq = seq
+            try:
+                live.apply(code)
+            except ValueError:
+                # Rules changed since the event was scored; it no longer applies
+                continue
+        with self._lock:
+            return self._matches.setdefault(match_id, live)
+
+    def snapshot(self, db: Session, match_id: int) -> Optional[Dict[str, Any]]:
+        """The live score of a match, or None if the match does not exist"""
+        live = self._load(db, match_id)
+        if live is None:
+            return None
+        with live.lock:
+            return live.snapshot()
+
+    def record(self, db: Session, match_id: int, events: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Apply a batch of scoring events to a match and return its score.
+
+        The batch is all or nothing: an event that does not fit the game or the score so far
+        raises ValueError and leaves the score as it was. Returns None if the match does
+        not exist.
+        """
+        status = db.query(Match.status).filter(Match.id == match_id).scalar()
+        if status is None:
+            return None
+        if status in ("completed", "cancelled"):
+            raise ValueError(f"Match {match_id} is {status}; live scoring is closed")
+        if not events:
+            raise ValueError("At least one event is required")
+
+        while True:
+            live = self._load(db, match_id)
+            if live is None:
+                return None
+            with live.lock:
+                if live.evicted:
+                    continue
+                codes = [encode_event(event, live.score.innings) for event in events]
+                first_seq, saved = live.seq + 1, list(live.codes)
+                try:
+                    for code in codes:
+                        live.apply(code)
+                except ValueError:
+                    live.codes = saved
+                    live.score = live._new_score()
+                    for code in saved:
+                        live.score.apply(code)
+                    raise
+                now = datetime.utcnow()
+                for code in codes:
+                    live.seq += 1
+                    live.pending.append((live.seq, code, now))
+                live.touched = time.monotonic()
+                snapshot = live.snapshot()
+                broker.publish([f"{MATCH_TOPIC}:{match_id}"], "live_score",
+                               dict(snapshot, from_seq=first_seq, events=codes))
+                flush_now = len(live.pending) >= self.flush_batch or live.score.finished
+            break
+
+        if flush_now:
+            self.flush(db)
+        return snapshot
+
+    def flush(self, db: Session) -> int:
+        """
+        Write every buffered event in one transaction and return how many were written.
+
+        Each flushed match also gets its score in extra_data["live_score"], its
+        score_summary, and moves from scheduled to in_progress.
+        """
+        with self._flush_lock:
+            with self._lock:
+                lives = list(self._matches.values())
+            batches = []
+            for live in lives:
+                with live.lock:
+                    if live.pending:
+                        batches.append((live, live.pending, live.snapshot()))
+                        live.pending = []
+            if not batches:
+                self._evict()
+                return 0
+
+            try:
+                matches = {match.id: match for match in db.query(Match).filter(
+                    Match.id.in_([live.match_id for live, _, _ in batches])
+                )}
+                rows = [
+                    {"match_id": live.match_id, "seq": seq, "code": code, "recorded_at": recorded_at}
+                    for live, events, _ in batches if live.match_id in matches
+                    for seq, code, recorded_at in events
+                ]
+                if rows:
+                    db.execute(insert(LiveScoreEvent), rows)
+                for live, _, snapshot in batches:
+                    match = matches.get(live.match_id)
+                    if match is None:
+                        continue
+                    previous = {"status": match.status, "score_summary": match.score_summary}
+                    match.extra_data = dict(match.extra_data or {}, live_score={
+                        key: snapshot[key] for key in ("game_type", "seq", "finished", "winner", "score_data")
+                    })
+                    match.score_summary = snapshot["summary"] or match.score_summary
+                    if match.status == "scheduled":
+                        match.status = "in_progress"
+                    changes = {field: getattr(match, field) for field, value in previous.items()
+                               if getattr(match, field) != value}
+                    if changes:
+                        queue_event(db, match_topics(match.id, match.game_id), "match", dict(id=match.id, **changes))
+                db.commit()
+            except Exception:
+                db.rollback()
+                for live, events, _ in batches:
+                    with live.lock:
+                        live.pending[:0] = events
+                raise
+
+            invalidate_game(*{match.game_id for match in matches.values()})
+            conflict_index.refresh(db, list(matches))
+            for live, _, _ in batches:
+                if live.match_id not in matches:
+                    self.discard(live.match_id)
+            self._evict()
+            return len(rows)
+
+    def _evict(self) -> None:
+        """Forget decided and idle matches that have nothing left to flush"""
+        idle_before = time.monotonic() - self.idle_seconds
+        with self._lock:
+            for match_id, live in list(self._matches.items()):
+                with live.lock:
+                    if not live.pending and (live.score.finished or live.touched < idle_before):
+                        live.evicted = True
+                        del self._matches[match_id]
+
+    def discard(self, match_id: int) -> None:
+        """Drop a match's live state and anything still buffered for it (the match was deleted)"""
+        with self._lock:
+            live = self._matches.pop(match_id, None)
+        if live is not None:
+            with live.lock:
+                live.evicted = True
+                live.pending = []
+
+    @property
+    def active_count(self) -> int:
+        return len(self._matches)
+
+    def start(self, session_factory: sessionmaker) -> None:
+        """Flush buffered events every flush_seconds from a background thread"""
+        if self._thread is not None or self.flush_seconds <= 0:
+            return
+        self._stop = threading.Event()
+
+        def run():
+            while not self._stop.wait(self.flush_seconds):
+                db = session_factory()
+                try:
+                    self.flush(db)
+                except Exception:
+                    logger.exception("Live score flush failed; events stay buffered")
+                finally:
+                    db.close()
+
+        self._thread = threading.Thread(target=run, name="live-score-flush", daemon=True)
+        self._thread.start()
+
+    def stop(self, session_factory: sessionmaker) -> None:
+        """Stop the background flusher and write whatever is still buffered"""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        db = session_factory()
+        try:
+            self.flush(db)
+        finally:
+            db.close()
+
+
+live_scores = LiveScoreBoard(
+    flush_seconds=_live_config["flush_seconds"],
+    flush_batch=_live_config["flush_batch"],
+    idle_seconds=_live_config["idle_seconds"]
+)
+
+
+def record_live_events(db: Session, match_id: int, events: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Score a batch of live events for a match"""
+    return live_scores.record(db, match_id, events)
+
+
+def get_live_score(db: Session, match_id: int) -> Optional[Dict[str, Any]]:
+    """Current live score of a match"""
+    return live_scores.snapshot(db, match_id)
@@ -0,0 +1,151 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_, case, func, insert, literal, select, update
+from sqlalchemy.orm import Session
+
+from codebase.model.request_model import MatchPlayer, Player, PointsLedger
+
+
+def credited_points(is_winner: Optional[bool], points_earned: Optional[int]) -> int:
+    """Points a match result credits to the player's total: the points earned in a win"""
+    return (points_earned or 0) if is_winner else 0
+
+
+def record_points(db: Session, match_player: MatchPlayer) -> int:
+    """
+    Bring a match player's ledger balance in line with its current result, in the caller's transaction.
+
+    Idempotent: repeating the same result writes nothing. Otherwise an entry holding the
+    difference is appended and the player's total moves by it with an atomic SQL
+    increment, so repeated or concurrent PUTs can never count a win twice. Returns the
+    applied change.
+    """
+    return record_points_many(db, [match_player]).get(match_player.player_id, 0)
+
+
+def _balances(db: Session, match_player_ids: List[int]) -> Dict[int, int]:
+    """Current ledger balance of each match player row (rows without entries are left out)"""
+    if not match_player_ids:
+        return {}
+    return dict(db.query(PointsLedger.match_player_id, func.sum(PointsLedger.points)).filter(
+        PointsLedger.match_player_id.in_(match_player_ids)
+    ).group_by(PointsLedger.match_player_id).all())
+
+
+def record_points_many(db: Session, match_players: List[MatchPlayer]) -> Dict[int, int]:
+    """
+    record_points() for several match players with a fixed number of statements.
+
+    Returns the change applied to each player's total (players without a change are left out).
+    """
+    match_player_ids = [match_player.id for match_player in match_players]
+    if match_player_ids:
+        # Serialize concurrent writers of the same results (balances are sums, which cannot be locked)
+        db.query(MatchPlayer.id).filter(MatchPlayer.id.in_(match_player_ids)).with_for_update().all()
+    balances = _balances(db, match_player_ids)
+
+    entries, deltas = [], defaultdict(int)
+    recorded_at = datetime.utcnow()
+    for match_player in match_players:
+        points = credited_points(match_player.is_winner, match_player.points_earned)
+        delta = points - (balances.get(match_player.id) or 0)
+        if delta == 0:
+            continue
+        entries.append(dict(match_player_id=match_player.id, match_id=match_player.match_id,
+                            player_id=match_player.player_id, points=delta, reason="result",
+                            recorded_at=recorded_at))
+        deltas[match_player.player_id] += delta
+    if not entries:
+        return {}
+
+    db.execute(insert(PointsLedger), entries)
+    _increment_totals(db, deltas)
+    return {player_id: delta for player_id, delta in deltas.items() if delta}
+
+
+def remove_points(db: Session, match_id: int) -> None:
+    """Balance out a match's ledger entries, and take them out of the totals, before its rows are deleted"""
+    balances = db.query(
+        PointsLedger.match_player_id, PointsLedger.player_id, func.sum(PointsLedger.points)
+    ).filter(
+        PointsLedger.match_player_id.in_(select(MatchPlayer.id).where(MatchPlayer.match_id == match_id))
+    ).group_by(PointsLedger.match_player_id, PointsLedger.player_id).all()
+
+    recorded_at = datetime.utcnow()
+    entries = [dict(match_player_id=match_player_id, match_id=match_id, player_id=player_id, points=-points,
+                    reason="removed", recorded_at=recorded_at)
+               for match_player_id, player_id, points in balances if points]
+    if not entries:
+        return
+    db.execute(insert(PointsLedger), entries)
+    deltas = defaultdict(int)
+    for entry in entries:
+        deltas[entry["player_id"]] += entry["points"]
+    _increment_totals(db, deltas)
+
+
+def _increment_totals(db: Session, deltas: Dict[int, int]) -> None:
+    """Move several players' totals in one atomic UPDATE"""
+    deltas = {player_id: delta for player_id, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    db.execute(
+        update(Player).where(Player.id.in_(list(deltas))).values(
+            total_points=func.coalesce(Player.total_points, 0) + case(deltas, value=Player.id, else_=0)
+        ).execution_options(synchronize_session=False)
+    )
+
+
+def rebuild_points(db: Session) -> int:
+    """
+    Correct the ledger against the match results and rebuild every player's total from it.
+
+    Nothing is rewritten: each match player row (or row since deleted) whose balance
+    differs from what its result credits gets a correction entry for the difference. All
+    steps are set-based statements (INSERT ... SELECT and UPDATE ... FROM an aggregate),
+    so the rebuild stays fast on large MatchPlayer tables. Returns the corrections appended.
+    """
+    balances = select(
+        PointsLedger.match_player_id,
+        PointsLedger.player_id,
+        func.max(PointsLedger.match_id).label("match_id"),
+        func.sum(PointsLedger.points).label("points")
+    ).group_by(PointsLedger.match_player_id, PointsLedger.player_id).subquery()
+    same_row = and_(balances.c.match_player_id == MatchPlayer.id, balances.c.player_id == MatchPlayer.player_id)
+    columns = ["match_player_id", "match_id", "player_id", "points", "reason", "recorded_at"]
+
+    # Match player rows whose balance differs from their result
+    credited = case((MatchPlayer.is_winner == True, func.coalesce(MatchPlayer.points_earned, 0)), else_=0)
+    correction = credited - func.coalesce(balances.c.points, 0)
+    corrected = db.execute(insert(PointsLedger).from_select(columns, select(
+        MatchPlayer.id, MatchPlayer.match_id, MatchPlayer.player_id, correction,
+        literal("correction"), func.current_timestamp()
+    ).select_from(MatchPlayer).outerjoin(balances, same_row).where(correction != 0))).rowcount
+
+    # Balances left by rows that no longer exist (or changed player)
+    corrected += db.execute(insert(PointsLedger).from_select(columns, select(
+        balances.c.match_player_id, balances.c.match_id, balances.c.player_id, -balances.c.points,
+        literal("correction"), func.current_timestamp()
+    ).select_from(balances).outerjoin(MatchPlayer, same_row).where(
+        MatchPlayer.id.is_(None), balances.c.points != 0
+    ))).rowcount
+
+    totals = select(
+        PointsLedger.player_id, func.sum(PointsLedger.points).label("points")
+    ).group_by(PointsLedger.player_id).subquery()
+    db.execute(update(Player).values(total_points=0).execution_options(synchronize_session=False))
+    db.execute(
+        update(Player).where(Player.id == totals.c.player_id).values(
+            total_points=totals.c.points
+        ).execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return corrected
+
+
+def ensure_points_ledger(db: Session) -> None:
+    """Build the ledger once for databases that predate it"""
+    if db.query(PointsLedger.id).first() is None and db.query(MatchPlayer.id).first() is not None:
+        rebuild_points(db)
@@ -0,0 +1,244 @@
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from codebase.model.request_model import Match, MatchPlayer, Player, Team, Rating, RatedMatch
+from codebase.utils.cache import cached, invalidate_namespace
+from codebase.utils.config_manager import config
+
+RATING_SCOPES = ("player", "team")
+
+_rating_config = config.get_rating_config()
+
+
+def expected_score(own_rating, opponent_rating, scale: float = _rating_config["scale"]):
+    """Elo win probability of a side rated own_rating against one rated opponent_rating"""
+    return 1.0 / (1.0 + 10.0 ** ((opponent_rating - own_rating) / scale))
+
+
+def compute_ratings(match_index: np.ndarray, entity_index: np.ndarray, won: np.ndarray,
+                    n_entities: int, initial_rating: float = _rating_config["initial_rating"],
+                    k_factor: float = _rating_config["k_factor"],
+                    scale: float = _rating_config["scale"]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Replay Elo over a flat list of match participants, vectorized with NumPy.
+
+    Participants must be ordered by match, in the order the matches are rated. Each side's
+    strength is the mean rating of its participants. Matches are grouped into layers in
+    which no entity appears twice; every entity still sees its matches in order, so each
+    layer is updated in one vectorized step with the same result as a sequential replay.
+
+    Returns the final rating and the number of rated matches of every entity.
+    """
+    ratings = np.full(n_entities, initial_rating, dtype=np.float64)
+    counts = np.bincount(entity_index, minlength=n_entities)
+    if len(match_index) == 0:
+        return ratings, counts
+
+    # Layer of each match: one past the latest layer of any of its participants
+    starts = np.flatnonzero(np.r_[True, match_index[1:] != match_index[:-1]])
+    ends = np.r_[starts[1:], len(match_index)]
+    entities = entity_index.tolist()
+    last_layer = [0] * n_entities
+    match_layers = []
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        layer = max(last_layer[entity] for entity in entities[start:end]) + 1
+        for entity in entities[start:end]:
+            last_layer[entity] = layer
+        match_layers.append(layer)
+
+    participant_layer = np.repeat(np.asarray(match_layers), ends - starts)
+    order = np.argsort(participant_layer, kind="stable")
+    layer = participant_layer[order]
+    entity = entity_index[order]
+    score = won[order].astype(np.float64)
+    # Sides are numbered match * 2 + won, so a side's opponent is side ^ 1
+    match_number = np.cumsum(np.r_[True, match_index[order][1:] != match_index[order][:-1]]) - 1
+    side = match_number * 2 + won[order].astype(np.int64)
+
+    bounds = np.flatnonzero(np.r_[True, layer[1:] != layer[:-1], True])
+    for start, end in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+        layer_entities = entity[start:end]
+        layer_sides = side[start:end] - side[start] + (side[start] & 1)
+        current = ratings[layer_entities]
+        totals = np.bincount(layer_sides, weights=current)
+        sizes = np.bincount(layer_sides)
+        side_rating = totals / np.maximum(sizes, 1)
+        expected = expected_score(side_rating[layer_sides], side_rating[layer_sides ^ 1], scale)
+        ratings[layer_entities] = current + k_factor * (score[start:end] - expected)
+
+    return ratings, counts
+
+
+def _participants_query(db: Session, scope: str):
+    """Participants of completed matches for a scope: (match_id, entity_id, game_id, is_winner)"""
+    entity_column = MatchPlayer.player_id if scope == "player" else MatchPlayer.team_id
+    query = db.query(
+        Match.id, entity_column, Match.game_id, MatchPlayer.is_winner
+    ).join(
+        MatchPlayer, MatchPlayer.match_id == Match.id
+    ).filter(
+        Match.status == "completed", entity_column.isnot(None)
+    )
+    # A team appears once per match even when several of its players are listed
+    return query.distinct() if scope == "team" else query
+
+
+def _rateable(match_index: np.ndarray, won: np.ndarray) -> np.ndarray:
+    """Mask of participants whose match has both a winning and a losing side"""
+    winners = np.bincount(match_index, weights=won)
+    losers = np.bincount(match_index, weights=1 - won)
+    return (winners > 0)[match_index] & (losers > 0)[match_index]
+
+
+def recompute_ratings(db: Session) -> Dict[str, int]:
+    """
+    Recompute every rating from the full completed-match history.
+
+    Run this after changing the rating parameters or correcting old results. Matches are
+    replayed in the order they were played (match_date, match_time, id).
+    """
+    match_order = db.query(Match.id).filter(Match.status == "completed").order_by(
+        Match.match_date, Match.match_time, Match.id
+    ).all()
+    position = {match_id: index for index, (match_id,) in enumerate(match_order)}
+
+    db.query(Rating).delete(synchronize_session=False)
+    db.query(RatedMatch).delete(synchronize_session=False)
+
+    rated_matches = set()
+    rows_written = {}
+    for scope in RATING_SCOPES:
+        rows = _participants_query(db, scope).all()
+        if not rows:
+            rows_written[scope] = 0
+            continue
+        rows.sort(key=lambda row: position[row[0]])
+
+        match_index = np.fromiter((position[row[0]] for row in rows), dtype=np.int64, count=len(rows))
+        won = np.fromiter((bool(row[3]) for row in rows), dtype=np.int64, count=len(rows))
+        keys = [(row[1], row[2]) for row in rows]
+        mask = _rateable(match_index, won)
+
+        # Ratings are per game, so an entity is an (entity_id, game_id) pair
+        entity_keys = list(dict.fromkeys(key for key, keep in zip(keys, mask) if keep))
+        entity_lookup = {key: index for index, key in enumerate(entity_keys)}
+        entity_index = np.fromiter(
+            (entity_lookup[key] for key, keep in zip(keys, mask) if keep), dtype=np.int64, count=int(mask.sum())
+        )
+
+        rows_written[scope] = len(entity_keys)
+        if not entity_keys:
+            continue
+
+        ratings, counts = compute_ratings(match_index[mask], entity_index, won[mask], len(entity_keys))
+        db.execute(Rating.__table__.insert(), [
+            {"scope": scope, "entity_id": entity_id, "game_id": game_id,
+             "rating": float(rating), "matches_rated": int(count)}
+            for (entity_id, game_id), rating, count in zip(entity_keys, ratings, counts)
+        ])
+        rated_matches.update(match_order[index][0] for index in np.unique(match_index[mask]).tolist())
+
+    if rated_matches:
+        rated_at = datetime.utcnow()
+        db.execute(RatedMatch.__table__.insert(), [
+            {"match_id": match_id, "rated_at": rated_at} for match_id in sorted(rated_matches)
+        ])
+    db.commit()
+    invalidate_namespace("leaderboard")
+    return rows_written
+
+
+def ensure_ratings(db: Session) -> None:
+    """Compute the ratings once for databases that predate the rating table"""
+    if db.query(RatedMatch.match_id).first() is None and db.query(Match.id).filter(Match.status == "completed").first() is not None:
+        recompute_ratings(db)
+
+
+def rate_match(db: Session, match_id: int) -> bool:
+    """
+    Fold a completed match into the ratings, in the caller's transaction.
+
+    Each match is rated once; later corrections to its result need recompute_ratings().
+    Returns False when the match is already rated or has no winning and losing side.
+    """
+    if db.query(RatedMatch.match_id).filter(RatedMatch.match_id == match_id).first() is not None:
+        return False
+
+    updates = []
+    for scope in RATING_SCOPES:
+        rows = _participants_query(db, scope).filter(Match.id == match_id).all()
+        if not any(row[3] for row in rows) or all(row[3] for row in rows):
+            continue
+
+        game_id = rows[0][2]
+        entity_ids = [row[1] for row in rows]
+        current = dict(db.query(Rating.entity_id, Rating.rating).filter(
+            Rating.scope == scope, Rating.game_id == game_id, Rating.entity_id.in_(entity_ids)
+        ).all())
+        ratings = {entity_id: current.get(entity_id, _rating_config["initial_rating"]) for entity_id in entity_ids}
+
+        side_rating = {}
+        for won in (True, False):
+            side = [ratings[row[1]] for row in rows if bool(row[3]) == won]
+            side_rating[won] = sum(side) / len(side)
+
+        for _, entity_id, _, is_winner in rows:
+            won = bool(is_winner)
+            expected = expected_score(side_rating[won], side_rating[not won])
+            updates.append({
+                "scope": scope, "entity_id": entity_id, "game_id": game_id,
+                "rating": ratings[entity_id] + _rating_config["k_factor"] * (won - expected),
+                "matches_rated": 1
+            })
+
+    if not updates:
+        return False
+
+    insert = postgresql_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    stmt = insert(Rating).values(updates)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["scope", "entity_id", "game_id"],
+        set_={"rating": stmt.excluded.rating, "matches_rated": Rating.matches_rated + 1}
+    )
+    db.execute(stmt)
+    db.add(RatedMatch(match_id=match_id, rated_at=datetime.utcnow()))
+    return True
+
+
+@cached("leaderboard")
+def get_rating_leaderboard(db: Session, game_id: int, scope: str = "player", limit: int = 10,
+                           min_matches: int = 1) -> List[Dict]:
+    """Get the highest rated players or teams of a game"""
+    if scope not in RATING_SCOPES:
+        raise ValueError(f"Unknown scope '{scope}', expected one of: {', '.join(RATING_SCOPES)}")
+
+    entity = Player if scope == "player" else Team
+    rank = func.rank().over(order_by=Rating.rating.desc())
+    rows = db.query(
+        Rating.entity_id, entity.name, Rating.rating, Rating.matches_rated, rank.label("rank")
+    ).outerjoin(
+        entity, entity.id == Rating.entity_id
+    ).filter(
+        Rating.scope == scope,
+        Rating.game_id == game_id,
+        Rating.matches_rated >= min_matches
+    ).order_by(
+        Rating.rating.desc(), Rating.entity_id
+    ).limit(limit).all()
+
+    return [
+        {
+            "rank": row.rank,
+            "id": row.entity_id,
+            "name": row.name,
+            "rating": round(row.rating, 1),
+            "matches_rated": row.matches_rated
+        }
+        for row in rows
+    ]
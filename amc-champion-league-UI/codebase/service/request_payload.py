@@ -82,7 +82,10 @@ class PlayerCreate(PlayerBase):
 
 class Player(PlayerBase):
     id: int
-    total_points: int
+    total_points: int = Field(description=(
+        "Points credited by the points ledger: the points earned in won matches only. "
+        "Differs from the leaderboards' total_points, which add up points_earned in every match."
+    ))
     
     model_config = ConfigDict(from_attributes=True)
 
@@ -112,6 +115,7 @@ class MatchCreate(MatchBase):
 
 class Match(MatchBase):
     id: int
+    scheduled_at: Optional[datetime] = None  # match_date + match_time, set by the server
     
     model_config = ConfigDict(from_attributes=True)
 
@@ -145,6 +149,63 @@ class MatchPlayer(MatchPlayerBase):
     
     model_config = ConfigDict(from_attributes=True)
 
+# Whole-match result submission
+class MatchResultPlayer(BaseModel):
+    player_id: int
+    team_id: Optional[int] = None  # Defaults to the existing row, else the match team the player is rostered on
+    franchise_id: Optional[int] = None  # Defaults to the existing row, else the player's franchise
+    points_earned: Optional[int] = None  # Defaults to the points the score earns the player, else 0
+    is_winner: Optional[bool] = None  # Defaults to whether the player's side is winner_id
+    extra_data: Optional[Dict[str, Any]] = None
+
+class MatchResultSubmit(BaseModel):
+    score: Optional[Dict[str, Any]] = None  # score_data in the game's GameScore shape; decides the result
+    score_summary: Optional[str] = None  # Defaults to the summary of score
+    winner_id: Optional[int] = None  # Winning franchise or team; must agree with score
+    status: Optional[str] = "completed"
+    players: List[MatchResultPlayer] = []
+    extra_data: Optional[Dict[str, Any]] = None  # Merged into the match's extra_data
+
+class ScoreEvaluation(BaseModel):
+    game_type: str
+    winner: Optional[str] = None  # home or away; None for a draw
+    draw: bool
+    summary: str
+    margin: Dict[str, int]  # e.g. {"sets": 1, "points": 7}, {"runs": 12} or {"wickets": 3, "balls": 4}
+    points: Dict[str, int]  # Points earned by each player of the home and the away side
+    score_data: Dict[str, Any]  # The score in the game's GameScore shape, sides as home and away
+
+class RescoreSummary(BaseModel):
+    matches_scored: int
+    matches_changed: List[int]  # Matches whose winner or score summary changed
+    points_changes: Dict[int, int]  # player_id -> change to total_points
+    errors: Dict[int, str]  # Matches whose stored score does not fit the rules; left unchanged
+
+class StandingDelta(BaseModel):
+    scope: str  # player, team or franchise
+    entity_id: int
+    game_id: int  # 0 for the overall standings
+    matches_played: int
+    matches_won: int
+    matches_lost: int
+    total_points: int
+
+class MatchResult(BaseModel):
+    match: Match
+    players: List[MatchPlayer]
+    standings_changes: List[StandingDelta]
+    points_changes: Dict[int, int]  # player_id -> change to total_points
+
+class SummaryJob(BaseModel):
+    id: str
+    match_id: int
+    status: str  # pending, running, retrying, deferred, succeeded or failed
+    attempts: int
+    error: Optional[str] = None  # Last failure
+    summary: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
 class GalleryBase(BaseModel):
     title: Optional[str] = None
     description: Optional[str] = None
@@ -163,13 +224,18 @@ class Gallery(GalleryBase):
 # Additional schemas for specific responses
 
 class PlayerLeaderboardEntry(BaseModel):
+    rank: Optional[int] = None  # Competition rank, ties share the same rank
     id: int
     name: str
     franchise_id: Optional[int] = None
     franchise_name: Optional[str] = None
-    total_points: int
+    total_points: int = Field(description=(
+        "Sum of points_earned over every match played, won or not (the standings). Differs from "
+        "Player.total_points, which only credits the points earned in wins."
+    ))
     matches_played: int
     matches_won: int
+    matches_lost: Optional[int] = None
     
     model_config = ConfigDict(from_attributes=True)
 
@@ -183,6 +249,8 @@ class FranchiseLeaderboardEntry(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 class TeamLeaderboardEntry(BaseModel):
+    rank: Optional[int] = None  # RANK() over the tie-breakers, ties share a rank
+    dense_rank: Optional[int] = None  # DENSE_RANK() over the tie-breakers
     id: int
     name: str
     franchise_id: int
@@ -200,6 +268,42 @@ class Leaderboard(BaseModel):
     franchise_leaderboard: List[FranchiseLeaderboardEntry]
     team_leaderboard: Optional[List[TeamLeaderboardEntry]] = None
 
+class LeaderboardMover(BaseModel):
+    id: int
+    name: Optional[str] = None
+    rank: int
+    previous_rank: Optional[int] = None  # None when the entry was not on the board before
+    movement: Optional[int] = None  # Positive when the entry climbed
+    total_points: int
+    points_gained: int
+
+class StatLeader(BaseModel):
+    rank: int
+    player_id: int
+    player_name: str
+    franchise_id: Optional[int] = None
+    franchise_name: Optional[str] = None
+    matches: int  # Matches that recorded the stat
+    total: int
+    best: int  # Highest value in a single match
+
+class StatRecord(BaseModel):
+    rank: int
+    match_id: int
+    player_id: int
+    player_name: str
+    game_id: int
+    match_date: Optional[str] = None
+    value: int
+
+class StandingSnapshot(BaseModel):
+    id: int
+    taken_at: datetime
+    reason: str
+    last_change_id: int
+    
+    model_config = ConfigDict(from_attributes=True)
+
 # Fixture schema for match display
 class FixtureDetail(BaseModel):
     id: int
@@ -217,6 +321,7 @@ class FixtureDetail(BaseModel):
     away_team: Optional[Dict[str, Any]] = None  # Make this optional
     match_date: Optional[str] = None  # Date in YYYY-MM-DD format
     match_time: Optional[str] = None  # Time in HH:MM format
+    scheduled_at: Optional[datetime] = None
     status: Optional[str] = "scheduled"
     location: Optional[str] = None
     score_summary: Optional[str] = None
@@ -225,6 +330,64 @@ class FixtureDetail(BaseModel):
     round: Optional[str] = None  # Tournament round
     extra_data: Optional[Dict[str, Any]] = None
 
+# Tournament generation schemas
+class TournamentCreate(BaseModel):
+    name: str
+    game_id: int
+    format: str = "round_robin"  # round_robin or knockout
+    entry_type: str = "team"  # team or franchise
+    entry_ids: List[int]  # In seed order, best seed first
+    groups: int = 1  # Round-robin groups, filled by snake seeding
+    double_round: bool = False  # Round robin: also play the return legs
+    start_date: Optional[str] = None  # YYYY-MM-DD of the first round
+    match_time: Optional[str] = None  # HH:MM the first match of each round starts
+    days_between_rounds: int = 1
+    location: Optional[str] = None  # A single venue: its matches are played one game length apart
+    check_conflicts: bool = True  # Reject schedules that overlap a venue, team or player
+
+class TournamentRound(BaseModel):
+    round: str
+    match_date: Optional[str] = None
+    matches: int
+
+class ScheduleConflict(BaseModel):
+    type: str  # location, team or player
+    key: Union[str, int]  # Venue name, team id or player id
+    match_id: Optional[int] = None
+    other_match_id: Optional[int] = None
+    overlap_start: datetime
+    overlap_end: datetime
+
+class TournamentSummary(BaseModel):
+    name: str
+    game_id: int
+    format: str
+    matches_created: int
+    rounds: List[TournamentRound]
+    match_ids: List[int]
+
+# Live scoring schemas
+class LiveScoreEventCreate(BaseModel):
+    type: Optional[str] = None  # point, ball or undo; defaults to point, or ball for innings games
+    side: Optional[str] = None  # home or away: who won the point, or (optionally) who is batting
+    points: int = 1  # Points won on a rally (more than one for carom shots)
+    runs: int = 0  # Runs off a ball
+    extra: Optional[str] = None  # Ball only: wide, no_ball, bye or leg_bye
+    wicket: bool = False  # Ball only
+
+class LiveScoreEventBatch(BaseModel):
+    events: List[LiveScoreEventCreate] = Field(..., min_length=1, max_length=500)
+
+class LiveScore(BaseModel):
+    match_id: int
+    game_id: int
+    game_type: str
+    seq: int  # Number of events logged, undos included
+    finished: bool
+    winner: Optional[str] = None  # home or away once decided
+    summary: str
+    score_data: Dict[str, Any]  # In the game's GameScore shape
+
 # Game Score Schemas - Flexible structure to handle various game types
 
 class BadmintonScore(BaseModel):
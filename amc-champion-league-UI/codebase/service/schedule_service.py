@@ -0,0 +1,105 @@
+from datetime import datetime
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import inspect, text, update
+from sqlalchemy.orm import Session
+
+from codebase.model.request_model import Match
+from codebase.utils.config_manager import config
+from codebase.utils.extracted_fields import create_available_indexes
+
+# Accepted match_date / match_time spellings, most common first
+_DATE_FORMATS = ("%Y-%m-%d", "%Y/%m/%d", "%d-%m-%Y", "%d/%m/%Y")
+_TIME_FORMATS = ("%H:%M", "%H:%M:%S", "%I:%M %p", "%I:%M%p")
+
+# Rows backfilled per UPDATE batch
+_BACKFILL_BATCH = 1000
+
+# Zone of the league's wall clock, which match_date, match_time and scheduled_at are in
+LEAGUE_TIMEZONE = ZoneInfo(config.get_scheduling_config()["timezone"])
+
+
+def league_time(moment: datetime) -> datetime:
+    """Convert an aware datetime to naive league-local time; naive values are league-local already"""
+    if moment.tzinfo is not None:
+        return moment.astimezone(LEAGUE_TIMEZONE).replace(tzinfo=None)
+    return moment
+
+
+def parse_schedule(match_date: Optional[str], match_time: Optional[str] = None) -> Optional[datetime]:
+    """
+    Turn the free-form match_date and match_time strings into the scheduled_at timestamp.
+
+    Dates are YYYY-MM-DD (or a full ISO timestamp, as stored for matches created without
+    a date); times are HH:MM. A missing or unreadable time means midnight, an unreadable
+    date means no timestamp. Values are league-local wall-clock times without a timezone.
+    """
+    if not match_date:
+        return None
+    match_date = str(match_date).strip()
+
+    scheduled = None
+    try:
+        scheduled = league_time(datetime.fromisoformat(match_date))
+    except ValueError:
+        for date_format in _DATE_FORMATS:
+            try:
+                scheduled = datetime.strptime(match_date, date_format)
+                break
+            except ValueError:
+                continue
+    if scheduled is None:
+        return None
+
+    if match_time:
+        for time_format in _TIME_FORMATS:
+            try:
+                moment = datetime.strptime(match_time.strip().upper(), time_format)
+            except ValueError:
+                continue
+            return scheduled.replace(hour=moment.hour, minute=moment.minute, second=moment.second, microsecond=0)
+    return scheduled
+
+
+def sync_scheduled_at(match: Match) -> None:
+    """Recompute a match's scheduled_at after its match_date or match_time changed"""
+    match.scheduled_at = parse_schedule(match.match_date, match.match_time)
+
+
+def backfill_scheduled_at(db: Session) -> int:
+    """Fill scheduled_at for every dated match that lacks it; returns the number of rows set"""
+    rows = db.query(Match.id, Match.match_date, Match.match_time).filter(
+        Match.scheduled_at.is_(None), Match.match_date.isnot(None)
+    ).all()
+
+    values = []
+    for match_id, match_date, match_time in rows:
+        scheduled_at = parse_schedule(match_date, match_time)
+        if scheduled_at is not None:
+            values.append({"id": match_id, "scheduled_at": scheduled_at})
+
+    # ORM bulk UPDATE by primary key, one executemany per batch
+    for start in range(0, len(values), _BACKFILL_BATCH):
+        db.execute(update(Match), values[start:start + _BACKFILL_BATCH])
+    db.commit()
+    return len(values)
+
+
+def ensure_scheduled_at(db: Session) -> int:
+    """
+    Migrate databases that predate the scheduled_at column.
+
+    Adds the column and its indexes when missing (create_all does not alter existing
+    tables), then backfills it from match_date and match_time. Safe to run repeatedly.
+    """
+    bind = db.get_bind()
+    columns = {column["name"] for column in inspect(bind).get_columns(Match.__tablename__)}
+    if "scheduled_at" not in columns:
+        column_type = Match.__table__.c.scheduled_at.type.compile(dialect=bind.dialect)
+        db.execute(text(f'ALTER TABLE "{Match.__tablename__}" ADD COLUMN scheduled_at {column_type}'))
+        db.commit()
+
+    create_available_indexes(db, Match.__table__)
+
+    return backfill_scheduled_at(db)
@@ -0,0 +1,604 @@
+import re
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import case, false, func, literal, update
+from sqlalchemy.orm import Session
+
+from codebase.model.request_model import Game, Match, MatchPlayer
+from codebase.service.conflict_service import conflict_index
+from codebase.service.points_service import record_points_many
+from codebase.service.rating_service import recompute_ratings
+from codebase.service.standings_service import apply_contributions, collect_contributions
+from codebase.utils.cache import invalidate_game
+from codebase.utils.config_manager import config
+from codebase.utils.events import match_topics, queue_event
+
+_scoring_config = config.get_scoring_config()
+
+SIDES = ("home", "away")
+
+# Side names found in older score payloads
+_SIDE_ALIASES = {"home": "home", "away": "away", "player1": "home", "player2": "away", "team1": "home", "team2": "away"}
+
+# Rally-scored games: points go to the open set (frame, round) until a side reaches the
+# target with the required lead, or the cap; the first side to win to_win units wins.
+# exact units end on the deciding point; carom shots can score several points at once
+RALLY_RULES = {
+    "badminton": {"unit": "sets", "target": 21, "win_by": 2, "cap": 30, "to_win": 2, "exact": 1},
+    "table_tennis": {"unit": "sets", "target": 11, "win_by": 2, "cap": 0, "to_win": 3, "exact": 1},
+    "pickleball": {"unit": "sets", "target": 11, "win_by": 2, "cap": 0, "to_win": 2, "exact": 1},
+    "pool": {"unit": "frames", "target": 1, "win_by": 1, "cap": 0, "to_win": 3, "exact": 1},
+    "carom": {"unit": "rounds", "target": 25, "win_by": 1, "cap": 0, "to_win": 2, "exact": 0}
+}
+
+# Ball-by-ball games: each side bats one innings of up to `overs` overs or `wickets` wickets
+INNINGS_RULES = {
+    "box_cricket": {"overs": 6, "wickets": 5, "balls_per_over": 6}
+}
+
+# Goal games: first to goals_to_win, or the side ahead when time runs out
+GOAL_RULES = {
+    "foosball": {"goals_to_win": 10}
+}
+
+# Games decided by a stated result
+RESULT_RULES = {
+    "chess": {}
+}
+
+_GAME_TYPE_ALIASES = {"pickle_ball": "pickleball", "tabletennis": "table_tennis", "cricket": "box_cricket"}
+
+_DECISIVE_RESULTS = ("win", "checkmate", "resignation", "timeout", "forfeit")
+_DRAWN_RESULTS = ("draw", "stalemate", "agreement", "repetition")
+
+
+def _best_of(count: int) -> int:
+    return count // 2 + 1
+
+
+# Rules a game declares in its extra_data: key -> (rule, conversion)
+_DECLARED_RULES = {
+    "points_per_set": ("target", int),
+    "points_to_win": ("target", int),
+    "sets": ("to_win", _best_of),
+    "frames_per_match": ("to_win", _best_of),
+    "rounds_per_match": ("to_win", _best_of),
+    "overs_per_side": ("overs", int),
+    "players_per_team": ("wickets", lambda players: max(1, players - 1)),
+    "goals_to_win": ("goals_to_win", int)
+}
+
+
+def _is_count(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def game_type(name: str, extra_data: Optional[Dict[str, Any]] = None) -> str:
+    """The GameScore game_type of a game: extra_data["game_type"], else its name in snake case"""
+    declared = (extra_data or {}).get("game_type")
+    normalized = re.sub(r"[^a-z0-9]+", "_", str(declared or name).lower()).strip("_")
+    return _GAME_TYPE_ALIASES.get(normalized, normalized)
+
+
+def override_rules(rules: Dict[str, Any], overrides: Any) -> None:
+    """Apply {rule: value} overrides to known rules in place; other keys and bad values are ignored"""
+    if not isinstance(overrides, dict):
+        return
+    for key, value in overrides.items():
+        if key in rules and key != "unit" and _is_count(value) and value >= 0:
+            rules[key] = value
+
+
+def game_rules(name: str, extra_data: Optional[Dict[str, Any]] = None,
+               winning_points: Optional[int] = None) -> Tuple[str, Dict[str, Any]]:
+    """
+    A game's type and scoring rules.
+
+    The defaults of the game type are adjusted by the rules the game declares in
+    extra_data (points_per_set, points_to_win, sets, frames_per_match, rounds_per_match,
+    overs_per_side, players_per_team, goals_to_win), then by extra_data["scoring_rules"],
+    e.g. {"cap": 0, "draw_points": 5}. Each winning player earns winning_points (else
+    [scoring] default_win_points). Raises ValueError for games without scoring rules.
+    """
+    kind = game_type(name, extra_data)
+    defaults = next((table[kind] for table in (RALLY_RULES, INNINGS_RULES, GOAL_RULES, RESULT_RULES)
+                     if kind in table), None)
+    if defaults is None:
+        raise ValueError(f"There are no scoring rules for {name}")
+
+    rules = dict(
+        defaults,
+        win_points=winning_points if winning_points is not None else _scoring_config["default_win_points"],
+        draw_points=_scoring_config["draw_points"],
+        loss_points=_scoring_config["loss_points"]
+    )
+    extra_data = extra_data or {}
+    for key, (rule, convert) in _DECLARED_RULES.items():
+        value = extra_data.get(key)
+        if rule in rules and _is_count(value) and value > 0:
+            rules[rule] = convert(value)
+    override_rules(rules, extra_data.get("scoring_rules"))
+    return kind, rules
+
+
+def _pair(entry: Any, what: str) -> Tuple[int, int]:
+    """The (home, away) counts of a {"home": n, "away": m} object (player1/player2 and team1/team2 also work)"""
+    if not isinstance(entry, dict):
+        raise ValueError(f"{what} must be an object with a home and an away score")
+    values = {}
+    for key, value in entry.items():
+        side = _SIDE_ALIASES.get(key)
+        if side is None:
+            continue
+        if not _is_count(value) or value < 0:
+            raise ValueError(f"{what}: {key} must be a whole number of zero or more")
+        values[side] = value
+    if len(values) != 2:
+        raise ValueError(f"{what} must have a home and an away score")
+    return values["home"], values["away"]
+
+
+def _outcome(kind: str, rules: Dict[str, Any], winner: Optional[str], summary: str,
+             margin: Dict[str, int], score_data: Dict[str, Any]) -> Dict[str, Any]:
+    if winner is None:
+        points = {side: rules["draw_points"] for side in SIDES}
+    else:
+        points = {side: rules["win_points"] if side == winner else rules["loss_points"] for side in SIDES}
+    return {
+        "game_type": kind,
+        "winner": winner,
+        "draw": winner is None,
+        "summary": summary,
+        "margin": margin,
+        "points": points,
+        "score_data": score_data
+    }
+
+
+def _evaluate_rally(entries: Sequence[Tuple[str, Dict[str, Any], Any]]) -> List[Any]:
+    """Sets, frames or rounds of many matches, checked and counted in one pass over all units"""
+    count = len(entries)
+    results: List[Any] = [None] * count
+    parsed: List[List[Tuple[int, int]]] = [[] for _ in range(count)]
+    rule_table = np.zeros((count, 5), dtype=np.int64)
+    declared = np.full((count, 2), -1, dtype=np.int64)
+    unit_match: List[int] = []
+    unit_scores: List[Tuple[int, int]] = []
+    for index, (kind, rules, score_data) in enumerate(entries):
+        unit = rules["unit"]
+        try:
+            units = score_data.get(unit) if isinstance(score_data, dict) else None
+            if not isinstance(units, list) or not units:
+                raise ValueError(f"The score needs a list of {unit}")
+            pairs = [_pair(entry, f"{unit[:-1]} {number}") for number, entry in enumerate(units, 1)]
+            if isinstance(score_data.get("final_result"), dict):
+                declared[index] = _pair(score_data["final_result"], "final_result")
+        except ValueError as e:
+            results[index] = e
+            continue
+        parsed[index] = pairs
+        unit_match.extend([index] * len(pairs))
+        unit_scores.extend(pairs)
+        rule_table[index] = (rules["target"], rules["win_by"], rules["cap"], rules["to_win"], rules.get("exact", 1))
+    if not unit_scores:
+        return results
+
+    match_index = np.asarray(unit_match, dtype=np.int64)
+    scores = np.asarray(unit_scores, dtype=np.int64)
+    home, away = scores[:, 0], scores[:, 1]
+    target, win_by, cap, to_win, exact = rule_table[match_index].T
+
+    def closed(high, low):
+        return (high > low) & (((high >= target) & (high - low >= win_by)) | ((cap > 0) & (high >= cap)))
+
+    high, low = np.maximum(home, away), np.minimum(home, away)
+    # An exact unit ends on its deciding point: one point earlier it was still open
+    finished = closed(high, low) & ~((exact > 0) & closed(high - 1, low))
+    home_won = finished & (home > away)
+    away_won = finished & (away > home)
+
+    # Units each side had won before this one, within its match (a match's units are contiguous)
+    position = np.arange(len(match_index))
+    first = np.maximum.accumulate(np.where(np.r_[True, match_index[1:] != match_index[:-1]], position, 0))
+    home_before = np.cumsum(home_won) - home_won
+    away_before = np.cumsum(away_won) - away_won
+    home_before = home_before - home_before[first]
+    away_before = away_before - away_before[first]
+    after_decision = (home_before >= to_win) | (away_before >= to_win)
+
+    won = np.stack([np.bincount(match_index, weights=home_won, minlength=count),
+                    np.bincount(match_index, weights=away_won, minlength=count)], axis=1).astype(np.int64)
+    points = np.stack([np.bincount(match_index, weights=home, minlength=count),
+                       np.bincount(match_index, weights=away, minlength=count)], axis=1).astype(np.int64)
+    decided = won.max(axis=1) >= rule_table[:, 3]
+    mismatch = (declared[:, 0] >= 0) & np.any(declared != won, axis=1)
+
+    bad_units = np.flatnonzero(~finished | after_decision)
+    bad_matches, first_bad = np.unique(match_index[bad_units], return_index=True)
+    first_bad_unit = dict(zip(bad_matches.tolist(), bad_units[first_bad].tolist()))
+
+    for index, (kind, rules, _) in enumerate(entries):
+        if results[index] is not None:
+            continue
+        unit = rules["unit"]
+        if index in first_bad_unit:
+            bad = first_bad_unit[index]
+            number = bad - int(first[bad]) + 1
+            if after_decision[bad]:
+                results[index] = ValueError(f"{unit[:-1]} {number} was played after the match was decided")
+            else:
+                home_score, away_score = unit_scores[bad]
+                cap_rule = f", capped at {rules['cap']}" if rules["cap"] else ""
+                results[index] = ValueError(
+                    f"{unit[:-1]} {number} ({home_score}-{away_score}) is not a finished {unit[:-1]} "
+                    f"(first to {rules['target']} by {rules['win_by']}{cap_rule})"
+                )
+            continue
+        if not decided[index]:
+            results[index] = ValueError(f"Neither side has won {rules['to_win']} {unit}")
+            continue
+        if mismatch[index]:
+            results[index] = ValueError(f"final_result does not match the {unit}")
+            continue
+
+        won_home, won_away = won[index].tolist()
+        pairs = parsed[index]
+        summary = f"{won_home}-{won_away}" if rules["target"] == 1 else ", ".join(f"{h}-{a}" for h, a in pairs)
+        margin = {unit: abs(won_home - won_away), "points": abs(int(points[index, 0] - points[index, 1]))}
+        score_data = {
+            unit: [{"home": h, "away": a} for h, a in pairs],
+            "final_result": {"home": won_home, "away": won_away}
+        }
+        results[index] = _outcome(kind, rules, "home" if won_home > won_away else "away", summary, margin, score_data)
+    return results
+
+
+def _balls(value: Any, balls_per_over: int, what: str) -> int:
+    """Balls bowled from an overs figure such as 4.3 or "4.3" (four overs and three balls)"""
+    whole, _, part = str(value).partition(".")
+    if not whole.isdigit() or (part and not part.isdigit()) or int(part or 0) >= balls_per_over:
+        raise ValueError(f"{what}: overs must look like 4.3 (overs.balls)")
+    return int(whole) * balls_per_over + int(part or 0)
+
+
+def _innings(entry: Any, number: int, balls_per_over: int) -> Dict[str, Any]:
+    what = f"innings {number}"
+    if not isinstance(entry, dict):
+        raise ValueError(f"{what} must be an object")
+    batting = _SIDE_ALIASES.get(entry.get("batting"))
+    if batting is None:
+        raise ValueError(f"{what} needs the batting side (home or away)")
+    innings = {"batting": batting}
+    for key, default in (("runs", None), ("wickets", 0), ("extras", 0)):
+        value = entry.get(key, default)
+        if not _is_count(value) or value < 0:
+            raise ValueError(f"{what}: {key} must be a whole number of zero or more")
+        innings[key] = value
+    if "balls" in entry:
+        if not _is_count(entry["balls"]) or entry["balls"] < 0:
+            raise ValueError(f"{what}: balls must be a whole number of zero or more")
+        innings["balls"] = entry["balls"]
+    elif "overs" in entry:
+        innings["balls"] = _balls(entry["overs"], balls_per_over, what)
+    else:
+        raise ValueError(f"{what} needs balls or overs")
+    return innings
+
+
+def _evaluate_innings(entries: Sequence[Tuple[str, Dict[str, Any], Any]]) -> List[Any]:
+    """Two-innings scores of many matches, checked and decided with array operations"""
+    count = len(entries)
+    results: List[Any] = [None] * count
+    parsed: List[List[Dict[str, Any]]] = [[] for _ in range(count)]
+    table = np.zeros((count, 8), dtype=np.int64)  # runs, wickets, balls of both innings; wickets, balls allowed
+    for index, (kind, rules, score_data) in enumerate(entries):
+        try:
+            innings = score_data.get("innings") if isinstance(score_data, dict) else None
+            if not isinstance(innings, list) or len(innings) != 2:
+                raise ValueError("The score needs both innings")
+            first, second = (_innings(entry, number, rules["balls_per_over"]) for number, entry in enumerate(innings, 1))
+            if first["batting"] == second["batting"]:
+                raise ValueError(f"{first['batting']} cannot bat both innings")
+        except ValueError as e:
+            results[index] = e
+            continue
+        parsed[index] = [first, second]
+        table[index] = (first["runs"], first["wickets"], first["balls"], second["runs"], second["wickets"],
+                        second["balls"], rules["wickets"], rules["overs"] * rules["balls_per_over"])
+
+    first_runs, first_wickets, first_balls, second_runs, second_wickets, second_balls, wickets, balls = table.T
+    too_long = ((first_wickets > wickets) | (first_balls > balls)) | ((second_wickets > wickets) | (second_balls > balls))
+    first_open = (first_wickets < wickets) & (first_balls < balls)
+    second_open = (second_runs <= first_runs) & (second_wickets < wickets) & (second_balls < balls)
+    lead = np.sign(first_runs - second_runs)
+
+    for index, (kind, rules, score_data) in enumerate(entries):
+        if results[index] is not None:
+            continue
+        if too_long[index]:
+            results[index] = ValueError(
+                f"An innings is longer than {rules['overs']} overs or {rules['wickets']} wickets"
+            )
+            continue
+        if first_open[index] or second_open[index]:
+            results[index] = ValueError(f"The {'first' if first_open[index] else 'second'} innings is not over")
+            continue
+
+        first, second = parsed[index]
+        winner = {1: first["batting"], -1: second["batting"], 0: None}[int(lead[index])]
+        declared = score_data.get("final_result")
+        if isinstance(declared, dict) and "winner" in declared:
+            if (_SIDE_ALIASES.get(declared["winner"]) if declared["winner"] != "tie" else None) != winner:
+                results[index] = ValueError("final_result does not match the innings")
+                continue
+
+        if winner == first["batting"]:
+            margin = {"runs": first["runs"] - second["runs"]}
+        elif winner is not None:
+            margin = {"wickets": rules["wickets"] - second["wickets"], "balls": int(balls[index]) - second["balls"]}
+        else:
+            margin = {}
+        per_over = rules["balls_per_over"]
+        innings = [dict(entry, overs=f"{entry['balls'] // per_over}.{entry['balls'] % per_over}") for entry in parsed[index]]
+        innings[1]["target"] = first["runs"] + 1
+        summary = ", ".join(f"{entry['batting']} {entry['runs']}/{entry['wickets']} ({entry['overs']})" for entry in innings)
+        final_result = {entry["batting"]: entry["runs"] for entry in innings}
+        final_result["winner"] = winner or "tie"
+        results[index] = _outcome(kind, rules, winner, summary, margin, {"innings": innings, "final_result": final_result})
+    return results
+
+
+def _evaluate_goals(entries: Sequence[Tuple[str, Dict[str, Any], Any]]) -> List[Any]:
+    """Goal counts of many matches, checked and decided with array operations"""
+    count = len(entries)
+    results: List[Any] = [None] * count
+    table = np.zeros((count, 3), dtype=np.int64)  # home goals, away goals, goals to win
+    for index, (kind, rules, score_data) in enumerate(entries):
+        try:
+            goals = _pair(score_data.get("goals") if isinstance(score_data, dict) else None, "goals")
+            declared = score_data.get("final_result")
+            if isinstance(declared, str) and declared.replace(" ", "") != f"{goals[0]}-{goals[1]}":
+                raise ValueError("final_result does not match the goals")
+        except ValueError as e:
+            results[index] = e
+            continue
+        table[index] = (goals[0], goals[1], rules["goals_to_win"])
+
+    home, away, goals_to_win = table.T
+    invalid = (home > goals_to_win) | (away > goals_to_win) | ((home == goals_to_win) & (away == goals_to_win))
+    lead = np.sign(home - away)
+
+    for index, (kind, rules, _) in enumerate(entries):
+        if results[index] is not None:
+            continue
+        if invalid[index]:
+            results[index] = ValueError(f"The game ends when a side reaches {rules['goals_to_win']} goals")
+            continue
+        home_goals, away_goals = int(home[index]), int(away[index])
+        winner = {1: "home", -1: "away", 0: None}[int(lead[index])]
+        score_data = {
+            "goals": {"home": home_goals, "away": away_goals},
+            "final_result": {"winner": winner or "draw", "score": f"{home_goals}-{away_goals}"}
+        }
+        results[index] = _outcome(kind, rules, winner, f"{home_goals}-{away_goals}",
+                                  {"goals": abs(home_goals - away_goals)}, score_data)
+    return results
+
+
+def _evaluate_results(entries: Sequence[Tuple[str, Dict[str, Any], Any]]) -> List[Any]:
+    """Stated results (chess): a decisive result names the winner, a drawn one does not"""
+    results: List[Any] = []
+    for kind, rules, score_data in entries:
+        score_data = score_data if isinstance(score_data, dict) else {}
+        result = str(score_data.get("result") or "").lower()
+        winner = _SIDE_ALIASES.get(score_data.get("winner"))
+        moves = score_data.get("moves")
+        if result in _DRAWN_RESULTS:
+            winner = None
+        elif result not in _DECISIVE_RESULTS:
+            results.append(ValueError(
+                f"Unknown result '{result}'; expected one of: {', '.join(_DECISIVE_RESULTS + _DRAWN_RESULTS)}"
+            ))
+            continue
+        elif winner is None:
+            results.append(ValueError(f"A {result} needs the winner (home or away)"))
+            continue
+        if moves is not None and (not _is_count(moves) or moves < 0):
+            results.append(ValueError("moves must be a whole number of zero or more"))
+            continue
+        summary = {"home": "1-0", "away": "0-1", None: "1/2-1/2"}[winner]
+        results.append(_outcome(kind, rules, winner, summary, {},
+                                {"result": result, "winner": winner, "moves": moves}))
+    return results
+
+
+_EVALUATORS = (
+    (RALLY_RULES, _evaluate_rally),
+    (INNINGS_RULES, _evaluate_innings),
+    (GOAL_RULES, _evaluate_goals),
+    (RESULT_RULES, _evaluate_results)
+)
+
+
+def evaluate_scores(entries: Sequence[Tuple[str, Dict[str, Any], Any]]) -> List[Any]:
+    """
+    Check and decide many (game_type, rules, score_data) entries at once.
+
+    Entries are grouped by kind of game and each group is checked and counted with a few
+    NumPy operations over all of its sets, innings or goals; Python only unpacks the
+    payloads and formats the outcomes. Returns, in order, each entry's outcome (winner,
+    draw, summary, margin, points per player of each side and the normalized score_data)
+    or the ValueError explaining why its score does not fit its rules.
+    """
+    results: List[Any] = [None] * len(entries)
+    for table, evaluate in _EVALUATORS:
+        positions = [position for position, entry in enumerate(entries) if entry[0] in table]
+        if positions:
+            for position, result in zip(positions, evaluate([entries[position] for position in positions])):
+                results[position] = result
+    for position, (kind, _, _) in enumerate(entries):
+        if results[position] is None:
+            results[position] = ValueError(f"There are no scoring rules for {kind}")
+    return results
+
+
+def evaluate_score(kind: str, rules: Dict[str, Any], score_data: Any) -> Dict[str, Any]:
+    """The outcome of one score; raises ValueError if it does not fit the rules"""
+    result = evaluate_scores([(kind, rules, score_data)])[0]
+    if isinstance(result, ValueError):
+        raise result
+    return result
+
+
+def evaluate_game_score(db: Session, game_id: int, score_data: Any) -> Optional[Dict[str, Any]]:
+    """The outcome of a score under a game's rules, or None if the game does not exist"""
+    game = db.query(Game.name, Game.winning_points, Game.extra_data).filter(Game.id == game_id).first()
+    if game is None:
+        return None
+    return evaluate_score(*game_rules(game.name, game.extra_data, game.winning_points), score_data)
+
+
+def match_sides(match) -> Dict[str, Optional[int]]:
+    """Each side's id: the teams of a team match, else the franchises"""
+    if match.home_team_id or match.away_team_id:
+        return {"home": match.home_team_id, "away": match.away_team_id}
+    return {"home": match.home_franchise_id, "away": match.away_franchise_id}
+
+
+def winner_id(match, outcome: Dict[str, Any]) -> Optional[int]:
+    """The id of the side that won a match's outcome, or None for a draw"""
+    return match_sides(match)[outcome["winner"]] if outcome["winner"] else None
+
+
+def result_points(outcome: Dict[str, Any], is_winner: bool) -> int:
+    """Points earned by a player on the winning side (is_winner) or on any other side"""
+    winner = outcome["winner"]
+    if winner is None:
+        return outcome["points"]["home"]
+    return outcome["points"][winner if is_winner else ("away" if winner == "home" else "home")]
+
+
+def score_record(outcome: Dict[str, Any]) -> Dict[str, Any]:
+    """What a match keeps of its outcome in extra_data["score"]"""
+    return {key: outcome[key] for key in ("game_type", "score_data", "winner", "margin")}
+
+
+def stored_score(extra_data: Any) -> Optional[Dict[str, Any]]:
+    """The score a match was decided by: extra_data["score"], else its finished live score"""
+    if not isinstance(extra_data, dict):
+        return None
+    for key in ("score", "live_score"):
+        entry = extra_data.get(key)
+        if isinstance(entry, dict) and isinstance(entry.get("score_data"), dict):
+            if key == "score" or entry.get("finished"):
+                return entry["score_data"]
+    return None
+
+
+def rescore_matches(db: Session, game_id: Optional[int] = None, match_date: Optional[str] = None,
+                    match_ids: Optional[List[int]] = None, dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Re-score completed matches from their stored scores under their games' current rules.
+
+    All scores go through one evaluate_scores() call. Matches and then their players
+    (is_winner, points_earned) are updated with set-based statements, rescore_batch
+    matches at a time, and the standings and points ledger move by the differences.
+    Ratings are recomputed if a winner changed. Matches without a stored score are
+    skipped; those whose score no longer fits the rules are reported in errors and left
+    unchanged. With dry_run nothing is written.
+    """
+    query = db.query(
+        Match.id, Match.game_id, Match.home_team_id, Match.away_team_id, Match.home_franchise_id,
+        Match.away_franchise_id, Match.winner_id, Match.score_summary, Match.extra_data
+    ).filter(Match.status == "completed")
+    if game_id is not None:
+        query = query.filter(Match.game_id == game_id)
+    if match_date is not None:
+        query = query.filter(Match.match_date == match_date)
+    if match_ids is not None:
+        query = query.filter(Match.id.in_(match_ids))
+    matches = [(match, stored_score(match.extra_data)) for match in query.order_by(Match.id)]
+    matches = [(match, score) for match, score in matches if score is not None]
+
+    rules, errors = {}, {}
+    games = db.query(Game.id, Game.name, Game.winning_points, Game.extra_data).filter(
+        Game.id.in_({match.game_id for match, _ in matches})
+    ).all() if matches else []
+    for game in games:
+        try:
+            rules[game.id] = game_rules(game.name, game.extra_data, game.winning_points)
+        except ValueError as e:
+            rules[game.id] = e
+    for match, _ in matches:
+        if isinstance(rules[match.game_id], ValueError):
+            errors[match.id] = str(rules[match.game_id])
+    matches = [(match, score) for match, score in matches if match.id not in errors]
+    outcomes = evaluate_scores([(*rules[match.game_id], score) for match, score in matches])
+
+    scored = []
+    for (match, _), outcome in zip(matches, outcomes):
+        if isinstance(outcome, ValueError):
+            errors[match.id] = str(outcome)
+        else:
+            scored.append((match, outcome, winner_id(match, outcome)))
+    changed = [(match, outcome, winner) for match, outcome, winner in scored
+               if winner != match.winner_id or outcome["summary"] != match.score_summary]
+    summary = {
+        "matches_scored": len(scored),
+        "matches_changed": [match.id for match, _, _ in changed],
+        "points_changes": {},
+        "errors": errors
+    }
+    if dry_run or not scored:
+        return summary
+
+    points_changes = defaultdict(int)
+    batch = max(1, _scoring_config["rescore_batch"])
+    for start in range(0, len(scored), batch):
+        chunk = scored[start:start + batch]
+        ids = [match.id for match, _, _ in chunk]
+        before = collect_contributions(db, match_ids=ids)
+
+        db.execute(update(Match), [
+            {"id": match.id, "winner_id": winner, "score_summary": outcome["summary"],
+             "extra_data": dict(match.extra_data, score=score_record(outcome))}
+            for match, outcome, winner in chunk
+        ])
+        winners = {match.id: winner for match, _, winner in chunk if winner is not None}
+        team_matches = [match.id for match, _, _ in chunk if match.home_team_id or match.away_team_id]
+        side = case((MatchPlayer.match_id.in_(team_matches), MatchPlayer.team_id), else_=MatchPlayer.franchise_id)
+        won = func.coalesce(side == case(winners, value=MatchPlayer.match_id), false()) if winners else false()
+        db.execute(
+            update(MatchPlayer).where(MatchPlayer.match_id.in_(ids)).values(
+                is_winner=won,
+                points_earned=case(
+                    (won, case({match.id: result_points(outcome, True) for match, outcome, _ in chunk},
+                               value=MatchPlayer.match_id)),
+                    else_=case({match.id: result_points(outcome, False) for match, outcome, _ in chunk},
+                               value=MatchPlayer.match_id, else_=literal(0))
+                )
+            ).execution_options(synchronize_session=False)
+        )
+
+        after = collect_contributions(db, match_ids=ids)
+        apply_contributions(db, [(contribution, -1) for contribution in before] + [(contribution, 1) for contribution in after])
+        players = db.query(
+            MatchPlayer.id, MatchPlayer.match_id, MatchPlayer.player_id, MatchPlayer.is_winner, MatchPlayer.points_earned
+        ).filter(MatchPlayer.match_id.in_(ids)).all()
+        for player_id, delta in record_points_many(db, players).items():
+            points_changes[player_id] += delta
+
+    for match, outcome, winner in changed:
+        queue_event(db, match_topics(match.id, match.game_id), "match",
+                    {"id": match.id, "winner_id": winner, "score_summary": outcome["summary"]})
+    db.commit()
+    db.expire_all()
+    invalidate_game(*{match.game_id for match, _, _ in scored})
+    conflict_index.refresh(db, [match.id for match, _, _ in scored])
+    if any(winner != match.winner_id for match, _, winner in changed):
+        recompute_ratings(db)
+
+    summary["points_changes"] = {player_id: delta for player_id, delta in points_changes.items() if delta}
+    return summary
@@ -0,0 +1,304 @@
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import func, case, insert, literal, select, union_all
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from codebase.model.request_model import (
+    Match, MatchPlayer, Player, Standing, StandingChange, StandingSnapshot, StandingSnapshotEntry
+)
+from codebase.utils.cache import invalidate_namespace
+from codebase.utils.config_manager import config
+from codebase.utils.events import LEADERBOARD_TOPIC, queue_event
+
+# game_id used for the rows that hold totals across all games
+OVERALL_GAME_ID = 0
+
+STANDING_COLUMNS = ("matches_played", "matches_won", "matches_lost", "total_points")
+STANDING_KEY_COLUMNS = ("scope", "entity_id", "game_id")
+
+_snapshot_config = config.get_snapshot_config()
+
+StandingKey = Tuple[str, int, int]  # (scope, entity_id, game_id)
+
+
+class Contribution(NamedTuple):
+    """What one or more MatchPlayer rows add to the standings"""
+    player_id: int
+    team_id: Optional[int]
+    franchise_id: Optional[int]
+    game_id: int
+    matches_played: int
+    matches_won: int
+    total_points: int
+
+
+def collect_contributions(db: Session, match_id: Optional[int] = None,
+                          match_player_ids: Optional[List[int]] = None,
+                          player_id: Optional[int] = None,
+                          match_ids: Optional[List[int]] = None) -> List[Contribution]:
+    """
+    Load the standings contribution of each matching MatchPlayer row.
+
+    Pending changes must be flushed first so the contributions reflect them.
+    """
+    query = db.query(
+        MatchPlayer.player_id,
+        MatchPlayer.team_id,
+        Player.franchise_id,
+        Match.game_id,
+        MatchPlayer.is_winner,
+        MatchPlayer.points_earned
+    ).join(
+        Match, MatchPlayer.match_id == Match.id
+    ).join(
+        Player, MatchPlayer.player_id == Player.id
+    )
+
+    if match_id is not None:
+        query = query.filter(MatchPlayer.match_id == match_id)
+    if match_ids is not None:
+        query = query.filter(MatchPlayer.match_id.in_(match_ids))
+    if match_player_ids is not None:
+        query = query.filter(MatchPlayer.id.in_(match_player_ids))
+    if player_id is not None:
+        query = query.filter(MatchPlayer.player_id == player_id)
+
+    return [
+        Contribution(
+            player_id=row.player_id,
+            team_id=row.team_id,
+            franchise_id=row.franchise_id,
+            game_id=row.game_id,
+            matches_played=1,
+            matches_won=1 if row.is_winner else 0,
+            total_points=row.points_earned or 0
+        )
+        for row in query.all()
+    ]
+
+
+def _standing_deltas(contributions: Iterable[Tuple[Contribution, int]]) -> Dict[StandingKey, List[int]]:
+    """Fold signed contributions into per-standing-row deltas"""
+    deltas: Dict[StandingKey, List[int]] = defaultdict(lambda: [0, 0, 0, 0])
+
+    for contribution, sign in contributions:
+        entities = (
+            ("player", contribution.player_id),
+            ("team", contribution.team_id),
+            ("franchise", contribution.franchise_id),
+        )
+        matches_lost = contribution.matches_played - contribution.matches_won
+
+        for scope, entity_id in entities:
+            if entity_id is None:
+                continue
+            for game_id in (contribution.game_id, OVERALL_GAME_ID):
+                delta = deltas[(scope, entity_id, game_id)]
+                delta[0] += sign * contribution.matches_played
+                delta[1] += sign * contribution.matches_won
+                delta[2] += sign * matches_lost
+                delta[3] += sign * contribution.total_points
+
+    return deltas
+
+
+def _delta_rows(deltas: Dict[StandingKey, List[int]]) -> List[Dict[str, int]]:
+    return [
+        dict(scope=scope, entity_id=entity_id, game_id=game_id, **dict(zip(STANDING_COLUMNS, values)))
+        for (scope, entity_id, game_id), values in deltas.items()
+    ]
+
+
+def apply_contributions(db: Session, contributions: Iterable[Tuple[Contribution, int]]) -> List[Dict[str, int]]:
+    """
+    Add (+1) or remove (-1) contributions from the standings.
+
+    Runs as a single INSERT ... ON CONFLICT DO UPDATE with column increments, so it
+    joins the caller's transaction and never reads the current totals. The same
+    increments are appended to the change log (for point-in-time queries) and streamed
+    to leaderboard subscribers once the transaction commits. Returns the applied deltas.
+    """
+    deltas = {key: values for key, values in _standing_deltas(contributions).items() if any(values)}
+    if not deltas:
+        return []
+
+    insert = postgresql_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    stmt = insert(Standing).values(_delta_rows(deltas))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["scope", "entity_id", "game_id"],
+        set_={column: getattr(Standing, column) + getattr(stmt.excluded, column) for column in STANDING_COLUMNS}
+    )
+    db.execute(stmt)
+    _record_changes(db, deltas)
+    changes = _delta_rows(deltas)
+    queue_event(db, [LEADERBOARD_TOPIC], "standings", {"changes": changes})
+    _snapshot_if_due(db)
+    return changes
+
+
+def _record_changes(db: Session, deltas: Dict[StandingKey, List[int]]) -> None:
+    recorded_at = datetime.utcnow()
+    db.execute(
+        StandingChange.__table__.insert(),
+        [dict(row, recorded_at=recorded_at) for row in _delta_rows(deltas)]
+    )
+
+
+def _snapshot_if_due(db: Session) -> None:
+    """Take a periodic snapshot once enough changes have accumulated since the last one"""
+    every_changes = _snapshot_config["every_changes"]
+    if every_changes <= 0:
+        return
+    last_snapshot = select(func.max(StandingSnapshot.last_change_id)).scalar_subquery()
+    latest_change, snapshotted = db.query(func.max(StandingChange.id), last_snapshot).one()
+    if (latest_change or 0) - (snapshotted or 0) >= every_changes:
+        take_snapshot(db, reason="periodic")
+
+
+def take_snapshot(db: Session, reason: str = "manual") -> StandingSnapshot:
+    """
+    Copy the current standings into a new snapshot, in the caller's transaction.
+
+    The snapshot remembers the last change log entry it includes, so point-in-time
+    queries can start from it and apply only the changes on either side.
+    """
+    last_change_id = db.query(func.coalesce(func.max(StandingChange.id), 0)).scalar()
+    snapshot = StandingSnapshot(taken_at=datetime.utcnow(), reason=reason, last_change_id=last_change_id)
+    db.add(snapshot)
+    db.flush()
+
+    columns = STANDING_KEY_COLUMNS + STANDING_COLUMNS
+    db.execute(
+        insert(StandingSnapshotEntry).from_select(
+            ("snapshot_id",) + columns,
+            select(literal(snapshot.id), *[getattr(Standing, column) for column in columns])
+            .where(Standing.matches_played != 0)
+        )
+    )
+    return snapshot
+
+
+def list_snapshots(db: Session, limit: int = 20) -> List[StandingSnapshot]:
+    """Most recent snapshots first"""
+    return db.query(StandingSnapshot).order_by(StandingSnapshot.id.desc()).limit(limit).all()
+
+
+def naive_utc(moment: datetime) -> datetime:
+    """Convert an aware datetime to the naive UTC form the snapshot tables store"""
+    if moment.tzinfo is not None:
+        return moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+
+def _signed_rows(source, sign: int = 1):
+    return [source.c[column] for column in STANDING_KEY_COLUMNS] + [
+        (source.c[column] * sign).label(column) if sign != 1 else source.c[column]
+        for column in STANDING_COLUMNS
+    ]
+
+
+def standings_as_of(db: Session, as_of: Optional[datetime] = None):
+    """
+    Return a selectable shaped like the standing table, holding the standings as of a moment.
+
+    Starts from the nearest known state, the live table or a snapshot before or after the
+    moment, and adds or subtracts only the change log entries in between, so no history
+    is replayed. Without as_of (or when nothing changed since) this is the standing table.
+    """
+    if as_of is None:
+        return Standing.__table__
+
+    as_of = naive_utc(as_of)
+    target, latest = db.query(
+        func.coalesce(func.max(case((StandingChange.recorded_at <= as_of, StandingChange.id))), 0),
+        func.coalesce(func.max(StandingChange.id), 0)
+    ).one()
+    if target == latest:
+        return Standing.__table__
+
+    before = db.query(StandingSnapshot).filter(
+        StandingSnapshot.last_change_id <= target
+    ).order_by(StandingSnapshot.last_change_id.desc()).first()
+    after = db.query(StandingSnapshot).filter(
+        StandingSnapshot.last_change_id >= target
+    ).order_by(StandingSnapshot.last_change_id.asc()).first()
+
+    # (changes to apply, base rows, first change id excluded, last change id included, sign)
+    entries = StandingSnapshotEntry.__table__
+    candidates = [(latest - target, select(*_signed_rows(Standing.__table__)), target, latest, -1)]
+    if after is not None:
+        base = select(*_signed_rows(entries)).where(entries.c.snapshot_id == after.id)
+        candidates.append((after.last_change_id - target, base, target, after.last_change_id, -1))
+    if before is not None:
+        base = select(*_signed_rows(entries)).where(entries.c.snapshot_id == before.id)
+        candidates.append((target - before.last_change_id, base, before.last_change_id, target, 1))
+    else:
+        candidates.append((target, None, 0, target, 1))
+    _, base, first_change, last_change, sign = min(candidates, key=lambda candidate: candidate[0])
+
+    changes = StandingChange.__table__
+    parts = [
+        select(*_signed_rows(changes, sign)).where(changes.c.id > first_change, changes.c.id <= last_change)
+    ]
+    if base is not None:
+        parts.insert(0, base)
+    combined = union_all(*parts).subquery()
+
+    return select(
+        *[combined.c[column] for column in STANDING_KEY_COLUMNS],
+        *[func.sum(combined.c[column]).label(column) for column in STANDING_COLUMNS]
+    ).group_by(
+        *[combined.c[column] for column in STANDING_KEY_COLUMNS]
+    ).subquery("standing")
+
+
+def rebuild_standings(db: Session) -> int:
+    """Recompute every standings row from MatchPlayer history, repairing any drift"""
+    matches_won = func.sum(case((MatchPlayer.is_winner == True, 1), else_=0))
+    rows = db.query(
+        MatchPlayer.player_id,
+        MatchPlayer.team_id,
+        Player.franchise_id,
+        Match.game_id,
+        func.count(MatchPlayer.id),
+        matches_won,
+        func.sum(func.coalesce(MatchPlayer.points_earned, 0))
+    ).join(
+        Match, MatchPlayer.match_id == Match.id
+    ).join(
+        Player, MatchPlayer.player_id == Player.id
+    ).group_by(
+        MatchPlayer.player_id, MatchPlayer.team_id, Player.franchise_id, Match.game_id
+    ).all()
+
+    deltas = _standing_deltas((Contribution(*row), 1) for row in rows)
+
+    # Log the correction against the old totals so point-in-time queries stay continuous
+    corrections: Dict[StandingKey, List[int]] = {key: list(values) for key, values in deltas.items()}
+    for row in db.query(Standing).all():
+        correction = corrections.setdefault((row.scope, row.entity_id, row.game_id), [0, 0, 0, 0])
+        for index, column in enumerate(STANDING_COLUMNS):
+            correction[index] -= getattr(row, column)
+    corrections = {key: values for key, values in corrections.items() if any(values)}
+
+    db.query(Standing).delete(synchronize_session=False)
+    if deltas:
+        db.execute(Standing.__table__.insert(), _delta_rows(deltas))
+    if corrections:
+        _record_changes(db, corrections)
+    take_snapshot(db, reason="rebuild")
+    # Deltas cannot describe a rebuild; subscribers reload the leaderboard instead
+    queue_event(db, [LEADERBOARD_TOPIC], "reset", {"rows": len(deltas)})
+    db.commit()
+    invalidate_namespace("leaderboard")
+    return len(deltas)
+
+
+def ensure_standings(db: Session) -> None:
+    """Build the standings once for databases that predate the standings table"""
+    if db.query(Standing.id).first() is None and db.query(MatchPlayer.id).first() is not None:
+        rebuild_standings(db)
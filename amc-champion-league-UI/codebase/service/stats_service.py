@@ -0,0 +1,93 @@
+from typing import Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from codebase.model.request_model import Franchise, Match, MatchPlayer, Player
+from codebase.utils.extracted_fields import extracted_fields
+
+# Per-player stats promoted out of MatchPlayer.extra_data: stat name (its extra_data key) -> column
+STAT_COLUMNS = {path[-1]: getattr(MatchPlayer, name) for name, path in extracted_fields(MatchPlayer).items()}
+
+
+def stat_column(stat: str):
+    """The MatchPlayer column holding a stat; raises ValueError for stats that are not extracted"""
+    if stat not in STAT_COLUMNS:
+        raise ValueError(f"Unknown stat '{stat}'; expected one of: {', '.join(sorted(STAT_COLUMNS))}")
+    return STAT_COLUMNS[stat]
+
+
+def get_stat_leaders(db: Session, stat: str, game_id: Optional[int] = None, limit: int = 10) -> List[Dict]:
+    """
+    Players with the highest total of a stat, e.g. most goals in foosball.
+
+    Summed and ranked by the database over the typed stat column, in one grouped query;
+    only match rows that recorded the stat count.
+    """
+    column = stat_column(stat)
+    query = db.query(
+        Player.id,
+        Player.name,
+        Player.franchise_id,
+        Franchise.name.label("franchise_name"),
+        func.count(column).label("matches"),
+        func.sum(column).label("total"),
+        func.max(column).label("best")
+    ).join(
+        MatchPlayer, MatchPlayer.player_id == Player.id
+    ).outerjoin(
+        Franchise, Player.franchise_id == Franchise.id
+    ).filter(column.isnot(None))
+    if game_id:
+        query = query.join(Match, MatchPlayer.match_id == Match.id).filter(Match.game_id == game_id)
+
+    rows = query.group_by(
+        Player.id, Player.name, Player.franchise_id, Franchise.name
+    ).order_by(func.sum(column).desc(), func.count(column).asc(), Player.id.asc()).limit(limit).all()
+
+    return [
+        {
+            "rank": position,
+            "player_id": row.id,
+            "player_name": row.name,
+            "franchise_id": row.franchise_id,
+            "franchise_name": row.franchise_name,
+            "matches": row.matches,
+            "total": row.total,
+            "best": row.best
+        }
+        for position, row in enumerate(rows, start=1)
+    ]
+
+
+def get_stat_records(db: Session, stat: str, game_id: Optional[int] = None, limit: int = 10) -> List[Dict]:
+    """Best single-match performances in a stat, read in order from the stat column's index"""
+    column = stat_column(stat)
+    query = db.query(
+        MatchPlayer.match_id,
+        MatchPlayer.player_id,
+        Player.name.label("player_name"),
+        Match.game_id,
+        Match.match_date,
+        column.label("value")
+    ).join(
+        Player, MatchPlayer.player_id == Player.id
+    ).join(
+        Match, MatchPlayer.match_id == Match.id
+    ).filter(column.isnot(None))
+    if game_id:
+        query = query.filter(Match.game_id == game_id)
+
+    rows = query.order_by(column.desc(), MatchPlayer.id.asc()).limit(limit).all()
+    return [
+        {
+            "rank": position,
+            "match_id": row.match_id,
+            "player_id": row.player_id,
+            "player_name": row.player_name,
+            "game_id": row.game_id,
+            "match_date": row.match_date,
+            "value": row.value
+        }
+        for position, row in enumerate(rows, start=1)
+    ]
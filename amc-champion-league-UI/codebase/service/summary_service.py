@@ -0,0 +1,481 @@
+import hashlib
+import json
+import logging
+import queue
+import random
+import threading
+import time
+import unicodedata
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, sessionmaker
+
+from codebase.genai.llm_call import get_chat_completion
+from codebase.model.request_model import Match, SummaryCache
+from codebase.utils.cache import invalidate_game
+from codebase.utils.config_manager import config
+from codebase.utils.events import match_topics, queue_event
+from codebase.utils.resilience import CircuitOpenError, DependencyBusyError
+
+logger = logging.getLogger(__name__)
+
+_genai_config = config.get_genai_config()
+
+# Keys a match's extra_data carries while and after its summary is produced
+SUMMARY_STATUS = "ai_summary_status"  # pending, ready or failed
+SUMMARY_JOB = "ai_summary_job_id"
+SUMMARY_FAILED = "AI summary generation failed"
+
+# Finished jobs kept for the status endpoint
+_FINISHED_JOBS = 1000
+
+# Cache rows per multi-row upsert, well under the bound-parameter limits
+_STORE_BATCH = 500
+
+
+def summary_prompt(notes: str) -> str:
+    return f"Summarize this match report in 2-3 concise sentences focusing on key highlights and outcome: {notes}"
+
+
+def batch_summary_prompt(notes: List[str]) -> str:
+    reports = "\n".join(f"[{number}] {text}" for number, text in enumerate(notes, 1))
+    return (
+        "Summarize each of these numbered match reports in 2-3 concise sentences focusing on key "
+        "highlights and outcome. Reply with only a JSON object mapping each report number to its "
+        f"summary.\n\n{reports}"
+    )
+
+
+def normalize_notes(notes: str) -> str:
+    """Notes as they are summarized and hashed: Unicode NFC with whitespace runs collapsed"""
+    return " ".join(unicodedata.normalize("NFC", notes).split())
+
+
+def summary_key(notes: str) -> str:
+    """Content address of a summary: the model and the prompt its notes produce"""
+    prompt = summary_prompt(normalize_notes(notes))
+    return hashlib.sha256(f"{_genai_config['model']}\n{prompt}".encode("utf-8")).hexdigest()
+
+
+# Summary cache
+def cached_summaries(db: Session, keys: Iterable[str]) -> Dict[str, str]:
+    """Look summaries up by key (one query) and mark the ones found as used"""
+    keys = list(set(keys))
+    if not keys:
+        return {}
+    found = dict(db.query(SummaryCache.key, SummaryCache.summary).filter(SummaryCache.key.in_(keys)).all())
+    if found:
+        db.execute(
+            update(SummaryCache).where(SummaryCache.key.in_(list(found))).values(
+                hits=SummaryCache.hits + 1, last_used_at=datetime.utcnow()
+            ).execution_options(synchronize_session=False)
+        )
+    return found
+
+
+def store_summaries(db: Session, summaries: Dict[str, str]) -> None:
+    """Upsert summaries by key, then evict expired and least recently used entries"""
+    if not summaries:
+        return
+    now = datetime.utcnow()
+    entries = [
+        dict(key=key, model=_genai_config["model"], summary=summary, hits=0, created_at=now, last_used_at=now)
+        for key, summary in summaries.items()
+    ]
+    insert_for_dialect = postgresql_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    for start in range(0, len(entries), _STORE_BATCH):
+        stmt = insert_for_dialect(SummaryCache).values(entries[start:start + _STORE_BATCH])
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=["key"],
+            set_={"summary": stmt.excluded.summary, "last_used_at": stmt.excluded.last_used_at}
+        ))
+    evict_summaries(db)
+
+
+def evict_summaries(db: Session) -> int:
+    """Drop entries unused for cache_ttl_days, then the least recently used beyond cache_max_entries"""
+    evicted = db.query(SummaryCache).filter(
+        SummaryCache.last_used_at < datetime.utcnow() - timedelta(days=_genai_config["cache_ttl_days"])
+    ).delete(synchronize_session=False)
+
+    excess = db.query(func.count(SummaryCache.key)).scalar() - _genai_config["cache_max_entries"]
+    if excess > 0:
+        oldest = select(SummaryCache.key).order_by(SummaryCache.last_used_at, SummaryCache.key).limit(excess)
+        evicted += db.query(SummaryCache).filter(
+            SummaryCache.key.in_(oldest.scalar_subquery())
+        ).delete(synchronize_session=False)
+    return evicted
+
+
+class SummaryJob:
+    """One match summary to generate; its state is what the job-status endpoint reports"""
+
+    def __init__(self, match_id: int, notes: str):
+        self.id = uuid.uuid4().hex
+        self.match_id = match_id
+        self.notes = notes
+        self.key = summary_key(notes)
+        self.status = "pending"  # pending, running, retrying, deferred, succeeded or failed
+        self.attempts = 0
+        self.error: Optional[str] = None
+        self.summary: Optional[str] = None
+        self.created_at = datetime.utcnow()
+        self.finished_at: Optional[datetime] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "match_id": self.match_id,
+            "status": self.status,
+            "attempts": self.attempts,
+            "error": self.error,
+            "summary": self.summary,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at
+        }
+
+
+class SummaryQueue:
+    """
+    Bounded pool of worker threads generating match summaries.
+
+    Each attempt calls the LLM with a timeout; failures are retried up to max_attempts
+    times after an exponential backoff (with jitter) without holding a worker. While the
+    LLM's circuit is open (or all its call slots are busy) jobs are deferred until it may
+    accept calls again, without using up an attempt. The result is written into the
+    match's extra_data, unless a newer job superseded it.
+    """
+
+    def __init__(self, workers: int = 2, queue_size: int = 100, timeout_seconds: float = 20.0,
+                 max_attempts: int = 3, backoff_seconds: float = 1.0):
+        self.workers = workers
+        self.timeout_seconds = timeout_seconds
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self._queue: "queue.Queue[Optional[SummaryJob]]" = queue.Queue(maxsize=queue_size)
+        self._jobs: "OrderedDict[str, SummaryJob]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._timers: Dict[str, threading.Timer] = {}
+        self._session_factory: Optional[sessionmaker] = None
+
+    def create(self, match_id: int, notes: str) -> SummaryJob:
+        """Register a job; submit() it once the transaction that marked the match pending commits"""
+        job = SummaryJob(match_id, notes)
+        with self._lock:
+            self._jobs[job.id] = job
+            finished = [job_id for job_id, entry in self._jobs.items() if entry.finished_at is not None]
+            for job_id in finished[:max(0, len(finished) - _FINISHED_JOBS)]:
+                del self._jobs[job_id]
+        return job
+
+    def get(self, job_id: str) -> Optional[SummaryJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def submit(self, job: SummaryJob) -> None:
+        """Queue a job; a full queue fails it straight away rather than blocking the caller"""
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            job.error = "Summary queue is full"
+            self._finish(job, None)
+
+    @property
+    def backlog(self) -> int:
+        return self._queue.qsize()
+
+    def start(self, session_factory: sessionmaker) -> None:
+        self._session_factory = session_factory
+        if self._threads:
+            return
+        for number in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"summary-worker-{number}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self) -> None:
+        """Stop the workers once the jobs already queued are done; pending retries are dropped"""
+        with self._lock:
+            timers, self._timers = list(self._timers.values()), {}
+        for timer in timers:
+            timer.cancel()
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def _work(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            try:
+                self._run(job)
+            except Exception:
+                logger.exception("Summary job %s failed unexpectedly", job.id)
+
+    def _run(self, job: SummaryJob) -> None:
+        job.status = "running"
+        # Another job may have summarized the same notes since this one was queued
+        if self._session_factory is not None:
+            db = self._session_factory()
+            try:
+                cached = cached_summaries(db, [job.key]).get(job.key)
+                db.commit()
+            finally:
+                db.close()
+            if cached:
+                self._finish(job, cached)
+                return
+        
+        job.attempts += 1
+        try:
+            summary = get_chat_completion(summary_prompt(normalize_notes(job.notes)), timeout=self.timeout_seconds)
+        except (CircuitOpenError, DependencyBusyError) as e:
+            # The call was never made: wait for the LLM instead of burning an attempt
+            job.attempts -= 1
+            job.error = f"{type(e).__name__}: {e}"
+            self._schedule(job, "deferred", e.retry_after * random.uniform(1.0, 1.5))
+            return
+        except Exception as e:
+            job.error = f"{type(e).__name__}: {e}"
+            if job.attempts < self.max_attempts:
+                self._retry(job)
+            else:
+                self._finish(job, None)
+            return
+        job.error = None
+        self._finish(job, summary or None)
+
+    def _retry(self, job: SummaryJob) -> None:
+        delay = self.backoff_seconds * 2 ** (job.attempts - 1)
+        self._schedule(job, "retrying", delay * random.uniform(0.8, 1.2))
+
+    def _schedule(self, job: SummaryJob, status: str, delay: float) -> None:
+        job.status = status
+        timer = threading.Timer(delay, self._requeue, args=(job,))
+        timer.daemon = True
+        with self._lock:
+            self._timers[job.id] = timer
+        timer.start()
+
+    def _requeue(self, job: SummaryJob) -> None:
+        with self._lock:
+            self._timers.pop(job.id, None)
+        self.submit(job)
+
+    def _finish(self, job: SummaryJob, summary: Optional[str]) -> None:
+        job.summary = summary
+        job.status = "succeeded" if summary else "failed"
+        job.finished_at = datetime.utcnow()
+        if self._session_factory is None:
+            return
+        db = self._session_factory()
+        try:
+            write_summary(db, job)
+        except Exception:
+            logger.exception("Could not store the summary of match %s", job.match_id)
+        finally:
+            db.close()
+
+
+def write_summary(db: Session, job: SummaryJob) -> bool:
+    """
+    Cache a finished job's summary and store it (or the failure fallback) in its match's
+    extra_data.
+
+    The match is skipped when it is gone or its notes were resubmitted since (a newer job
+    owns it).
+    """
+    if job.summary:
+        store_summaries(db, {job.key: job.summary})
+    match = db.query(Match).filter(Match.id == job.match_id).first()
+    if match is None or (match.extra_data or {}).get(SUMMARY_JOB) != job.id:
+        db.commit()
+        return False
+
+    match.extra_data = dict(
+        match.extra_data,
+        ai_summary=job.summary or SUMMARY_FAILED,
+        **{SUMMARY_STATUS: "ready" if job.summary else "failed"}
+    )
+    queue_event(db, match_topics(match.id, match.game_id), "match_summary", {
+        "id": match.id,
+        "ai_summary": match.extra_data["ai_summary"],
+        SUMMARY_STATUS: match.extra_data[SUMMARY_STATUS]
+    })
+    db.commit()
+    invalidate_game(match.game_id)
+    return True
+
+
+summary_jobs = SummaryQueue(
+    workers=_genai_config["workers"],
+    queue_size=_genai_config["queue_size"],
+    timeout_seconds=_genai_config["timeout_seconds"],
+    max_attempts=_genai_config["max_attempts"],
+    backoff_seconds=_genai_config["backoff_seconds"]
+)
+
+
+def request_summary(db: Session, match: Match) -> Optional[SummaryJob]:
+    """
+    Fill in a match's summary when its extra_data has notes but no ai_summary.
+
+    Notes summarized before are answered from the cache at once. Otherwise the summary is
+    marked pending and a job returned, which the caller passes to summary_jobs.submit()
+    once it has committed.
+    """
+    extra_data = match.extra_data
+    if not isinstance(extra_data, dict) or not extra_data.get("notes") or extra_data.get("ai_summary"):
+        return None
+    cached = cached_summaries(db, [summary_key(extra_data["notes"])])
+    if cached:
+        extra_data = {key: value for key, value in extra_data.items() if key != SUMMARY_JOB}
+        match.extra_data = dict(extra_data, ai_summary=next(iter(cached.values())), **{SUMMARY_STATUS: "ready"})
+        return None
+    job = summary_jobs.create(match.id, extra_data["notes"])
+    match.extra_data = dict(extra_data, **{SUMMARY_STATUS: "pending", SUMMARY_JOB: job.id})
+    return job
+
+
+def get_summary_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """Status of a summary job, or None if it is unknown (or expired)"""
+    job = summary_jobs.get(job_id)
+    return job.to_dict() if job is not None else None
+
+
+def resume_summaries(db: Session) -> int:
+    """Queue again the summaries left pending when the application last stopped"""
+    jobs = []
+    for match in db.query(Match).filter(Match.summary_status == "pending"):
+        if isinstance(match.extra_data, dict) and match.extra_data.get(SUMMARY_STATUS) == "pending":
+            extra_data = dict(match.extra_data)
+            extra_data.pop("ai_summary", None)
+            match.extra_data = extra_data
+            job = request_summary(db, match)
+            if job is not None:
+                jobs.append(job)
+    if jobs:
+        db.commit()
+    for job in jobs:
+        summary_jobs.submit(job)
+    return len(jobs)
+
+
+# Batch summaries
+def _pack(items: List[Tuple[str, str]]) -> List[List[Tuple[str, str]]]:
+    """Group (key, notes) items into requests of at most batch_size items and batch_max_chars"""
+    chunks, chunk, size = [], [], 0
+    for key, notes in items:
+        if chunk and (len(chunk) >= _genai_config["batch_size"] or size + len(notes) > _genai_config["batch_max_chars"]):
+            chunks.append(chunk)
+            chunk, size = [], 0
+        chunk.append((key, notes))
+        size += len(notes)
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def _parse_batch(answer: str, count: int) -> Dict[int, str]:
+    """Summaries by report number from a batch answer, tolerating a fenced code block around the JSON"""
+    answer = answer.strip()
+    if answer.startswith("```"):
+        answer = answer.strip("`").split("\n", 1)[-1]
+    parsed = json.loads(answer[answer.find("{"):answer.rfind("}") + 1])
+    return {
+        int(number): str(summary).strip() for number, summary in parsed.items()
+        if str(number).isdigit() and 1 <= int(number) <= count and str(summary).strip()
+    }
+
+
+def _summarize_chunk(chunk: List[Tuple[str, str]]) -> Dict[str, str]:
+    """Summaries of one packed request by key, with the queue's timeout, retries and backoff"""
+    notes = [text for _, text in chunk]
+    for attempt in range(1, summary_jobs.max_attempts + 1):
+        try:
+            if len(chunk) == 1:
+                return {chunk[0][0]: get_chat_completion(summary_prompt(notes[0]), timeout=summary_jobs.timeout_seconds)}
+            answer = get_chat_completion(batch_summary_prompt(notes), timeout=summary_jobs.timeout_seconds,
+                                         max_tokens=150 * len(chunk))
+            by_number = _parse_batch(answer, len(chunk))
+            return {key: by_number[number] for number, (key, _) in enumerate(chunk, 1) if number in by_number}
+        except CircuitOpenError as e:
+            # The LLM is down; leave these reports for a later run
+            logger.warning("Batch summary of %s reports skipped: %s", len(chunk), e)
+            return {}
+        except Exception as e:
+            logger.warning("Batch summary of %s reports failed (attempt %s): %s", len(chunk), attempt, e)
+            if attempt < summary_jobs.max_attempts:
+                time.sleep(summary_jobs.backoff_seconds * 2 ** (attempt - 1) * random.uniform(0.8, 1.2))
+    return {}
+
+
+def summarize_notes(db: Session, notes_by_match: Dict[int, str]) -> Dict[int, Optional[str]]:
+    """
+    Summaries for many matches' notes at once.
+
+    Cached summaries are reused and identical notes summarized once; the rest are packed
+    into batch requests, batch_concurrency of them in flight at a time. New summaries are
+    cached; the caller commits. Matches whose summary could not be produced map to None.
+    """
+    keys = {match_id: summary_key(notes) for match_id, notes in notes_by_match.items()}
+    summaries = cached_summaries(db, keys.values())
+    missing = {}
+    for match_id, key in keys.items():
+        if key not in summaries and key not in missing:
+            missing[key] = normalize_notes(notes_by_match[match_id])
+
+    if missing:
+        with ThreadPoolExecutor(max_workers=max(1, _genai_config["batch_concurrency"])) as pool:
+            fresh = {}
+            for result in pool.map(_summarize_chunk, _pack(list(missing.items()))):
+                fresh.update(result)
+        store_summaries(db, fresh)
+        summaries.update(fresh)
+    return {match_id: summaries.get(key) for match_id, key in keys.items()}
+
+
+def backfill_summaries(db: Session, match_ids: Optional[List[int]] = None, overwrite: bool = False) -> Dict[str, int]:
+    """
+    Summarize every match with notes but no summary (all with notes if overwrite) in batches.
+
+    Supersedes their queued jobs and commits once. Returns counts of summarized and failed matches.
+    """
+    query = db.query(Match).filter(Match.has_notes.is_(True))
+    if match_ids:
+        query = query.filter(Match.id.in_(match_ids))
+    matches = [
+        match for match in query
+        if isinstance(match.extra_data, dict) and match.extra_data.get("notes")
+        and (overwrite or not match.extra_data.get("ai_summary")
+             or match.extra_data.get(SUMMARY_STATUS) in ("pending", "failed"))
+    ]
+    summaries = summarize_notes(db, {match.id: match.extra_data["notes"] for match in matches})
+
+    counts = {"summarized": 0, "failed": 0}
+    for match in matches:
+        summary = summaries[match.id]
+        extra_data = {key: value for key, value in match.extra_data.items() if key != SUMMARY_JOB}
+        match.extra_data = dict(extra_data, ai_summary=summary or SUMMARY_FAILED,
+                                **{SUMMARY_STATUS: "ready" if summary else "failed"})
+        counts["summarized" if summary else "failed"] += 1
+        queue_event(db, match_topics(match.id, match.game_id), "match_summary", {
+            "id": match.id,
+            "ai_summary": match.extra_data["ai_summary"],
+            SUMMARY_STATUS: match.extra_data[SUMMARY_STATUS]
+        })
+    db.commit()
+    if matches:
+        invalidate_game(*{match.game_id for match in matches})
+    return counts
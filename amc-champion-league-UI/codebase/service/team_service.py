@@ -15,6 +15,7 @@ from codebase.service.request_payload import (
 from codebase.utils.image_storage import (
     upload_image_to_storage, list_images_from_storage, delete_image_from_storage
 )
+from codebase.utils.pagination import keyset
 
 # Team CRUD Operations
 def create_team(db: Session, team: TeamCreate) -> Team:
@@ -101,9 +102,9 @@ def get_teams_by_game(db: Session, game_id: int) -> List[Dict[str, Any]]:
         
     return result
 
-def get_teams_with_details(db: Session, skip: int = 0, limit: int = 100) -> List[Dict]:
+def get_teams_with_details(db: Session, skip: int = 0, limit: int = 100, after: Optional[str] = None) -> List[Dict]:
     """Get teams with franchise and game names"""
-    teams = db.query(
+    teams = keyset(db.query(
         Team,
         Franchise.name.label("franchise_name"),
         Game.name.label("game_name")
@@ -111,7 +112,7 @@ def get_teams_with_details(db: Session, skip: int = 0, limit: int = 100) -> List
         Franchise, Team.franchise_id == Franchise.id
     ).join(
         Game, Team.game_id == Game.id
-    ).offset(skip).limit(limit).all()
+    ), [Team.id], after).offset(skip).limit(limit).all()
     
     result = []
     for team, franchise_name, game_name in teams:
@@ -400,9 +401,8 @@ def update_match_result(db: Session,
     
         
         if extra_data:
-            if not db_match.extra_data:
-                db_match.extra_data = {}
-            db_match.extra_data.update(extra_data)
+            # Assign a new dict: in-place changes to the JSON column are not written
+            db_match.extra_data = {**(db_match.extra_data or {}), **extra_data}
         
         db.commit()
         db.refresh(db_match)
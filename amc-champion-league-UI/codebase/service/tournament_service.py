@@ -0,0 +1,344 @@
+from collections import defaultdict
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from codebase.model.request_model import Franchise, Game, Match, Team
+from codebase.service.request_payload import TournamentCreate, TournamentSummary
+from codebase.service.schedule_service import parse_schedule
+from codebase.service.conflict_service import check_schedule, conflict_index, match_length
+from codebase.utils.cache import invalidate_game
+from codebase.utils.events import FIXTURES_TOPIC, match_topics, queue_event
+
+TOURNAMENT_FORMATS = ("round_robin", "knockout")
+ENTRY_TYPES = ("team", "franchise")
+
+# A participant's side of a match: (team_id, franchise_id)
+Entry = Tuple[Optional[int], Optional[int]]
+
+
+def round_robin_rounds(entries: List[Any], double_round: bool = False) -> List[List[Tuple[Any, Any]]]:
+    """
+    Circle-method round robin: every entry meets every other once (twice with return legs).
+
+    Returns rounds of (home, away) pairs in which no entry plays twice; with an odd
+    number of entries one entry rests each round. Home and away alternate per round.
+    """
+    rotation = list(entries) + ([None] if len(entries) % 2 else [])
+    size = len(rotation)
+    rounds = []
+    for number in range(size - 1):
+        pairs = []
+        for index in range(size // 2):
+            home, away = rotation[index], rotation[size - 1 - index]
+            if home is None or away is None:
+                continue
+            pairs.append((away, home) if (number + index) % 2 else (home, away))
+        rounds.append(pairs)
+        # Keep the first entry fixed and rotate the others one place
+        rotation = [rotation[0], rotation[-1]] + rotation[1:-1]
+
+    if double_round:
+        rounds += [[(away, home) for home, away in pairs] for pairs in rounds]
+    return rounds
+
+
+def snake_groups(entries: List[Any], groups: int) -> List[List[Any]]:
+    """Split seeded entries into groups 1..n, n..1, 1..n, ... so the groups are balanced"""
+    buckets: List[List[Any]] = [[] for _ in range(groups)]
+    for index, entry in enumerate(entries):
+        position = index % groups
+        buckets[position if (index // groups) % 2 == 0 else groups - 1 - position].append(entry)
+    return buckets
+
+
+def seed_order(bracket_size: int) -> List[int]:
+    """Seeds (1-based) in bracket order, so 1 meets the last seed and 1 and 2 meet only in the final"""
+    order = [1]
+    while len(order) < bracket_size:
+        order = [seed for top in order for seed in (top, 2 * len(order) + 1 - top)]
+    return order
+
+
+def knockout_label(matches_in_round: int) -> str:
+    """Round label by the number of matches in the round, matching the existing round names"""
+    if matches_in_round == 1:
+        return "Finals"
+    if matches_in_round == 2:
+        return "Semi Finals"
+    if matches_in_round == 4:
+        return "Quarter Finals"
+    return f"Round of {matches_in_round * 2}"
+
+
+def _load_entries(db: Session, request: TournamentCreate) -> List[Entry]:
+    """Resolve the entry ids, in seed order, to (team_id, franchise_id) sides with one query"""
+    if len(set(request.entry_ids)) != len(request.entry_ids):
+        raise ValueError("entry_ids must not repeat")
+
+    if request.entry_type == "team":
+        rows = db.query(Team.id, Team.franchise_id, Team.game_id).filter(Team.id.in_(request.entry_ids)).all()
+        found = {team_id: (team_id, franchise_id) for team_id, franchise_id, _ in rows}
+        other_game = [team_id for team_id, _, game_id in rows if game_id != request.game_id]
+        if other_game:
+            raise ValueError(f"Teams {other_game} do not play game {request.game_id}")
+    else:
+        rows = db.query(Franchise.id).filter(Franchise.id.in_(request.entry_ids)).all()
+        found = {franchise_id: (None, franchise_id) for franchise_id, in rows}
+
+    missing = [entry_id for entry_id in request.entry_ids if entry_id not in found]
+    if missing:
+        raise ValueError(f"Unknown {request.entry_type} ids: {missing}")
+    return [found[entry_id] for entry_id in request.entry_ids]
+
+
+class _Schedule:
+    """
+    Dates and start times of tournament matches.
+
+    A round's matches start together when they are spread over venues. At a single
+    location they are played one after another, a match length apart, and a round on the
+    same date as an earlier one starts after it.
+    """
+
+    def __init__(self, request: TournamentCreate, slot_length: timedelta):
+        self.match_time = request.match_time
+        self.start = None
+        if request.start_date:
+            self.start = parse_schedule(request.start_date)
+            if self.start is None:
+                raise ValueError(f"Invalid start_date '{request.start_date}', expected YYYY-MM-DD")
+        self.step = timedelta(days=max(request.days_between_rounds, 0))
+        self.slot_length = slot_length
+        self.one_venue = bool(request.location and request.location.strip())
+        self._next_slot: Dict[str, int] = defaultdict(int)  # match_date -> first free slot
+
+    def match_date(self, round_index: int) -> Optional[str]:
+        if self.start is None:
+            return None
+        return (self.start + self.step * round_index).strftime("%Y-%m-%d")
+
+    def assign(self, round_index: int, rows: List[Dict[str, Any]]) -> None:
+        """Set the schedule columns of a round's match rows, given in playing order"""
+        match_date = self.match_date(round_index)
+        start = parse_schedule(match_date, self.match_time) if match_date and self.match_time else None
+        if start is None:
+            # Without a date and time of day nothing occupies a slot
+            for row in rows:
+                row.update(match_date=match_date, match_time=self.match_time,
+                           scheduled_at=parse_schedule(match_date, self.match_time))
+            return
+        if not rows:
+            return
+
+        first = self._next_slot[match_date]
+        for number, row in enumerate(rows):
+            moment = start + self.slot_length * (first + (number if self.one_venue else 0))
+            row.update(match_date=moment.strftime("%Y-%m-%d"), match_time=moment.strftime("%H:%M"),
+                       scheduled_at=moment)
+        self._next_slot[match_date] = first + (len(rows) if self.one_venue else 1)
+
+
+def _match_row(request: TournamentCreate, label: str, home: Optional[Entry], away: Optional[Entry],
+               tournament: Dict[str, Any]) -> Dict[str, Any]:
+    """A match row without its schedule columns; _Schedule.assign() sets those"""
+    return {
+        "game_id": request.game_id,
+        "home_team_id": home[0] if home else None,
+        "home_franchise_id": home[1] if home else None,
+        "away_team_id": away[0] if away else None,
+        "away_franchise_id": away[1] if away else None,
+        "status": "scheduled",
+        "location": request.location,
+        "round": label,
+        "extra_data": {"tournament": tournament}
+    }
+
+
+def _insert_matches(db: Session, rows: List[Dict[str, Any]], ordered: bool = False) -> List[int]:
+    """
+    Bulk insert match rows as multi-row INSERT ... RETURNING batches and return the new ids.
+
+    Only ordered=True guarantees the ids come back in row order; that costs a statement
+    per row on SQLite, so it is used for the (small) knockout rounds that link matches.
+    """
+    if not rows:
+        return []
+    # Core insert: no ORM bookkeeping per row
+    table = Match.__table__
+    stmt = table.insert().returning(table.c.id, sort_by_parameter_order=ordered)
+    return list(db.execute(stmt, rows).scalars())
+
+
+def _check_conflicts(db: Session, request: TournamentCreate, rows: List[Dict[str, Any]]) -> None:
+    """Validate the whole schedule, against existing fixtures and itself, before inserting it"""
+    if request.check_conflicts:
+        check_schedule(db, [Match(**row) for row in rows])
+
+
+def _round_robin(db: Session, request: TournamentCreate, entries: List[Entry],
+                 schedule: _Schedule) -> Tuple[List[int], List[Dict[str, Any]]]:
+    if request.groups < 1 or request.groups * 2 > len(entries):
+        raise ValueError("Every group needs at least two entries")
+
+    group_names = [chr(ord("A") + index) if index < 26 else str(index + 1) for index in range(request.groups)]
+    group_rounds = [
+        round_robin_rounds(group, request.double_round) for group in snake_groups(entries, request.groups)
+    ]
+
+    rows, rounds = [], []
+    # Round n of every group is played on the same date
+    for round_index in range(max(len(group) for group in group_rounds)):
+        round_rows = []
+        for name, group in zip(group_names, group_rounds):
+            if round_index >= len(group):
+                continue
+            label = f"Group {name} Round {round_index + 1}" if request.groups > 1 else f"Round {round_index + 1}"
+            tournament = {"name": request.name, "format": "round_robin", "entry_type": request.entry_type}
+            if request.groups > 1:
+                tournament["group"] = name
+            for home, away in group[round_index]:
+                round_rows.append(_match_row(request, label, home, away, tournament))
+            rounds.append({"round": label, "match_date": schedule.match_date(round_index),
+                           "matches": len(group[round_index])})
+        schedule.assign(round_index, round_rows)
+        rows.extend(round_rows)
+    _check_conflicts(db, request, rows)
+    return _insert_matches(db, rows), rounds
+
+
+def _knockout(db: Session, request: TournamentCreate, entries: List[Entry],
+              schedule: _Schedule) -> Tuple[List[int], List[Dict[str, Any]]]:
+    bracket_size = 1
+    while bracket_size < len(entries):
+        bracket_size *= 2
+    round_count = bracket_size.bit_length() - 1
+
+    # Seeds without an opponent (a "bye") start in the second round
+    pairs = seed_order(bracket_size)
+    first_round = [
+        (entries[top - 1] if top <= len(entries) else None, entries[bottom - 1] if bottom <= len(entries) else None)
+        for top, bottom in zip(pairs[0::2], pairs[1::2])
+    ]
+    slots: Dict[Tuple[int, int], List[Optional[Entry]]] = {}
+    for position, (top, bottom) in enumerate(first_round):
+        if top is None or bottom is None:
+            slot = slots.setdefault((1, position // 2), [None, None])
+            slot[position % 2] = top or bottom
+
+    planned: Dict[int, List[Tuple[int, Dict[str, Any]]]] = {}  # round -> [(position, row)]
+    labels = {}
+    for round_index in range(round_count):
+        matches_in_round = bracket_size >> (round_index + 1)
+        labels[round_index] = knockout_label(matches_in_round)
+        planned[round_index] = []
+        for position in range(matches_in_round):
+            if round_index == 0:
+                home, away = first_round[position]
+                if home is None or away is None:
+                    continue
+            else:
+                home, away = slots.get((round_index, position), [None, None])
+            tournament = {"name": request.name, "format": "knockout", "entry_type": request.entry_type}
+            planned[round_index].append(
+                (position, _match_row(request, labels[round_index], home, away, tournament))
+            )
+        schedule.assign(round_index, [row for _, row in planned[round_index]])
+    _check_conflicts(db, request, [row for round_rows in planned.values() for _, row in round_rows])
+
+    # Insert the final first so every match can link to the match its winner advances to
+    match_ids: Dict[Tuple[int, int], int] = {}
+    all_ids, rounds = [], []
+    for round_index in reversed(range(round_count)):
+        for position, row in planned[round_index]:
+            if round_index + 1 < round_count:
+                row["extra_data"]["tournament"]["next_match_id"] = match_ids[(round_index + 1, position // 2)]
+                row["extra_data"]["tournament"]["next_slot"] = "home" if position % 2 == 0 else "away"
+
+        ids = _insert_matches(db, [row for _, row in planned[round_index]], ordered=True)
+        match_ids.update(
+            ((round_index, position), match_id) for (position, _), match_id in zip(planned[round_index], ids)
+        )
+        all_ids[:0] = ids
+        rounds.insert(0, {"round": labels[round_index], "match_date": schedule.match_date(round_index),
+                          "matches": len(ids)})
+    return all_ids, rounds
+
+
+def generate_tournament(db: Session, request: TournamentCreate) -> TournamentSummary:
+    """
+    Generate every match of a round-robin or seeded knockout tournament in one transaction.
+
+    Entries are teams or franchises in seed order. Knockout matches of later rounds are
+    created up front with empty sides and filled in by advance_bracket() as results come in.
+    The schedule is checked for venue, team and player conflicts before anything is written.
+    """
+    if request.format not in TOURNAMENT_FORMATS:
+        raise ValueError(f"Unknown format '{request.format}', expected one of: {', '.join(TOURNAMENT_FORMATS)}")
+    if request.entry_type not in ENTRY_TYPES:
+        raise ValueError(f"Unknown entry_type '{request.entry_type}', expected one of: {', '.join(ENTRY_TYPES)}")
+    if len(request.entry_ids) < 2:
+        raise ValueError("A tournament needs at least two entries")
+    if db.query(Game.id).filter(Game.id == request.game_id).first() is None:
+        raise ValueError(f"Game {request.game_id} not found")
+
+    entries = _load_entries(db, request)
+    schedule = _Schedule(request, match_length(db, request.game_id))
+    generate = _round_robin if request.format == "round_robin" else _knockout
+    match_ids, rounds = generate(db, request, entries, schedule)
+
+    queue_event(db, [FIXTURES_TOPIC, f"{FIXTURES_TOPIC}:{request.game_id}"], "tournament_created", {
+        "name": request.name, "game_id": request.game_id, "format": request.format, "matches": len(match_ids)
+    })
+    db.commit()
+    invalidate_game(request.game_id)
+    conflict_index.refresh(db, match_ids)
+
+    return TournamentSummary(
+        name=request.name,
+        game_id=request.game_id,
+        format=request.format,
+        matches_created=len(match_ids),
+        rounds=rounds,
+        match_ids=match_ids
+    )
+
+
+def advance_bracket(db: Session, match: Match) -> Optional[Match]:
+    """
+    Move the winner of a completed knockout match into its next match, in the caller's transaction.
+
+    The winner must be one of the match's sides (a team or franchise id, following the
+    tournament's entry type). A corrected winner replaces the earlier one until the next
+    match is completed. Returns the updated next match, if any.
+    """
+    tournament = (match.extra_data or {}).get("tournament") or {}
+    next_match_id = tournament.get("next_match_id")
+    if match.status != "completed" or not match.winner_id or not next_match_id:
+        return None
+
+    if tournament.get("entry_type") == "franchise":
+        sides = {match.home_franchise_id: (None, match.home_franchise_id),
+                 match.away_franchise_id: (None, match.away_franchise_id)}
+    else:
+        sides = {match.home_team_id: (match.home_team_id, match.home_franchise_id),
+                 match.away_team_id: (match.away_team_id, match.away_franchise_id)}
+    winner = sides.get(match.winner_id)
+    if winner is None:
+        return None
+
+    next_match = db.query(Match).filter(Match.id == next_match_id).first()
+    if next_match is None or next_match.status == "completed":
+        return None
+
+    slot = tournament.get("next_slot", "home")
+    team_id, franchise_id = winner
+    if (getattr(next_match, f"{slot}_team_id"), getattr(next_match, f"{slot}_franchise_id")) == winner:
+        return next_match
+    setattr(next_match, f"{slot}_team_id", team_id)
+    setattr(next_match, f"{slot}_franchise_id", franchise_id)
+    queue_event(db, match_topics(next_match.id, next_match.game_id), "match", {
+        "id": next_match.id, f"{slot}_team_id": team_id, f"{slot}_franchise_id": franchise_id
+    })
+    return next_match
@@ -0,0 +1,205 @@
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from codebase.utils.config_manager import config
+
+
+class TTLCache:
+    """
+    Thread-safe in-process cache with a bounded size, LRU eviction and per-entry TTL.
+
+    Entries carry tags so writes can invalidate exactly the entries they affect. Every
+    invalidation also moves its tags' generations: a value computed before the snapshot
+    taken with generation() is not stored if one of its tags was invalidated meanwhile.
+    """
+
+    def __init__(self, name: str, max_entries: int = 512, ttl_seconds: float = 300):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any, frozenset]]" = OrderedDict()
+        self._generations: Dict[Hashable, int] = {}
+        self._clears = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.stale_writes = 0
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return (found, value) for a key, dropping it if it has expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def _generation(self, tags: Iterable[Hashable]) -> Tuple[int, Tuple[int, ...]]:
+        return self._clears, tuple(self._generations.get(tag, 0) for tag in tags)
+
+    def generation(self, tags: Iterable[Hashable]) -> Tuple[int, Tuple[int, ...]]:
+        """Snapshot of the tags' generations; take it before computing a value to set() later"""
+        with self._lock:
+            return self._generation(tags)
+
+    def set(self, key: Hashable, value: Any, tags: Iterable[Hashable] = (),
+            generation: Optional[Tuple[int, Tuple[int, ...]]] = None) -> None:
+        """
+        Store a value, evicting the least recently used entries beyond max_entries.
+
+        With a generation snapshot, the value is dropped instead when any of its tags was
+        invalidated since the snapshot, as it may have been read before that write.
+        """
+        tags = tuple(tags)
+        with self._lock:
+            if generation is not None and generation != self._generation(tags):
+                self.stale_writes += 1
+                return
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value, frozenset(tags))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, *tags: Hashable) -> int:
+        """Drop every entry carrying any of the given tags"""
+        wanted = set(tags)
+        with self._lock:
+            for tag in wanted:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+            stale = [key for key, (_, _, entry_tags) in self._entries.items() if entry_tags & wanted]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+            return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._clears += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "stale_writes": self.stale_writes,
+            }
+
+
+_cache_config = config.get_cache_config()
+
+# Shared cache for leaderboard and fixture reads
+query_cache = TTLCache(
+    "query",
+    max_entries=_cache_config["max_entries"],
+    ttl_seconds=_cache_config["ttl_seconds"]
+)
+
+
+def _freeze(value: Any) -> Hashable:
+    """Make list/dict arguments usable as part of a cache key"""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    return value
+
+
+def _game_tag(namespace: str, game_id: Optional[int]) -> Tuple[str, Optional[int]]:
+    """Tag of a game's entries; game_id 0 is the overall board, tagged like None"""
+    return namespace, game_id or None
+
+
+def cached(namespace: str, cache: TTLCache = query_cache) -> Callable:
+    """
+    Cache a service function's result keyed by all of its arguments except the session.
+
+    Entries are tagged with the namespace and with (namespace, game_id) so that
+    invalidate_game() and invalidate_namespace() can drop exactly the affected keys. A
+    result whose tags were invalidated while it was computed is returned but not stored.
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _cache_config["enabled"]:
+                return func(*args, **kwargs)
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = {name: value for name, value in bound.arguments.items() if name != "db"}
+            key = (namespace, func.__name__, _freeze(arguments))
+
+            found, value = cache.get(key)
+            if found:
+                return value
+
+            tags = (namespace, _game_tag(namespace, arguments.get("game_id")))
+            generation = cache.generation(tags)
+            value = func(*args, **kwargs)
+            cache.set(key, value, tags=tags, generation=generation)
+            return value
+
+        return wrapper
+    return decorator
+
+
+def cached_per_game(namespace: str, name: str, game_ids: Iterable[Optional[int]], arguments: Dict[str, Any],
+                    compute: Callable[[List[Optional[int]]], Dict[Optional[int], Any]],
+                    cache: TTLCache = query_cache) -> Dict[Optional[int], Any]:
+    """
+    Look up one cache entry per game and compute all the misses in a single call.
+
+    Each game's result is stored under its own key and (namespace, game_id) tag, so a
+    request for several games and later requests for any one of them share entries.
+    """
+    game_ids = list(dict.fromkeys(game_ids))
+    if not _cache_config["enabled"]:
+        return compute(game_ids)
+
+    frozen = _freeze(arguments)
+    results, missing = {}, []
+    for game_id in game_ids:
+        found, value = cache.get((namespace, name, game_id, frozen))
+        if found:
+            results[game_id] = value
+        else:
+            missing.append(game_id)
+
+    if missing:
+        generations = {game_id: cache.generation((namespace, _game_tag(namespace, game_id))) for game_id in missing}
+        for game_id, value in compute(missing).items():
+            cache.set((namespace, name, game_id, frozen), value, tags=(namespace, _game_tag(namespace, game_id)),
+                      generation=generations.get(game_id))
+            results[game_id] = value
+    return results
+
+
+def invalidate_game(*game_ids: Optional[int], cache: TTLCache = query_cache) -> None:
+    """Drop leaderboard and fixture entries for the given games and the unfiltered (all games) entries"""
+    tags = []
+    for namespace in ("leaderboard", "fixtures"):
+        tags.append(_game_tag(namespace, None))
+        tags.extend(_game_tag(namespace, game_id) for game_id in game_ids if game_id)
+    cache.invalidate(*tags)
+
+
+def invalidate_namespace(*namespaces: str, cache: TTLCache = query_cache) -> None:
+    """Drop every entry in the given namespaces"""
+    cache.invalidate(*namespaces)
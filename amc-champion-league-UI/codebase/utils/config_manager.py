@@ -36,6 +36,37 @@ class ConfigManager:
             return self._config.get("database", "sqlite_url", fallback="sqlite:///amc_champion_league.db")
         return db_url
     
+    def get_database_config(self) -> Dict[str, Any]:
+        """Get the engine profile: SQLite pragmas, connection pool and PostgreSQL timeouts"""
+        defaults = {
+            "profile": "tuned",
+            "sqlite_journal_mode": "wal",
+            "sqlite_synchronous": "normal",
+            "sqlite_busy_timeout_ms": 5000,
+            "sqlite_cache_size_kb": 65536,
+            "sqlite_mmap_size_mb": 256,
+            "sqlite_temp_store": "memory",
+            "pool_size": 10,
+            "max_overflow": 20,
+            "pool_timeout_seconds": 30,
+            "pool_recycle_seconds": 1800,
+            "pool_pre_ping": True,
+            "statement_timeout_ms": 30000,
+            "lock_timeout_ms": 5000
+        }
+        if not self._config.has_section("database"):
+            return defaults
+        
+        settings = {}
+        for key, default in defaults.items():
+            if isinstance(default, bool):
+                settings[key] = self._config.getboolean("database", key, fallback=default)
+            elif isinstance(default, int):
+                settings[key] = self._config.getint("database", key, fallback=default)
+            else:
+                settings[key] = self._config.get("database", key, fallback=default).strip().lower()
+        return settings
+    
     def get_storage_config(self) -> Dict[str, Any]:
         """Get storage configuration"""
         if not self._config.has_section("storage"):
@@ -43,14 +74,16 @@ class ConfigManager:
                 "use_s3": False,
                 "s3_bucket_name": "amc-champion-league",
                 "s3_region": "us-east-1",
-                "local_image_dir": "./images"
+                "local_image_dir": "./images",
+                "s3_stub": False
             }
         
         return {
             "use_s3": self._config.getboolean("storage", "use_s3", fallback=False),
             "s3_bucket_name": self._config.get("storage", "s3_bucket_name", fallback="amc-champion-league"),
             "s3_region": self._config.get("storage", "s3_region", fallback="us-east-1"),
-            "local_image_dir": self._config.get("storage", "local_image_dir", fallback="./images")
+            "local_image_dir": self._config.get("storage", "local_image_dir", fallback="./images"),
+            "s3_stub": self._config.getboolean("storage", "s3_stub", fallback=False)
         }
     
     def get_application_config(self) -> Dict[str, Any]:
@@ -89,6 +122,183 @@ class ConfigManager:
             return 10
         return self._config.getint("scoring", "default_win_points", fallback=10)
     
+    def get_cache_config(self) -> Dict[str, Any]:
+        """Get in-process query cache configuration"""
+        if not self._config.has_section("cache"):
+            return {
+                "enabled": True,
+                "max_entries": 512,
+                "ttl_seconds": 300
+            }
+        
+        return {
+            "enabled": self._config.getboolean("cache", "enabled", fallback=True),
+            "max_entries": self._config.getint("cache", "max_entries", fallback=512),
+            "ttl_seconds": self._config.getfloat("cache", "ttl_seconds", fallback=300)
+        }
+    
+    def get_stream_config(self) -> Dict[str, Any]:
+        """Get server-sent events stream configuration"""
+        if not self._config.has_section("stream"):
+            return {
+                "backlog_size": 1000,
+                "queue_size": 256,
+                "heartbeat_seconds": 15
+            }
+        
+        return {
+            "backlog_size": self._config.getint("stream", "backlog_size", fallback=1000),
+            "queue_size": self._config.getint("stream", "queue_size", fallback=256),
+            "heartbeat_seconds": self._config.getfloat("stream", "heartbeat_seconds", fallback=15)
+        }
+    
+    def get_snapshot_config(self) -> Dict[str, Any]:
+        """Get standings snapshot configuration"""
+        if not self._config.has_section("snapshots"):
+            return {
+                "every_changes": 500
+            }
+        
+        return {
+            "every_changes": self._config.getint("snapshots", "every_changes", fallback=500)
+        }
+    
+    def get_rating_config(self) -> Dict[str, Any]:
+        """Get Elo rating parameters"""
+        if not self._config.has_section("ratings"):
+            return {
+                "initial_rating": 1500.0,
+                "k_factor": 32.0,
+                "scale": 400.0
+            }
+        
+        return {
+            "initial_rating": self._config.getfloat("ratings", "initial_rating", fallback=1500.0),
+            "k_factor": self._config.getfloat("ratings", "k_factor", fallback=32.0),
+            "scale": self._config.getfloat("ratings", "scale", fallback=400.0)
+        }
+    
+    def get_pagination_config(self) -> Dict[str, Any]:
+        """Get list endpoint pagination configuration"""
+        if not self._config.has_section("pagination"):
+            return {
+                "max_page_size": 100
+            }
+        
+        return {
+            "max_page_size": self._config.getint("pagination", "max_page_size", fallback=100)
+        }
+    
+    def get_scheduling_config(self) -> Dict[str, Any]:
+        """Get fixture scheduling and conflict detection configuration"""
+        if not self._config.has_section("scheduling"):
+            return {
+                "default_match_minutes": 60,
+                "reject_conflicts": True,
+                "timezone": "UTC"
+            }
+        
+        return {
+            "default_match_minutes": self._config.getint("scheduling", "default_match_minutes", fallback=60),
+            "reject_conflicts": self._config.getboolean("scheduling", "reject_conflicts", fallback=True),
+            "timezone": self._config.get("scheduling", "timezone", fallback="UTC")
+        }
+    
+    def get_scoring_config(self) -> Dict[str, Any]:
+        """Get result scoring configuration"""
+        if not self._config.has_section("scoring"):
+            return {
+                "default_win_points": 10,
+                "draw_points": 0,
+                "loss_points": 0,
+                "rescore_batch": 500
+            }
+        
+        return {
+            "default_win_points": self._config.getint("scoring", "default_win_points", fallback=10),
+            "draw_points": self._config.getint("scoring", "draw_points", fallback=0),
+            "loss_points": self._config.getint("scoring", "loss_points", fallback=0),
+            "rescore_batch": self._config.getint("scoring", "rescore_batch", fallback=500)
+        }
+    
+    def get_live_scoring_config(self) -> Dict[str, Any]:
+        """Get live scoring buffering configuration"""
+        if not self._config.has_section("live_scoring"):
+            return {
+                "flush_seconds": 2.0,
+                "flush_batch": 200,
+                "idle_seconds": 900
+            }
+        
+        return {
+            "flush_seconds": self._config.getfloat("live_scoring", "flush_seconds", fallback=2.0),
+            "flush_batch": self._config.getint("live_scoring", "flush_batch", fallback=200),
+            "idle_seconds": self._config.getint("live_scoring", "idle_seconds", fallback=900)
+        }
+    
+    def get_genai_config(self) -> Dict[str, Any]:
+        """Get LLM provider and summary job queue configuration"""
+        if not self._config.has_section("genai"):
+            return {
+                "provider": "stub",
+                "model": "gpt-3.5-turbo",
+                "api_key": None,
+                "workers": 2,
+                "queue_size": 100,
+                "timeout_seconds": 20.0,
+                "max_attempts": 3,
+                "backoff_seconds": 1.0,
+                "stub_latency_seconds": 0.0,
+                "stub_failure_rate": 0.0,
+                "cache_max_entries": 10000,
+                "cache_ttl_days": 180,
+                "batch_size": 20,
+                "batch_max_chars": 12000,
+                "batch_concurrency": 4
+            }
+        
+        return {
+            "provider": self._config.get("genai", "provider", fallback="stub"),
+            "model": self._config.get("genai", "model", fallback="gpt-3.5-turbo"),
+            "api_key": self._config.get("genai", "api_key", fallback=None) or None,
+            "workers": self._config.getint("genai", "workers", fallback=2),
+            "queue_size": self._config.getint("genai", "queue_size", fallback=100),
+            "timeout_seconds": self._config.getfloat("genai", "timeout_seconds", fallback=20.0),
+            "max_attempts": self._config.getint("genai", "max_attempts", fallback=3),
+            "backoff_seconds": self._config.getfloat("genai", "backoff_seconds", fallback=1.0),
+            "stub_latency_seconds": self._config.getfloat("genai", "stub_latency_seconds", fallback=0.0),
+            "stub_failure_rate": self._config.getfloat("genai", "stub_failure_rate", fallback=0.0),
+            "cache_max_entries": self._config.getint("genai", "cache_max_entries", fallback=10000),
+            "cache_ttl_days": self._config.getint("genai", "cache_ttl_days", fallback=180),
+            "batch_size": self._config.getint("genai", "batch_size", fallback=20),
+            "batch_max_chars": self._config.getint("genai", "batch_max_chars", fallback=12000),
+            "batch_concurrency": self._config.getint("genai", "batch_concurrency", fallback=4)
+        }
+    
+    def get_resilience_config(self, dependency: str) -> Dict[str, Any]:
+        """Get the timeout, concurrency, circuit breaker and fault injection settings of an outbound dependency (s3, llm)"""
+        defaults = {
+            "timeout_seconds": 5.0 if dependency == "s3" else 30.0,
+            "max_concurrent": 8 if dependency == "s3" else 4,
+            "wait_seconds": 0.5,
+            "failure_threshold": 5,
+            "reset_seconds": 30.0,
+            "half_open_calls": 1,
+            "fault_latency_seconds": 0.0,
+            "fault_failure_rate": 0.0
+        }
+        if not self._config.has_section("resilience"):
+            return defaults
+        
+        settings = {}
+        for key, default in defaults.items():
+            option = f"{dependency}_{key}"
+            if isinstance(default, int):
+                settings[key] = self._config.getint("resilience", option, fallback=default)
+            else:
+                settings[key] = self._config.getfloat("resilience", option, fallback=default)
+        return settings
+    
     def get(self, section: str, key: str, fallback: Any = None) -> Any:
         """Get a specific config value"""
         if not self._config.has_section(section):
@@ -1,6 +1,9 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from typing import Any, Dict, List, Optional
 import os
 
 # Import config manager
@@ -9,18 +12,100 @@ from codebase.utils.config_manager import config
 # Get database URL from config
 DATABASE_URL = config.get_database_url()
 
-# Create SQLAlchemy engine
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {})
+# Accepted values of the SQLite pragmas that take a keyword
+_SQLITE_JOURNAL_MODES = ("delete", "truncate", "persist", "memory", "wal", "off")
+_SQLITE_SYNCHRONOUS = ("off", "normal", "full", "extra")
+_SQLITE_TEMP_STORES = ("default", "file", "memory")
 
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def _choice(settings: Dict[str, Any], key: str, allowed) -> str:
+    value = settings[key]
+    if value not in allowed:
+        raise ValueError(f"[database] {key} must be one of: {', '.join(allowed)}")
+    return value
+
+def sqlite_pragmas(settings: Dict[str, Any]) -> List[str]:
+    """PRAGMA statements a profile runs on every new SQLite connection"""
+    return [
+        f"PRAGMA journal_mode = {_choice(settings, 'sqlite_journal_mode', _SQLITE_JOURNAL_MODES)}",
+        f"PRAGMA synchronous = {_choice(settings, 'sqlite_synchronous', _SQLITE_SYNCHRONOUS)}",
+        f"PRAGMA busy_timeout = {int(settings['sqlite_busy_timeout_ms'])}",
+        # A negative cache_size is in KiB rather than pages
+        f"PRAGMA cache_size = {-int(settings['sqlite_cache_size_kb'])}",
+        f"PRAGMA mmap_size = {int(settings['sqlite_mmap_size_mb']) * 1024 * 1024}",
+        f"PRAGMA temp_store = {_choice(settings, 'sqlite_temp_store', _SQLITE_TEMP_STORES)}"
+    ]
+
+def create_database_engine(url: str, settings: Optional[Dict[str, Any]] = None) -> Engine:
+    """
+    Create the engine for url with an engine profile ([database] settings by default).
+
+    The tuned profile runs the SQLite pragmas on every new connection, and gives
+    PostgreSQL a sized, pre-pinged pool whose sessions carry statement and lock
+    timeouts. The default profile is a bare engine with the library defaults.
+    """
+    settings = settings if settings is not None else config.get_database_config()
+    profile = _choice(settings, "profile", ("tuned", "default"))
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    in_memory = backend == "sqlite" and parsed.database in (None, "", ":memory:")
+    options: Dict[str, Any] = {}
+    connect_args: Dict[str, Any] = {"check_same_thread": False} if backend == "sqlite" else {}
+
+    if in_memory:
+        # One shared connection: every connection to sqlite:// would otherwise open its own empty database
+        options["poolclass"] = StaticPool
+    elif profile == "tuned":
+        options.update(pool_size=settings["pool_size"], max_overflow=settings["max_overflow"],
+                       pool_timeout=settings["pool_timeout_seconds"])
+        if backend == "postgresql":
+            options.update(pool_pre_ping=settings["pool_pre_ping"], pool_recycle=settings["pool_recycle_seconds"])
+            connect_args["options"] = (f"-c statement_timeout={int(settings['statement_timeout_ms'])} "
+                                       f"-c lock_timeout={int(settings['lock_timeout_ms'])}")
+
+    new_engine = create_engine(url, connect_args=connect_args, **options)
+
+    if profile == "tuned" and backend == "sqlite":
+        pragmas = sqlite_pragmas(settings)
+
+        @event.listens_for(new_engine, "connect")
+        def apply_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            try:
+                for pragma in pragmas:
+                    cursor.execute(pragma)
+            finally:
+                cursor.close()
+
+    return new_engine
+
+# Create SQLAlchemy engine
+engine = create_database_engine(DATABASE_URL)
 
 # Import models to register them with SQLAlchemy
 from codebase.model.request_model import Base
 
+from codebase.utils.versioning import track_table_versions, seed_table_versions
+from codebase.utils.extracted_fields import track_extracted_fields
+from codebase.utils.events import track_stream_events
+
+def create_session_factory(bind: Engine) -> sessionmaker:
+    """Session factory for an engine, with the write hooks every application session needs"""
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=bind)
+    # Bump per-table change counters (used for ETags) on every commit
+    track_table_versions(factory)
+    # Keep the typed copies of extra_data keys in step with extra_data on every write
+    track_extracted_fields(factory)
+    # Publish stream events queued during a transaction once it commits
+    track_stream_events(factory)
+    return factory
+
+# Create session factory
+SessionLocal = create_session_factory(engine)
+
 # Create database tables
 def create_db_tables():
     Base.metadata.create_all(bind=engine)
+    seed_table_versions(engine)
 
 # Get database session
 def get_db():
@@ -0,0 +1,44 @@
+import hashlib
+
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy.orm import Session
+
+from codebase.utils.database import get_db
+from codebase.utils.versioning import get_table_versions
+
+
+def _etag(request: Request, versions: dict) -> str:
+    """Weak ETag derived from the request URL and the change counters of the tables behind it"""
+    fingerprint = "|".join(
+        [request.url.path, request.url.query] + [f"{name}:{versions.get(name, 0)}" for name in sorted(versions)]
+    )
+    return f'W/"{hashlib.sha1(fingerprint.encode()).hexdigest()[:20]}"'
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    # Weak comparison: W/"x" and "x" match
+    bare = etag[2:] if etag.startswith("W/") else etag
+    return any((tag[2:] if tag.startswith("W/") else tag) == bare for tag in candidates)
+
+
+def conditional_get(*tables: str) -> Depends:
+    """
+    Route dependency that answers If-None-Match with 304 before the endpoint runs.
+
+    The ETag changes whenever any of the given tables is written, so polling clients
+    get 304s between results without the service query being executed.
+    """
+    def check(request: Request, response: Response, db: Session = Depends(get_db)) -> None:
+        etag = _etag(request, get_table_versions(db, tables))
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _matches(if_none_match, etag):
+            raise HTTPException(status_code=304, headers=headers)
+
+        response.headers.update(headers)
+
+    return Depends(check)
@@ -0,0 +1,161 @@
+import asyncio
+import json
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, sessionmaker
+
+from codebase.utils.config_manager import config
+
+_PENDING_EVENTS = "pending_events"
+
+# Topics a client can subscribe to; fixtures and match topics take an id suffix
+LEADERBOARD_TOPIC = "leaderboard"
+FIXTURES_TOPIC = "fixtures"
+MATCH_TOPIC = "match"
+
+
+class StreamEvent:
+    """A delta published to one or more topics"""
+    __slots__ = ("id", "topics", "type", "data")
+
+    def __init__(self, event_id: int, topics: Tuple[str, ...], event_type: str, data: Dict[str, Any]):
+        self.id = event_id
+        self.topics = topics
+        self.type = event_type
+        self.data = data
+
+    def to_sse(self) -> str:
+        payload = json.dumps(self.data, separators=(",", ":"), default=str)
+        return f"id: {self.id}\nevent: {self.type}\ndata: {payload}\n\n"
+
+
+class Subscription:
+    """One connected client: its topics and the asyncio queue its events are delivered to"""
+
+    def __init__(self, topics: Set[str], loop: asyncio.AbstractEventLoop, queue_size: int):
+        self.topics = topics
+        self.loop = loop
+        self.queue: "asyncio.Queue[Optional[StreamEvent]]" = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+    def wants(self, stream_event: StreamEvent) -> bool:
+        return any(topic in self.topics for topic in stream_event.topics)
+
+    def deliver(self, stream_event: Optional[StreamEvent]) -> None:
+        """Runs on the subscriber's event loop"""
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(stream_event)
+        except asyncio.QueueFull:
+            # Slow client: end its stream, it will resume from Last-Event-ID
+            self.overflowed = True
+            self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+
+class EventBroker:
+    """
+    In-process fan-out of stream events to asyncio subscribers.
+
+    publish() is thread-safe so sync service functions running in the threadpool can
+    call it. A bounded backlog lets reconnecting clients resume from Last-Event-ID.
+    """
+
+    def __init__(self, backlog_size: int = 1000, queue_size: int = 256):
+        self._backlog: Deque[StreamEvent] = deque(maxlen=backlog_size)
+        self._subscriptions: Set[Subscription] = set()
+        self._lock = threading.Lock()
+        self._last_id = 0
+        self.queue_size = queue_size
+
+    def publish(self, topics: Iterable[str], event_type: str, data: Dict[str, Any]) -> StreamEvent:
+        with self._lock:
+            self._last_id += 1
+            stream_event = StreamEvent(self._last_id, tuple(topics), event_type, data)
+            self._backlog.append(stream_event)
+            subscribers = [s for s in self._subscriptions if s.wants(stream_event)]
+
+        for subscription in subscribers:
+            subscription.loop.call_soon_threadsafe(subscription.deliver, stream_event)
+        return stream_event
+
+    def subscribe(self, topics: Iterable[str], last_event_id: Optional[int] = None) -> Tuple[Subscription, List[StreamEvent], bool]:
+        """
+        Register a subscriber on the running event loop.
+
+        Returns the subscription, the backlog events to replay and whether the
+        client must reload because the events it missed are no longer in the backlog.
+        """
+        subscription = Subscription(set(topics), asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            self._subscriptions.add(subscription)
+            replay: List[StreamEvent] = []
+            reset = False
+            if last_event_id is not None:
+                oldest = self._backlog[0].id if self._backlog else self._last_id + 1
+                reset = last_event_id + 1 < oldest and last_event_id < self._last_id
+                replay = [e for e in self._backlog if e.id > last_event_id and subscription.wants(e)]
+        return subscription, replay, reset
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscriptions)
+
+
+_stream_config = config.get_stream_config()
+
+broker = EventBroker(
+    backlog_size=_stream_config["backlog_size"],
+    queue_size=_stream_config["queue_size"]
+)
+
+
+def match_topics(match_id: int, *game_ids: Optional[int]) -> List[str]:
+    """Topics that carry changes to a match: the match itself and its games' fixtures"""
+    topics = [f"{MATCH_TOPIC}:{match_id}", FIXTURES_TOPIC]
+    topics.extend(f"{FIXTURES_TOPIC}:{game_id}" for game_id in dict.fromkeys(game_ids) if game_id)
+    return topics
+
+
+def parse_topics(raw_topics: Iterable[str]) -> Set[str]:
+    """Validate subscription topics such as 'leaderboard', 'fixtures', 'fixtures:3' or 'match:12'"""
+    topics = set()
+    for topic in raw_topics:
+        name, _, suffix = topic.partition(":")
+        if name == LEADERBOARD_TOPIC and not suffix:
+            topics.add(topic)
+        elif name == FIXTURES_TOPIC and (not suffix or suffix.isdigit()):
+            topics.add(topic)
+        elif name == MATCH_TOPIC and suffix.isdigit():
+            topics.add(topic)
+        else:
+            raise ValueError(f"Unknown stream topic '{topic}'")
+    return topics
+
+
+def queue_event(db: Session, topics: Iterable[str], event_type: str, data: Dict[str, Any]) -> None:
+    """Publish an event once the session's current transaction commits"""
+    db.info.setdefault(_PENDING_EVENTS, []).append((tuple(topics), event_type, data))
+
+
+def _publish_pending(session: Session) -> None:
+    for topics, event_type, data in session.info.pop(_PENDING_EVENTS, []):
+        broker.publish(topics, event_type, data)
+
+
+def _discard_pending(session: Session, *args) -> None:
+    session.info.pop(_PENDING_EVENTS, None)
+
+
+def track_stream_events(session_factory: sessionmaker) -> None:
+    """Publish queued events after commit and drop them on rollback"""
+    event.listen(session_factory, "after_commit", _publish_pending)
+    event.listen(session_factory, "after_rollback", _discard_pending)
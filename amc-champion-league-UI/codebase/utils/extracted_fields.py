@@ -0,0 +1,165 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Boolean, Column, Float, Integer, Table, event, inspect, text, update
+from sqlalchemy.orm import Session, attributes, sessionmaker
+from sqlalchemy.sql import visitors
+
+from codebase.model.request_model import Base
+
+# Rows written per bulk UPDATE batch when filling extracted columns
+_BACKFILL_BATCH = 1000
+
+
+def extracted_fields(model: Any) -> Dict[str, Tuple[str, ...]]:
+    """A model's declared extracted fields: column name -> path of keys inside extra_data"""
+    return getattr(model, "__extracted_fields__", None) or {}
+
+
+def extracted_models() -> List[Any]:
+    """Every mapped model that declares extracted fields"""
+    return sorted((mapper.class_ for mapper in Base.registry.mappers if extracted_fields(mapper.class_)),
+                  key=lambda model: model.__tablename__)
+
+
+def _models_by_table() -> Dict[str, Any]:
+    return {model.__tablename__: model for model in extracted_models()}
+
+
+def _coerce(value: Any, column_type: Any) -> Any:
+    """
+    Convert an extra_data value to its column's type.
+
+    Boolean columns hold whether the value is present and not empty. Numbers stored as
+    strings are accepted; anything that does not fit the column (a list, "n/a") is NULL.
+    """
+    if isinstance(column_type, Boolean):
+        return bool(value)
+    if value is None or isinstance(value, (dict, list)):
+        return None
+    if isinstance(column_type, (Integer, Float)):
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            return None
+        if isinstance(column_type, Float):
+            return number
+        return int(number) if number.is_integer() else None
+    return str(value)
+
+
+def extract_value(extra_data: Any, path: Sequence[str], column_type: Any) -> Any:
+    """The value at path inside extra_data, converted to the column type"""
+    value = extra_data
+    for key in path:
+        value = value.get(key) if isinstance(value, dict) else None
+    return _coerce(value, column_type)
+
+
+def extracted_values(model: Any, extra_data: Any) -> Dict[str, Any]:
+    """Column values a model's extracted fields take for this extra_data"""
+    columns = model.__table__.c
+    return {name: extract_value(extra_data, path, columns[name].type)
+            for name, path in extracted_fields(model).items()}
+
+
+def sync_extracted(obj: Any) -> None:
+    """Recompute an object's extracted columns from its extra_data"""
+    for name, value in extracted_values(type(obj), obj.extra_data).items():
+        setattr(obj, name, value)
+
+
+def _sync_flush(session: Session, flush_context, instances) -> None:
+    """Refresh the extracted columns of new objects and of objects whose extra_data was replaced"""
+    for obj in list(session.new) + list(session.dirty):
+        if not extracted_fields(type(obj)):
+            continue
+        if obj in session.new or attributes.get_history(obj, "extra_data").has_changes():
+            sync_extracted(obj)
+
+
+def _sync_bulk_statement(orm_execute_state) -> None:
+    """Add extracted values to bulk INSERT/UPDATE parameter rows that carry extra_data"""
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update):
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    model = _models_by_table().get(getattr(table, "name", None))
+    if model is None:
+        return
+    parameters = orm_execute_state.parameters
+    rows = parameters if isinstance(parameters, list) else [parameters] if isinstance(parameters, dict) else []
+    for row in rows:
+        if "extra_data" in row:
+            row.update(extracted_values(model, row["extra_data"]))
+
+
+def track_extracted_fields(session_factory: sessionmaker) -> None:
+    """
+    Keep extracted columns in step with extra_data for every write through this factory.
+
+    Covers objects written by a flush and parameter rows of bulk INSERT/UPDATE statements.
+    extra_data is a plain JSON column, so changes must assign a new dict (in-place
+    mutations are not written at all).
+    """
+    event.listen(session_factory, "before_flush", _sync_flush)
+    event.listen(session_factory, "do_orm_execute", _sync_bulk_statement)
+
+
+def backfill_extracted(db: Session, model: Any, columns: Optional[Iterable[str]] = None) -> int:
+    """Recompute a model's extracted columns (all, or the given ones) for every row; returns rows updated"""
+    columns = list(columns) if columns is not None else list(extracted_fields(model))
+    rows = db.query(model.id, model.extra_data, *(getattr(model, name) for name in columns)).all()
+
+    values = []
+    for row in rows:
+        extracted = extracted_values(model, row.extra_data)
+        changed = {name: extracted[name] for name in columns if getattr(row, name) != extracted[name]}
+        if changed:
+            values.append({"id": row.id, **changed})
+
+    # ORM bulk UPDATE by primary key, one executemany per batch and set of columns
+    for start in range(0, len(values), _BACKFILL_BATCH):
+        db.execute(update(model), values[start:start + _BACKFILL_BATCH])
+    db.commit()
+    return len(values)
+
+
+def create_available_indexes(db: Session, table: Table) -> None:
+    """
+    Create a table's missing indexes, skipping those on columns the database table lacks.
+
+    Each migration adds its own columns and then calls this, so an index spanning columns
+    of several migrations is created by whichever of them runs last.
+    """
+    bind = db.get_bind()
+    existing = {column["name"] for column in inspect(bind).get_columns(table.name)}
+    for index in table.indexes:
+        columns = {element.name for expression in index.expressions
+                   for element in visitors.iterate(expression) if isinstance(element, Column)}
+        if columns <= existing:
+            index.create(bind=bind, checkfirst=True)
+
+
+def ensure_extracted_fields(db: Session) -> Dict[str, int]:
+    """
+    Migrate databases that predate an extracted field.
+
+    Adds missing extracted columns and their indexes (create_all does not alter existing
+    tables), including the PostgreSQL GIN indexes on extra_data, then fills the new
+    columns from extra_data. Returns the rows filled per table. Safe to run repeatedly.
+    """
+    bind = db.get_bind()
+    filled = {}
+    for model in extracted_models():
+        table = model.__table__
+        existing = {column["name"] for column in inspect(bind).get_columns(table.name)}
+        missing = [name for name in extracted_fields(model) if name not in existing]
+        for name in missing:
+            column_type = table.c[name].type.compile(dialect=bind.dialect)
+            db.execute(text(f'ALTER TABLE "{table.name}" ADD COLUMN {name} {column_type}'))
+        db.commit()
+
+        create_available_indexes(db, table)
+
+        if missing:
+            filled[table.name] = backfill_extracted(db, model, missing)
+    return filled
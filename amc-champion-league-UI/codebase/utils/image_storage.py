@@ -1,11 +1,14 @@
 import boto3
 import os
+import threading
+from botocore.config import Config as BotoConfig
 from fastapi import UploadFile
-from typing import List, Optional
+from typing import Dict, List
 import uuid
 
 # Import config manager
 from codebase.utils.config_manager import config
+from codebase.utils.resilience import dependency
 
 # Get storage configuration
 storage_config = config.get_storage_config()
@@ -14,8 +17,55 @@ S3_REGION = storage_config["s3_region"]
 USE_S3 = storage_config["use_s3"]
 LOCAL_IMAGE_DIR = storage_config["local_image_dir"]
 
-# Initialize S3 client if S3 is enabled
-s3_client = boto3.client('s3') if USE_S3 else None
+
+class StubS3Client:
+    """In-memory stand-in for the few S3 calls used here ([storage] s3_stub), for offline testing"""
+
+    def __init__(self):
+        self._objects: Dict[str, Dict[str, bytes]] = {}
+        self._lock = threading.Lock()
+
+    def put_object(self, Bucket: str, Key: str, Body: bytes):
+        with self._lock:
+            self._objects.setdefault(Bucket, {})[Key] = Body
+        return {}
+
+    def list_objects_v2(self, Bucket: str, Prefix: str = ""):
+        with self._lock:
+            keys = sorted(key for key in self._objects.get(Bucket, {}) if key.startswith(Prefix))
+        return {"Contents": [{"Key": key} for key in keys]} if keys else {}
+
+    def delete_object(self, Bucket: str, Key: str):
+        with self._lock:
+            self._objects.get(Bucket, {}).pop(Key, None)
+        return {}
+
+
+# Every S3 call goes through the shared s3 guard: deadline, bounded concurrency, circuit breaker
+s3 = dependency("s3")
+
+_s3_client = None
+_s3_client_lock = threading.Lock()
+
+def get_s3_client():
+    """The S3 client, created on first use with connect/read timeouts inside the s3 deadline"""
+    global _s3_client
+    if _s3_client is None:
+        with _s3_client_lock:
+            if _s3_client is None:
+                if storage_config["s3_stub"]:
+                    _s3_client = StubS3Client()
+                else:
+                    _s3_client = boto3.client('s3', region_name=S3_REGION, config=BotoConfig(
+                        connect_timeout=min(2.0, s3.timeout_seconds),
+                        read_timeout=s3.timeout_seconds,
+                        retries={"max_attempts": 1},
+                        max_pool_connections=s3.max_concurrent
+                    ))
+    return _s3_client
+
+# Last successful listing per folder, served while S3 is unavailable
+_listing_cache: Dict[str, List[str]] = {}
 
 # Ensure local directory exists if not using S3
 if not USE_S3:
@@ -28,31 +78,33 @@ if not USE_S3:
 async def upload_image_to_storage(file: UploadFile, folder: str = "gallery") -> str:
     """
     Upload an image to S3 or local storage and return the path/URL
-    
+
     Args:
         file: The uploaded file
         folder: Subfolder to store the image in (games, franchises, players, gallery)
-        
+
     Returns:
         str: The path/URL to the uploaded image
+
+    Raises:
+        DependencyUnavailableError: S3 is failing, too slow or its circuit is open
     """
     # Generate unique filename
     file_extension = os.path.splitext(file.filename)[1]
     unique_filename = f"{uuid.uuid4()}{file_extension}"
-    
+
     # Full path for the file
     file_path = f"{folder}/{unique_filename}"
-    
+
     # Read file content
     file_content = await file.read()
-    
+
     if USE_S3:
-        # Upload to S3
-        s3_client.put_object(
-            Bucket=S3_BUCKET_NAME,
-            Key=file_path,
-            Body=file_content
+        # Upload to S3 off the event loop, under the s3 deadline
+        await s3.call_async(
+            lambda: get_s3_client().put_object(Bucket=S3_BUCKET_NAME, Key=file_path, Body=file_content)
         )
+        _listing_cache.pop(folder, None)
         return f"s3://{S3_BUCKET_NAME}/{file_path}"
     else:
         # Save to local filesystem
@@ -64,39 +116,45 @@ async def upload_image_to_storage(file: UploadFile, folder: str = "gallery") ->
 def list_images_from_storage(folder: str = "gallery") -> List[str]:
     """
     List all images in a specific folder from S3 or local storage
-    
+
+    While S3 is unavailable the last successful listing of the folder is returned
+    (or an empty list if there is none).
+
     Args:
         folder: The folder to list images from
-        
+
     Returns:
         List[str]: List of image paths/URLs
     """
     if USE_S3:
         # List objects from S3
-        response = s3_client.list_objects_v2(
-            Bucket=S3_BUCKET_NAME,
-            Prefix=folder
-        )
-        
-        if 'Contents' in response:
-            return [f"s3://{S3_BUCKET_NAME}/{item['Key']}" for item in response['Contents']]
-        return []
+        def fetch():
+            response = get_s3_client().list_objects_v2(Bucket=S3_BUCKET_NAME, Prefix=folder)
+            if 'Contents' in response:
+                return [f"s3://{S3_BUCKET_NAME}/{item['Key']}" for item in response['Contents']]
+            return []
+
+        images = s3.call(fetch, fallback=lambda error: None)
+        if images is None:
+            return list(_listing_cache.get(folder, []))
+        _listing_cache[folder] = images
+        return images
     else:
         # List files from local directory
         folder_path = os.path.join(LOCAL_IMAGE_DIR, folder)
         if not os.path.exists(folder_path):
             return []
-            
+
         files = os.listdir(folder_path)
         return [f"/images/{folder}/{file}" for file in files]
 
 def delete_image_from_storage(image_path: str) -> bool:
     """
     Delete an image from S3 or local storage
-    
+
     Args:
         image_path: The full path/URL to the image
-        
+
     Returns:
         bool: True if deletion was successful
     """
@@ -104,7 +162,8 @@ def delete_image_from_storage(image_path: str) -> bool:
         if USE_S3 and image_path.startswith(f"s3://{S3_BUCKET_NAME}/"):
             # Extract key from S3 URL
             key = image_path.replace(f"s3://{S3_BUCKET_NAME}/", "")
-            s3_client.delete_object(Bucket=S3_BUCKET_NAME, Key=key)
+            s3.call(lambda: get_s3_client().delete_object(Bucket=S3_BUCKET_NAME, Key=key))
+            _listing_cache.pop(key.split("/", 1)[0], None)
         elif image_path.startswith("/images/"):
             # Delete from local filesystem
             local_path = os.path.join(LOCAL_IMAGE_DIR, image_path.replace("/images/", ""))
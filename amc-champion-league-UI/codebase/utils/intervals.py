@@ -0,0 +1,75 @@
+import bisect
+from datetime import datetime, timedelta
+from typing import Dict, Hashable, Iterator, List, Optional, Set, Tuple
+
+# (start, end, item): a half-open [start, end) interval owned by an item
+Interval = Tuple[datetime, datetime, Hashable]
+
+
+class IntervalIndex:
+    """
+    Half-open [start, end) intervals grouped by key, for overlap lookups.
+
+    Each key keeps its intervals sorted by start together with the longest interval it
+    holds, so an overlap query only has to look at intervals starting in
+    (start - longest, end): two binary searches plus the k candidates in that window,
+    O(log n + k) per check. Not thread-safe; callers hold their own lock.
+    """
+
+    def __init__(self):
+        self._buckets: Dict[Hashable, List[Interval]] = {}
+        self._longest: Dict[Hashable, timedelta] = {}
+        self._keys: Dict[Hashable, Set[Hashable]] = {}  # item -> keys it is indexed under
+        self._spans: Dict[Hashable, Tuple[datetime, datetime]] = {}
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._spans
+
+    def add(self, item: Hashable, start: datetime, end: datetime, keys: Set[Hashable]) -> None:
+        """Index an item's interval under each of its keys, replacing any earlier entry"""
+        if item in self._spans:
+            self.remove(item)
+        self._spans[item] = (start, end)
+        self._keys[item] = set(keys)
+        for key in keys:
+            bisect.insort(self._buckets.setdefault(key, []), (start, end, item), key=lambda entry: entry[:2])
+            if end - start > self._longest.get(key, timedelta(0)):
+                self._longest[key] = end - start
+
+    def remove(self, item: Hashable) -> None:
+        span = self._spans.pop(item, None)
+        if span is None:
+            return
+        for key in self._keys.pop(item):
+            bucket = self._buckets[key]
+            position = bisect.bisect_left(bucket, span, key=lambda entry: entry[:2])
+            while bucket[position][2] != item:
+                position += 1
+            del bucket[position]
+            if not bucket:
+                del self._buckets[key]
+                del self._longest[key]
+
+    def overlapping(self, key: Hashable, start: datetime, end: datetime,
+                    ignore: Optional[Hashable] = None) -> Iterator[Interval]:
+        """Intervals under key that overlap [start, end)"""
+        bucket = self._buckets.get(key)
+        if not bucket:
+            return
+        low = bisect.bisect_right(bucket, start - self._longest[key], key=lambda entry: entry[0])
+        high = bisect.bisect_left(bucket, end, key=lambda entry: entry[0])
+        for entry in bucket[low:high]:
+            if entry[1] > start and entry[2] != ignore:
+                yield entry
+
+    def overlapping_pairs(self) -> Iterator[Tuple[Hashable, Interval, Interval]]:
+        """Every pair of overlapping intervals under the same key, as (key, earlier, later)"""
+        for key, bucket in self._buckets.items():
+            for position, later in enumerate(bucket):
+                low = bisect.bisect_right(bucket, later[0] - self._longest[key], 0, position, key=lambda entry: entry[0])
+                for earlier in bucket[low:position]:
+                    if earlier[1] > later[0]:
+                        yield key, earlier, later
@@ -0,0 +1,76 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Sequence
+
+from fastapi import Query, Request, Response
+from sqlalchemy import DateTime, and_, or_
+
+from codebase.utils.config_manager import config
+
+MAX_PAGE_SIZE = config.get_pagination_config()["max_page_size"]
+
+
+def page_limit(default: int = 100):
+    """Query parameter for a page size capped at the configured maximum"""
+    return Query(min(default, MAX_PAGE_SIZE), ge=1, le=MAX_PAGE_SIZE)
+
+
+def encode_cursor(*values: Any) -> str:
+    """Opaque cursor holding the sort key of the last row of a page"""
+    raw = json.dumps(list(values), separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def _cursor_value(column, value: Any) -> Any:
+    """Cursors carry timestamps as strings; turn them back into datetimes for DateTime columns"""
+    if isinstance(value, str) and isinstance(getattr(column, "type", None), DateTime):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            raise ValueError("Invalid cursor")
+    return value
+
+
+def keyset(query, columns: Sequence, after: Optional[str] = None):
+    """
+    Order a query by the given (ascending, non-null) columns and start it after a cursor.
+
+    The cursor condition is (c1 > v1) OR (c1 = v1 AND c2 > v2) ..., which lets the
+    database seek into an index on the columns instead of counting past an OFFSET.
+    """
+    query = query.order_by(*columns)
+    if after is None:
+        return query
+
+    values = [_cursor_value(column, value) for column, value in zip(columns, decode_cursor(after, len(columns)))]
+    conditions = []
+    for index, column in enumerate(columns):
+        equal = [columns[position] == values[position] for position in range(index)]
+        conditions.append(and_(*equal, column > values[index]))
+    return query.filter(or_(*conditions))
+
+
+def next_cursor(items: Sequence, limit: int, key: Callable[[Any], Sequence]) -> Optional[str]:
+    """Cursor for the page after items, or None when this page was not full"""
+    if len(items) < limit or not items:
+        return None
+    return encode_cursor(*key(items[-1]))
+
+
+def set_next_cursor(request: Request, response: Response, cursor: Optional[str]) -> None:
+    """Expose the next page through X-Next-Cursor and a Link rel="next" header"""
+    if cursor is None:
+        return
+    response.headers["X-Next-Cursor"] = cursor
+    response.headers["Link"] = f'<{request.url.include_query_params(after=cursor)}>; rel="next"'
@@ -0,0 +1,283 @@
+import asyncio
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from codebase.utils.config_manager import config
+
+# Upper bounds (seconds) of the call latency histogram exported on /metrics
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class DependencyUnavailableError(Exception):
+    """An outbound call was not made or not completed; retry_after hints when to try again"""
+
+    def __init__(self, dependency: str, message: str, retry_after: float = 1.0):
+        self.dependency = dependency
+        self.retry_after = retry_after
+        super().__init__(f"{dependency}: {message}")
+
+
+class CircuitOpenError(DependencyUnavailableError):
+    """The dependency's circuit is open after repeated failures"""
+
+
+class DependencyBusyError(DependencyUnavailableError):
+    """Every concurrent call slot for the dependency is taken"""
+
+
+class DeadlineExceededError(DependencyUnavailableError, TimeoutError):
+    """The call did not finish before its deadline"""
+
+
+class InjectedFault(Exception):
+    """A failure raised on purpose by a dependency's fault injection settings"""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    Opens after failure_threshold failures in a row and rejects calls for reset_seconds;
+    then lets up to half_open_calls probe calls through. A successful probe closes the
+    circuit, a failed one opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 30.0, half_open_calls: int = 1):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.half_open_calls = half_open_calls
+        self.state = CLOSED
+        self.failures = 0
+        self.trips = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == OPEN:
+                if time.monotonic() < self._opened_at + self.reset_seconds:
+                    return False
+                self.state = HALF_OPEN
+                self._probes = 0
+            if self.state == HALF_OPEN:
+                if self._probes >= self.half_open_calls:
+                    return False
+                self._probes += 1
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.state = CLOSED
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.trips += 1
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+
+    def retry_after(self) -> float:
+        """Seconds until an open circuit lets a probe through"""
+        with self._lock:
+            if self.state != OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self.reset_seconds - time.monotonic())
+
+
+class Dependency:
+    """
+    Guarded access to one outbound dependency (S3, the LLM API).
+
+    Every call gets a concurrency slot (waiting at most wait_seconds), passes the circuit
+    breaker and runs on the dependency's own worker threads under a deadline. A call past
+    its deadline frees the caller, but keeps its slot until the underlying call returns,
+    so a hung dependency can never hold more than max_concurrent threads. When the call is
+    refused or fails, the fallback (if given) provides the result instead.
+    """
+
+    def __init__(self, name: str, timeout_seconds: float = 5.0, max_concurrent: int = 8, wait_seconds: float = 0.5,
+                 failure_threshold: int = 5, reset_seconds: float = 30.0, half_open_calls: int = 1,
+                 fault_latency_seconds: float = 0.0, fault_failure_rate: float = 0.0):
+        self.name = name
+        self.timeout_seconds = timeout_seconds
+        self.wait_seconds = wait_seconds
+        self.max_concurrent = max_concurrent
+        self.fault_latency_seconds = fault_latency_seconds
+        self.fault_failure_rate = fault_failure_rate
+        self.breaker = CircuitBreaker(failure_threshold, reset_seconds, half_open_calls)
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix=f"{name}-call")
+        self._lock = threading.Lock()
+        self.counters = {"calls": 0, "failures": 0, "timeouts": 0, "rejected": 0, "busy": 0, "fallbacks": 0}
+        self.in_flight = 0
+        self._latency_buckets = [0] * len(LATENCY_BUCKETS)
+        self._latency_sum = 0.0
+        self._latency_count = 0
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self.counters[counter] += 1
+
+    def _observe(self, seconds: float) -> None:
+        with self._lock:
+            self._latency_sum += seconds
+            self._latency_count += 1
+            for position, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    self._latency_buckets[position] += 1
+
+    def _run(self, fn: Callable, args: Tuple, kwargs: Dict[str, Any]) -> Any:
+        """Runs on a dependency thread: injected faults first, then the call itself"""
+        if self.fault_latency_seconds:
+            time.sleep(self.fault_latency_seconds)
+        if self.fault_failure_rate and random.random() < self.fault_failure_rate:
+            raise InjectedFault(f"{self.name} failure (injected)")
+        return fn(*args, **kwargs)
+
+    def _release(self, future: Future) -> None:
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+    def _start(self, fn: Callable, args: Tuple, kwargs: Dict[str, Any]) -> Future:
+        """Pass the breaker with a slot already held, and start the call"""
+        if not self.breaker.allow():
+            self._slots.release()
+            self._count("rejected")
+            raise CircuitOpenError(self.name, "circuit open", retry_after=self.breaker.retry_after() or 1.0)
+        with self._lock:
+            self.counters["calls"] += 1
+            self.in_flight += 1
+        future = self._executor.submit(self._run, fn, args, kwargs)
+        future.add_done_callback(self._release)
+        return future
+
+    def _busy(self) -> DependencyBusyError:
+        self._count("busy")
+        return DependencyBusyError(self.name, f"all {self.max_concurrent} call slots are in use")
+
+    def _finish(self, started: float, error: Optional[BaseException]) -> None:
+        self._observe(time.monotonic() - started)
+        if error is None:
+            self.breaker.record_success()
+            return
+        self._count("timeouts" if isinstance(error, DeadlineExceededError) else "failures")
+        self.breaker.record_failure()
+
+    def _timeout(self, timeout: Optional[float]) -> float:
+        return min(timeout, self.timeout_seconds) if timeout else self.timeout_seconds
+
+    def call(self, fn: Callable, *args, fallback: Optional[Callable[[Exception], Any]] = None,
+             timeout: Optional[float] = None, **kwargs) -> Any:
+        """Call fn(*args, **kwargs) under this dependency's guards; raises DependencyUnavailableError or fn's error"""
+        try:
+            if not self._slots.acquire(timeout=self.wait_seconds):
+                raise self._busy()
+            future = self._start(fn, args, kwargs)
+        except DependencyUnavailableError as e:
+            return self._fall_back(fallback, e)
+
+        started = time.monotonic()
+        deadline = self._timeout(timeout)
+        try:
+            result = future.result(timeout=deadline)
+        except FutureTimeoutError:
+            error = DeadlineExceededError(self.name, f"no answer within {deadline:g}s")
+            self._finish(started, error)
+            return self._fall_back(fallback, error)
+        except Exception as e:
+            self._finish(started, e)
+            return self._fall_back(fallback, e)
+        self._finish(started, None)
+        return result
+
+    async def call_async(self, fn: Callable, *args, fallback: Optional[Callable[[Exception], Any]] = None,
+                         timeout: Optional[float] = None, **kwargs) -> Any:
+        """call() for coroutines: the event loop is never blocked on the dependency"""
+        loop = asyncio.get_running_loop()
+        try:
+            if not self._slots.acquire(blocking=False):
+                acquired = await loop.run_in_executor(None, self._slots.acquire, True, self.wait_seconds)
+                if not acquired:
+                    raise self._busy()
+            future = self._start(fn, args, kwargs)
+        except DependencyUnavailableError as e:
+            return self._fall_back(fallback, e)
+
+        started = time.monotonic()
+        deadline = self._timeout(timeout)
+        try:
+            result = await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout=deadline)
+        except asyncio.TimeoutError:
+            error = DeadlineExceededError(self.name, f"no answer within {deadline:g}s")
+            self._finish(started, error)
+            return self._fall_back(fallback, error)
+        except Exception as e:
+            self._finish(started, e)
+            return self._fall_back(fallback, e)
+        self._finish(started, None)
+        return result
+
+    def _fall_back(self, fallback: Optional[Callable[[Exception], Any]], error: Exception) -> Any:
+        if fallback is None:
+            raise error
+        self._count("fallbacks")
+        return fallback(error)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self.breaker.state,
+                "trips": self.breaker.trips,
+                "in_flight": self.in_flight,
+                "latency_buckets": list(self._latency_buckets),
+                "latency_sum": self._latency_sum,
+                "latency_count": self._latency_count,
+                **self.counters
+            }
+
+
+_dependencies: Dict[str, Dependency] = {}
+_registry_lock = threading.Lock()
+
+
+def dependency(name: str) -> Dependency:
+    """The shared guard for a dependency, configured from its [resilience] settings"""
+    with _registry_lock:
+        if name not in _dependencies:
+            _dependencies[name] = Dependency(name, **config.get_resilience_config(name))
+        return _dependencies[name]
+
+
+def resilience_metrics() -> List[str]:
+    """Prometheus text lines for every dependency used so far"""
+    lines = []
+    stats = {name: guard.stats() for name, guard in sorted(_dependencies.items())}
+    for counter in ("calls", "failures", "timeouts", "rejected", "busy", "fallbacks", "trips"):
+        lines.append(f"# TYPE amc_dependency_{counter}_total counter")
+        lines.extend(f'amc_dependency_{counter}_total{{dependency="{name}"}} {entry[counter]}'
+                     for name, entry in stats.items())
+    lines.append("# TYPE amc_dependency_in_flight gauge")
+    lines.extend(f'amc_dependency_in_flight{{dependency="{name}"}} {entry["in_flight"]}' for name, entry in stats.items())
+    lines.append("# TYPE amc_dependency_circuit_state gauge")
+    lines.extend(f'amc_dependency_circuit_state{{dependency="{name}"}} {_STATE_VALUES[entry["state"]]}'
+                 for name, entry in stats.items())
+    lines.append("# TYPE amc_dependency_latency_seconds histogram")
+    for name, entry in stats.items():
+        for bound, count in zip(LATENCY_BUCKETS, entry["latency_buckets"]):
+            lines.append(f'amc_dependency_latency_seconds_bucket{{dependency="{name}",le="{bound:g}"}} {count}')
+        lines.append(f'amc_dependency_latency_seconds_bucket{{dependency="{name}",le="+Inf"}} {entry["latency_count"]}')
+        lines.append(f'amc_dependency_latency_seconds_sum{{dependency="{name}"}} {entry["latency_sum"]:.6f}')
+        lines.append(f'amc_dependency_latency_seconds_count{{dependency="{name}"}} {entry["latency_count"]}')
+    return lines
@@ -0,0 +1,131 @@
+from typing import Any, Dict, Iterable, Optional, Set
+
+from sqlalchemy import event, update, insert, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, attributes, sessionmaker
+
+from codebase.model.request_model import Base, TableVersion
+
+_CHANGED_TABLES = "changed_tables"
+_COMMITTED_TABLES = "committed_tables"
+_VERSION_TABLE = TableVersion.__tablename__
+
+# Counters that only move for some columns: counter -> table -> column -> the values that
+# matter (None for any change). Inserting or deleting a row of the table always counts.
+COLUMN_COUNTERS: Dict[str, Dict[str, Dict[str, Optional[Set[Any]]]]] = {
+    # Everything a match's slot in the schedule (conflict checks) is built from
+    "match_schedule": {
+        "match": {"game_id": None, "scheduled_at": None, "match_time": None, "location": None,
+                  "home_team_id": None, "away_team_id": None, "status": {"cancelled"}},
+        "match_player": {"match_id": None, "player_id": None},
+        "team_player": {"team_id": None, "player_id": None},
+        "game": {"match_minutes": None}
+    }
+}
+
+
+def _changed_tables(session: Session) -> Set[str]:
+    return session.info.setdefault(_CHANGED_TABLES, set())
+
+
+def _counted(watched: Dict[str, Optional[Set[Any]]], obj: Any) -> bool:
+    """Whether an updated object changed a watched column to or from a value that matters"""
+    for column, values in watched.items():
+        history = attributes.get_history(obj, column)
+        if not history.has_changes():
+            continue
+        if values is None or values & set(history.added or ()) or values & set(history.deleted or ()):
+            return True
+    return False
+
+
+def _record_flush(session: Session, flush_context) -> None:
+    """Remember which tables (and column counters) the flush wrote to"""
+    changed = _changed_tables(session)
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        table = getattr(obj, "__table__", None)
+        if table is None:
+            continue
+        changed.add(table.name)
+        for counter, tables in COLUMN_COUNTERS.items():
+            watched = tables.get(table.name)
+            if watched is not None and (obj in session.new or obj in session.deleted or _counted(watched, obj)):
+                changed.add(counter)
+
+
+def _statement_columns(orm_execute_state) -> Optional[Set[str]]:
+    """Columns a bulk UPDATE sets, or None when they cannot be told"""
+    parameters = orm_execute_state.parameters
+    rows = parameters if isinstance(parameters, list) else [parameters] if isinstance(parameters, dict) else []
+    columns = {str(key) for row in rows for key in row}
+    values = getattr(orm_execute_state.statement, "_values", None) or {}
+    columns.update(getattr(key, "key", None) or str(key) for key in values)
+    return columns or None
+
+
+def _record_bulk_statement(orm_execute_state) -> None:
+    """Remember tables written by bulk INSERT/UPDATE/DELETE statements, which bypass the flush"""
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    name = getattr(table, "name", None)
+    if not name:
+        return
+    changed = _changed_tables(orm_execute_state.session)
+    changed.add(name)
+    for counter, tables in COLUMN_COUNTERS.items():
+        watched = tables.get(name)
+        if watched is None:
+            continue
+        # Old values are unknown here, so any watched column counts
+        columns = _statement_columns(orm_execute_state) if orm_execute_state.is_update else None
+        if columns is None or columns & set(watched):
+            changed.add(counter)
+
+
+def _bump_versions(session: Session) -> None:
+    """Increment the change counter of every written table inside the committing transaction"""
+    session.flush()
+    changed = _changed_tables(session) - {_VERSION_TABLE}
+    if changed:
+        session.execute(
+            update(TableVersion)
+            .where(TableVersion.table_name.in_(sorted(changed)))
+            .values(version=TableVersion.version + 1)
+        )
+    session.info[_CHANGED_TABLES] = set()
+    session.info[_COMMITTED_TABLES] = changed
+
+
+def _forget_changes(session: Session, *args) -> None:
+    session.info.pop(_CHANGED_TABLES, None)
+
+
+def committed_tables(db: Session) -> Set[str]:
+    """Tables and column counters the session's last commit bumped"""
+    return set(db.info.get(_COMMITTED_TABLES, ()))
+
+
+def track_table_versions(session_factory: sessionmaker) -> None:
+    """Keep table_version in step with every write made through sessions from this factory"""
+    event.listen(session_factory, "after_flush", _record_flush)
+    event.listen(session_factory, "do_orm_execute", _record_bulk_statement)
+    event.listen(session_factory, "before_commit", _bump_versions)
+    event.listen(session_factory, "after_rollback", _forget_changes)
+
+
+def seed_table_versions(engine: Engine) -> None:
+    """Create a counter row for every mapped table and column counter that does not have one yet"""
+    with engine.begin() as connection:
+        existing = set(connection.execute(select(TableVersion.table_name)).scalars())
+        missing = [name for name in list(Base.metadata.tables) + list(COLUMN_COUNTERS) if name not in existing]
+        if missing:
+            connection.execute(insert(TableVersion), [{"table_name": name, "version": 0} for name in missing])
+
+
+def get_table_versions(db: Session, tables: Iterable[str]) -> Dict[str, int]:
+    """Read the current change counters for the given tables"""
+    rows = db.query(TableVersion.table_name, TableVersion.version).filter(
+        TableVersion.table_name.in_(list(tables))
+    ).all()
+    return {name: version for name, version in rows}
@@ -0,0 +1,40 @@
+"""
+Summarize match notes in bulk, e.g. at the end of a season
+
+Usage: python scripts/backfill_summaries.py [--match-ids 1,2,3] [--overwrite]
+"""
+import argparse
+import os
+import sys
+import time
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from codebase.utils.database import SessionLocal, create_db_tables
+from codebase.service.summary_service import backfill_summaries
+
+def main():
+    """Summarize every match with notes but no summary, packing notes into batch requests"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--match-ids", help="Comma-separated match ids (default: all matches)")
+    parser.add_argument("--overwrite", action="store_true", help="Also replace existing summaries")
+    args = parser.parse_args()
+    match_ids = [int(match_id) for match_id in args.match_ids.split(",")] if args.match_ids else None
+
+    create_db_tables()
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        counts = backfill_summaries(db, match_ids=match_ids, overwrite=args.overwrite)
+        elapsed = time.perf_counter() - started
+        print(f"Summarized {counts['summarized']} matches ({counts['failed']} failed) in {elapsed:.2f}s")
+    except Exception as e:
+        print(f"Error backfilling summaries: {str(e)}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
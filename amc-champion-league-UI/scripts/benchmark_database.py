@@ -0,0 +1,175 @@
+"""
+Benchmark concurrent leaderboard reads and result writes under each engine profile
+
+Each SQLite profile runs on its own copy of the database, so the configured database is
+left untouched. Other databases (--url) are used in place; every result the writers
+change is put back at the end.
+
+Usage: python scripts/benchmark_database.py [--profiles default,tuned] [--readers 8] [--writers 2] [--seconds 10]
+"""
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+from sqlalchemy.engine import make_url
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from codebase.model.request_model import Base, Game, MatchPlayer
+from codebase.service.game_service import get_player_leaderboard, update_match_player_result
+from codebase.service.request_payload import MatchPlayerUpdate
+from codebase.service.schedule_service import ensure_scheduled_at
+from codebase.utils.config_manager import config
+from codebase.utils.database import DATABASE_URL, create_database_engine, create_session_factory
+from codebase.utils.extracted_fields import ensure_extracted_fields
+
+PROFILES = ("default", "tuned")
+
+# The leaderboard query itself, past the in-process query cache
+leaderboard_query = get_player_leaderboard.__wrapped__
+
+def sqlite_copy(url: str, directory: str, profile: str) -> str:
+    """Copy a SQLite database (including any WAL content) for one profile; returns the copy's URL"""
+    target = os.path.join(directory, f"{profile}.db")
+    source = sqlite3.connect(make_url(url).database)
+    copy = sqlite3.connect(target)
+    try:
+        source.backup(copy)
+        # journal_mode=wal is stored in the file: start every copy from the rollback journal
+        copy.execute("PRAGMA journal_mode = delete")
+    finally:
+        copy.close()
+        source.close()
+    return f"sqlite:///{target}"
+
+def percentile(samples, q: float) -> float:
+    return float(np.percentile(samples, q)) * 1000 if samples else 0.0
+
+def run_profile(url: str, settings, readers: int, writers: int, seconds: float, seed: int):
+    """Run reader and writer threads for the given time; returns throughput, latencies and errors"""
+    engine = create_database_engine(url, settings)
+    factory = create_session_factory(engine)
+    Base.metadata.create_all(bind=engine)
+    db = factory()
+    try:
+        # Bring older databases up to the current models, as the application does on startup
+        ensure_extracted_fields(db)
+        ensure_scheduled_at(db)
+        game_ids = [game_id for (game_id,) in db.query(Game.id)]
+        rows = db.query(MatchPlayer.id, MatchPlayer.points_earned).order_by(MatchPlayer.id).all()
+    finally:
+        db.close()
+    if not rows:
+        raise ValueError("The database has no match players; run scripts/create_sample_data.py first")
+
+    stop = threading.Event()
+    lock = threading.Lock()
+    read_times, write_times, errors = [], [], []
+    originals = {}
+
+    def reader(number: int):
+        rng = random.Random(seed + number)
+        times = []
+        while not stop.is_set():
+            session = factory()
+            started = time.perf_counter()
+            try:
+                leaderboard_query(session, limit=10, game_id=rng.choice(game_ids + [None]))
+                times.append(time.perf_counter() - started)
+            except Exception as e:
+                with lock:
+                    errors.append(f"read: {e.__class__.__name__}: {str(e).splitlines()[0]}")
+            finally:
+                session.close()
+        with lock:
+            read_times.extend(times)
+
+    def writer(number: int):
+        rng = random.Random(seed + 1000 + number)
+        times = []
+        while not stop.is_set():
+            match_player_id, points_earned = rng.choice(rows)
+            with lock:
+                originals.setdefault(match_player_id, points_earned)
+            session = factory()
+            started = time.perf_counter()
+            try:
+                update_match_player_result(session, match_player_id,
+                                           MatchPlayerUpdate(points_earned=(points_earned or 0) + rng.randint(1, 5)))
+                times.append(time.perf_counter() - started)
+            except Exception as e:
+                session.rollback()
+                with lock:
+                    errors.append(f"write: {e.__class__.__name__}: {str(e).splitlines()[0]}")
+            finally:
+                session.close()
+        with lock:
+            write_times.extend(times)
+
+    threads = [threading.Thread(target=reader, args=(number,)) for number in range(readers)]
+    threads += [threading.Thread(target=writer, args=(number,)) for number in range(writers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    # Put back every result the writers changed
+    db = factory()
+    try:
+        for match_player_id, points_earned in originals.items():
+            update_match_player_result(db, match_player_id, MatchPlayerUpdate(points_earned=points_earned or 0))
+    finally:
+        db.close()
+        engine.dispose()
+
+    return {
+        "reads": len(read_times) / seconds,
+        "writes": len(write_times) / seconds,
+        "read_p50": percentile(read_times, 50),
+        "read_p95": percentile(read_times, 95),
+        "write_p50": percentile(write_times, 50),
+        "write_p95": percentile(write_times, 95),
+        "errors": errors
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent reads and writes per engine profile")
+    parser.add_argument("--url", default=DATABASE_URL, help="Database to benchmark (default: the configured one)")
+    parser.add_argument("--profiles", default=",".join(PROFILES), help="Comma-separated profiles to compare")
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    profiles = [profile.strip() for profile in args.profiles.split(",") if profile.strip()]
+    sqlite = make_url(args.url).get_backend_name() == "sqlite"
+    directory = tempfile.mkdtemp(prefix="amc-benchmark-") if sqlite else None
+    print(f"{args.readers} readers, {args.writers} writers, {args.seconds:g}s per profile")
+    try:
+        for profile in profiles:
+            settings = dict(config.get_database_config(), profile=profile)
+            url = sqlite_copy(args.url, directory, profile) if sqlite else args.url
+            result = run_profile(url, settings, args.readers, args.writers, args.seconds, args.seed)
+            print(f"{profile:>8}: {result['reads']:8,.0f} reads/s (p50 {result['read_p50']:.1f}ms, "
+                  f"p95 {result['read_p95']:.1f}ms), {result['writes']:6,.0f} writes/s "
+                  f"(p50 {result['write_p50']:.1f}ms, p95 {result['write_p95']:.1f}ms), "
+                  f"{len(result['errors'])} errors")
+            for error in sorted(set(result["errors"]))[:5]:
+                print(f"          {error}")
+    finally:
+        if directory:
+            shutil.rmtree(directory, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
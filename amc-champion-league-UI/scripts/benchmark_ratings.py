@@ -0,0 +1,83 @@
+"""
+Benchmark the vectorized rating recompute on synthetic match history
+
+Usage: python scripts/benchmark_ratings.py --matches 1000000 --players 5000 --team-size 2
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from codebase.service.rating_service import compute_ratings, expected_score
+from codebase.utils.config_manager import config
+
+def synthetic_history(matches: int, players: int, team_size: int, seed: int):
+    """Random matches between two sides of distinct players, participants ordered by match"""
+    rng = np.random.default_rng(seed)
+    per_match = team_size * 2
+    entity_index = _distinct_players(rng, matches, players, per_match)
+    won = np.tile(np.r_[np.ones(team_size, dtype=np.int64), np.zeros(team_size, dtype=np.int64)], matches)
+    match_index = np.repeat(np.arange(matches, dtype=np.int64), per_match)
+    return match_index, entity_index.reshape(-1).astype(np.int64), won
+
+def _distinct_players(rng, matches: int, players: int, per_match: int) -> np.ndarray:
+    picks = rng.integers(0, players, size=(matches, per_match))
+    # Redraw the (rare) matches that picked a player twice
+    while True:
+        ordered = np.sort(picks, axis=1)
+        clashes = np.flatnonzero((ordered[:, 1:] == ordered[:, :-1]).any(axis=1))
+        if len(clashes) == 0:
+            return picks
+        picks[clashes] = rng.integers(0, players, size=(len(clashes), per_match))
+
+def sequential_ratings(match_index, entity_index, won, n_entities, initial_rating, k_factor, scale):
+    """Plain one-match-at-a-time Elo, used to check the vectorized result"""
+    ratings = [initial_rating] * n_entities
+    starts = np.flatnonzero(np.r_[True, match_index[1:] != match_index[:-1]]).tolist() + [len(match_index)]
+    entities, scores = entity_index.tolist(), won.tolist()
+    for start, end in zip(starts[:-1], starts[1:]):
+        sides = {1: [], 0: []}
+        for position in range(start, end):
+            sides[scores[position]].append(ratings[entities[position]])
+        means = {side: sum(values) / len(values) for side, values in sides.items()}
+        for position in range(start, end):
+            side = scores[position]
+            expected = expected_score(means[side], means[1 - side], scale)
+            ratings[entities[position]] += k_factor * (side - expected)
+    return np.asarray(ratings)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the vectorized Elo recompute")
+    parser.add_argument("--matches", type=int, default=1_000_000)
+    parser.add_argument("--players", type=int, default=5_000)
+    parser.add_argument("--team-size", type=int, default=1)
+    parser.add_argument("--check", type=int, default=20_000, help="matches to verify against a sequential replay")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    params = config.get_rating_config()
+    match_index, entity_index, won = synthetic_history(args.matches, args.players, args.team_size, args.seed)
+    print(f"{args.matches:,} matches, {args.players:,} players, {len(match_index):,} participants")
+
+    started = time.perf_counter()
+    ratings, counts = compute_ratings(match_index, entity_index, won, args.players, **params)
+    elapsed = time.perf_counter() - started
+    print(f"Vectorized recompute: {elapsed:.2f}s ({args.matches / elapsed:,.0f} matches/s)")
+    print(f"Rating spread: min {ratings.min():.1f}, max {ratings.max():.1f}, mean {ratings.mean():.1f}")
+
+    if args.check:
+        sample = match_index < args.check
+        vectorized, _ = compute_ratings(match_index[sample], entity_index[sample], won[sample], args.players, **params)
+        started = time.perf_counter()
+        reference = sequential_ratings(match_index[sample], entity_index[sample], won[sample], args.players, **params)
+        elapsed = time.perf_counter() - started
+        print(f"Sequential replay of {args.check:,} matches: {elapsed:.2f}s, "
+              f"max difference {np.abs(vectorized - reference).max():.2e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+"""
+Migration script adding the typed match.scheduled_at column and its calendar indexes
+"""
+import os
+import sys
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from codebase.utils.database import SessionLocal, create_db_tables
+from codebase.service.schedule_service import ensure_scheduled_at
+
+def main():
+    """Add scheduled_at if missing and backfill it from match_date and match_time"""
+    create_db_tables()
+    db = SessionLocal()
+    try:
+        filled = ensure_scheduled_at(db)
+        print(f"Backfilled scheduled_at for {filled} matches")
+    except Exception as e:
+        print(f"Error migrating scheduled_at: {str(e)}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+Correct the points ledger against the match results and rebuild every player's total_points
+"""
+import os
+import sys
+import time
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from codebase.utils.database import SessionLocal, create_db_tables
+from codebase.service.points_service import rebuild_points
+
+def main():
+    """Append ledger corrections and recompute the player totals with set-based statements"""
+    create_db_tables()
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        corrections = rebuild_points(db)
+        elapsed = time.perf_counter() - started
+        print(f"Appended {corrections} ledger corrections and rebuilt all player totals in {elapsed:.2f}s")
+    except Exception as e:
+        print(f"Error rebuilding points: {str(e)}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
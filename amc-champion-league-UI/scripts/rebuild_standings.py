@@ -0,0 +1,28 @@
+"""
+Rebuild the materialized leaderboard standings from match results
+"""
+import os
+import sys
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from codebase.utils.database import SessionLocal, create_db_tables
+from codebase.service.standings_service import rebuild_standings
+
+def main():
+    """Recompute every standings row, repairing any drift from the match results"""
+    create_db_tables()
+    db = SessionLocal()
+    try:
+        rows = rebuild_standings(db)
+        print(f"Rebuilt {rows} standings rows")
+    except Exception as e:
+        print(f"Error rebuilding standings: {str(e)}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
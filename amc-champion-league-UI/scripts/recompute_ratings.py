@@ -0,0 +1,31 @@
+"""
+Recompute every player and team rating from the completed-match history
+"""
+import os
+import sys
+import time
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from codebase.utils.database import SessionLocal, create_db_tables
+from codebase.service.rating_service import recompute_ratings
+
+def main():
+    """Replay all completed matches with the current [ratings] parameters"""
+    create_db_tables()
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        rows = recompute_ratings(db)
+        elapsed = time.perf_counter() - started
+        print(f"Recomputed {rows['player']} player and {rows['team']} team ratings in {elapsed:.2f}s")
+    except Exception as e:
+        print(f"Error recomputing ratings: {str(e)}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
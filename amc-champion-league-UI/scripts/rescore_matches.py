@@ -0,0 +1,47 @@
+"""
+Re-score completed matches from their stored scores, e.g. after a game's rules change
+
+Usage: python scripts/rescore_matches.py [--game-id 1] [--date 2024-05-01] [--match-ids 1,2,3] [--dry-run]
+"""
+import argparse
+import os
+import sys
+import time
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from codebase.utils.database import SessionLocal, create_db_tables
+from codebase.service.scoring_service import rescore_matches
+
+def main():
+    """Re-derive winners, score summaries and player points under the current scoring rules"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--game-id", type=int, help="Only matches of this game")
+    parser.add_argument("--date", help="Only matches played on this date (YYYY-MM-DD)")
+    parser.add_argument("--match-ids", help="Comma-separated match ids (default: all completed matches)")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without writing")
+    args = parser.parse_args()
+    match_ids = [int(match_id) for match_id in args.match_ids.split(",")] if args.match_ids else None
+
+    create_db_tables()
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        summary = rescore_matches(db, game_id=args.game_id, match_date=args.date, match_ids=match_ids,
+                                  dry_run=args.dry_run)
+        elapsed = time.perf_counter() - started
+        verb = "would change" if args.dry_run else "changed"
+        print(f"Scored {summary['matches_scored']} matches in {elapsed:.2f}s; "
+              f"{len(summary['matches_changed'])} {verb}, {len(summary['points_changes'])} player totals moved")
+        for match_id, error in sorted(summary["errors"].items()):
+            print(f"  match {match_id}: {error}")
+    except Exception as e:
+        print(f"Error re-scoring matches: {str(e)}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
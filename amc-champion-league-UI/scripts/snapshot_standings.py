@@ -0,0 +1,31 @@
+"""
+Take a standings snapshot, e.g. from a daily cron job at the end of each match day
+"""
+import os
+import sys
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from codebase.utils.database import SessionLocal, create_db_tables
+from codebase.service.standings_service import take_snapshot
+from codebase.utils.cache import invalidate_namespace
+
+def main():
+    """Copy the current standings into a new snapshot"""
+    create_db_tables()
+    db = SessionLocal()
+    try:
+        snapshot = take_snapshot(db, reason="periodic")
+        db.commit()
+        invalidate_namespace("leaderboard")
+        print(f"Took snapshot {snapshot.id} at {snapshot.taken_at.isoformat()} (change {snapshot.last_change_id})")
+    except Exception as e:
+        print(f"Error taking snapshot: {str(e)}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Add missing extracted extra_data columns and recompute them from extra_data
+
+Run after changing a model's __extracted_fields__ or after writes that bypassed the
+application (raw SQL, restores). Usage: python scripts/sync_extracted_fields.py [--table match_player]
+"""
+import argparse
+import os
+import sys
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from codebase.utils.database import SessionLocal, create_db_tables
+from codebase.utils.extracted_fields import backfill_extracted, ensure_extracted_fields, extracted_models
+
+def main():
+    """Migrate the extracted columns, then bring every row's copies in line with its extra_data"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--table", help="Only this table (default: every table with extracted fields)")
+    args = parser.parse_args()
+
+    create_db_tables()
+    db = SessionLocal()
+    try:
+        filled = ensure_extracted_fields(db)
+        models = [model for model in extracted_models() if args.table in (None, model.__tablename__)]
+        if not models:
+            raise ValueError(f"Table {args.table} has no extracted fields")
+        for model in models:
+            updated = filled.get(model.__tablename__, 0) + backfill_extracted(db, model)
+            print(f"{model.__tablename__}: updated {updated} rows")
+    except Exception as e:
+        print(f"Error syncing extracted fields: {str(e)}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+import os
+import tempfile
+
+# Every test session runs against a private SQLite file; set before the app creates its engine
+os.environ["DATABASE_DB_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='amc-tests-'), 'test.db')}"
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from codebase.app.api import app
+from codebase.model.request_model import Base, Franchise, Game, Player, Team, TeamPlayer
+from codebase.service.conflict_service import conflict_index
+from codebase.utils import resilience
+from codebase.utils.cache import query_cache
+from codebase.utils.config_manager import config
+from codebase.utils.database import SessionLocal, engine
+from codebase.utils.versioning import seed_table_versions
+
+
+@pytest.fixture(scope="session")
+def app_client():
+    # Runs the startup hooks (tables, migrations, background workers) once
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def client(app_client):
+    """The API client on an emptied database and cold caches"""
+    with engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
+    seed_table_versions(engine)
+    query_cache.clear()
+    conflict_index.reset()
+    yield app_client
+
+
+@pytest.fixture
+def db(client):
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+class QueryCounter:
+    """Counts the statements sent to the database while active"""
+
+    def __init__(self):
+        self.statements = []
+
+    def __enter__(self):
+        event.listen(engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc_info):
+        event.remove(engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+@pytest.fixture
+def count_queries():
+    return QueryCounter
+
+
+@pytest.fixture
+def guard(monkeypatch):
+    """Builds dependency(name) afresh from [resilience] settings overridden for the test"""
+    monkeypatch.setattr(resilience, "_dependencies", {})
+
+    def build(name, **settings):
+        for key, value in settings.items():
+            monkeypatch.setitem(config._config["resilience"], f"{name}_{key}", str(value))
+        return resilience.dependency(name)
+    return build
+
+
+@pytest.fixture
+def league(db):
+    """
+    A small league: two games, two franchises with a foosball team each, and three
+    rostered players per team. Matches and results are left to the tests' API calls.
+    """
+    games = [Game(name="Foosball", winning_points=10), Game(name="Carrom", winning_points=10)]
+    db.add_all(games)
+    db.flush()
+    franchises, teams, players = [], [], {}
+    for number in (1, 2):
+        franchise = Franchise(name=f"Franchise {number}")
+        db.add(franchise)
+        db.flush()
+        team = Team(name=f"Team {number}", franchise_id=franchise.id, game_id=games[0].id)
+        roster = [Player(name=f"Player {number}.{seat}", franchise_id=franchise.id, total_points=0)
+                  for seat in range(3)]
+        db.add(team)
+        db.add_all(roster)
+        db.flush()
+        db.add_all(TeamPlayer(team_id=team.id, player_id=player.id) for player in roster)
+        franchises.append({"id": franchise.id})
+        teams.append({"id": team.id, "franchise_id": franchise.id})
+        players[team.id] = [{"id": player.id} for player in roster]
+    db.commit()
+    return {"game": {"id": games[0].id}, "other_game": {"id": games[1].id},
+            "franchises": franchises, "teams": teams, "players": players}
@@ -0,0 +1,66 @@
+from codebase.utils.cache import TTLCache, cached, invalidate_game
+
+
+def _submit_result(client, league):
+    home, away = league["teams"]
+    match = client.post("/api/v1/matches/", json={
+        "game_id": league["game"]["id"], "home_team_id": home["id"], "away_team_id": away["id"],
+        "home_franchise_id": home["franchise_id"], "away_franchise_id": away["franchise_id"]
+    }).json()
+    response = client.post(f"/api/v1/matches/{match['id']}/result", json={
+        "winner_id": home["id"],
+        "players": [{"player_id": player["id"], "points_earned": 4} for player in league["players"][home["id"]]]
+    })
+    assert response.status_code == 200, response.text
+
+
+def test_overall_board_requested_as_game_zero_is_invalidated(client, league):
+    before = client.get("/api/v1/leaderboard/", params={"game_ids": "0"})
+    assert before.status_code == 200, before.text
+
+    _submit_result(client, league)
+
+    after = client.get("/api/v1/leaderboard/", params={"game_ids": "0"})
+    assert after.status_code == 200
+    assert after.json() != before.json()
+    assert after.json() == client.get("/api/v1/leaderboard/", params={"game_ids": "0"}).json()
+
+
+def test_cached_game_zero_shares_the_overall_tag():
+    cache = TTLCache("test")
+    calls = []
+
+    @cached("leaderboard", cache=cache)
+    def board(db, game_id=None):
+        calls.append(game_id)
+        return len(calls)
+
+    assert board(None, game_id=0) == board(None, game_id=0) == 1
+    invalidate_game(5, cache=cache)
+    assert board(None, game_id=0) == 2
+
+
+def test_results_invalidated_while_computing_are_not_stored():
+    cache = TTLCache("test")
+    calls = []
+
+    @cached("fixtures", cache=cache)
+    def fixtures(db, game_id=None):
+        calls.append(game_id)
+        if len(calls) == 1:
+            # A write commits and invalidates while the first read is still running
+            invalidate_game(game_id, cache=cache)
+        return len(calls)
+
+    assert fixtures(None, game_id=3) == 1
+    assert fixtures(None, game_id=3) == 2  # The stale first result was not kept
+    assert fixtures(None, game_id=3) == 2
+    assert cache.stats()["stale_writes"] == 1
+
+
+def test_clearing_the_cache_discards_results_in_flight():
+    cache = TTLCache("test")
+    generation = cache.generation(["leaderboard"])
+    cache.clear()
+    cache.set("key", "stale", tags=["leaderboard"], generation=generation)
+    assert cache.get("key") == (False, None)
@@ -0,0 +1,63 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.pool import QueuePool, StaticPool
+
+from codebase.utils.config_manager import config
+from codebase.utils.database import create_database_engine
+
+
+def _settings(**overrides):
+    return dict(config.get_database_config(), **overrides)
+
+
+def _pragmas(engine):
+    with engine.connect() as connection:
+        return {name: connection.execute(text(f"PRAGMA {name}")).scalar()
+                for name in ("journal_mode", "synchronous", "busy_timeout", "cache_size", "mmap_size", "temp_store")}
+
+
+def test_the_tuned_profile_sets_the_pragmas_on_every_connection(tmp_path):
+    engine = create_database_engine(f"sqlite:///{tmp_path / 'tuned.db'}", _settings(
+        profile="tuned", sqlite_journal_mode="wal", sqlite_synchronous="normal", sqlite_busy_timeout_ms=2500,
+        sqlite_cache_size_kb=4096, sqlite_mmap_size_mb=8, sqlite_temp_store="memory", pool_size=3
+    ))
+    try:
+        expected = {"journal_mode": "wal", "synchronous": 1, "busy_timeout": 2500, "cache_size": -4096,
+                    "mmap_size": 8 * 1024 * 1024, "temp_store": 2}
+        with engine.connect() as held:  # A second connection is opened while this one is checked out
+            assert _pragmas(engine) == expected
+            assert held.execute(text("PRAGMA busy_timeout")).scalar() == 2500
+        assert isinstance(engine.pool, QueuePool) and engine.pool.size() == 3
+    finally:
+        engine.dispose()
+
+
+def test_the_default_profile_keeps_the_library_defaults(tmp_path):
+    engine = create_database_engine(f"sqlite:///{tmp_path / 'default.db'}", _settings(profile="default"))
+    try:
+        pragmas = _pragmas(engine)
+        assert (pragmas["journal_mode"], pragmas["synchronous"], pragmas["cache_size"], pragmas["temp_store"]) == (
+            "delete", 2, -2000, 0
+        )
+    finally:
+        engine.dispose()
+
+
+def test_an_in_memory_database_shares_one_connection():
+    engine = create_database_engine("sqlite://", _settings(profile="tuned"))
+    try:
+        assert isinstance(engine.pool, StaticPool)
+        with engine.begin() as connection:
+            connection.execute(text("CREATE TABLE seen (id INTEGER)"))
+        with engine.connect() as connection:
+            assert connection.execute(text("SELECT count(*) FROM seen")).scalar() == 0
+    finally:
+        engine.dispose()
+
+
+@pytest.mark.parametrize("key, value", [
+    ("profile", "fast"), ("sqlite_journal_mode", "wall"), ("sqlite_synchronous", "sometimes"),
+])
+def test_unknown_settings_are_rejected(key, value):
+    with pytest.raises(ValueError, match=f"\\[database\\] {key} must be one of"):
+        create_database_engine("sqlite://", _settings(**{key: value}))
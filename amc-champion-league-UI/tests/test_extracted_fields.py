@@ -0,0 +1,78 @@
+import pytest
+from sqlalchemy import insert, text, update
+
+from codebase.model.request_model import Game, Match, MatchPlayer
+from codebase.utils.extracted_fields import backfill_extracted
+
+
+def _stats(db, match_id):
+    db.expire_all()
+    return [tuple(row) for row in db.query(MatchPlayer.stat_goals, MatchPlayer.stat_runs, MatchPlayer.stat_wickets).filter(
+        MatchPlayer.match_id == match_id
+    ).order_by(MatchPlayer.id)]
+
+
+def _match_columns(db, match_id):
+    db.expire_all()
+    return tuple(db.query(Match.has_notes, Match.summary_status).filter(Match.id == match_id).one())
+
+
+@pytest.fixture
+def match_id(db, league):
+    match = Match(game_id=league["game"]["id"], extra_data={"notes": "Close game", "ai_summary_status": "pending"})
+    db.add(match)
+    db.commit()
+    return match.id
+
+
+def test_flushed_objects_keep_their_columns_in_step(db, match_id):
+    assert _match_columns(db, match_id) == (True, "pending")
+
+    match = db.get(Match, match_id)
+    match.extra_data = dict(match.extra_data, notes="", ai_summary_status="ready")
+    db.commit()
+    assert _match_columns(db, match_id) == (False, "ready")
+
+
+@pytest.mark.parametrize("extra_data, stats", [
+    ({"goals": 3, "runs": 12, "wickets": 1}, (3, 12, 1)),
+    ({"goals": "4", "runs": 7.0}, (4, 7, None)),  # Numbers stored as strings or whole floats
+    ({"goals": "n/a", "runs": [1, 2], "wickets": 2.5}, (None, None, None)),  # Values that do not fit the column
+    (None, (None, None, None)),
+])
+def test_bulk_inserts_fill_the_columns(db, league, match_id, extra_data, stats):
+    player_ids = [player["id"] for player in league["players"][league["teams"][0]["id"]]]
+    db.execute(insert(MatchPlayer), [
+        {"match_id": match_id, "player_id": player_id, "extra_data": extra_data} for player_id in player_ids
+    ])
+    db.commit()
+    assert _stats(db, match_id) == [stats] * len(player_ids)
+
+
+def test_bulk_updates_by_primary_key_keep_the_columns_in_step(db, league, match_id):
+    player_ids = [player["id"] for player in league["players"][league["teams"][0]["id"]]]
+    db.add_all(MatchPlayer(match_id=match_id, player_id=player_id, extra_data={"goals": 1}) for player_id in player_ids)
+    db.commit()
+    rows = db.query(MatchPlayer.id).filter(MatchPlayer.match_id == match_id).order_by(MatchPlayer.id).all()
+
+    db.execute(update(MatchPlayer), [
+        {"id": row.id, "extra_data": {"goals": number, "runs": 10 * number}} for number, row in enumerate(rows)
+    ])
+    db.execute(update(Match), [{"id": match_id, "extra_data": {"ai_summary_status": "failed"}}])
+    db.commit()
+
+    assert _stats(db, match_id) == [(0, 0, None), (1, 10, None), (2, 20, None)]
+    assert _match_columns(db, match_id) == (False, "failed")
+
+
+def test_backfill_repairs_writes_that_bypassed_the_hooks(db, league):
+    game_id = league["other_game"]["id"]
+    db.execute(text("UPDATE game SET extra_data = :extra_data WHERE id = :id"),
+               {"extra_data": '{"match_minutes": "40"}', "id": game_id})
+    db.commit()
+    assert db.get(Game, game_id).match_minutes is None
+
+    assert backfill_extracted(db, Game) == 1
+    db.expire_all()
+    assert db.get(Game, game_id).match_minutes == 40
+    assert backfill_extracted(db, Game) == 0
@@ -0,0 +1,74 @@
+from datetime import date, timedelta
+
+import pytest
+
+from codebase.utils.cache import query_cache
+
+
+@pytest.fixture
+def fixtures(client, league):
+    """Thirty matches between the two teams, one a day, half of them with results"""
+    home, away = league["teams"]
+    first_day = date(2026, 3, 2)
+    for number in range(30):
+        response = client.post("/api/v1/matches/", json={
+            "game_id": league["game"]["id"],
+            "home_franchise_id": home["franchise_id"],
+            "away_franchise_id": away["franchise_id"],
+            "home_team_id": home["id"],
+            "away_team_id": away["id"],
+            "match_date": (first_day + timedelta(days=number)).isoformat(),
+            "match_time": "10:00",
+            "location": "Court 1",
+            "round": "League",
+            "status": "completed" if number % 2 else "scheduled"
+        })
+        assert response.status_code == 200, response.text
+        match_id = response.json()["id"]
+        if number % 2:
+            for team in (home, away):
+                for player in league["players"][team["id"]]:
+                    response = client.post("/api/v1/match-players/", json={
+                        "match_id": match_id,
+                        "player_id": player["id"],
+                        "team_id": team["id"],
+                        "points_earned": 3,
+                        "is_winner": team is home
+                    })
+                    assert response.status_code == 200, response.text
+    return league
+
+
+def _queries(client, count_queries, path, params):
+    # Cold cache, so the count covers the database work of a full request
+    query_cache.clear()
+    with count_queries() as counter:
+        response = client.get(path, params=params)
+    assert response.status_code == 200, response.text
+    return counter.count, response.json()
+
+
+@pytest.mark.parametrize("path, params", [
+    ("/api/v1/fixtures/", {}),
+    ("/api/v1/fixtures/", {"status": "completed"}),
+    ("/api/v1/fixtures/calendar", {"from": "2026-03-01", "to": "2026-05-01"}),
+])
+def test_fixture_queries_do_not_grow_with_the_page(client, fixtures, count_queries, path, params):
+    small_count, small_page = _queries(client, count_queries, path, dict(params, limit=2))
+    large_count, large_page = _queries(client, count_queries, path, dict(params, limit=30))
+
+    assert len(small_page) == 2
+    assert len(large_page) > 10
+    assert small_count == large_count
+    assert large_count <= 6
+
+
+def test_fixture_pages_follow_the_cursor(client, fixtures):
+    first = client.get("/api/v1/fixtures/calendar", params={"from": "2026-03-01", "to": "2026-05-01", "limit": 20})
+    assert first.status_code == 200
+    second = client.get("/api/v1/fixtures/calendar", params={
+        "from": "2026-03-01", "to": "2026-05-01", "limit": 20, "after": first.headers["X-Next-Cursor"]
+    })
+    assert second.status_code == 200
+    ids = [fixture["id"] for fixture in first.json() + second.json()]
+    assert len(ids) == len(set(ids)) == 30
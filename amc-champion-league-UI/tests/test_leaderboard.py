@@ -0,0 +1,63 @@
+import pytest
+
+from codebase.model.request_model import Player, Team, TeamPlayer
+
+
+@pytest.fixture
+def teams(client, db, league):
+    """Four teams of the league's game: Team 1 beat Team 2, Team 2 beat Team 4, Team 3 has not played"""
+    entries = [dict(team, player_id=league["players"][team["id"]][0]["id"]) for team in league["teams"]]
+    for number, franchise in ((3, league["franchises"][0]), (4, league["franchises"][1])):
+        team = Team(name=f"Team {number}", franchise_id=franchise["id"], game_id=league["game"]["id"])
+        player = Player(name=f"Player {number}.0", franchise_id=franchise["id"], total_points=0)
+        db.add_all([team, player])
+        db.flush()
+        db.add(TeamPlayer(team_id=team.id, player_id=player.id))
+        entries.append({"id": team.id, "franchise_id": franchise["id"], "player_id": player.id})
+    db.commit()
+
+    for winner, loser in ((0, 1), (1, 3)):
+        home, away = entries[winner], entries[loser]
+        match = client.post("/api/v1/matches/", json={
+            "game_id": league["game"]["id"], "home_team_id": home["id"], "away_team_id": away["id"],
+            "home_franchise_id": home["franchise_id"], "away_franchise_id": away["franchise_id"]
+        }).json()
+        response = client.post(f"/api/v1/matches/{match['id']}/result", json={
+            "winner_id": home["id"],
+            "players": [{"player_id": home["player_id"], "points_earned": 10},
+                        {"player_id": away["player_id"], "points_earned": 0}]
+        })
+        assert response.status_code == 200, response.text
+    return [team["id"] for team in entries]
+
+
+def _ranks(client, league, **params):
+    response = client.get("/api/v1/leaderboard/teams", params=dict(game_id=league["game"]["id"], **params))
+    assert response.status_code == 200, response.text
+    return [(entry["id"], entry["rank"], entry["dense_rank"]) for entry in response.json()]
+
+
+def test_level_teams_share_a_rank(client, league, teams):
+    first, second, third, fourth = teams
+    assert _ranks(client, league, tie_breakers="points,wins") == [
+        (first, 1, 1), (second, 1, 1), (third, 3, 2), (fourth, 3, 2)
+    ]
+
+
+def test_head_to_head_breaks_a_tie_between_level_teams(client, league, teams):
+    first, second, third, fourth = teams
+    # Team 1 beat Team 2; Team 2's win over Team 4 does not count, Team 4 is not level with it
+    assert _ranks(client, league) == [(first, 1, 1), (second, 2, 2), (third, 3, 3), (fourth, 3, 3)]
+    assert _ranks(client, league, tie_breakers="points,wins,fewest_played") == [
+        (first, 1, 1), (second, 2, 2), (third, 3, 3), (fourth, 4, 4)
+    ]
+
+
+def test_a_single_teams_rank_and_a_page(client, league, teams):
+    rank = client.get(f"/api/v1/leaderboard/teams/{teams[1]}/rank", params={"game_id": league["game"]["id"]}).json()
+    assert (rank["rank"], rank["dense_rank"], rank["total_points"], rank["matches_played"]) == (2, 2, 10, 2)
+    assert [team_id for team_id, _, _ in _ranks(client, league, offset=1, limit=2)] == teams[1:3]
+
+    response = client.get("/api/v1/leaderboard/teams", params={"tie_breakers": "points,luck"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unknown tie-breaker(s): luck"
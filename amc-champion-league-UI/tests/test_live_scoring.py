@@ -0,0 +1,149 @@
+import pytest
+
+from codebase.model.request_model import Game, LiveScoreEvent, Match
+from codebase.service.live_scoring_service import LiveScoreBoard
+
+
+def _point(side, points=1):
+    return {"type": "point", "side": side, "points": points}
+
+
+def _ball(runs=0, wicket=False, extra=None):
+    return {"type": "ball", "runs": runs, "wicket": wicket, "extra": extra}
+
+
+UNDO = {"type": "undo"}
+
+
+@pytest.fixture
+def board():
+    """A private score board that only writes when told to, or when a match is decided"""
+    return LiveScoreBoard(flush_seconds=0, flush_batch=1000, idle_seconds=900)
+
+
+@pytest.fixture
+def live_match(db, client):
+    def create(name, **live_scoring):
+        game = Game(name=name, winning_points=10, extra_data={"live_scoring": live_scoring})
+        db.add(game)
+        db.flush()
+        match = Match(game_id=game.id, status="scheduled")
+        db.add(match)
+        db.commit()
+        return match.id
+    return create
+
+
+@pytest.mark.parametrize("events, sets, current", [
+    ([_point("home", 20), _point("away", 20), _point("home")], [], {"home": 21, "away": 20}),
+    ([_point("home", 20), _point("away", 20), _point("home"), _point("home")], [{"home": 22, "away": 20}], None),
+    ([_point("home", 20), _point("away", 20)] + [_point("home"), _point("away")] * 9 + [_point("away")],
+     [{"home": 29, "away": 30}], None),
+])
+def test_a_set_closes_by_win_by_or_at_the_cap(db, board, live_match, events, sets, current):
+    match_id = live_match("Badminton")
+    score = board.record(db, match_id, events)
+
+    assert score["score_data"]["sets"] == sets + ([current] if current else [])
+    assert score["score_data"]["final_result"] == {
+        "home": sum(unit["home"] > unit["away"] for unit in sets),
+        "away": sum(unit["away"] > unit["home"] for unit in sets)
+    }
+    assert not score["finished"]
+
+
+def test_the_match_ends_when_a_side_wins_to_win_sets(db, board, live_match):
+    match_id = live_match("Badminton")
+    board.record(db, match_id, [_point("home", 21)])
+    score = board.record(db, match_id, [_point("away", 21), _point("away", 21)])
+
+    assert score["finished"] and score["winner"] == "away"
+    assert score["summary"] == "21-0, 0-21, 0-21"
+
+
+@pytest.mark.parametrize("second_innings, winner, summary", [
+    ([_ball(0)] * 6, "home", "home 5/2 (0.4), away 0/0 (1.0)"),  # Overs run out
+    ([_ball(0, wicket=True)] * 2, "home", "home 5/2 (0.4), away 0/2 (0.2)"),  # Wickets fall
+    ([_ball(1, extra="wide"), _ball(4)], "away", "home 5/2 (0.4), away 6/0 (0.1)"),  # Target passed
+])
+def test_innings_close_on_wickets_overs_or_the_target(db, board, live_match, second_innings, winner, summary):
+    match_id = live_match("Box Cricket", overs=1, wickets=2)
+    score = board.record(db, match_id, [_ball(4), _ball(0, wicket=True), _ball(1), _ball(0, wicket=True)])
+    assert [entry["batting"] for entry in score["score_data"]["innings"]] == ["home"]
+    assert not score["finished"]
+
+    score = board.record(db, match_id, second_innings)
+    assert score["finished"] and score["winner"] == winner
+    assert score["summary"] == summary
+    assert score["score_data"]["innings"][1]["target"] == 6
+
+
+def test_undo_replays_the_log_without_the_last_event(db, board, live_match):
+    match_id = live_match("Badminton")
+    score = board.record(db, match_id, [_point("home", 20), _point("away", 19), _point("home")])
+    assert score["score_data"]["sets"] == [{"home": 21, "away": 19}]
+
+    # Undoing the deciding point reopens the set
+    score = board.record(db, match_id, [UNDO])
+    assert score["score_data"] == {"sets": [{"home": 20, "away": 19}], "final_result": {"home": 0, "away": 0}}
+    assert score["seq"] == 4  # Undo events take a sequence number too
+
+    score = board.record(db, match_id, [_point("away"), UNDO, UNDO])
+    assert score["summary"] == "20-0"
+
+
+@pytest.mark.parametrize("batch, error", [
+    ([_point("home"), _point("home", 21), _point("away")], "already decided"),
+    ([_point("away"), UNDO, UNDO, UNDO], "no event to undo"),
+    ([_point("away"), _ball(4)], "do not apply"),
+])
+def test_a_failing_batch_leaves_the_score_as_it_was(db, board, live_match, batch, error):
+    match_id = live_match("Badminton", to_win=1)
+    before = board.record(db, match_id, [_point("home", 5)])
+
+    with pytest.raises(ValueError, match=error):
+        board.record(db, match_id, batch)
+    assert board.snapshot(db, match_id) == before
+    assert board.flush(db) == 1  # Only the first batch was buffered
+
+
+def test_flush_writes_the_event_log_and_starts_the_match(db, board, live_match):
+    match_id = live_match("Badminton")
+    board.record(db, match_id, [_point("home", 3), _point("away"), UNDO, _point("away", 2)])
+    assert db.query(LiveScoreEvent).count() == 0
+
+    assert board.flush(db) == 4
+    rows = db.query(LiveScoreEvent.seq, LiveScoreEvent.code).filter(
+        LiveScoreEvent.match_id == match_id
+    ).order_by(LiveScoreEvent.seq).all()
+    assert [tuple(row) for row in rows] == [(1, "h3"), (2, "a"), (3, "u"), (4, "a2")]
+
+    match = db.get(Match, match_id)
+    assert match.status == "in_progress"
+    assert match.score_summary == "3-2"
+    assert match.extra_data["live_score"]["seq"] == 4
+    assert match.extra_data["live_score"]["score_data"]["sets"] == [{"home": 3, "away": 2}]
+    assert board.flush(db) == 0
+
+
+def test_a_decided_match_is_flushed_and_evicted_at_once(db, board, live_match):
+    match_id = live_match("Badminton", to_win=1)
+    board.record(db, match_id, [_point("home", 21)])
+
+    assert board.active_count == 0
+    assert db.query(LiveScoreEvent).filter(LiveScoreEvent.match_id == match_id).count() == 1
+    assert db.get(Match, match_id).extra_data["live_score"]["finished"]
+
+
+def test_an_evicted_match_is_rebuilt_from_its_log(db, live_match):
+    board = LiveScoreBoard(flush_seconds=0, flush_batch=1000, idle_seconds=0)
+    match_id = live_match("Box Cricket", overs=1, wickets=2)
+    score = board.record(db, match_id, [_ball(4), _ball(1, extra="no_ball"), _ball(0, wicket=True), UNDO, _ball(6)])
+
+    board.flush(db)
+    assert board.active_count == 0  # Idle with nothing left to write
+
+    assert board.snapshot(db, match_id) == score
+    score = board.record(db, match_id, [_ball(1)])
+    assert score["seq"] == 6
+    assert score["summary"] == "home 13/0 (0.3)"
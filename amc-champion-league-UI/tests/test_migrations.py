@@ -0,0 +1,47 @@
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LEGACY_DATABASE = os.path.join(ROOT, "amc_champion_league.db")
+
+# Starts the application (running every startup migration) and stops it again
+STARTUP = "from fastapi.testclient import TestClient\nfrom codebase.app.api import app\nwith TestClient(app):\n    pass\n"
+
+
+def _start(database, cwd):
+    env = dict(os.environ, DATABASE_DB_URL=f"sqlite:///{database}", PYTHONPATH=ROOT)
+    return subprocess.run([sys.executable, "-c", STARTUP], cwd=cwd, env=env, capture_output=True, text=True,
+                          timeout=120)
+
+
+def _columns(database, table):
+    connection = sqlite3.connect(database)
+    try:
+        return {row[1] for row in connection.execute(f'PRAGMA table_info("{table}")')}
+    finally:
+        connection.close()
+
+
+@pytest.mark.skipif(not os.path.exists(LEGACY_DATABASE), reason="no checked-in database to migrate")
+def test_startup_migrates_an_old_database(tmp_path):
+    database = str(tmp_path / "legacy.db")
+    shutil.copyfile(LEGACY_DATABASE, database)
+    assert "scheduled_at" not in _columns(database, "match")
+
+    for _ in range(2):  # The second start finds everything migrated
+        started = _start(database, tmp_path)
+        assert started.returncode == 0, started.stderr
+
+    columns = _columns(database, "match")
+    assert {"scheduled_at", "has_notes", "summary_status"} <= columns
+    connection = sqlite3.connect(database)
+    try:
+        indexes = {row[1] for row in connection.execute('PRAGMA index_list("match")')}
+    finally:
+        connection.close()
+    assert {"ix_match_game_scheduled", "ix_match_status_scheduled"} <= indexes
@@ -0,0 +1,79 @@
+import pytest
+
+from codebase.model.request_model import Player, TeamPlayer
+
+
+def _pages(client, path, **params):
+    """Every page of a list endpoint, following X-Next-Cursor"""
+    pages, after = [], None
+    while True:
+        response = client.get(path, params=dict(params, **({"after": after} if after else {})))
+        assert response.status_code == 200, response.text
+        pages.append([item["id"] for item in response.json()])
+        after = response.headers.get("X-Next-Cursor")
+        if after is None:
+            return pages
+        assert response.headers["Link"].endswith('; rel="next"') and f"after={after}" in response.headers["Link"]
+
+
+def test_cursor_pages_cover_every_row_once(client, db, league):
+    ids = sorted(player_id for player_id, in db.query(Player.id))
+    assert len(ids) == 6
+
+    assert _pages(client, "/api/v1/players/", limit=4) == [ids[:4], ids[4:]]
+    assert _pages(client, "/api/v1/players/", limit=3) == [ids[:3], ids[3:], []]  # A full last page has a next cursor
+    franchise_id = league["franchises"][1]["id"]
+    assert _pages(client, "/api/v1/players/", limit=2, franchise_id=franchise_id) == [ids[3:5], ids[5:]]
+
+
+def test_a_cursor_seeks_past_rows_removed_before_it(client, db, league):
+    ids = sorted(player_id for player_id, in db.query(Player.id))
+    first = client.get("/api/v1/players/", params={"limit": 2})
+    db.query(TeamPlayer).filter(TeamPlayer.player_id == ids[0]).delete()
+    db.query(Player).filter(Player.id == ids[0]).delete()
+    db.commit()
+
+    # An offset would now skip ids[2]; the cursor continues after ids[1]
+    second = client.get("/api/v1/players/", params={"limit": 2, "after": first.headers["X-Next-Cursor"]})
+    assert [player["id"] for player in second.json()] == ids[2:4]
+
+
+def test_a_bad_cursor_is_rejected(client):
+    assert client.get("/api/v1/players/", params={"after": "not-a-cursor"}).status_code == 400
+    assert client.get("/api/v1/players/", params={"limit": 101}).status_code == 422  # Above max_page_size
+
+
+@pytest.fixture
+def board(client, league):
+    """One result: the winners on 5, 5 and 3 points, the losers on 2, 2 and 0, so ranks run 1, 1, 3, 4, 4, 6"""
+    home, away = league["teams"]
+    match = client.post("/api/v1/matches/", json={
+        "game_id": league["game"]["id"], "home_team_id": home["id"], "away_team_id": away["id"],
+        "home_franchise_id": home["franchise_id"], "away_franchise_id": away["franchise_id"]
+    }).json()
+    points = {home["id"]: [5, 5, 3], away["id"]: [2, 2, 0]}
+    response = client.post(f"/api/v1/matches/{match['id']}/result", json={
+        "winner_id": home["id"],
+        "players": [{"player_id": player["id"], "points_earned": points[team["id"]][seat]}
+                    for team in (home, away) for seat, player in enumerate(league["players"][team["id"]])]
+    })
+    assert response.status_code == 200, response.text
+
+    entries = client.get("/api/v1/leaderboard/players", params={"limit": 100}).json()
+    return [dict(entry, position=position) for position, entry in enumerate(entries, 1)]
+
+
+@pytest.mark.parametrize("n", [0, 1, 2, 6])
+def test_around_matches_the_full_board(client, board, n):
+    assert [entry["rank"] for entry in board] == [1, 1, 3, 4, 4, 6]
+    for index, entry in enumerate(board):
+        response = client.get(f"/api/v1/leaderboard/players/{entry['id']}/around", params={"n": n})
+        assert response.status_code == 200, response.text
+        assert response.json() == board[max(0, index - n):index + n + 1]
+
+
+def test_around_a_player_without_results(client, db, board):
+    player = Player(name="Bench", total_points=0)
+    db.add(player)
+    db.commit()
+    assert client.get(f"/api/v1/leaderboard/players/{player.id}/around").status_code == 404
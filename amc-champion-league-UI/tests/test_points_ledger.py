@@ -0,0 +1,55 @@
+from sqlalchemy import update
+
+from codebase.model.request_model import MatchPlayer, Player, PointsLedger
+from codebase.service.points_service import rebuild_points
+
+
+def _played_match(client, league, winner_index=0, points=5):
+    home, away = league["teams"]
+    match = client.post("/api/v1/matches/", json={
+        "game_id": league["game"]["id"], "home_team_id": home["id"], "away_team_id": away["id"],
+        "home_franchise_id": home["franchise_id"], "away_franchise_id": away["franchise_id"]
+    }).json()
+    response = client.post(f"/api/v1/matches/{match['id']}/result", json={
+        "winner_id": league["teams"][winner_index]["id"],
+        "players": [{"player_id": player["id"], "points_earned": points}
+                    for team in (home, away) for player in league["players"][team["id"]]]
+    })
+    assert response.status_code == 200, response.text
+    return match["id"]
+
+
+def _history(db, player_id):
+    db.expire_all()
+    return [(entry.reason, entry.points) for entry in
+            db.query(PointsLedger).filter(PointsLedger.player_id == player_id).order_by(PointsLedger.id)]
+
+
+def test_result_changes_are_appended(client, db, league):
+    player_id = league["players"][league["teams"][0]["id"]][0]["id"]
+    match_id = _played_match(client, league, winner_index=0, points=5)
+
+    # Losing on a corrected result, then winning again with more points, then deleting the match
+    lost = {"players": [{"player_id": player_id, "points_earned": 5, "is_winner": False}]}
+    assert client.post(f"/api/v1/matches/{match_id}/result", json=lost).status_code == 200
+    assert client.post(f"/api/v1/matches/{match_id}/result", json={
+        "players": [{"player_id": player_id, "points_earned": 8, "is_winner": True}]
+    }).status_code == 200
+    assert client.delete(f"/api/v1/matches/{match_id}").status_code == 200
+
+    assert _history(db, player_id) == [("result", 5), ("result", -5), ("result", 8), ("removed", -8)]
+    assert db.query(Player.total_points).filter(Player.id == player_id).scalar() == 0
+
+
+def test_rebuild_appends_corrections_for_drift(client, db, league):
+    winner_id = league["players"][league["teams"][0]["id"]][0]["id"]
+    _played_match(client, league, winner_index=0, points=5)
+
+    # A write that bypassed the ledger
+    db.execute(update(MatchPlayer).where(MatchPlayer.player_id == winner_id).values(points_earned=7))
+    db.commit()
+    assert rebuild_points(db) == 1
+    assert _history(db, winner_id) == [("result", 5), ("correction", 2)]
+    assert db.query(Player.total_points).filter(Player.id == winner_id).scalar() == 7
+    assert rebuild_points(db) == 0
+
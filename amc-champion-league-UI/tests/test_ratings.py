@@ -0,0 +1,50 @@
+import pytest
+
+from codebase.model.request_model import Match, MatchPlayer, RatedMatch, Rating
+from codebase.service.rating_service import rate_match, recompute_ratings
+
+# (day, game, winning team index, players by team index and seat)
+MATCHES = [
+    (1, "game", 0, {0: [0, 1], 1: [0]}),
+    (2, "game", 1, {0: [0], 1: [0, 1, 2]}),
+    (3, "other_game", 0, {0: [0], 1: [0]}),
+    (4, "game", 0, {0: [1, 2], 1: [1]}),
+    (5, "game", None, {0: [0], 1: [1]}),  # No winner: not rated
+    (6, "game", 1, {0: [0, 2], 1: [0, 2]}),
+    (7, "game", 0, {0: [0, 1, 2], 1: [0, 1, 2]}),
+]
+
+
+def _ratings(db):
+    db.expire_all()
+    return {(row.scope, row.entity_id, row.game_id): (row.rating, row.matches_rated) for row in db.query(Rating)}
+
+
+def test_incremental_ratings_equal_a_full_recompute(db, league):
+    rated = []
+    for day, game, winner, seats in MATCHES:
+        teams = league["teams"]
+        match = Match(game_id=league[game]["id"], status="completed", match_date=f"2024-03-{day:02d}",
+                      home_team_id=teams[0]["id"], away_team_id=teams[1]["id"],
+                      winner_id=teams[winner]["id"] if winner is not None else None)
+        db.add(match)
+        db.flush()
+        for side, team in enumerate(teams):
+            db.add_all(MatchPlayer(match_id=match.id, player_id=league["players"][team["id"]][seat]["id"],
+                                   team_id=team["id"], franchise_id=team["franchise_id"], is_winner=side == winner)
+                       for seat in seats[side])
+        db.flush()
+        rated.append(rate_match(db, match.id))
+        db.commit()
+    assert rated == [True, True, True, True, False, True, True]
+
+    incremental = _ratings(db)
+    assert len(incremental) == 6 + 2 + 2 + 2  # Players of each game, then teams of each game
+    assert db.query(RatedMatch).count() == 6
+
+    recompute_ratings(db)
+    recomputed = _ratings(db)
+    assert recomputed.keys() == incremental.keys()
+    for key, (rating, matches_rated) in incremental.items():
+        assert recomputed[key] == (pytest.approx(rating), matches_rated)
+    assert db.query(RatedMatch).count() == 6
@@ -0,0 +1,137 @@
+import asyncio
+import io
+import time
+
+import pytest
+from fastapi import UploadFile
+
+from codebase.model.request_model import Match
+from codebase.service.summary_service import SUMMARY_FAILED, backfill_summaries
+from codebase.utils import image_storage
+from codebase.utils.resilience import (
+    CLOSED, HALF_OPEN, OPEN, CircuitOpenError, DeadlineExceededError, DependencyBusyError, InjectedFault
+)
+
+
+@pytest.fixture
+def s3_storage(monkeypatch):
+    """Gallery storage on the in-memory S3 stand-in"""
+    monkeypatch.setattr(image_storage, "USE_S3", True)
+    monkeypatch.setattr(image_storage, "_s3_client", image_storage.StubS3Client())
+    monkeypatch.setattr(image_storage, "_listing_cache", {})
+    return image_storage
+
+
+def test_circuit_opens_after_the_failure_threshold(guard):
+    llm = guard("llm", fault_failure_rate=1, failure_threshold=3, reset_seconds=60)
+    calls = []
+
+    for _ in range(3):
+        assert llm.breaker.state == CLOSED
+        with pytest.raises(InjectedFault):
+            llm.call(calls.append, "made")
+    assert llm.breaker.state == OPEN
+
+    with pytest.raises(CircuitOpenError) as refused:
+        llm.call(calls.append, "made")
+    assert 0 < refused.value.retry_after <= 60
+    assert calls == []  # Injected faults fail before the call; the open circuit never starts it
+    stats = llm.stats()
+    assert (stats["calls"], stats["failures"], stats["rejected"], stats["trips"]) == (3, 3, 1, 1)
+
+
+def test_half_open_probe_reopens_or_closes_the_circuit(guard):
+    s3 = guard("s3", fault_failure_rate=1, failure_threshold=1, reset_seconds=0.05, half_open_calls=1)
+    with pytest.raises(InjectedFault):
+        s3.call(lambda: "listing")
+    assert s3.breaker.state == OPEN
+
+    # A failed probe opens the circuit again
+    time.sleep(0.06)
+    with pytest.raises(InjectedFault):
+        s3.call(lambda: "listing")
+    assert s3.breaker.state == OPEN
+    assert s3.stats()["trips"] == 2
+
+    # A successful probe closes it
+    s3.fault_failure_rate = 0
+    time.sleep(0.06)
+    assert s3.call(lambda: "listing") == "listing"
+    assert s3.breaker.state == CLOSED
+    assert s3.stats()["trips"] == 2
+
+
+def test_half_open_lets_only_the_probe_through(guard):
+    llm = guard("llm", failure_threshold=1, reset_seconds=0.05, half_open_calls=1)
+    llm.breaker.record_failure()
+    time.sleep(0.06)
+    assert llm.breaker.allow()
+    assert llm.breaker.state == HALF_OPEN
+    assert not llm.breaker.allow()  # A second caller waits for the probe's outcome
+
+
+def test_a_slow_call_exceeds_its_deadline(guard):
+    llm = guard("llm", fault_latency_seconds=0.3, timeout_seconds=0.05)
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceededError):
+        llm.call(lambda: "summary")
+    assert time.monotonic() - started < 0.25
+    assert llm.stats()["timeouts"] == 1
+    assert llm.call(lambda: "summary", fallback=lambda error: type(error).__name__) == "DeadlineExceededError"
+
+
+def test_a_full_semaphore_refuses_after_wait_seconds(guard):
+    s3 = guard("s3", max_concurrent=1, wait_seconds=0.1, timeout_seconds=0.05, fault_latency_seconds=0.5)
+    with pytest.raises(DeadlineExceededError):
+        s3.call(lambda: "listing")
+
+    # The timed-out call still holds the only slot until it returns
+    started = time.monotonic()
+    with pytest.raises(DependencyBusyError):
+        s3.call(lambda: "listing")
+    assert time.monotonic() - started >= 0.1
+    assert s3.stats()["busy"] == 1
+
+
+def test_s3_listings_fall_back_to_the_last_good_listing(guard, s3_storage, monkeypatch):
+    s3 = guard("s3", failure_threshold=2, reset_seconds=60)
+    monkeypatch.setattr(s3_storage, "s3", s3)
+    s3_storage.get_s3_client().put_object(Bucket=s3_storage.S3_BUCKET_NAME, Key="gallery/one.png", Body=b"")
+    listing = s3_storage.list_images_from_storage("gallery")
+    assert listing == [f"s3://{s3_storage.S3_BUCKET_NAME}/gallery/one.png"]
+
+    s3.fault_failure_rate = 1
+    for _ in range(3):  # Two failures, then refusals while the circuit is open
+        assert s3_storage.list_images_from_storage("gallery") == listing
+    assert s3_storage.list_images_from_storage("players") == []
+    stats = s3.stats()
+    assert (stats["failures"], stats["rejected"], stats["fallbacks"], stats["state"]) == (2, 2, 4, OPEN)
+
+
+def test_s3_uploads_are_refused_while_the_circuit_is_open(guard, s3_storage, monkeypatch):
+    s3 = guard("s3", fault_failure_rate=1, failure_threshold=1, reset_seconds=30)
+    monkeypatch.setattr(s3_storage, "s3", s3)
+    with pytest.raises(InjectedFault):
+        s3.call(lambda: None)
+
+    upload = UploadFile(io.BytesIO(b"image"), filename="photo.png")
+    with pytest.raises(CircuitOpenError) as refused:
+        asyncio.run(s3_storage.upload_image_to_storage(upload, "gallery"))
+    assert 0 < refused.value.retry_after <= 30  # The API answers 503 with this as Retry-After
+    assert s3_storage.get_s3_client().list_objects_v2(Bucket=s3_storage.S3_BUCKET_NAME) == {}
+
+
+def test_llm_backfills_fall_back_while_the_circuit_is_open(db, league, guard):
+    llm = guard("llm", fault_failure_rate=1, failure_threshold=1, reset_seconds=60)
+    with pytest.raises(InjectedFault):
+        llm.call(lambda: None)
+
+    match = Match(game_id=league["game"]["id"], status="completed",
+                  extra_data={"notes": "Team 1 won on the last point. A close match."})
+    db.add(match)
+    db.commit()
+
+    assert backfill_summaries(db) == {"summarized": 0, "failed": 1}
+    db.refresh(match)
+    assert match.extra_data["ai_summary"] == SUMMARY_FAILED
+    assert llm.stats()["calls"] == 1  # Refused by the circuit, without retries
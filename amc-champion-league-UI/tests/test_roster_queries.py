@@ -0,0 +1,69 @@
+import pytest
+
+from codebase.model.request_model import Match, MatchPlayer, Player, Team, TeamPlayer
+from codebase.utils.cache import query_cache
+
+
+@pytest.fixture
+def rosters(client, db, league):
+    """The league plus a twelve-player team whose players all played one match and joined every team"""
+    franchise_id = league["franchises"][0]["id"]
+    team = Team(name="Big Team", franchise_id=franchise_id, game_id=league["game"]["id"])
+    players = [Player(name=f"Big {seat}", franchise_id=franchise_id, total_points=0) for seat in range(12)]
+    db.add(team)
+    db.add_all(players)
+    db.flush()
+    db.add_all(TeamPlayer(team_id=team.id, player_id=player.id) for player in players)
+    db.add_all(TeamPlayer(team_id=other["id"], player_id=players[0].id) for other in league["teams"])
+
+    small_match, big_match = Match(game_id=league["game"]["id"]), Match(game_id=league["game"]["id"])
+    db.add_all([small_match, big_match])
+    db.flush()
+    db.add(MatchPlayer(match_id=small_match.id, player_id=players[0].id, franchise_id=franchise_id, team_id=team.id))
+    db.add_all(MatchPlayer(match_id=big_match.id, player_id=player.id, franchise_id=franchise_id, team_id=team.id,
+                           points_earned=2, is_winner=True) for player in players)
+    db.commit()
+    return {
+        "teams": (league["teams"][0]["id"], team.id),
+        "players": (players[1].id, players[0].id),
+        "matches": (small_match.id, big_match.id)
+    }
+
+
+def _queries(client, count_queries, path, include):
+    query_cache.clear()
+    with count_queries() as counter:
+        response = client.get(path, params={"include": include})
+    assert response.status_code == 200, response.text
+    return counter.count, response.json()
+
+
+@pytest.mark.parametrize("path, key, include, sizes", [
+    ("/api/v1/teams/{}/players", "teams", "player,franchise,team", (4, 12)),
+    ("/api/v1/players/{}/teams", "players", "team,franchise,game", (1, 3)),
+    ("/api/v1/matches/{}/players", "matches", "player,franchise,team,match", (1, 12)),
+])
+def test_roster_queries_do_not_grow_with_the_roster(client, rosters, count_queries, path, key, include, sizes):
+    small, big = rosters[key]
+    small_count, small_rows = _queries(client, count_queries, path.format(small), include)
+    big_count, big_rows = _queries(client, count_queries, path.format(big), include)
+
+    assert (len(small_rows), len(big_rows)) == sizes
+    assert small_count == big_count
+    assert big_count <= 3
+    for row in big_rows:
+        assert all(isinstance(row[name], dict) and row[name]["id"] for name in include.split(","))
+
+
+def test_includes_are_embedded_only_on_request(client, rosters):
+    team_id = rosters["teams"][1]
+    rows = client.get(f"/api/v1/teams/{team_id}/players").json()
+    assert "player" not in rows[0] and "team" not in rows[0]
+
+    rows = client.get(f"/api/v1/teams/{team_id}/players", params={"include": "team"}).json()
+    assert {row["team"]["name"] for row in rows} == {"Big Team"}
+    assert rows[0]["player_name"] == "Big 0"
+
+    response = client.get(f"/api/v1/teams/{team_id}/players", params={"include": "team,game"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unknown include game; expected any of: player, franchise, team"
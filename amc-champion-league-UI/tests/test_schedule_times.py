@@ -0,0 +1,35 @@
+from datetime import datetime, timedelta, timezone
+
+from codebase.model.request_model import Match
+from codebase.service.schedule_service import league_time, parse_schedule
+
+
+def test_league_time_converts_aware_values():
+    # The league clock is UTC in the test configuration
+    assert league_time(datetime(2026, 3, 2, 9, 0, tzinfo=timezone(timedelta(hours=1)))) == datetime(2026, 3, 2, 8, 0)
+    assert league_time(datetime(2026, 3, 2, 9, 0)) == datetime(2026, 3, 2, 9, 0)
+    assert parse_schedule("2026-03-02T23:30:00-02:00") == datetime(2026, 3, 3, 1, 30)
+
+
+def test_calendar_and_conflict_windows_convert_offsets(client, db, league):
+    response = client.post("/api/v1/matches/", json={
+        "game_id": league["game"]["id"], "match_date": "2026-03-02", "match_time": "08:30", "location": "Court 1"
+    })
+    assert response.status_code == 200, response.text
+    # A double booking written past the conflict check, e.g. by an import
+    db.add(Match(game_id=league["game"]["id"], match_date="2026-03-02", match_time="08:45", location="Court 1",
+                 scheduled_at=datetime(2026, 3, 2, 8, 45), status="scheduled"))
+    db.commit()
+
+    # 09:00+01:00 is 08:00 on the league clock, so both matches are inside the window
+    window = {"from": "2026-03-02T09:00:00+01:00", "to": "2026-03-02T10:00:00+01:00"}
+    calendar = client.get("/api/v1/fixtures/calendar", params=window)
+    assert calendar.status_code == 200, calendar.text
+    assert [fixture["match_time"] for fixture in calendar.json()] == ["08:30", "08:45"]
+    conflicts = client.get("/api/v1/fixtures/conflicts", params=window)
+    assert conflicts.status_code == 200, conflicts.text
+    assert [conflict["type"] for conflict in conflicts.json()] == ["location"]
+
+    later = {"from": "2026-03-02T11:00:00+01:00", "to": "2026-03-02T12:00:00+01:00"}
+    assert client.get("/api/v1/fixtures/calendar", params=later).json() == []
+    assert client.get("/api/v1/fixtures/conflicts", params=later).json() == []
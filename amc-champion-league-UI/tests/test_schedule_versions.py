@@ -0,0 +1,75 @@
+from sqlalchemy import update
+
+from codebase.model.request_model import Match
+from codebase.service.conflict_service import conflict_index
+from codebase.utils.versioning import get_table_versions
+
+
+def _schedule_version(db):
+    db.expire_all()
+    return get_table_versions(db, ["match_schedule"])["match_schedule"]
+
+
+def _create_match(client, league, **fields):
+    home, away = league["teams"]
+    response = client.post("/api/v1/matches/", json=dict({
+        "game_id": league["game"]["id"],
+        "home_franchise_id": home["franchise_id"],
+        "away_franchise_id": away["franchise_id"],
+        "home_team_id": home["id"],
+        "away_team_id": away["id"],
+        "match_date": "2026-05-04",
+        "match_time": "12:00",
+        "location": "Court 2"
+    }, **fields))
+    return response
+
+
+def test_result_writes_leave_the_schedule_counter_alone(client, db, league):
+    match_id = _create_match(client, league).json()["id"]
+    home = league["teams"][0]
+
+    response = client.post(f"/api/v1/matches/{match_id}/result", json={
+        "winner_id": home["id"],
+        "players": [{"player_id": player["id"], "points_earned": 2} for player in league["players"][home["id"]]]
+    })
+    assert response.status_code == 200, response.text
+    after_first_result = _schedule_version(db)  # The first result adds the match's player rows
+
+    rows = client.get(f"/api/v1/matches/{match_id}/players").json()
+    assert client.put(f"/api/v1/match-players/{rows[0]['id']}", json={"points_earned": 5}).status_code == 200
+    assert client.put(f"/api/v1/matches/{match_id}", json={"score_summary": "10-8"}).status_code == 200
+    assert _schedule_version(db) == after_first_result
+
+    assert client.put(f"/api/v1/matches/{match_id}", json={"location": "Court 3"}).status_code == 200
+    assert _schedule_version(db) == after_first_result + 1
+
+
+def test_bulk_updates_count_only_schedule_columns(client, db, league):
+    match_id = _create_match(client, league).json()["id"]
+    version = _schedule_version(db)
+
+    db.execute(update(Match).where(Match.id == match_id).values(score_summary="3-1"))
+    db.commit()
+    assert _schedule_version(db) == version
+
+    db.execute(update(Match), [{"id": match_id, "location": "Court 9"}])
+    db.commit()
+    assert _schedule_version(db) == version + 1
+
+
+def test_the_conflict_index_follows_reschedules_without_rebuilding(client, db, league):
+    first = _create_match(client, league).json()["id"]
+    second = _create_match(client, league, match_date="2026-05-05").json()["id"]
+    built = conflict_index._versions
+
+    # A result write is not a schedule change: the index stays as it is
+    response = client.post(f"/api/v1/matches/{second}/result", json={"winner_id": league["teams"][1]["id"]})
+    assert response.status_code == 200, response.text
+    assert conflict_index._versions == built
+
+    # Moving the second match onto the first one's slot clashes on the court and both teams
+    clash = client.put(f"/api/v1/matches/{second}", json={"match_date": "2026-05-04"})
+    assert clash.status_code == 409
+    assert {conflict["type"] for conflict in clash.json()["detail"]["conflicts"]} >= {"location", "team"}
+    assert all(conflict["other_match_id"] == first for conflict in clash.json()["detail"]["conflicts"])
@@ -0,0 +1,101 @@
+import re
+from itertools import chain, zip_longest
+
+import pytest
+
+from codebase.service.scoring_service import evaluate_score, evaluate_scores, game_rules
+
+
+def _units(unit, *pairs, **fields):
+    return dict({unit: [{"home": home, "away": away} for home, away in pairs]}, **fields)
+
+
+def _innings(first, second):
+    return {"innings": [dict(first, batting="home"), dict(second, batting="away")]}
+
+
+def _goals(home, away):
+    return {"goals": {"home": home, "away": away}}
+
+
+# kind, score_data, winner, summary
+VALID = [
+    ("badminton", _units("sets", (21, 19), (30, 29)), "home", "21-19, 30-29"),
+    ("badminton", _units("sets", (22, 20), (19, 21), (21, 23)), "away", "22-20, 19-21, 21-23"),
+    ("badminton", _units("sets", (21, 5), (29, 30), (30, 28), final_result={"home": 2, "away": 1}),
+     "home", "21-5, 29-30, 30-28"),
+    ("carom", _units("rounds", (27, 5), (26, 3)), "home", "27-5, 26-3"),  # Not exact: a shot can overshoot
+    ("pool", _units("frames", (1, 0), (0, 1), (1, 0), (1, 0)), "home", "3-1"),
+    ("box_cricket", _innings({"runs": 40, "overs": "6.0"}, {"runs": 41, "wickets": 3, "overs": "4.2"}),
+     "away", "home 40/0 (6.0), away 41/3 (4.2)"),
+    ("box_cricket", _innings({"runs": 40, "balls": 36}, {"runs": 30, "wickets": 5, "overs": 3.1}),
+     "home", "home 40/0 (6.0), away 30/5 (3.1)"),
+    ("box_cricket", _innings({"runs": 40, "wickets": 5, "overs": "5.3"}, {"runs": 40, "overs": "6.0"}),
+     None, "home 40/5 (5.3), away 40/0 (6.0)"),
+    ("foosball", _goals(10, 7), "home", "10-7"),
+    ("foosball", _goals(5, 8), "away", "5-8"),  # Time ran out
+    ("foosball", _goals(4, 4), None, "4-4"),
+    ("chess", {"result": "checkmate", "winner": "away", "moves": 31}, "away", "0-1"),
+    ("chess", {"result": "stalemate"}, None, "1/2-1/2"),
+]
+
+# kind, score_data, error
+INVALID = [
+    ("badminton", _units("sets", (25, 5), (21, 0)), "set 1 (25-5) is not a finished set (first to 21 by 2, capped at 30)"),
+    ("badminton", _units("sets", (21, 10), (20, 18)), "set 2 (20-18) is not a finished set"),
+    ("badminton", _units("sets", (21, 10), (21, 10), (21, 10)), "set 3 was played after the match was decided"),
+    ("badminton", _units("sets", (21, 10)), "Neither side has won 2 sets"),
+    ("badminton", _units("sets", (21, 10), (21, 10), final_result={"home": 1, "away": 1}),
+     "final_result does not match the sets"),
+    ("badminton", _units("sets"), "The score needs a list of sets"),
+    ("table_tennis", _units("sets", (11, 9), (11, 9), (9, 11), (11, 9), (11, 9)),
+     "set 5 was played after the match was decided"),
+    ("box_cricket", _innings({"runs": 40, "overs": "6.0"}, {"runs": 30, "wickets": 2, "overs": "4.0"}),
+     "The second innings is not over"),
+    ("box_cricket", _innings({"runs": 40, "overs": "4.0"}, {"runs": 30, "wickets": 5, "overs": "4.0"}),
+     "The first innings is not over"),
+    ("box_cricket", _innings({"runs": 40, "wickets": 6, "overs": "6.0"}, {"runs": 41, "overs": "1.0"}),
+     "An innings is longer than 6 overs or 5 wickets"),
+    ("box_cricket", _innings({"runs": 40, "overs": "5.6"}, {"runs": 41, "overs": "1.0"}),
+     "innings 1: overs must look like 4.3"),
+    ("foosball", _goals(10, 10), "The game ends when a side reaches 10 goals"),
+    ("foosball", _goals(11, 3), "The game ends when a side reaches 10 goals"),
+    ("foosball", {"goals": {"home": 10}}, "goals must have a home and an away score"),
+    ("chess", {"result": "resignation"}, "A resignation needs the winner"),
+]
+
+
+@pytest.mark.parametrize("kind, score_data, winner, summary", VALID)
+def test_valid_scores_are_decided(kind, score_data, winner, summary):
+    outcome = evaluate_score(*game_rules(kind), score_data)
+    assert (outcome["winner"], outcome["draw"], outcome["summary"]) == (winner, winner is None, summary)
+
+
+@pytest.mark.parametrize("kind, score_data, error", INVALID)
+def test_invalid_scores_are_explained(kind, score_data, error):
+    with pytest.raises(ValueError, match=re.escape(error)):
+        evaluate_score(*game_rules(kind), score_data)
+
+
+def test_a_batch_decides_each_score_on_its_own():
+    # Interleaved, so each match's sets are numbered from its own first set
+    cases = [(kind, score_data) for kind, score_data, *_ in filter(None, chain(*zip_longest(VALID, INVALID)))]
+    batch = evaluate_scores([(*game_rules(kind), score_data) for kind, score_data in cases])
+
+    for (kind, score_data), result in zip(cases, batch):
+        try:
+            expected = evaluate_score(*game_rules(kind), score_data)
+        except ValueError as e:
+            assert isinstance(result, ValueError) and str(result) == str(e)
+        else:
+            assert result == expected
+
+
+def test_declared_rules_adjust_the_defaults():
+    kind, rules = game_rules("Badminton", {"points_per_set": 15, "sets": 1, "scoring_rules": {"cap": 0}}, 12)
+    assert (kind, rules["target"], rules["to_win"], rules["cap"], rules["win_points"]) == ("badminton", 15, 1, 0, 12)
+
+    outcome = evaluate_score(kind, rules, _units("sets", (15, 13)))
+    assert outcome["points"] == {"home": 12, "away": 0}
+    with pytest.raises(ValueError, match=re.escape("set 1 (16-13) is not a finished set (first to 15 by 2)")):
+        evaluate_score(kind, rules, _units("sets", (16, 13)))
@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, select, update
+
+from codebase.model.request_model import Standing, StandingChange
+from codebase.service import standings_service
+from codebase.service.standings_service import STANDING_COLUMNS, STANDING_KEY_COLUMNS, standings_as_of, take_snapshot
+
+DAY = datetime(2024, 5, 1, 18, 0)
+
+
+def _state(db, source):
+    rows = db.execute(select(*[source.c[column] for column in STANDING_KEY_COLUMNS + STANDING_COLUMNS]))
+    return {tuple(row[:3]): tuple(row[3:]) for row in rows if any(row[3:])}
+
+
+def _result(client, league, match_id, winner_index, points):
+    home, away = league["teams"]
+    response = client.post(f"/api/v1/matches/{match_id}/result", json={
+        "winner_id": league["teams"][winner_index]["id"],
+        "players": [{"player_id": player["id"], "points_earned": points}
+                    for team in (home, away) for player in league["players"][team["id"]]]
+    })
+    assert response.status_code == 200, response.text
+
+
+@pytest.fixture
+def history(client, db, league, monkeypatch):
+    """
+    Four days of results (day 3 corrects day 1's result), each day's changes stamped with
+    that day, and the standings after each day; snapshot_after lists the days to snapshot.
+    """
+    monkeypatch.setitem(standings_service._snapshot_config, "every_changes", 0)
+    home, away = league["teams"]
+
+    def play(snapshot_after):
+        match_ids = [client.post("/api/v1/matches/", json={
+            "game_id": league["game"]["id"], "home_team_id": home["id"], "away_team_id": away["id"],
+            "home_franchise_id": home["franchise_id"], "away_franchise_id": away["franchise_id"]
+        }).json()["id"] for _ in range(3)]
+        results = [(match_ids[0], 0, 5), (match_ids[1], 1, 3), (match_ids[0], 1, 8), (match_ids[2], 0, 4)]
+
+        states = [{}]
+        for day, (match_id, winner_index, points) in enumerate(results, 1):
+            last_change = db.query(func.coalesce(func.max(StandingChange.id), 0)).scalar()
+            _result(client, league, match_id, winner_index, points)
+            db.execute(update(StandingChange).where(StandingChange.id > last_change).values(
+                recorded_at=DAY + timedelta(days=day)
+            ))
+            if day in snapshot_after:
+                take_snapshot(db)
+            db.commit()
+            states.append(_state(db, Standing.__table__))
+        return states
+    return play
+
+
+@pytest.mark.parametrize("snapshot_after", [(), (1,), (3,), (1, 3), (2, 4)])
+def test_standings_as_of_any_moment(db, history, snapshot_after):
+    states = history(snapshot_after)
+    assert len({tuple(sorted(state.items())) for state in states}) == 5  # Each day changed the standings
+
+    for day, state in enumerate(states):
+        moment = DAY + timedelta(days=day, hours=1)
+        assert _state(db, standings_as_of(db, moment)) == state, f"as of day {day}"
+    assert _state(db, standings_as_of(db, DAY - timedelta(days=30))) == {}
+
+
+def test_an_aware_moment_is_read_as_utc(db, history):
+    states = history((2,))
+    moment = (DAY + timedelta(days=2, hours=1)).replace(tzinfo=timezone.utc).astimezone(timezone(timedelta(hours=5)))
+    assert _state(db, standings_as_of(db, moment)) == states[2]
@@ -0,0 +1,130 @@
+"""
+The standings and the points ledger are maintained incrementally on every result write;
+after each kind of write they must equal what a full rebuild computes from MatchPlayer.
+"""
+from sqlalchemy import func
+
+from codebase.model.request_model import Game, MatchPlayer, Player, PointsLedger, Standing
+from codebase.service.points_service import rebuild_points
+from codebase.service.scoring_service import rescore_matches
+from codebase.service.standings_service import rebuild_standings
+
+
+def _standings(db):
+    return {
+        (row.scope, row.entity_id, row.game_id): (row.matches_played, row.matches_won, row.matches_lost, row.total_points)
+        for row in db.query(Standing)
+        if any((row.matches_played, row.matches_won, row.matches_lost, row.total_points))
+    }
+
+
+def _points(db):
+    balances = {match_player_id: points for match_player_id, points in db.query(
+        PointsLedger.match_player_id, func.sum(PointsLedger.points)
+    ).group_by(PointsLedger.match_player_id) if points}
+    totals = {player_id: total or 0 for player_id, total in db.query(Player.id, Player.total_points)}
+    return balances, totals
+
+
+def assert_matches_rebuild(db):
+    db.expire_all()
+    standings, points = _standings(db), _points(db)
+    rebuild_standings(db)
+    assert rebuild_points(db) == 0  # The ledger needed no correction
+    db.expire_all()
+    assert _standings(db) == standings
+    assert _points(db) == points
+
+
+def _create_match(client, league, **fields):
+    home, away = league["teams"]
+    response = client.post("/api/v1/matches/", json=dict({
+        "game_id": league["game"]["id"],
+        "home_franchise_id": home["franchise_id"],
+        "away_franchise_id": away["franchise_id"],
+        "home_team_id": home["id"],
+        "away_team_id": away["id"],
+        "status": "scheduled"
+    }, **fields))
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def _submit(client, league, match_id, winner_index, points):
+    home, away = league["teams"]
+    winner = league["teams"][winner_index]
+    response = client.post(f"/api/v1/matches/{match_id}/result", json={
+        "winner_id": winner["id"],
+        "players": [{"player_id": player["id"], "points_earned": points + seat}
+                    for team in (home, away) for seat, player in enumerate(league["players"][team["id"]])]
+    })
+    assert response.status_code == 200, response.text
+
+
+def test_incremental_totals_equal_a_rebuild(client, db, league):
+    first = _create_match(client, league)
+    second = _create_match(client, league)
+
+    _submit(client, league, first, winner_index=0, points=5)
+    _submit(client, league, second, winner_index=1, points=2)
+    assert_matches_rebuild(db)
+    assert _standings(db)
+
+    # Re-submitting replaces the first result instead of adding to it
+    _submit(client, league, first, winner_index=1, points=7)
+    assert_matches_rebuild(db)
+
+    # Moving a played match to another game moves its results between the per-game rows
+    response = client.put(f"/api/v1/matches/{first}", json={"game_id": league["other_game"]["id"]})
+    assert response.status_code == 200, response.text
+    assert_matches_rebuild(db)
+    assert any(game_id == league["other_game"]["id"] for _, _, game_id in _standings(db))
+
+    response = client.delete(f"/api/v1/matches/{first}")
+    assert response.status_code == 200, response.text
+    assert_matches_rebuild(db)
+    assert all(game_id != league["other_game"]["id"] for _, _, game_id in _standings(db))
+
+
+def test_single_player_updates_equal_a_rebuild(client, db, league):
+    match_id = _create_match(client, league)
+    _submit(client, league, match_id, winner_index=0, points=4)
+
+    rows = client.get(f"/api/v1/matches/{match_id}/players").json()
+    for row in rows[:2]:
+        response = client.put(f"/api/v1/match-players/{row['id']}", json={"is_winner": not row["is_winner"],
+                                                                          "points_earned": 9})
+        assert response.status_code == 200, response.text
+    assert_matches_rebuild(db)
+
+
+def test_rescoring_after_a_rules_change_equals_a_rebuild(client, db, league):
+    home, away = league["teams"]
+    players = [{"player_id": player["id"]} for team in (home, away) for player in league["players"][team["id"]]]
+    match_ids = []
+    for goals_home, goals_away in ((10, 7), (5, 8), (4, 4)):
+        match_id = _create_match(client, league)
+        response = client.post(f"/api/v1/matches/{match_id}/result", json={
+            "score": {"goals": {"home": goals_home, "away": goals_away}}, "players": players
+        })
+        assert response.status_code == 200, response.text
+        match_ids.append(match_id)
+    assert_matches_rebuild(db)
+
+    # More points for a win and for a draw, and games to 8 goals: the 10-7 win no longer fits
+    game = db.get(Game, league["game"]["id"])
+    game.winning_points = 15
+    game.extra_data = {"scoring_rules": {"goals_to_win": 8, "draw_points": 4}}
+    db.commit()
+
+    summary = rescore_matches(db, game_id=game.id)
+    assert summary["matches_scored"] == 2
+    assert list(summary["errors"]) == [match_ids[0]]
+    assert list(summary["points_changes"].values()) == [5, 5, 5]  # The winners of the 5-8 game
+    assert_matches_rebuild(db)
+
+    def points(match_id):
+        return sorted(points for points, in db.query(MatchPlayer.points_earned).filter(MatchPlayer.match_id == match_id))
+    assert points(match_ids[0]) == [0, 0, 0, 10, 10, 10]  # Left as it was
+    assert points(match_ids[1]) == [0, 0, 0, 15, 15, 15]
+    assert points(match_ids[2]) == [4] * 6  # Draw points, which player totals leave out
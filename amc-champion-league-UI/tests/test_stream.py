@@ -0,0 +1,70 @@
+import asyncio
+
+from starlette.requests import Request
+
+from codebase.app.api import stream_endpoint
+from codebase.utils.events import FIXTURES_TOPIC, LEADERBOARD_TOPIC, EventBroker, broker
+
+
+def _request():
+    return Request({"type": "http", "method": "GET", "path": "/api/v1/stream", "headers": []})
+
+
+async def _read(body, count):
+    return [await asyncio.wait_for(body.__anext__(), timeout=1) for _ in range(count)]
+
+
+def test_last_event_id_resumes_after_the_last_event_seen():
+    async def reconnect():
+        seen = broker.publish([FIXTURES_TOPIC], "match", {"id": 1})
+        missed = broker.publish([FIXTURES_TOPIC, f"{FIXTURES_TOPIC}:3"], "match", {"id": 2})
+        broker.publish([LEADERBOARD_TOPIC], "standings", {"id": 3})  # Not subscribed to
+
+        response = await stream_endpoint(_request(), topics=FIXTURES_TOPIC, last_event_id=None,
+                                         last_event_id_header=seen.id)
+        body = response.body_iterator
+        try:
+            chunks = await _read(body, 2)
+            live = broker.publish([FIXTURES_TOPIC], "result", {"id": 4})
+            chunks += await _read(body, 1)
+        finally:
+            await body.aclose()
+        return chunks, missed, live
+
+    subscribers = broker.subscriber_count
+    chunks, missed, live = asyncio.run(reconnect())
+    assert chunks == [
+        "retry: 3000\n\n",
+        f'id: {missed.id}\nevent: match\ndata: {{"id":2}}\n\n',
+        f'id: {live.id}\nevent: result\ndata: {{"id":4}}\n\n'
+    ]
+    assert broker.subscriber_count == subscribers
+
+
+def test_a_client_that_missed_more_than_the_backlog_is_told_to_reload():
+    async def resume(last_event_id):
+        events = EventBroker(backlog_size=2)
+        for number in range(1, 5):
+            events.publish([LEADERBOARD_TOPIC], "standings", {"id": number})
+        subscription, replay, reset = events.subscribe({LEADERBOARD_TOPIC}, last_event_id)
+        return [stream_event.id for stream_event in replay], reset
+
+    assert asyncio.run(resume(1)) == ([3, 4], True)  # Event 2 is gone
+    assert asyncio.run(resume(2)) == ([3, 4], False)
+    assert asyncio.run(resume(4)) == ([], False)
+    assert asyncio.run(resume(None)) == ([], False)
+
+
+def test_a_slow_client_is_ended_so_it_resumes():
+    async def overflow():
+        events = EventBroker(queue_size=2)
+        subscription, _, _ = events.subscribe({LEADERBOARD_TOPIC})
+        for number in range(3):
+            events.publish([LEADERBOARD_TOPIC], "standings", {"id": number})
+        await asyncio.sleep(0)  # Let the deliveries run
+        return subscription, [subscription.queue.get_nowait() for _ in range(subscription.queue.qsize())]
+
+    subscription, queued = asyncio.run(overflow())
+    assert subscription.overflowed
+    # The oldest queued event makes room for the end-of-stream marker; nothing is queued after it
+    assert [stream_event and stream_event.id for stream_event in queued] == [2, None]
@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from codebase.model.request_model import SummaryCache
+from codebase.service import summary_service
+from codebase.service.summary_service import (
+    _pack, cached_summaries, store_summaries, summarize_notes, summary_key
+)
+
+NOTES = [
+    "Team 1 won the first game 10-4. Team 2 came back. Team 1 closed it out.",
+    "A tight match decided on the last point. Both keepers were excellent.",
+    "Team 2 dominated from the start and never looked back.",
+]
+
+
+@pytest.fixture
+def prompts(monkeypatch, guard):
+    """Every prompt sent to the (stub) LLM"""
+    guard("llm")
+    sent = []
+    completion = summary_service.get_chat_completion
+
+    def record(prompt, **options):
+        sent.append(prompt)
+        return completion(prompt, **options)
+
+    monkeypatch.setattr(summary_service, "get_chat_completion", record)
+    return sent
+
+
+def _cache(db):
+    db.expire_all()
+    return {entry.key: entry for entry in db.query(SummaryCache)}
+
+
+def test_summary_keys_hash_the_model_and_the_normalized_prompt(monkeypatch):
+    key = summary_key(NOTES[0])
+    assert summary_key("  " + NOTES[0].replace(" ", " \n\t ") + "\n") == key
+    assert summary_key("Cafe\u0301 league final.") == summary_key("Caf\u00e9 league final.")  # NFC
+    assert summary_key(NOTES[1]) != key
+
+    monkeypatch.setitem(summary_service._genai_config, "model", "another-model")
+    assert summary_key(NOTES[0]) != key
+
+
+def test_cached_and_repeated_notes_are_summarized_once(db, client, prompts):
+    summaries = summarize_notes(db, {1: NOTES[0], 2: NOTES[1], 3: " " + NOTES[0]})
+    db.commit()
+    assert len(prompts) == 1  # One batch request, holding the two distinct reports
+    assert "[2]" in prompts[0] and "[3]" not in prompts[0]
+    assert summaries[1] == summaries[3] == "Team 1 won the first game 10-4. Team 2 came back."
+
+    again = summarize_notes(db, {4: NOTES[0], 5: NOTES[2]})
+    db.commit()
+    assert len(prompts) == 2 and NOTES[0] not in prompts[1]  # Only the new notes were sent
+    assert again[4] == summaries[1]
+    cache = _cache(db)
+    assert (cache[summary_key(NOTES[0])].hits, cache[summary_key(NOTES[1])].hits) == (1, 0)
+
+
+def test_expired_and_least_recently_used_entries_are_evicted(db, client, monkeypatch):
+    monkeypatch.setitem(summary_service._genai_config, "cache_max_entries", 3)
+    monkeypatch.setitem(summary_service._genai_config, "cache_ttl_days", 30)
+    now = datetime.utcnow()
+    db.add_all(SummaryCache(key=f"old-{age}", model="m", summary="s", hits=0,
+                            created_at=now - timedelta(days=90), last_used_at=now - timedelta(days=age))
+               for age in (40, 10, 5, 1))
+    db.commit()
+
+    cached_summaries(db, ["old-10"])  # Now the most recently used
+    store_summaries(db, {"new": "summary"})
+    db.commit()
+
+    # old-40 expired; of the other four, the least recently used (old-5) goes
+    assert set(_cache(db)) == {"old-10", "old-1", "new"}
+
+
+@pytest.mark.parametrize("batch_size, batch_max_chars, lengths, chunks", [
+    (20, 100, [40, 40, 40, 40, 40], [2, 2, 1]),
+    (20, 100, [30, 30, 40, 10], [3, 1]),
+    (20, 100, [150, 20, 150], [1, 1, 1]),  # Over-long notes still go, on their own
+    (2, 1000, [10, 10, 10, 10, 10], [2, 2, 1]),
+])
+def test_batches_are_split_by_size_and_characters(monkeypatch, batch_size, batch_max_chars, lengths, chunks):
+    monkeypatch.setitem(summary_service._genai_config, "batch_size", batch_size)
+    monkeypatch.setitem(summary_service._genai_config, "batch_max_chars", batch_max_chars)
+    items = [(f"key-{number}", "x" * length) for number, length in enumerate(lengths)]
+
+    packed = _pack(items)
+    assert [len(chunk) for chunk in packed] == chunks
+    assert [item for chunk in packed for item in chunk] == items
+
+
+def test_a_backfill_sends_one_request_per_packed_batch(db, client, prompts, monkeypatch):
+    monkeypatch.setitem(summary_service._genai_config, "batch_max_chars", len(NOTES[0]) + len(NOTES[1]))
+    summaries = summarize_notes(db, dict(enumerate(NOTES)))
+
+    assert len(prompts) == 2
+    assert summary_service.summary_prompt(NOTES[2]) in prompts  # A batch of one uses the single prompt
+    assert all(summaries.values())
@@ -0,0 +1,116 @@
+import time
+
+import pytest
+
+from codebase.genai import llm_call
+from codebase.model.request_model import Match
+from codebase.service import summary_service
+from codebase.service.summary_service import SUMMARY_FAILED, SUMMARY_STATUS, SummaryQueue, request_summary
+from codebase.utils.database import SessionLocal
+
+NOTES = "Team 1 took the first game easily. Team 2 levelled late. Team 1 won the decider."
+
+
+@pytest.fixture
+def stub_llm(monkeypatch, guard):
+    """The stub provider behind a fresh llm guard, with jitter taken out of every delay"""
+    monkeypatch.setitem(llm_call._genai_config, "provider", "stub")
+    monkeypatch.setattr(summary_service.random, "uniform", lambda low, high: 1.0)
+
+    def configure(failure_rate=0.0, latency_seconds=0.0, **guard_settings):
+        monkeypatch.setitem(llm_call._genai_config, "stub_failure_rate", failure_rate)
+        monkeypatch.setitem(llm_call._genai_config, "stub_latency_seconds", latency_seconds)
+        return guard("llm", **guard_settings)
+    return configure
+
+
+@pytest.fixture
+def jobs(monkeypatch, client):
+    """A private summary queue that records every delay it schedules"""
+    summary_queue = SummaryQueue(workers=1, queue_size=10, timeout_seconds=0.2, max_attempts=3, backoff_seconds=0.05)
+    summary_queue.delays = []
+    schedule = summary_queue._schedule
+
+    def record(job, status, delay):
+        summary_queue.delays.append((status, job.attempts, delay))
+        schedule(job, status, delay)
+
+    monkeypatch.setattr(summary_queue, "_schedule", record)
+    monkeypatch.setattr(summary_service, "summary_jobs", summary_queue)
+    summary_queue.start(SessionLocal)
+    yield summary_queue
+    summary_queue.stop()
+
+
+def _summarize(db, league, jobs):
+    match = Match(game_id=league["game"]["id"], status="completed", extra_data={"notes": NOTES})
+    db.add(match)
+    db.flush()
+    job = request_summary(db, match)
+    db.commit()
+    jobs.submit(job)
+    return match, job
+
+
+def _wait(db, match, job, seconds=5.0):
+    """Until the job has finished and its result is stored on the match"""
+    deadline = time.monotonic() + seconds
+    while True:
+        db.refresh(match)
+        if job.finished_at is not None and match.extra_data[SUMMARY_STATUS] != "pending":
+            return
+        assert time.monotonic() < deadline, f"job still {job.status}"
+        time.sleep(0.01)
+
+
+def test_failures_are_retried_with_doubling_backoff(db, league, jobs, stub_llm):
+    stub_llm(failure_rate=1.0)
+    match, job = _summarize(db, league, jobs)
+    _wait(db, match, job)
+
+    assert job.status == "failed"
+    assert job.attempts == jobs.max_attempts == 3
+    assert "Stub LLM failure" in job.error
+    assert jobs.delays == [("retrying", 1, pytest.approx(0.05)), ("retrying", 2, pytest.approx(0.1))]
+    assert match.extra_data["ai_summary"] == SUMMARY_FAILED
+    assert match.extra_data[SUMMARY_STATUS] == "failed"
+
+
+def test_a_timed_out_attempt_uses_up_an_attempt(db, league, jobs, stub_llm):
+    stub_llm(latency_seconds=1.0)
+    match, job = _summarize(db, league, jobs)
+    _wait(db, match, job)
+
+    assert job.status == "failed"
+    assert job.attempts == 3
+    assert [status for status, _, _ in jobs.delays] == ["retrying", "retrying"]
+
+
+def test_an_open_circuit_defers_without_using_an_attempt(db, league, jobs, stub_llm):
+    llm = stub_llm(failure_threshold=1, reset_seconds=0.2)
+    llm.breaker.record_failure()
+
+    match, job = _summarize(db, league, jobs)
+    _wait(db, match, job)
+
+    status, attempts, delay = jobs.delays[0]
+    assert (status, attempts) == ("deferred", 0)
+    assert 0 < delay <= 0.2
+    assert job.status == "succeeded"
+    assert job.attempts == 1  # Only the call made once the circuit let it through
+    assert match.extra_data[SUMMARY_STATUS] == "ready"
+    assert match.extra_data["ai_summary"].startswith("Team 1 took the first game easily.")
+
+
+def test_a_full_queue_fails_the_job_at_once():
+    summary_queue = SummaryQueue(workers=1, queue_size=1)  # Not started, so nothing is taken off the queue
+    first = summary_queue.create(1, NOTES)
+    second = summary_queue.create(2, NOTES)
+    summary_queue.submit(first)
+    summary_queue.submit(second)
+
+    assert first.status == "pending"
+    assert summary_queue.backlog == 1
+    assert second.status == "failed"
+    assert second.error == "Summary queue is full"
+    assert second.finished_at is not None
@@ -0,0 +1,86 @@
+import pytest
+
+from codebase.model.request_model import Franchise, Game, Player, Team, TeamPlayer
+
+
+@pytest.fixture
+def entrants(db):
+    """A game with 60-minute matches and six teams of two rostered players"""
+    game = Game(name="Table Tennis", winning_points=10, extra_data={"match_minutes": 60})
+    db.add(game)
+    db.flush()
+    team_ids = []
+    for number in range(6):
+        franchise = Franchise(name=f"Franchise {number}")
+        db.add(franchise)
+        db.flush()
+        team = Team(name=f"Team {number}", franchise_id=franchise.id, game_id=game.id)
+        roster = [Player(name=f"Player {number}.{seat}", franchise_id=franchise.id, total_points=0)
+                  for seat in range(2)]
+        db.add(team)
+        db.add_all(roster)
+        db.flush()
+        db.add_all(TeamPlayer(team_id=team.id, player_id=player.id) for player in roster)
+        team_ids.append(team.id)
+    db.commit()
+    return game.id, team_ids
+
+
+@pytest.mark.parametrize("tournament", [
+    {"format": "round_robin"},
+    {"format": "round_robin", "groups": 2, "days_between_rounds": 0},
+    {"format": "knockout"},
+])
+def test_generated_fixtures_at_one_location_do_not_conflict(client, entrants, tournament):
+    game_id, team_ids = entrants
+    response = client.post("/api/v1/fixtures/generate", json=dict({
+        "name": "Spring Cup",
+        "game_id": game_id,
+        "entry_ids": team_ids,
+        "start_date": "2026-04-06",
+        "match_time": "10:00",
+        "location": "Court 1"
+    }, **tournament))
+    assert response.status_code == 200, response.text
+    summary = response.json()
+
+    conflicts = client.get("/api/v1/fixtures/conflicts")
+    assert conflicts.status_code == 200
+    assert conflicts.json() == []
+
+    matches = [client.get(f"/api/v1/matches/{match_id}").json() for match_id in summary["match_ids"]]
+    starts = sorted(match["scheduled_at"] for match in matches)
+    assert len(set(starts)) == len(starts)  # One match at a time on the single court
+    assert all(match["match_time"] and match["location"] == "Court 1" for match in matches)
+
+
+def test_generated_rounds_without_a_location_share_a_start(client, entrants):
+    game_id, team_ids = entrants
+    response = client.post("/api/v1/fixtures/generate", json={
+        "name": "Spring League",
+        "game_id": game_id,
+        "entry_ids": team_ids[:4],
+        "start_date": "2026-04-06",
+        "match_time": "18:30"
+    })
+    assert response.status_code == 200, response.text
+    matches = [client.get(f"/api/v1/matches/{match_id}").json() for match_id in response.json()["match_ids"]]
+    assert {(match["match_date"], match["match_time"]) for match in matches} == {
+        ("2026-04-06", "18:30"), ("2026-04-07", "18:30"), ("2026-04-08", "18:30")
+    }
+
+
+def test_generated_fixtures_still_reject_a_booked_court(client, entrants):
+    game_id, team_ids = entrants
+    booked = client.post("/api/v1/fixtures/generate", json={
+        "name": "Morning Cup", "game_id": game_id, "entry_ids": team_ids[:2], "start_date": "2026-04-06",
+        "match_time": "10:00", "location": "Court 1"
+    })
+    assert booked.status_code == 200, booked.text
+
+    clash = client.post("/api/v1/fixtures/generate", json={
+        "name": "Evening Cup", "game_id": game_id, "entry_ids": team_ids[2:4], "start_date": "2026-04-06",
+        "match_time": "10:30", "location": "court 1"
+    })
+    assert clash.status_code == 409
+    assert clash.json()["detail"]["conflicts"][0]["type"] == "location"